@@ -7,6 +7,8 @@ These scripts are intended to be invoked via the Agent's runtime environment
 
 Structure:
 - Scripts should be stateless where possible.
+- `python .agent/scripts <tool> [args]` dispatches to any script's main()
+  (see __main__.py and tool_registry.TOOLS).
 """
 
 __version__ = "1.0.0"
@@ -0,0 +1,68 @@
+"""
+DDR Tools Entry Point.
+
+Single command that dispatches to every tool script's ``main()``.
+
+Only the chosen tool's module is imported, and the tool parses its own
+arguments, so ``python .agent/scripts find_tags_citing --id BRD-1`` behaves
+exactly like ``python .agent/scripts/find_tags_citing.py --id BRD-1``.
+
+Meta
+----
+Knowledge Source: .agent/knowledge/sources/protocols/traceability_chain.md
+Architect       : Antigravity IDE
+
+Usage
+-----
+    python .agent/scripts <tool> [tool arguments...]
+    python .agent/scripts find-tags-citing --id BRD-1
+    python .agent/scripts --list
+
+    cd .agent && python -m scripts <tool> [tool arguments...]
+
+Exit Codes
+----------
+Exit code of the tool; 1 for an unknown tool, 2 for a missing tool name.
+"""
+import sys
+from pathlib import Path
+
+# Sibling imports (``from needs_store import ...``) also under ``python -m``.
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from tool_registry import TOOLS, load_tool, resolve_tool  # noqa: E402
+
+USAGE = "usage: python .agent/scripts <tool> [tool arguments...] | --list"
+
+
+def main() -> int:
+    """
+    CLI entry point for the DDR tools.
+
+    Returns
+    -------
+    int
+        Exit code of the dispatched tool.
+    """
+    if len(sys.argv) < 2 or sys.argv[1] in ("-h", "--help"):
+        print(USAGE, file=sys.stderr)
+        print("tools: " + ", ".join(sorted(TOOLS)), file=sys.stderr)
+        return 2
+    if sys.argv[1] == "--list":
+        print("\n".join(sorted(TOOLS)))
+        return 0
+
+    try:
+        name = resolve_tool(sys.argv[1])
+    except KeyError as e:
+        print(f"Error: {e.args[0]}", file=sys.stderr)
+        print(USAGE, file=sys.stderr)
+        return 1
+
+    # The tool sees the same argv as when its script is run directly.
+    sys.argv = [f"{name}.py", *sys.argv[2:]]
+    return load_tool(name).main() or 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
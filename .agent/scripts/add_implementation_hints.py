@@ -19,29 +19,11 @@ Exit Codes
 1 : Error
 """
 import argparse
-import json
 import re
 import sys
 from pathlib import Path
 
-
-def load_needs(path: Path) -> dict:
-    """
-    Load needs from needs.json.
-
-    Parameters
-    ----------
-    path : Path
-        Path to needs.json.
-
-    Returns
-    -------
-    dict
-        need_id -> need_data mapping.
-    """
-    with open(path, "r", encoding="utf-8") as f:
-        data = json.load(f)
-    return data.get("versions", {}).get("0.1", {}).get("needs", {})
+from needs_store import load_records
 
 
 def add_hints(isp_file: Path, needs: dict, dry_run: bool = False) -> str:
@@ -103,7 +85,7 @@ def main() -> int:
         print(f"Error: {needs_path} not found", file=sys.stderr); return 1
 
     try:
-        add_hints(isp, load_needs(needs_path), args.dry_run)
+        add_hints(isp, load_records(needs_path), args.dry_run)
         return 0
     except Exception as e:
         print(f"Error: {e}", file=sys.stderr); return 1
@@ -0,0 +1,487 @@
+"""
+Audit Engine.
+
+Runs the per-need audit checks in a single pass over the needs and
+produces one stream of findings; the reports of the stand-alone checkers
+are views over that stream.
+
+Each need is visited once and handed to every selected check:
+
+- ``anti_patterns``       : detect_anti_patterns rules (validation-cached)
+- ``tier_compliance``     : validate_tier_compliance rules (validation-cached)
+- ``traceability_report`` : generate_traceability_report.need_violations
+
+after which each reconciliation manifest is checked once
+(``manifest_integrity``: check_manifest_integrity.check_manifest). The
+checks call the same per-need functions as the stand-alone tools, so a
+view rebuilds a tool's report exactly.
+
+Three anti-patterns restate a traceability violation: AP002 (Orphan Tag)
+is ORPHAN, AP003 (Sibling Citation) is SIBLING_CITATION and AP004 (Forward
+Reference) is FORWARD_REFERENCE, except that the anti-patterns also count
+links to tags that do not exist. When both checks run, the combined
+report keeps the traceability finding and drops an anti-pattern finding
+that only repeats it for the same need; the per-check views still
+report both.
+
+Meta
+----
+Tool Definition : .agent/tools/trace_audit_engine.md
+Knowledge Source: .agent/knowledge/sources/protocols/traceability_chain.md
+                  .agent/knowledge/sources/patterns/manifest_structure.md
+Architect       : Antigravity IDE
+
+Usage
+-----
+    python audit_engine.py --needs-json docs/_build/json/needs.json
+    python audit_engine.py --checks anti_patterns,traceability_report
+    python audit_engine.py --view tier_compliance
+    python audit_engine.py --format sarif > audit.sarif
+
+    from audit_engine import Audit, VIEWS
+
+    audit = Audit(needs, manifest_dir=Path("docs"), needs_path=path).run()
+    report = VIEWS["traceability_report"](audit)
+
+Exit Codes
+----------
+0 : Success (JSON printed to stdout)
+1 : Error (Details printed to stderr)
+
+Notes
+-----
+- A check that raises stops for the remaining needs; its error is kept
+  in ``Audit.errors`` and its view raises ``RuntimeError``.
+- Views produce the stand-alone tools' output with default options
+  (``traceability_report`` also takes ``severity``).
+- ``--format ndjson|sarif|junit`` writes findings while the pass runs
+  (``violation_writer``) instead of collecting a report.
+"""
+import argparse
+import json
+import sys
+from functools import partial
+from itertools import groupby
+from operator import attrgetter
+from pathlib import Path
+from typing import Any, Callable, Iterable, Iterator, NamedTuple, TextIO
+
+import check_manifest_integrity
+import detect_anti_patterns
+import generate_traceability_report
+import validate_tier_compliance
+from needs_store import load_records
+from validation_cache import ValidationCache, ruleset_version
+from violation_writer import WRITERS, write_findings
+
+CHECKS: tuple[str, ...] = (
+    "anti_patterns", "tier_compliance", "traceability_report", "manifest_integrity",
+)
+
+# Anti-pattern -> traceability violation type it restates.
+DUPLICATES: dict[str, str] = {
+    "AP002": "ORPHAN",
+    "AP003": "SIBLING_CITATION",
+    "AP004": "FORWARD_REFERENCE",
+}
+
+# Severity of findings whose checker assigns none.
+DEFAULT_SEVERITY: str = "WARNING"
+
+MANIFEST_MESSAGES: dict[str, str] = {
+    "MISSING_FIELD": "Missing field {field}",
+    "INVALID_STATUS": "Invalid integrity status '{value}'",
+    "COUNT_MISMATCH": "tag_count {declared} does not match {actual} inventory items",
+    "MISSING_TAG": "Pending item targets unknown tag '{tag}'",
+}
+
+
+class Finding(NamedTuple):
+    """
+    One violation in the audit stream.
+
+    Attributes
+    ----------
+    check : str
+        Check that reported it (see ``CHECKS``).
+    id : str
+        Need ID, or the manifest path for manifest findings.
+    rule : str
+        Pattern ID, tier rule or violation type.
+    severity : str
+        ``ERROR`` or ``WARNING``.
+    message : str
+        Human-readable description.
+    docname : str or None
+        Source document of the need.
+    lineno : int or None
+        Line of the need's directive in ``docname``.
+    detail : dict
+        The record the stand-alone checker reports.
+    """
+    check: str
+    id: str
+    rule: str
+    severity: str
+    message: str
+    docname: str | None
+    lineno: int | None
+    detail: dict
+
+    def to_dict(self) -> dict:
+        """Return the finding without its checker record."""
+        return {"check": self.check, "id": self.id, "rule": self.rule,
+                "severity": self.severity, "message": self.message,
+                "docname": self.docname, "lineno": self.lineno}
+
+
+# Builds a Finding from a full tuple without the Python-level __new__;
+# checks create one per violation.
+_finding = partial(tuple.__new__, Finding)
+
+
+class Audit:
+    """
+    One pass of the selected checks over a needs set.
+
+    Parameters
+    ----------
+    needs : dict
+        Dictionary of need_id -> need data, in needs.json order.
+    checks : tuple[str, ...]
+        Checks to run (subset of ``CHECKS``).
+    manifest_dir : Path, optional
+        Directory scanned for reconciliation manifests; required by
+        ``manifest_integrity``.
+    needs_path : Path, optional
+        Path to needs.json. If given, the rule checkers answer unchanged
+        needs from their validation caches.
+
+    Attributes
+    ----------
+    findings : list[Finding]
+        All findings in stream order (after ``run``): per need in
+        needs.json order, checks in ``CHECKS`` order, then manifests.
+    counts : dict[str, int]
+        Needs (or manifests) each check examined.
+    errors : dict[str, str]
+        Check -> error that stopped it.
+    """
+
+    def __init__(self, needs: dict, checks: tuple[str, ...] = CHECKS,
+                 manifest_dir: Path | None = None, needs_path: Path | None = None):
+        unknown = [c for c in checks if c not in CHECKS]
+        if unknown:
+            raise ValueError(f"Unknown check(s): {', '.join(unknown)}. Valid: {', '.join(CHECKS)}")
+        if "manifest_integrity" in checks and manifest_dir is None:
+            raise ValueError("manifest_integrity needs a manifest_dir")
+        self.needs = needs
+        self.checks = tuple(c for c in CHECKS if c in checks)
+        self.manifest_dir = manifest_dir
+        self.needs_path = needs_path
+        self.findings: list[Finding] = []
+        self.counts = {c: 0 for c in self.checks}
+        self.errors: dict[str, str] = {}
+        self._caches: dict[str, ValidationCache] = {}
+        self._check_all = detect_anti_patterns.PATTERNS.checker()
+        if needs_path is not None:
+            versions = {"anti_patterns": ruleset_version(*detect_anti_patterns.RULESET_FILES),
+                        "tier_compliance": ruleset_version(validate_tier_compliance.__file__)}
+            self._caches = {c: ValidationCache(needs_path, c, v, needs)
+                            for c, v in versions.items() if c in self.checks}
+
+    def _anti_patterns(self, nid: str, ndata: Any) -> list[Finding]:
+        hits = self._cached("anti_patterns", nid, ndata, self._check_all)
+        if not hits:
+            return []
+        loc = ndata.get("docname"), ndata.get("lineno")
+        return [_finding(("anti_patterns", nid, v["pattern"], DEFAULT_SEVERITY, v["name"],
+                          *loc, v))
+                for v in detect_anti_patterns.report_hits(nid, hits)]
+
+    def _tier_compliance(self, nid: str, ndata: Any) -> list[Finding]:
+        tier = validate_tier_compliance.get_tier(nid)
+        if tier not in validate_tier_compliance.RULES:
+            return []
+        self.counts["tier_compliance"] += 1
+        found = self._cached("tier_compliance", nid, ndata,
+                             lambda nid, ndata: validate_tier_compliance.check_need(nid, ndata, tier))
+        if not found:
+            return []
+        loc = ndata.get("docname"), ndata.get("lineno")
+        return [_finding(("tier_compliance", nid, v["rule"], DEFAULT_SEVERITY,
+                          f"Fails {tier} rule '{v['rule']}'", *loc, v)) for v in found]
+
+    def _traceability_report(self, nid: str, ndata: Any) -> list[Finding]:
+        found = generate_traceability_report.need_violations(nid, ndata, self.needs)
+        if not found:
+            return []
+        loc = ndata.get("docname"), ndata.get("lineno")
+        return [_finding(("traceability_report", nid, v["type"], v["severity"], v["message"],
+                          *loc, v)) for v in found]
+
+    def _cached(self, check: str, nid: str, ndata: Any,
+                compute: Callable[[str, Any], Any]) -> Any:
+        cache = self._caches.get(check)
+        if cache is None:
+            return compute(nid, ndata)
+        return cache.get(nid, ndata, lambda: compute(nid, ndata))
+
+    def stream(self) -> Iterator[Finding]:
+        """
+        Run the checks, yielding findings as they are found.
+
+        Yields
+        ------
+        Finding
+            In stream order (see ``findings``).
+        """
+        runs = [(c, getattr(self, f"_{c}")) for c in self.checks if c != "manifest_integrity"]
+        for nid, ndata in self.needs.items():
+            for check, run in runs:
+                try:
+                    found = run(nid, ndata)
+                except Exception as e:
+                    self.errors[check] = f"{type(e).__name__}: {e}"
+                    runs = [(c, r) for c, r in runs if c != check]
+                    continue
+                yield from found
+        for check, _ in runs:
+            if check != "tier_compliance":
+                self.counts[check] = len(self.needs)
+
+        if "manifest_integrity" in self.checks:
+            try:
+                for mpath in check_manifest_integrity.find_manifests(self.manifest_dir):
+                    issues = check_manifest_integrity.check_manifest(mpath, self.needs)
+                    self.counts["manifest_integrity"] += 1
+                    for v in issues:
+                        yield Finding("manifest_integrity", str(mpath), v["type"], v["severity"],
+                                      MANIFEST_MESSAGES[v["type"]].format(**v), None, None, v)
+            except Exception as e:
+                self.errors["manifest_integrity"] = f"{type(e).__name__}: {e}"
+
+        for cache in self._caches.values():
+            cache.save()
+
+    def run(self) -> "Audit":
+        """Run the checks, collecting the stream into ``findings``."""
+        self.findings = list(self.stream())
+        return self
+
+    def details(self, check: str) -> list[dict]:
+        """Return the checker records of one check, in stream order."""
+        if check in self.errors:
+            raise RuntimeError(f"{check} failed: {self.errors[check]}")
+        if check not in self.checks:
+            raise ValueError(f"{check} was not run")
+        return [f.detail for f in self.findings if f.check == check]
+
+    def per_need(self, check: str) -> list[list[dict]]:
+        """Return the checker records of one check grouped by need, in needs order."""
+        by_id: dict[str, list[dict]] = {}
+        for detail in self.details(check):
+            by_id.setdefault(detail["id"], []).append(detail)
+        return [by_id.get(nid, []) for nid in self.needs]
+
+
+def anti_patterns_view(audit: Audit) -> dict:
+    """Return ``detect_anti_patterns.detect``'s report."""
+    return detect_anti_patterns.summarize(audit.per_need("anti_patterns"))
+
+
+def tier_compliance_view(audit: Audit) -> dict:
+    """Return ``validate_tier_compliance.validate``'s report."""
+    details = audit.details("tier_compliance")
+    return {"checked": audit.counts["tier_compliance"], "violations": len(details),
+            "details": details}
+
+
+def traceability_view(audit: Audit, severity: str = "ALL") -> dict:
+    """Return ``generate_traceability_report.analyze``'s report."""
+    return generate_traceability_report.summarize(
+        audit.needs, audit.per_need("traceability_report"), severity)
+
+
+def manifest_view(audit: Audit) -> dict:
+    """Return ``check_manifest_integrity.check_manifests``' report."""
+    return check_manifest_integrity.summarize(audit.counts["manifest_integrity"],
+                                              audit.details("manifest_integrity"))
+
+
+VIEWS: dict[str, Callable[[Audit], dict]] = {
+    "anti_patterns": anti_patterns_view,
+    "tier_compliance": tier_compliance_view,
+    "traceability_report": traceability_view,
+    "manifest_integrity": manifest_view,
+}
+
+
+def deduplicated(findings: Iterable[Finding]) -> Iterator[Finding]:
+    """
+    Drop anti-pattern findings that repeat a traceability finding.
+
+    Parameters
+    ----------
+    findings : Iterable[Finding]
+        Findings in stream order; only one need's findings are held at a
+        time, so a live ``Audit.stream()`` stays streaming.
+
+    Yields
+    ------
+    Finding
+        The remaining findings, in order.
+    """
+    for _, group in groupby(findings, key=attrgetter("id")):
+        group = list(group)
+        traced = {f.rule for f in group if f.check == "traceability_report"}
+        for f in group:
+            if not (f.check == "anti_patterns" and DUPLICATES.get(f.rule) in traced):
+                yield f
+
+
+def combined(findings: list[Finding]) -> tuple[list[Finding], int]:
+    """Return ``deduplicated`` findings and the number dropped."""
+    kept = list(deduplicated(findings))
+    return kept, len(findings) - len(kept)
+
+
+def report(audit: Audit) -> dict:
+    """
+    Build the combined report of an audit.
+
+    Returns
+    -------
+    dict
+        ``summary`` (counts per check and severity, duplicates dropped),
+        ``findings`` and ``errors``.
+    """
+    findings, duplicates = combined(audit.findings)
+    by_check = {c: 0 for c in audit.checks}
+    by_severity: dict[str, int] = {}
+    for f in findings:
+        by_check[f.check] += 1
+        by_severity[f.severity] = by_severity.get(f.severity, 0) + 1
+    return {"success": not audit.errors,
+            "summary": {"needs": len(audit.needs), "checked": audit.counts,
+                        "findings": len(findings), "duplicates_dropped": duplicates,
+                        "by_check": by_check, "by_severity": by_severity},
+            "findings": [f.to_dict() for f in findings],
+            "errors": audit.errors}
+
+
+def stream_check(needs: dict, check: str, fmt: str, out: TextIO,
+                 keep: Callable[[Finding], bool] | None = None,
+                 manifest_dir: Path | None = None, needs_path: Path | None = None,
+                 source_dir: str = "docs") -> int:
+    """
+    Stream one check's findings to ``out`` (the checkers' streaming formats).
+
+    Parameters
+    ----------
+    needs : dict
+        Dictionary of need_id -> need data.
+    check : str
+        Check to run (see ``CHECKS``).
+    fmt : str
+        Format in ``violation_writer.WRITERS``.
+    out : TextIO
+        Destination stream.
+    keep : Callable[[Finding], bool], optional
+        Filter standing in for the checker's own options.
+    manifest_dir, needs_path : Path, optional
+        As for ``Audit``.
+    source_dir : str
+        Directory docnames are relative to.
+
+    Returns
+    -------
+    int
+        Exit code: 1 if the check failed part-way, else 0.
+    """
+    audit = Audit(needs, (check,), manifest_dir, needs_path)
+    findings = audit.stream() if keep is None else filter(keep, audit.stream())
+    write_findings(findings, fmt, out, source_dir, audit.errors)
+    for name, error in audit.errors.items():
+        print(f"Error in check {name}: {error}", file=sys.stderr)
+    return 1 if audit.errors else 0
+
+
+def main() -> int:
+    """
+    CLI entry point for audit_engine.
+
+    Returns
+    -------
+    int
+        Exit code (0=success, 1=error).
+    """
+    parser = argparse.ArgumentParser(
+        description="Run every audit check in one pass over the needs."
+    )
+    parser.add_argument(
+        "--needs-json",
+        default="docs/_build/json/needs.json",
+        help="Path to needs.json file"
+    )
+    parser.add_argument(
+        "--manifest-dir",
+        default="docs/",
+        help="Directory to scan for reconciliation manifests"
+    )
+    parser.add_argument(
+        "--checks",
+        help=f"Comma-separated checks to run (default: all of {', '.join(CHECKS)})"
+    )
+    parser.add_argument(
+        "--view",
+        choices=list(VIEWS),
+        help="Print this check's stand-alone report instead of the combined one"
+    )
+    parser.add_argument(
+        "--format",
+        choices=["json", *WRITERS],
+        default="json",
+        help="json report, or stream findings as ndjson, SARIF 2.1.0 or JUnit XML"
+    )
+    parser.add_argument(
+        "--source-dir",
+        default="docs",
+        help="Directory docnames are relative to, for streamed file paths (default: docs)"
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Check every need instead of reusing cached results"
+    )
+
+    args = parser.parse_args()
+
+    path = Path(args.needs_json)
+    if not path.exists():
+        print(f"Error: {path} not found", file=sys.stderr)
+        return 1
+
+    try:
+        checks = tuple(c.strip() for c in args.checks.split(",")) if args.checks else CHECKS
+        if args.view:
+            checks = (args.view,)
+        audit = Audit(load_records(path), checks, Path(args.manifest_dir),
+                      None if args.no_cache else path)
+        if args.format != "json":
+            stream = audit.stream() if args.view else deduplicated(audit.stream())
+            write_findings(stream, args.format, sys.stdout, args.source_dir, audit.errors)
+        else:
+            audit.run()
+            print(json.dumps(VIEWS[args.view](audit) if args.view else report(audit), indent=2))
+        for check, error in audit.errors.items():
+            print(f"Error in check {check}: {error}", file=sys.stderr)
+        return 0 if not audit.errors else 1
+
+    except Exception as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
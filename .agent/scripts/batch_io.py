@@ -0,0 +1,227 @@
+"""
+Batch I/O.
+
+Shared batch mode for the per-tag tools (extract_citations,
+find_tags_citing, update_tag, deprecate_tag, generate_class_stub).
+
+A batch is a list of requests answered from one loaded needs set and
+graph. Requests come from repeated ``--id`` options and/or a JSONL source
+(``--batch FILE``, ``-`` for stdin); results stream to stdout as NDJSON,
+one line per request, in request order.
+
+Meta
+----
+Knowledge Source: .agent/knowledge/sources/protocols/impact_analysis.md
+Architect       : Antigravity IDE
+
+Usage
+-----
+    python find_tags_citing.py --id BRD-1 --id BRD-2
+    python update_tag.py --batch requests.jsonl
+    python extract_citations.py --batch - < ids.txt
+
+Request Format
+--------------
+Each non-blank JSONL line is either a JSON object whose keys are the tool's
+option names (``{"id": "FSD-1", "field": "title", "value": "New"}``) or a
+bare tag ID (``FSD-1``, quoted or not). Lines starting with ``#`` are
+skipped. Options given on the command line are defaults for every request.
+
+Notes
+-----
+- A request that fails validation yields
+  ``{"success": false, "request": {...}, "error": "..."}`` and the batch
+  carries on; the exit code is 1 if any request failed.
+- Tag IDs, fields and values must be JSON strings and ``recursive`` a
+  JSON boolean; ``"recursive": "false"`` is rejected, not coerced.
+"""
+import json
+import sys
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, Optional, TextIO
+
+# JSON type of each request key; ``null`` stands for an omitted option,
+# except for the tag ID.
+REQUEST_TYPES: dict[str, type] = {
+    "id": str,
+    "tdd_id": str,
+    "field": str,
+    "value": str,
+    "replacement": str,
+    "recursive": bool,
+}
+_TAG_KEYS: frozenset = frozenset({"id", "tdd_id"})
+
+
+def add_batch_argument(parser, key: str = "id", aliases: tuple[str, ...] = ()) -> None:
+    """
+    Add ``--batch`` and make ``--<key>`` repeatable (one of them required).
+
+    Parameters
+    ----------
+    parser : argparse.ArgumentParser
+        Tool parser; must not already define ``--<key>``.
+    key : str
+        Request key naming the tag ID option (``id`` or ``tdd_id``).
+    aliases : tuple[str, ...]
+        Extra option strings for ``--<key>`` (e.g. ``("--tag-id",)``).
+    """
+    group = parser.add_mutually_exclusive_group(required=True)
+    option = "--" + key.replace("_", "-")
+    group.add_argument(
+        option,
+        *aliases,
+        dest=key,
+        action="append",
+        help="Tag ID to process; repeat for a batch (NDJSON output)"
+    )
+    group.add_argument(
+        "--batch",
+        metavar="JSONL",
+        help="File of JSONL requests or tag IDs, one per line ('-' for stdin)"
+    )
+
+
+def is_batch(args, key: str = "id") -> bool:
+    """Return True if the parsed arguments select batch (NDJSON) mode."""
+    return args.batch is not None or len(getattr(args, key) or []) > 1
+
+
+def _parse_line(line: str, key: str) -> dict:
+    text = line.strip()
+    if text.startswith("{"):
+        request = json.loads(text)
+        if not isinstance(request, dict):
+            raise ValueError("request must be a JSON object")
+        return request
+    if text.startswith('"'):
+        return {key: json.loads(text)}
+    return {key: text}
+
+
+def read_requests(stream: TextIO, key: str = "id") -> Iterator[dict]:
+    """
+    Parse JSONL requests from a text stream.
+
+    Parameters
+    ----------
+    stream : TextIO
+        Open request source.
+    key : str
+        Key that bare tag IDs are stored under.
+
+    Yields
+    ------
+    dict
+        Request object; malformed lines yield ``{"_error": message}``.
+    """
+    for lineno, line in enumerate(stream, 1):
+        if not line.strip() or line.lstrip().startswith("#"):
+            continue
+        try:
+            yield _parse_line(line, key)
+        except ValueError as e:
+            yield {"_error": f"line {lineno}: {e}", "_line": line.rstrip("\n")}
+
+
+def iter_requests(args, key: str = "id",
+                  defaults: Optional[dict] = None) -> Iterator[dict]:
+    """
+    Yield the requests selected on the command line.
+
+    Parameters
+    ----------
+    args : argparse.Namespace
+        Parsed arguments (see ``add_batch_argument``).
+    key : str
+        Request key naming the tag ID.
+    defaults : dict, optional
+        Command-line values applied to every request unless it overrides them.
+
+    Yields
+    ------
+    dict
+        Requests from ``--<key>`` first, then from ``--batch``.
+    """
+    defaults = {k: v for k, v in (defaults or {}).items() if v is not None}
+    for tag_id in getattr(args, key) or []:
+        yield {**defaults, key: tag_id}
+    if args.batch is None:
+        return
+    stream = sys.stdin if args.batch == "-" else open(Path(args.batch), encoding="utf-8")
+    try:
+        for request in read_requests(stream, key):
+            yield request if "_error" in request else {**defaults, **request}
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+
+
+def check_request(request: dict) -> None:
+    """
+    Check the JSON types of a request's fields.
+
+    Parameters
+    ----------
+    request : dict
+        Request (see ``iter_requests``).
+
+    Raises
+    ------
+    ValueError
+        If a field has the wrong type (see ``REQUEST_TYPES``).
+    """
+    for key, value in request.items():
+        expected = REQUEST_TYPES.get(key)
+        if expected is None or (value is None and key not in _TAG_KEYS):
+            continue
+        if type(value) is not expected:
+            name = "a string" if expected is str else "true or false"
+            raise ValueError(f"Request field '{key}' must be {name}, not {json.dumps(value)}")
+
+
+def run_batch(requests: Iterable[dict], handle: Callable[..., dict],
+              allowed: Iterable[str], out: Optional[TextIO] = None) -> int:
+    """
+    Answer requests and stream one NDJSON result line per request.
+
+    Parameters
+    ----------
+    requests : Iterable[dict]
+        Requests (see ``iter_requests``).
+    handle : Callable[..., dict]
+        Called with each request's fields as keyword arguments; returns the
+        tool's usual result dict. Requests failing ``check_request`` and
+        ``ValueError``/``KeyError``/``TypeError`` from ``handle`` become a
+        failure record for that request.
+    allowed : Iterable[str]
+        Keys a request may carry.
+    out : TextIO, optional
+        Output stream (default: stdout).
+
+    Returns
+    -------
+    int
+        Exit code: 0 if every request succeeded, 1 otherwise.
+    """
+    out = out or sys.stdout
+    allowed = frozenset(allowed)
+    failed = False
+    for request in requests:
+        if "_error" in request:
+            result = {"success": False, "request": request["_line"],
+                      "error": request["_error"]}
+        else:
+            unknown = sorted(set(request) - allowed)
+            try:
+                if unknown:
+                    raise ValueError(f"Unknown request keys: {', '.join(unknown)}")
+                check_request(request)
+                result = handle(**request)
+            except (ValueError, KeyError, TypeError) as e:
+                message = e.args[0] if isinstance(e, KeyError) and e.args else e
+                result = {"success": False, "request": request, "error": str(message)}
+        failed |= not result.get("success", False)
+        out.write(json.dumps(result) + "\n")
+        out.flush()
+    return 1 if failed else 0
@@ -0,0 +1,408 @@
+"""
+Blast Radius Tool.
+
+Ranks DDR tags by how risky they are to change. A tag's score combines
+three measures of what an edit to it sets in motion:
+
+- ``weighted_descendants``: every tag citing it directly or transitively,
+  weighted by tier (``TIER_WEIGHTS``; implementation-side tags cost more
+  to rework). Counted exactly from the reachability index's bitsets.
+- ``fanout``: depth-discounted number of citation paths leading to it,
+  ``sum(DEPTH_DISCOUNT ** (k - 1) * paths_of_length(k))`` for ``k`` up to
+  ``MAX_DEPTH`` (a Katz-style centrality over the reverse graph). Computed
+  for all tags at once by ``MAX_DEPTH`` sparse matrix-vector products over
+  the CSR child arrays, vectorized with NumPy when it is installed.
+- ``manifests``: reconciliation manifests (one per top-level docs section)
+  holding the tag or a descendant, i.e. the sections an edit turns DIRTY.
+  Propagated as small bitmasks over the condensation of the graph, children
+  first.
+
+``score = weighted_descendants + FANOUT_WEIGHT * fanout
++ MANIFEST_WEIGHT * len(manifests)``. Scores are cached with the other
+needs.json snapshots.
+
+Meta
+----
+Tool Definition : .agent/tools/trace_blast_radius.md
+Knowledge Source: .agent/knowledge/sources/protocols/impact_analysis.md
+                  .agent/knowledge/sources/protocols/reconciliation_dirty_flag.md
+Architect       : Antigravity IDE
+
+Usage
+-----
+    python blast_radius.py --top 20
+    python blast_radius.py --id BRD-5
+
+    from blast_radius import load_blast_radius
+
+    radius = load_blast_radius(Path("docs/_build/json/needs.json"))
+    radius.entry("BRD-5")["high_risk"]
+
+Exit Codes
+----------
+0 : Success (JSON result printed to stdout)
+1 : Error (Details printed to stderr)
+
+Notes
+-----
+- NumPy is optional; without it the propagation runs as plain Python
+  loops over the same arrays and gives identical scores.
+- ``high_risk`` marks tags scoring at or above the ``HIGH_RISK_PERCENTILE``
+  of all non-zero scores.
+"""
+import argparse
+import json
+import sys
+from pathlib import Path
+
+import needs_store
+from citation_graph import CitationGraph, load_graph
+from needs_store import TIER_ORDER, get_tier
+from reachability import Reachability, load_reachability
+
+try:
+    import numpy as np
+except ImportError:  # optional: pure-Python propagation below
+    np = None
+
+# Snapshot kind for needs_store.cached; bump the suffix if the payload changes.
+SNAPSHOT_KIND: str = "blast-radius-v1"
+
+TIER_WEIGHTS: dict[str, float] = {
+    "BRD": 1.0, "NFR": 1.0, "FSD": 2.0, "SAD": 2.0, "ICD": 3.0, "TDD": 3.0, "ISP": 4.0,
+}
+UNKNOWN_TIER_WEIGHT: float = 1.0
+DEPTH_DISCOUNT: float = 0.5
+MAX_DEPTH: int = 8
+FANOUT_WEIGHT: float = 1.0
+MANIFEST_WEIGHT: float = 5.0
+HIGH_RISK_PERCENTILE: float = 0.9
+
+
+def manifest_of(docname: str) -> str:
+    """Return the docs section whose reconciliation manifest covers ``docname``."""
+    return docname.split("/", 1)[0] if docname else ""
+
+
+def discounted_fanout(graph: CitationGraph, depth: int = MAX_DEPTH,
+                      discount: float = DEPTH_DISCOUNT) -> list[float]:
+    """
+    Depth-discounted citation path counts for every node.
+
+    Parameters
+    ----------
+    graph : CitationGraph
+        Citation graph.
+    depth : int
+        Longest path length counted.
+    discount : float
+        Factor applied per level beyond the first.
+
+    Returns
+    -------
+    list[float]
+        Per node, ``sum(discount ** (k - 1) * paths_of_length(k))``.
+    """
+    count = len(graph.ids)
+    c_off, c_idx = graph.child_offsets, graph.child_indices
+    if np is not None:
+        offsets = np.frombuffer(c_off, dtype=np.int32)
+        children = np.frombuffer(c_idx, dtype=np.int32)
+        rows = np.repeat(np.arange(count), np.diff(offsets))
+        paths = np.ones(count)
+        total = np.zeros(count)
+        for level in range(depth):
+            paths = np.bincount(rows, weights=paths[children], minlength=count)
+            total += discount ** level * paths
+        return total.tolist()
+
+    paths = [1.0] * count
+    total = [0.0] * count
+    for level in range(depth):
+        weight = discount ** level
+        nxt = [0.0] * count
+        for i in range(count):
+            s = 0.0
+            for k in range(c_off[i], c_off[i + 1]):
+                s += paths[c_idx[k]]
+            nxt[i] = s
+            total[i] += weight * s
+        paths = nxt
+    return total
+
+
+def manifests_touched(graph: CitationGraph, needs: dict) -> tuple[list[str], list[int]]:
+    """
+    Reconciliation manifests holding each node or one of its descendants.
+
+    Parameters
+    ----------
+    graph : CitationGraph
+        Citation graph for ``needs``.
+    needs : dict
+        Dictionary of need_id -> need data.
+
+    Returns
+    -------
+    tuple[list[str], list[int]]
+        Manifest names (sorted) and, per node, a bitmask over them.
+    """
+    ids, count = graph.ids, graph.need_count
+    sections = [manifest_of(needs[ids[i]].get("docname", "")) for i in range(count)]
+    names = sorted({s for s in sections if s})
+    bit = {name: 1 << m for m, name in enumerate(names)}
+    own = [bit.get(s, 0) for s in sections] + [0] * (len(ids) - count)
+
+    # Components come parents-first; walk them backwards so every citing
+    # component is finished before the components it cites.
+    c_off, c_idx = graph.child_offsets, graph.child_indices
+    components = graph.strongly_connected_components()
+    masks = [0] * len(ids)
+    for members in reversed(components):
+        mask = 0
+        for node in members:
+            mask |= own[node]
+            for k in range(c_off[node], c_off[node + 1]):
+                mask |= masks[c_idx[k]]
+        for node in members:
+            masks[node] = mask
+    return names, masks
+
+
+def score_graph(graph: CitationGraph, needs: dict, reach: Reachability | None = None) -> tuple:
+    """
+    Compute blast-radius metrics for every defined need.
+
+    Parameters
+    ----------
+    graph : CitationGraph
+        Citation graph for ``needs``.
+    needs : dict
+        Dictionary of need_id -> need data.
+    reach : Reachability, optional
+        Reachability index for ``graph``. Built on demand if omitted.
+
+    Returns
+    -------
+    tuple
+        Plain-data state for ``BlastRadius``: ids, manifest names, and per
+        need the descendant count, weighted descendants, fanout, manifest
+        mask and score.
+    """
+    reach = reach or Reachability.from_graph(graph)
+    count, ids = graph.need_count, graph.ids
+
+    # One bitset per distinct tier weight; weighted count = sum of weighted
+    # popcounts of the intersections.
+    by_weight: dict[float, bytearray] = {}
+    for i in range(count):
+        w = TIER_WEIGHTS.get(get_tier(ids[i]), UNKNOWN_TIER_WEIGHT)
+        buf = by_weight.setdefault(w, bytearray((count + 7) // 8))
+        buf[i >> 3] |= 1 << (i & 7)
+    groups = sorted((w, int.from_bytes(buf, "little")) for w, buf in by_weight.items())
+    # The heaviest group is implied: weighted = top * total + the other
+    # groups' excess over ``top`` (negative), saving one AND per need.
+    top = groups[-1][0] if groups else 0.0
+    rest = [(w - top, mask) for w, mask in groups[:-1]]
+
+    # Members of a citation cycle share one descendant int.
+    memo: dict[int, tuple[int, float]] = {}
+    defined_mask = (1 << count) - 1
+    descendants, weighted = [0] * count, [0.0] * count
+    for i in range(count):
+        bits = reach.descendant_bits[i]
+        key = id(bits)
+        if key not in memo:
+            if bits.bit_length() > count:
+                bits &= defined_mask
+            total = bits.bit_count()
+            memo[key] = (total, top * total + sum(d * (bits & mask).bit_count()
+                                                  for d, mask in rest))
+        descendants[i], weighted[i] = memo[key]
+
+    fanout = discounted_fanout(graph)[:count]
+    names, masks = manifests_touched(graph, needs)
+    masks = masks[:count]
+    scores = [round(weighted[i] + FANOUT_WEIGHT * fanout[i]
+                    + MANIFEST_WEIGHT * masks[i].bit_count(), 3) for i in range(count)]
+    return ([ids[i] for i in range(count)], names, descendants, weighted, [round(f, 3) for f in fanout], masks, scores)
+
+
+class BlastRadius:
+    """
+    Blast-radius scores of every defined need, with rank lookups.
+
+    Attributes
+    ----------
+    ids : list[str]
+        Need IDs in needs.json order.
+    manifests : list[str]
+        Manifest (docs section) names; bit ``m`` of a mask is ``manifests[m]``.
+    scores : list[float]
+        Per need, the combined score.
+    """
+
+    def __init__(self, ids: list[str], manifests: list[str], descendants: list[int],
+                 weighted: list[float], fanout: list[float], masks: list[int],
+                 scores: list[float]):
+        self.ids = ids
+        self.index = {tag_id: i for i, tag_id in enumerate(ids)}
+        self.manifests = manifests
+        self.descendants = descendants
+        self.weighted = weighted
+        self.fanout = fanout
+        self.masks = masks
+        self.scores = scores
+        self.order = sorted(range(len(ids)), key=lambda i: (-scores[i], i))
+        self.rank = [0] * len(ids)
+        for r, i in enumerate(self.order, 1):
+            self.rank[i] = r
+        nonzero = sorted(s for s in scores if s > 0)
+        cut = int(HIGH_RISK_PERCENTILE * len(nonzero))
+        self.threshold = nonzero[min(cut, len(nonzero) - 1)] if nonzero else None
+
+    def __contains__(self, tag_id: str) -> bool:
+        return tag_id in self.index
+
+    def score(self, tag_id: str) -> float:
+        """
+        Return the score of a tag.
+
+        Raises
+        ------
+        KeyError
+            If the tag is not a defined need.
+        """
+        i = self.index.get(tag_id)
+        if i is None:
+            raise KeyError(f"Unknown tag: {tag_id}")
+        return self.scores[i]
+
+    def entry(self, tag_id: str) -> dict:
+        """
+        Return every metric of a tag.
+
+        Raises
+        ------
+        KeyError
+            If the tag is not a defined need.
+        """
+        i = self.index.get(tag_id)
+        if i is None:
+            raise KeyError(f"Unknown tag: {tag_id}")
+        return {
+            "id": tag_id,
+            "tier": get_tier(tag_id),
+            "score": self.scores[i],
+            "rank": self.rank[i],
+            "high_risk": self.threshold is not None and self.scores[i] >= self.threshold,
+            "descendants": self.descendants[i],
+            "weighted_descendants": self.weighted[i],
+            "fanout": self.fanout[i],
+            "manifests": [m for b, m in enumerate(self.manifests) if self.masks[i] >> b & 1],
+        }
+
+    def top(self, n: int, tier: str | None = None) -> list[dict]:
+        """Return the ``n`` highest-scoring tags, optionally of one tier."""
+        picked = (i for i in self.order if tier is None or get_tier(self.ids[i]) == tier)
+        return [self.entry(self.ids[i]) for _, i in zip(range(n), picked)]
+
+
+def load_blast_radius(needs_path: Path, needs: dict | None = None,
+                      graph: CitationGraph | None = None,
+                      use_cache: bool = True) -> BlastRadius:
+    """
+    Load blast-radius scores for needs.json, reusing a valid snapshot.
+
+    Parameters
+    ----------
+    needs_path : Path
+        Path to needs.json.
+    needs : dict, optional
+        Already loaded needs; used on a cache miss.
+    graph : CitationGraph, optional
+        Already loaded graph; used on a cache miss.
+    use_cache : bool
+        If False, compute in memory and never touch snapshots.
+
+    Returns
+    -------
+    BlastRadius
+        Scores for the current needs.json.
+
+    Raises
+    ------
+    FileNotFoundError
+        If needs.json does not exist.
+    """
+    def build(path: Path) -> tuple:
+        records = needs if needs is not None else needs_store.load_records(path, use_cache)
+        source = graph if graph is not None else load_graph(path, records, use_cache)
+        reach = load_reachability(path, source, use_cache)
+        return score_graph(source, records, reach)
+
+    return BlastRadius(*needs_store.cached(Path(needs_path), SNAPSHOT_KIND, build, use_cache))
+
+
+def main() -> int:
+    """
+    CLI entry point for blast_radius.
+
+    Returns
+    -------
+    int
+        Exit code (0=success, 1=error).
+    """
+    parser = argparse.ArgumentParser(
+        description="Rank DDR tags by the blast radius of changing them."
+    )
+    parser.add_argument(
+        "--id",
+        help="Report one tag instead of the ranking"
+    )
+    parser.add_argument(
+        "--top",
+        type=int,
+        default=20,
+        help="Number of tags in the ranking (default: 20)"
+    )
+    parser.add_argument(
+        "--tier",
+        choices=TIER_ORDER,
+        help="Rank only tags of this tier"
+    )
+    parser.add_argument(
+        "--needs-json",
+        default="docs/_build/json/needs.json",
+        help="Path to needs.json file"
+    )
+
+    args = parser.parse_args()
+
+    try:
+        radius = load_blast_radius(Path(args.needs_json))
+        if args.id:
+            result = {"success": True, **radius.entry(args.id)}
+        else:
+            result = {"success": True, "count": len(radius.ids),
+                      "high_risk_threshold": radius.threshold,
+                      "ranking": radius.top(args.top, args.tier)}
+        print(json.dumps(result, indent=2))
+        return 0
+
+    except KeyError as e:
+        print(f"Error: {e.args[0]}", file=sys.stderr)
+        return 1
+    except FileNotFoundError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    except ValueError as e:
+        print(f"Error parsing needs.json: {e}", file=sys.stderr)
+        return 1
+    except Exception as e:
+        print(f"Error scoring blast radius: {e}", file=sys.stderr)
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
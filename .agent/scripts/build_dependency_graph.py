@@ -24,6 +24,9 @@ import sys
 from pathlib import Path
 from typing import Any
 
+from citation_graph import CitationGraph, load_graph
+from needs_store import load_records
+
 TIER_ORDER: list[str] = ["BRD", "NFR", "FSD", "SAD", "ICD", "TDD", "ISP"]
 
 
@@ -34,39 +37,47 @@ def get_tier(tag_id: str) -> str | None:
     return prefix if prefix in TIER_ORDER else None
 
 
-def load_needs(path: Path) -> dict[str, dict]:
-    with open(path, "r", encoding="utf-8") as f:
-        data = json.load(f)
-    return data.get("versions", {}).get("0.1", {}).get("needs", {})
-
-
-def build_graph(needs: dict, include_orphans: bool = False) -> dict[str, Any]:
+def find_cycles(graph: CitationGraph) -> list[dict[str, Any]]:
+    """
+    Report every citation cycle as a strongly connected component.
+
+    Parameters
+    ----------
+    graph : CitationGraph
+        Citation graph.
+
+    Returns
+    -------
+    list[dict]
+        One entry per cyclic component: ``members`` (tag IDs in needs.json
+        order) and the citation ``edges`` between them.
+    """
+    ids, found = graph.ids, []
+    for component in graph.cycles():
+        members = set(component)
+        edges = [{"source": ids[c], "target": ids[p]}
+                 for c in component for p in graph.parents(c) if p in members]
+        found.append({"members": [ids[n] for n in component], "edges": edges})
+    return found
+
+
+def build_graph(needs: dict, include_orphans: bool = False,
+                graph: CitationGraph | None = None) -> dict[str, Any]:
+    graph = graph or CitationGraph.from_needs(needs)
+    ids, resolved = graph.ids, graph.is_resolved
     nodes: dict[str, dict] = {}
-    edges: list[dict] = []
 
-    for nid, ndata in needs.items():
-        tier = get_tier(nid)
-        nodes[nid] = {"tier": tier, "title": ndata.get("title", nid),
-                      "parents": ndata.get("links", []), "children": []}
+    for i, (nid, ndata) in enumerate(needs.items()):
+        nodes[nid] = {"tier": get_tier(nid), "title": ndata.get("title", nid),
+                      "parents": ndata.get("links", []),
+                      "children": [ids[c] for c in graph.children(i)]}
 
-    for nid, node in nodes.items():
-        for pid in node["parents"]:
-            if pid in nodes:
-                nodes[pid]["children"].append(nid)
-                edges.append({"source": nid, "target": pid})
+    edges = [{"source": ids[c], "target": ids[p]} for c, p in graph.edges() if resolved(p)]
 
     orphans = [n for n, d in nodes.items() if d["tier"] != "BRD" and not d["parents"]]
     roots = [n for n, d in nodes.items() if d["tier"] == "BRD"]
 
-    def has_cycle() -> bool:
-        visited, rec = set(), set()
-        def dfs(n):
-            visited.add(n); rec.add(n)
-            for p in nodes.get(n, {}).get("parents", []):
-                if p not in visited and dfs(p): return True
-                if p in rec: return True
-            rec.remove(n); return False
-        return any(dfs(n) for n in nodes if n not in visited)
+    cycles = find_cycles(graph)
 
     if not include_orphans:
         nodes = {k: v for k, v in nodes.items() if k not in orphans or v["tier"] == "BRD"}
@@ -78,8 +89,8 @@ def build_graph(needs: dict, include_orphans: bool = False) -> dict[str, Any]:
 
     return {"nodes": nodes, "edges": edges,
             "stats": {"total_nodes": len(nodes), "total_edges": len(edges),
-                      "orphan_count": len(orphans), "root_count": len(roots), "has_cycles": has_cycle()},
-            "tiers_summary": tiers}
+                      "orphan_count": len(orphans), "root_count": len(roots), "has_cycles": bool(cycles)},
+            "tiers_summary": tiers, "cycles": cycles}
 
 
 def main() -> int:
@@ -94,7 +105,8 @@ def main() -> int:
         print(f"Error: {path} not found", file=sys.stderr); return 1
 
     try:
-        result = build_graph(load_needs(path), args.include_orphans)
+        needs = load_records(path)
+        result = build_graph(needs, args.include_orphans, load_graph(path, needs))
         out = json.dumps(result, indent=2)
         if args.output: Path(args.output).write_text(out, encoding="utf-8")
         else: print(out)
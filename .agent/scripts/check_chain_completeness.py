@@ -0,0 +1,245 @@
+"""
+Check Chain Completeness Tool.
+
+Checks that every DDR tag reaches a BRD root through legal tier steps
+(``TIER_HIERARCHY`` in create_tag.py), per the trace_complete_chain rule.
+
+Every legal step cites a tier strictly earlier in ``TIER_ORDER``, so
+bucketing the needs by tier gives a topological order of the legal-step
+graph. One dynamic-programming pass over the buckets, BRD first, computes
+for every tag at once whether a valid root chain exists and the shortest
+one: a BRD is a chain of length 0, and any other tag extends the shortest
+chain among its legally cited, valid parents. The pass is O(V + E) and
+needs no cycle handling, because illegal steps (including every edge of a
+citation cycle within one tier) are never followed.
+
+Meta
+----
+Tool Definition : .agent/tools/check_chain_completeness.md
+Knowledge Source: .agent/knowledge/sources/protocols/traceability_chain.md
+                  .agent/rules/trace_complete_chain.md
+Architect       : Antigravity IDE
+
+Usage
+-----
+    python check_chain_completeness.py --needs-json docs/_build/json/needs.json
+    python check_chain_completeness.py --invalid-only
+    python check_chain_completeness.py --id ISP-3.1
+
+Exit Codes
+----------
+0 : Success (JSON report printed to stdout)
+1 : Error (Details printed to stderr)
+
+Notes
+-----
+- Ties between equally short chains go to the parent listed first in
+  ``:links:``.
+- Invalid tags carry a ``reason``:
+
+  ``ORPHAN``            no ``:links:`` at all
+  ``MISSING_PARENT``    none of the cited tags exist
+  ``ILLEGAL_TIER_STEP`` no existing parent is at a tier the tag may cite
+  ``BROKEN_CHAIN``      legal parents exist but none of them has a chain
+  ``UNKNOWN_TIER``      the ID has no DDR tier prefix
+"""
+import argparse
+import json
+import sys
+from pathlib import Path
+
+from citation_graph import CitationGraph, load_graph
+from create_tag import TIER_HIERARCHY
+from needs_store import TIER_ORDER, get_tier, load_records
+
+ROOT_TIER: str = "BRD"
+
+
+def check_chains(needs: dict, graph: CitationGraph | None = None) -> list[dict]:
+    """
+    Compute root-chain validity and the shortest root chain for every tag.
+
+    Parameters
+    ----------
+    needs : dict
+        Dictionary of need_id -> need data.
+    graph : CitationGraph, optional
+        Prebuilt citation graph for ``needs``. Built on demand if omitted.
+
+    Returns
+    -------
+    list[dict]
+        One result per need, in needs.json order: ``id``, ``tier``,
+        ``valid`` and either ``length`` (citation hops) and ``chain``
+        (tag IDs from the tag up to its BRD root), or ``reason`` and
+        ``parents`` (the cited IDs).
+    """
+    graph = graph or CitationGraph.from_needs(needs)
+    count, resolved = graph.need_count, graph.is_resolved
+    ids, p_off, p_idx = graph.ids, graph.parent_offsets, graph.parent_indices
+
+    tiers = [get_tier(ids[i]) for i in range(count)]
+    allowed = {tier: frozenset(parents) for tier, parents in TIER_HIERARCHY.items()}
+    rank = {tier: r for r, tier in enumerate(TIER_ORDER)}
+
+    buckets: list[list[int]] = [[] for _ in TIER_ORDER]
+    for i, tier in enumerate(tiers):
+        if tier is not None:
+            buckets[rank[tier]].append(i)
+
+    # dist[i]: hops to a root, -1 if none; step[i]: next node on the chain.
+    dist = [-1] * count
+    step = [-1] * count
+    for bucket in buckets:
+        for i in bucket:
+            if tiers[i] == ROOT_TIER:
+                dist[i] = 0
+                continue
+            legal = allowed.get(tiers[i], frozenset())
+            best = -1
+            for k in range(p_off[i], p_off[i + 1]):
+                p = p_idx[k]
+                if resolved(p) and tiers[p] in legal and dist[p] >= 0:
+                    if best == -1 or dist[p] + 1 < best:
+                        best, step[i] = dist[p] + 1, p
+            dist[i] = best
+
+    results = []
+    for i in range(count):
+        tag_id = ids[i]
+        result = {"id": tag_id, "tier": tiers[i], "valid": dist[i] >= 0}
+        if dist[i] >= 0:
+            chain, node = [tag_id], i
+            while step[node] != -1:
+                node = step[node]
+                chain.append(ids[node])
+            result.update(length=dist[i], chain=chain)
+        else:
+            parents = [ids[p] for p in graph.parents(i)]
+            result.update(reason=_reason(tiers[i], [p for p in graph.parents(i) if resolved(p)],
+                                         parents, tiers, allowed),
+                          parents=parents)
+        results.append(result)
+    return results
+
+
+def _reason(tier: str | None, existing: list[int], parents: list[str],
+            tiers: list[str | None], allowed: dict) -> str:
+    if tier is None:
+        return "UNKNOWN_TIER"
+    if not parents:
+        return "ORPHAN"
+    if not existing:
+        return "MISSING_PARENT"
+    if not any(tiers[p] in allowed.get(tier, ()) for p in existing):
+        return "ILLEGAL_TIER_STEP"
+    return "BROKEN_CHAIN"
+
+
+def summarize(results: list[dict]) -> dict:
+    """
+    Count valid and invalid tags and group the failures by reason.
+
+    Parameters
+    ----------
+    results : list[dict]
+        Output of ``check_chains``.
+
+    Returns
+    -------
+    dict
+        ``total``, ``valid``, ``invalid``, ``by_reason`` and
+        ``max_length`` (longest shortest chain).
+    """
+    by_reason: dict[str, int] = {}
+    for r in results:
+        if not r["valid"]:
+            by_reason[r["reason"]] = by_reason.get(r["reason"], 0) + 1
+    valid = [r["length"] for r in results if r["valid"]]
+    return {"total": len(results), "valid": len(valid), "invalid": len(results) - len(valid),
+            "by_reason": by_reason, "max_length": max(valid, default=0)}
+
+
+def report(needs: dict, graph: CitationGraph | None = None,
+           invalid_only: bool = False) -> dict:
+    """
+    Build the chain completeness report.
+
+    Parameters
+    ----------
+    needs : dict
+        Dictionary of need_id -> need data.
+    graph : CitationGraph, optional
+        Prebuilt citation graph for ``needs``.
+    invalid_only : bool
+        List only tags without a valid root chain.
+
+    Returns
+    -------
+    dict
+        ``summary`` (see ``summarize``) and per-tag ``results``.
+    """
+    results = check_chains(needs, graph)
+    shown = [r for r in results if not r["valid"]] if invalid_only else results
+    return {"summary": summarize(results), "results": shown}
+
+
+def main() -> int:
+    """
+    CLI entry point for check_chain_completeness.
+
+    Returns
+    -------
+    int
+        Exit code (0=success, 1=error).
+    """
+    parser = argparse.ArgumentParser(
+        description="Check that every DDR tag reaches a BRD through legal tier steps."
+    )
+    parser.add_argument(
+        "--needs-json",
+        default="docs/_build/json/needs.json",
+        help="Path to needs.json file"
+    )
+    parser.add_argument(
+        "--id",
+        help="Report only this tag"
+    )
+    parser.add_argument(
+        "--invalid-only",
+        action="store_true",
+        help="List only tags without a valid root chain"
+    )
+
+    args = parser.parse_args()
+
+    path = Path(args.needs_json)
+    if not path.exists():
+        print(f"Error: {path} not found", file=sys.stderr)
+        return 1
+
+    try:
+        needs = load_records(path)
+        graph = load_graph(path, needs)
+
+        if args.id:
+            match = [r for r in check_chains(needs, graph) if r["id"] == args.id]
+            if not match:
+                print(f"Error: Tag {args.id} not found", file=sys.stderr)
+                return 1
+            print(json.dumps({"success": True, **match[0]}, indent=2))
+            return 0
+
+        print(json.dumps({"success": True, **report(needs, graph, args.invalid_only)}, indent=2))
+        return 0
+
+    except ValueError as e:
+        print(f"Error parsing needs.json: {e}", file=sys.stderr)
+        return 1
+    except Exception as e:
+        print(f"Error checking chains: {e}", file=sys.stderr)
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -13,6 +13,7 @@ Architect       : Antigravity IDE
 Usage
 -----
     python check_manifest_integrity.py --manifest-dir docs/ --needs-json docs/_build/json/needs.json
+    python check_manifest_integrity.py --format ndjson
 
 Exit Codes
 ----------
@@ -24,6 +25,10 @@ import json
 import re
 import sys
 from pathlib import Path
+from typing import Container
+
+from needs_store import load_records
+from violation_writer import WRITERS
 
 # Required fields per manifest_structure.md §Fields
 REQUIRED_FIELDS: list[str] = [
@@ -32,10 +37,73 @@ REQUIRED_FIELDS: list[str] = [
 ]
 VALID_INTEGRITY_STATUS: list[str] = ["CLEAN", "DIRTY"]
 
-def load_needs(path: Path) -> dict:
-    with open(path, "r", encoding="utf-8") as f:
-        data = json.load(f)
-    return data.get("versions", {}).get("0.1", {}).get("needs", {})
+
+def check_manifest(mpath: Path, needs: Container[str]) -> list[dict]:
+    """
+    Validate one reconciliation manifest.
+
+    Parameters
+    ----------
+    mpath : Path
+        Manifest file.
+    needs : Container[str]
+        IDs of the defined tags, for the pending-item check.
+
+    Returns
+    -------
+    list[dict]
+        The manifest's issues.
+    """
+    content = mpath.read_text(encoding="utf-8")
+    manifest_issues = []
+
+    # Check required fields
+    for field in REQUIRED_FIELDS:
+        if field not in content:
+            manifest_issues.append({
+                "manifest": str(mpath), "type": "MISSING_FIELD",
+                "field": field, "severity": "ERROR"
+            })
+
+    # Check integrity_status value
+    status_match = re.search(r':integrity_status:\s*"?(\w+)"?', content)
+    if status_match:
+        status_val = status_match.group(1)
+        if status_val not in VALID_INTEGRITY_STATUS:
+            manifest_issues.append({
+                "manifest": str(mpath), "type": "INVALID_STATUS",
+                "value": status_val, "severity": "ERROR"
+            })
+
+    # Check tag_count vs tag_inventory mismatch (anti-pattern)
+    count_match = re.search(r':tag_count:\s*(\d+)', content)
+    inventory_match = re.search(r':tag_inventory:\s*\[([^\]]*)\]', content)
+    if count_match and inventory_match:
+        declared_count = int(count_match.group(1))
+        inventory_items = [t.strip().strip('"\'')
+                           for t in inventory_match.group(1).split(",") if t.strip()]
+        if declared_count != len(inventory_items):
+            manifest_issues.append({
+                "manifest": str(mpath), "type": "COUNT_MISMATCH",
+                "declared": declared_count, "actual": len(inventory_items),
+                "severity": "ERROR"
+            })
+
+    # Check pending items reference valid tags
+    pending = re.findall(r'"target_tag":\s*"([^"]+)"', content)
+    for tag in pending:
+        if tag and tag not in needs:
+            manifest_issues.append({
+                "manifest": str(mpath), "type": "MISSING_TAG",
+                "tag": tag, "severity": "WARNING"
+            })
+
+    return manifest_issues
+
+
+def find_manifests(manifest_dir: Path) -> list[Path]:
+    """Return the reconciliation manifests under ``manifest_dir``."""
+    return list(manifest_dir.rglob("reconciliation_manifest.rst"))
 
 
 def check_manifests(manifest_dir: Path, needs: dict) -> dict:
@@ -55,62 +123,23 @@ def check_manifests(manifest_dir: Path, needs: dict) -> dict:
         Validation results with manifests_checked, issues count, and details.
     """
     issues = []
-    manifests = list(manifest_dir.rglob("reconciliation_manifest.rst"))
+    manifests = find_manifests(manifest_dir)
 
     for mpath in manifests:
-        content = mpath.read_text(encoding="utf-8")
-        manifest_issues = []
-
-        # Check required fields
-        for field in REQUIRED_FIELDS:
-            if field not in content:
-                manifest_issues.append({
-                    "manifest": str(mpath), "type": "MISSING_FIELD",
-                    "field": field, "severity": "ERROR"
-                })
-
-        # Check integrity_status value
-        status_match = re.search(r':integrity_status:\s*"?(\w+)"?', content)
-        if status_match:
-            status_val = status_match.group(1)
-            if status_val not in VALID_INTEGRITY_STATUS:
-                manifest_issues.append({
-                    "manifest": str(mpath), "type": "INVALID_STATUS",
-                    "value": status_val, "severity": "ERROR"
-                })
-
-        # Check tag_count vs tag_inventory mismatch (anti-pattern)
-        count_match = re.search(r':tag_count:\s*(\d+)', content)
-        inventory_match = re.search(r':tag_inventory:\s*\[([^\]]*)\]', content)
-        if count_match and inventory_match:
-            declared_count = int(count_match.group(1))
-            inventory_items = [t.strip().strip('"\'')
-                               for t in inventory_match.group(1).split(",") if t.strip()]
-            if declared_count != len(inventory_items):
-                manifest_issues.append({
-                    "manifest": str(mpath), "type": "COUNT_MISMATCH",
-                    "declared": declared_count, "actual": len(inventory_items),
-                    "severity": "ERROR"
-                })
-
-        # Check pending items reference valid tags
-        pending = re.findall(r'"target_tag":\s*"([^"]+)"', content)
-        for tag in pending:
-            if tag and tag not in needs:
-                manifest_issues.append({
-                    "manifest": str(mpath), "type": "MISSING_TAG",
-                    "tag": tag, "severity": "WARNING"
-                })
-
-        issues.extend(manifest_issues)
+        issues.extend(check_manifest(mpath, needs))
+
+    return summarize(len(manifests), issues)
+
 
+def summarize(manifests_checked: int, issues: list[dict]) -> dict:
+    """Assemble the result from the issues of ``manifests_checked`` manifests."""
     by_type = {}
     for issue in issues:
         t = issue.get("type", "UNKNOWN")
         by_type[t] = by_type.get(t, 0) + 1
 
     return {
-        "manifests_checked": len(manifests),
+        "manifests_checked": manifests_checked,
         "issues": len(issues),
         "by_type": by_type,
         "details": issues
@@ -121,6 +150,8 @@ def main() -> int:
     parser = argparse.ArgumentParser()
     parser.add_argument("--manifest-dir", default="docs/")
     parser.add_argument("--needs-json", default="docs/_build/json/needs.json")
+    parser.add_argument("--format", choices=["json", *WRITERS], default="json",
+                        help="JSON report, or stream violations as ndjson, sarif or junit")
     args = parser.parse_args()
 
     needs_path = Path(args.needs_json)
@@ -128,7 +159,11 @@ def main() -> int:
         print(f"Error: {needs_path} not found", file=sys.stderr); return 1
 
     try:
-        print(json.dumps(check_manifests(Path(args.manifest_dir), load_needs(needs_path)), indent=2))
+        if args.format != "json":
+            from audit_engine import stream_check  # audit_engine imports this module
+            return stream_check(load_records(needs_path), "manifest_integrity", args.format,
+                                sys.stdout, manifest_dir=Path(args.manifest_dir))
+        print(json.dumps(check_manifests(Path(args.manifest_dir), load_records(needs_path)), indent=2))
         return 0
     except Exception as e:
         print(f"Error: {e}", file=sys.stderr); return 1
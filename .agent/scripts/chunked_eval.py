@@ -0,0 +1,137 @@
+"""
+Chunked Evaluation.
+
+Runs a per-need checker over contiguous chunks of needs in a
+``ProcessPoolExecutor`` (``--jobs N`` of detect_anti_patterns,
+validate_tier_compliance and generate_traceability_report).
+
+Needs are cut into chunks in input order, a few per worker so a slow
+chunk does not hold up the rest. Each need is projected onto the fields
+its checker reads before it is pickled, so a worker receives tuples of
+titles, content or links rather than whole sphinx-needs entries. Chunk
+results are concatenated in submission order: the output lists one result per
+need in the order the needs were given, whatever order the workers
+finish in, and the report built from it is identical to a serial run.
+
+Unlike ``partition_graph.run_sharded`` no citation graph is built; a
+checker that needs facts about other needs (such as which cited tags
+exist) receives them per chunk through ``context``.
+
+Meta
+----
+Knowledge Source: .agent/knowledge/sources/protocols/traceability_chain.md
+Architect       : Antigravity IDE
+
+Usage
+-----
+    from chunked_eval import run_chunked
+
+    def check_chunk(chunk, patterns):  # top-level, so workers can import it
+        return [scan(nid, ndata, patterns) for nid, ndata in chunk]
+
+    results = run_chunked(check_chunk, pairs, ("title", "content"), jobs=8,
+                          args=(patterns,))
+
+Notes
+-----
+- ``check_chunk`` must be a module-level function and must return one
+  result per need of its chunk, in chunk order.
+- Fewer needs than ``MIN_CHUNK`` per worker, or ``jobs=1``, run
+  in-process on the unprojected needs.
+"""
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Any, Callable, Sequence
+
+# Chunks per worker; more balance the load, fewer pickle less.
+CHUNKS_PER_JOB: int = 4
+# Smallest chunk worth a round trip to a worker.
+MIN_CHUNK: int = 500
+# Marks a field the need does not have (pickles as a singleton).
+ABSENT = Ellipsis
+
+
+def project(ndata: Any, fields: Sequence[str]) -> tuple:
+    """
+    Return the values of ``fields`` in a need, as shipped to a worker.
+
+    Parameters
+    ----------
+    ndata : Any
+        ``Need`` record or raw need dict.
+    fields : Sequence[str]
+        Fields the checker reads.
+
+    Returns
+    -------
+    tuple
+        One value per field; ``ABSENT`` where ``ndata`` lacks the field.
+    """
+    return tuple([ndata[f] if f in ndata else ABSENT for f in fields])
+
+
+def restore(fields: Sequence[str], row: tuple) -> dict:
+    """Rebuild the projected need of ``project``; absent fields stay absent."""
+    return {f: v for f, v in zip(fields, row) if v is not ABSENT}
+
+
+def _run_chunk(check_chunk: Callable[..., list], fields: Sequence[str], ids: list[str],
+               rows: list[tuple], *args) -> list:
+    # Worker side: a flat ID list and value tuples pickle and load faster
+    # than per-need dicts.
+    return check_chunk([(nid, restore(fields, row)) for nid, row in zip(ids, rows)], *args)
+
+
+def run_chunked(check_chunk: Callable[..., list], pairs: Sequence[tuple[str, Any]],
+                fields: Sequence[str], jobs: int | None = None, args: tuple = (),
+                context: Callable[[list], tuple] | None = None,
+                chunk_size: int | None = None, executor: Executor | None = None) -> list:
+    """
+    Evaluate ``check_chunk`` over chunks of ``pairs`` across processes.
+
+    Parameters
+    ----------
+    check_chunk : Callable[..., list]
+        Module-level ``check_chunk(chunk, *args, *context(chunk))``; ``chunk``
+        is a list of ``(need_id, projected need)`` pairs.
+    pairs : Sequence[tuple[str, Any]]
+        ``(need_id, need)`` pairs to check.
+    fields : Sequence[str]
+        Need fields ``check_chunk`` reads (see ``project``).
+    jobs : int, optional
+        Worker processes; defaults to the CPU count. 1 runs in-process.
+    args : tuple
+        Extra arguments passed with every chunk.
+    context : Callable[[list], tuple], optional
+        Computes further arguments for one chunk of ``pairs`` in the
+        calling process.
+    chunk_size : int, optional
+        Needs per chunk. Default: ``CHUNKS_PER_JOB`` chunks per worker, at
+        least ``MIN_CHUNK`` needs each.
+    executor : Executor, optional
+        Pool to submit chunks to instead of creating one.
+
+    Returns
+    -------
+    list
+        One result per pair, in ``pairs`` order.
+    """
+    jobs = jobs or os.cpu_count() or 1
+    size = chunk_size or max(MIN_CHUNK, -(-len(pairs) // (jobs * CHUNKS_PER_JOB)))
+    if executor is None and (jobs == 1 or len(pairs) <= size):
+        chunk = list(pairs)
+        return check_chunk(chunk, *args, *(context(chunk) if context else ()))
+
+    chunks = [pairs[i:i + size] for i in range(0, len(pairs), size)]
+
+    # Generated lazily: workers start on the first chunks while later ones
+    # are still being projected.
+    calls = ((check_chunk, fields, [nid for nid, _ in chunk],
+              [project(ndata, fields) for _, ndata in chunk], *args,
+              *(context(chunk) if context else ())) for chunk in chunks)
+    if executor is not None:
+        outputs = [f.result() for f in [executor.submit(_run_chunk, *c) for c in calls]]
+    else:
+        with ProcessPoolExecutor(max_workers=min(jobs, len(chunks))) as pool:
+            outputs = [f.result() for f in [pool.submit(_run_chunk, *c) for c in calls]]
+    return [r for output in outputs for r in output]
@@ -0,0 +1,637 @@
+"""
+Citation Graph.
+
+Int-indexed DDR citation graph shared by all graph tools.
+
+Tag IDs are mapped to dense integers and both directions of the citation
+relation are stored in compressed sparse row (CSR) form:
+
+- ``parent_offsets`` / ``parent_indices``: forward adjacency (``:links:``),
+  child -> cited parents.
+- ``child_offsets`` / ``child_indices``: reverse adjacency (links back),
+  parent -> citing children.
+
+The neighbours of node ``i`` are ``indices[offsets[i]:offsets[i + 1]]``.
+All arrays are ``array('i')`` buffers, so traversals iterate over compact
+machine ints instead of per-node Python lists and dicts.
+
+The graph can be persisted to a versioned binary snapshot (``save``) that
+other processes open with ``mmap`` (``open_mapped``). The CSR arrays, the ID
+string table and a sorted ID permutation are read straight out of the
+mapping through ``memoryview`` casts, so concurrent agents share one
+page-cached copy and can query without parsing or copying anything.
+
+Meta
+----
+Knowledge Source: .agent/knowledge/sources/protocols/traceability_chain.md
+                  .agent/knowledge/sources/protocols/impact_analysis.md
+Architect       : Antigravity IDE
+
+Usage
+-----
+    from citation_graph import CitationGraph
+
+    graph = CitationGraph.from_needs(needs)
+    graph.children_of("BRD-1")
+    graph.traverse(["FSD-1"], direction="up", max_depth=3)
+    graph.cycles()                      # cyclic SCCs as node index lists
+
+    graph = load_graph(Path("docs/_build/json/needs.json"))  # mmap snapshot
+
+Notes
+-----
+- Nodes ``0 .. need_count - 1`` are the needs, in needs.json order.
+- Link targets that are not defined needs are appended as unresolved
+  nodes (``need_count ..``) so that dangling citations stay queryable.
+- Parents keep ``:links:`` order; children are in needs.json order.
+  Duplicate links are collapsed.
+
+Snapshot Layout (version 1, native byte order, 4-byte aligned)
+----------------------------------------------------------------
+    header   : magic "DDRGRAPH", version, byte order, source key
+               (mtime_ns, size, sha256 of needs.json), node_count,
+               need_count, edge_count, id_bytes
+    int32    : parent_offsets[node_count + 1], parent_indices[edge_count]
+    int32    : child_offsets[node_count + 1],  child_indices[edge_count]
+    int32    : id_offsets[node_count + 1]
+    int32    : id_order[node_count]   (node indices sorted by UTF-8 ID)
+    bytes    : id_blob[id_bytes]      (concatenated UTF-8 IDs)
+"""
+import mmap
+import struct
+import sys
+from array import array
+from collections import deque
+from pathlib import Path
+from typing import Iterable, Iterator
+
+import needs_store
+
+# Traversal directions: "up" follows :links: to parents, "down" follows
+# citing children.
+DIRECTIONS: tuple[str, ...] = ("up", "down", "both")
+
+GRAPH_MAGIC: bytes = b"DDRGRAPH"
+GRAPH_FORMAT_VERSION: int = 1
+
+# magic, version, big-endian flag, mtime_ns, size, sha256,
+# node_count, need_count, edge_count, id_bytes
+_HEADER = struct.Struct("=8sII qq 32s IIII")
+_BIG_ENDIAN: int = int(sys.byteorder == "big")
+
+
+def _csr(rows: list[list[int]]) -> tuple[array, array]:
+    offsets = array("i", [0])
+    indices = array("i")
+    for row in rows:
+        indices.extend(row)
+        offsets.append(len(indices))
+    return offsets, indices
+
+
+class _IdTable:
+    """Node index -> tag ID, decoded lazily from a mapped string table."""
+
+    __slots__ = ("_offsets", "_blob", "_decoded")
+
+    def __init__(self, offsets: memoryview, blob: memoryview):
+        self._offsets = offsets
+        self._blob = blob
+        self._decoded: dict[int, str] = {}
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def __getitem__(self, i: int) -> str:
+        tag_id = self._decoded.get(i)
+        if tag_id is None:
+            if not 0 <= i < len(self):
+                raise IndexError(i)
+            raw = self._blob[self._offsets[i]:self._offsets[i + 1]]
+            tag_id = self._decoded[i] = sys.intern(str(raw, "utf-8"))
+        return tag_id
+
+    def __iter__(self) -> Iterator[str]:
+        return (self[i] for i in range(len(self)))
+
+
+class _IdIndex:
+    """Tag ID -> node index by binary search over the sorted ID permutation."""
+
+    __slots__ = ("_ids", "_order", "_offsets", "_blob", "_found")
+
+    def __init__(self, ids: _IdTable, order: memoryview):
+        self._ids = ids
+        self._order = order
+        self._offsets = ids._offsets
+        self._blob = ids._blob
+        self._found: dict[str, int | None] = {}
+
+    def get(self, tag_id: str, default=None):
+        if tag_id in self._found:
+            i = self._found[tag_id]
+            return default if i is None else i
+        key = tag_id.encode("utf-8")
+        order, offsets, blob = self._order, self._offsets, self._blob
+        lo, hi = 0, len(order)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            node = order[mid]
+            if bytes(blob[offsets[node]:offsets[node + 1]]) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        i = None
+        if lo < len(order):
+            node = order[lo]
+            if blob[offsets[node]:offsets[node + 1]] == key:
+                i = node
+        self._found[tag_id] = i
+        return default if i is None else i
+
+    def __getitem__(self, tag_id: str) -> int:
+        i = self.get(tag_id)
+        if i is None:
+            raise KeyError(tag_id)
+        return i
+
+    def __contains__(self, tag_id: str) -> bool:
+        return self.get(tag_id) is not None
+
+    def __len__(self) -> int:
+        return len(self._order)
+
+
+class CitationGraph:
+    """
+    CSR-encoded citation graph over dense node indices.
+
+    Attributes
+    ----------
+    ids : list[str]
+        Node index -> tag ID.
+    index : dict[str, int]
+        Tag ID -> node index (a read-only mapping for mapped graphs).
+    need_count : int
+        Number of nodes that are defined needs; higher indices are
+        unresolved link targets.
+    parent_offsets, parent_indices : array
+        Forward (child -> parent) adjacency in CSR form.
+    child_offsets, child_indices : array
+        Reverse (parent -> child) adjacency in CSR form.
+    """
+
+    __slots__ = ("ids", "index", "need_count", "parent_offsets", "parent_indices",
+                 "child_offsets", "child_indices", "_mapping")
+
+    def __init__(self, ids: list[str], need_count: int,
+                 parent_offsets: array, parent_indices: array,
+                 child_offsets: array, child_indices: array, index=None):
+        self.ids = ids
+        self.index = index if index is not None else {t: i for i, t in enumerate(ids)}
+        self._mapping = None
+        self.need_count = need_count
+        self.parent_offsets = parent_offsets
+        self.parent_indices = parent_indices
+        self.child_offsets = child_offsets
+        self.child_indices = child_indices
+
+    @classmethod
+    def from_needs(cls, needs: dict) -> "CitationGraph":
+        """
+        Build the graph from loaded needs.
+
+        Parameters
+        ----------
+        needs : dict
+            Dictionary of need_id -> need data (``Need`` or raw dict).
+
+        Returns
+        -------
+        CitationGraph
+            Graph with forward and reverse CSR adjacency.
+        """
+        ids = list(needs)
+        index = {tag_id: i for i, tag_id in enumerate(ids)}
+        need_count = len(ids)
+
+        parent_rows: list[list[int]] = []
+        for ndata in needs.values():
+            links = ndata.get("links", [])
+            if isinstance(links, str):
+                links = [links] if links else []
+            row: list[int] = []
+            for pid in links:
+                p = index.get(pid)
+                if p is None:
+                    p = index[pid] = len(ids)
+                    ids.append(pid)
+                if p not in row:
+                    row.append(p)
+            parent_rows.append(row)
+        parent_rows.extend([] for _ in range(len(ids) - need_count))
+
+        child_rows: list[list[int]] = [[] for _ in ids]
+        for c, row in enumerate(parent_rows):
+            for p in row:
+                child_rows[p].append(c)
+
+        return cls(ids, need_count, *_csr(parent_rows), *_csr(child_rows), index=index)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __contains__(self, tag_id: str) -> bool:
+        return tag_id in self.index
+
+    @property
+    def edge_count(self) -> int:
+        """Number of distinct child -> parent citations."""
+        return len(self.parent_indices)
+
+    def is_resolved(self, i: int) -> bool:
+        """Return True if node ``i`` is a defined need."""
+        return i < self.need_count
+
+    def parents(self, i: int) -> array:
+        """Return parent indices of node ``i`` in ``:links:`` order."""
+        return self.parent_indices[self.parent_offsets[i]:self.parent_offsets[i + 1]]
+
+    def children(self, i: int) -> array:
+        """Return indices of nodes citing node ``i``, in needs order."""
+        return self.child_indices[self.child_offsets[i]:self.child_offsets[i + 1]]
+
+    def parents_of(self, tag_id: str) -> list[str]:
+        """Return parent IDs of a tag (empty if unknown)."""
+        i = self.index.get(tag_id)
+        return [] if i is None else [self.ids[p] for p in self.parents(i)]
+
+    def children_of(self, tag_id: str) -> list[str]:
+        """Return IDs of tags citing a tag (empty if unknown)."""
+        i = self.index.get(tag_id)
+        return [] if i is None else [self.ids[c] for c in self.children(i)]
+
+    def edges(self) -> Iterator[tuple[int, int]]:
+        """Yield ``(child, parent)`` index pairs in needs/links order."""
+        offsets, indices = self.parent_offsets, self.parent_indices
+        for c in range(len(self.ids)):
+            for k in range(offsets[c], offsets[c + 1]):
+                yield c, indices[k]
+
+    def traverse(self, start: Iterable[str], direction: str = "down",
+                 max_depth: int | None = None) -> list[int]:
+        """
+        Breadth-first traversal from one or more start tags.
+
+        Parameters
+        ----------
+        start : Iterable[str]
+            Start tag IDs; unknown IDs are ignored.
+        direction : str
+            ``"up"`` (parents), ``"down"`` (children) or ``"both"``.
+        max_depth : int, optional
+            Maximum hop count from the start tags. Unlimited if None.
+
+        Returns
+        -------
+        list[int]
+            Visited node indices in BFS order, start nodes included.
+        """
+        if direction not in DIRECTIONS:
+            raise ValueError(f"Invalid direction: {direction}. Valid: {list(DIRECTIONS)}")
+        up = direction in ("up", "both")
+        down = direction in ("down", "both")
+        p_off, p_idx = self.parent_offsets, self.parent_indices
+        c_off, c_idx = self.child_offsets, self.child_indices
+
+        seen = bytearray(len(self.ids))
+        order: list[int] = []
+        queue: deque[tuple[int, int]] = deque()
+        for tag_id in start:
+            i = self.index.get(tag_id)
+            if i is not None and not seen[i]:
+                seen[i] = 1
+                order.append(i)
+                queue.append((i, 0))
+
+        while queue:
+            node, lvl = queue.popleft()
+            if max_depth is not None and lvl >= max_depth:
+                continue
+            nxt = lvl + 1
+            if up:
+                for k in range(p_off[node], p_off[node + 1]):
+                    n = p_idx[k]
+                    if not seen[n]:
+                        seen[n] = 1
+                        order.append(n)
+                        queue.append((n, nxt))
+            if down:
+                for k in range(c_off[node], c_off[node + 1]):
+                    n = c_idx[k]
+                    if not seen[n]:
+                        seen[n] = 1
+                        order.append(n)
+                        queue.append((n, nxt))
+        return order
+
+    def strongly_connected_components(self) -> list[list[int]]:
+        """
+        Partition the graph into strongly connected components.
+
+        Iterative Tarjan over the forward (``:links:``) adjacency with an
+        explicit stack, so deep citation chains cannot hit the recursion
+        limit. Every node and edge is visited once.
+
+        Returns
+        -------
+        list[list[int]]
+            Components in parents-first order (a topological order of the
+            condensation: a component comes after every component it
+            cites). Members are sorted by node index.
+        """
+        count = len(self.ids)
+        offsets, indices = self.parent_offsets, self.parent_indices
+        order = [-1] * count
+        low = [0] * count
+        on_stack = bytearray(count)
+        stack: list[int] = []
+        components: list[list[int]] = []
+        counter = 0
+
+        for root in range(count):
+            if order[root] != -1:
+                continue
+            order[root] = low[root] = counter
+            counter += 1
+            stack.append(root)
+            on_stack[root] = 1
+            # Frames are (node, next edge position).
+            work = [(root, offsets[root])]
+            while work:
+                node, k = work[-1]
+                end = offsets[node + 1]
+                while k < end:
+                    nxt = indices[k]
+                    k += 1
+                    if order[nxt] == -1:
+                        work[-1] = (node, k)
+                        order[nxt] = low[nxt] = counter
+                        counter += 1
+                        stack.append(nxt)
+                        on_stack[nxt] = 1
+                        work.append((nxt, offsets[nxt]))
+                        break
+                    if on_stack[nxt] and order[nxt] < low[node]:
+                        low[node] = order[nxt]
+                else:
+                    work.pop()
+                    if work:
+                        caller = work[-1][0]
+                        if low[node] < low[caller]:
+                            low[caller] = low[node]
+                    if low[node] == order[node]:
+                        component = []
+                        while True:
+                            member = stack.pop()
+                            on_stack[member] = 0
+                            component.append(member)
+                            if member == node:
+                                break
+                        component.sort()
+                        components.append(component)
+        return components
+
+    def is_cyclic(self, component: list[int]) -> bool:
+        """Return True if a strongly connected component contains a cycle."""
+        if len(component) > 1:
+            return True
+        node = component[0]
+        return node in self.parents(node)
+
+    def cycles(self) -> list[list[int]]:
+        """
+        Return the components that contain citation cycles.
+
+        Returns
+        -------
+        list[list[int]]
+            Cyclic components (several members, or one need citing
+            itself), ordered by their lowest node index.
+        """
+        found = [c for c in self.strongly_connected_components() if self.is_cyclic(c)]
+        found.sort(key=lambda c: c[0])
+        return found
+
+    @property
+    def is_mapped(self) -> bool:
+        """True if the arrays are views into a memory-mapped snapshot."""
+        return self._mapping is not None
+
+    def save(self, path: Path, source_key: dict) -> bool:
+        """
+        Write the graph as a binary snapshot for ``open_mapped``.
+
+        Parameters
+        ----------
+        path : Path
+            Snapshot file path.
+        source_key : dict
+            needs.json key (see ``needs_store.source_key``).
+
+        Returns
+        -------
+        bool
+            False if the snapshot could not be written.
+        """
+        encoded = [tag_id.encode("utf-8") for tag_id in self.ids]
+        id_offsets = array("i", [0])
+        for raw in encoded:
+            id_offsets.append(id_offsets[-1] + len(raw))
+        id_order = array("i", sorted(range(len(encoded)), key=encoded.__getitem__))
+        blob = b"".join(encoded)
+
+        header = _HEADER.pack(
+            GRAPH_MAGIC, GRAPH_FORMAT_VERSION, _BIG_ENDIAN,
+            source_key["mtime_ns"], source_key["size"],
+            bytes.fromhex(source_key["sha256"]),
+            len(self.ids), self.need_count, len(self.parent_indices), len(blob),
+        )
+
+        def write(f) -> None:
+            f.write(header)
+            f.write(b"\0" * (-len(header) % 4))
+            for arr in (self.parent_offsets, self.parent_indices, self.child_offsets,
+                        self.child_indices, id_offsets, id_order):
+                f.write(array("i", arr).tobytes())
+            f.write(blob)
+
+        return needs_store.write_atomic(Path(path), write)
+
+    @staticmethod
+    def read_source_key(path: Path) -> dict | None:
+        """
+        Read the needs.json key stored in a snapshot header.
+
+        Parameters
+        ----------
+        path : Path
+            Snapshot file path.
+
+        Returns
+        -------
+        dict or None
+            Source key, or None if the file is missing, from another format
+            version, or written with a different byte order.
+        """
+        try:
+            with open(path, "rb") as f:
+                raw = f.read(_HEADER.size)
+        except OSError:
+            return None
+        if len(raw) < _HEADER.size:
+            return None
+        magic, version, big, mtime_ns, size, sha, *_ = _HEADER.unpack(raw)
+        if magic != GRAPH_MAGIC or version != GRAPH_FORMAT_VERSION or big != _BIG_ENDIAN:
+            return None
+        return {"mtime_ns": mtime_ns, "size": size, "sha256": sha.hex()}
+
+    @classmethod
+    def open_mapped(cls, path: Path) -> "CitationGraph":
+        """
+        Open a binary snapshot without copying it.
+
+        Parameters
+        ----------
+        path : Path
+            Snapshot written by ``save``.
+
+        Returns
+        -------
+        CitationGraph
+            Graph whose arrays are ``memoryview`` casts into the mapping.
+
+        Raises
+        ------
+        ValueError
+            If the file is not a compatible graph snapshot.
+        """
+        with open(path, "rb") as f:
+            mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        view = memoryview(mapping)
+        if len(view) < _HEADER.size:
+            raise ValueError(f"Truncated graph snapshot: {path}")
+        magic, version, big, _, _, _, nodes, needs, edges, id_bytes = \
+            _HEADER.unpack_from(view)
+        if magic != GRAPH_MAGIC or version != GRAPH_FORMAT_VERSION or big != _BIG_ENDIAN:
+            raise ValueError(f"Incompatible graph snapshot: {path}")
+
+        pos = _HEADER.size + (-_HEADER.size % 4)
+
+        def take_ints(count: int) -> memoryview:
+            nonlocal pos
+            start, pos = pos, pos + 4 * count
+            return view[start:pos].cast("i")
+
+        p_off, p_idx = take_ints(nodes + 1), take_ints(edges)
+        c_off, c_idx = take_ints(nodes + 1), take_ints(edges)
+        id_offsets, id_order = take_ints(nodes + 1), take_ints(nodes)
+        if pos + id_bytes > len(view):
+            raise ValueError(f"Truncated graph snapshot: {path}")
+        ids = _IdTable(id_offsets, view[pos:pos + id_bytes])
+
+        graph = cls(ids, needs, p_off, p_idx, c_off, c_idx, index=_IdIndex(ids, id_order))
+        graph._mapping = mapping
+        return graph
+
+
+def load_graph(needs_path: Path, needs: dict | None = None,
+               use_cache: bool = True) -> CitationGraph:
+    """
+    Load the citation graph for needs.json, preferring the mapped snapshot.
+
+    Parameters
+    ----------
+    needs_path : Path
+        Path to needs.json.
+    needs : dict, optional
+        Already loaded needs; used to build the graph on a cache miss.
+    use_cache : bool
+        If False, build in memory and never touch the snapshot.
+
+    Returns
+    -------
+    CitationGraph
+        Memory-mapped graph when a current snapshot exists, otherwise a
+        freshly built graph (which is then persisted for the next caller).
+
+    Raises
+    ------
+    FileNotFoundError
+        If needs.json does not exist.
+    """
+    needs_path = Path(needs_path)
+    if not needs_path.exists():
+        raise FileNotFoundError(f"Needs file not found: {needs_path}")
+
+    def build() -> CitationGraph:
+        return CitationGraph.from_needs(
+            needs if needs is not None else needs_store.load_records(needs_path, use_cache))
+
+    if not use_cache:
+        return build()
+
+    graph = needs_store.memo_get(needs_path, "graph")
+    if graph is None:
+        stamp = needs_store.source_stamp(needs_path)
+        graph = _load_snapshot(needs_path, build)
+        needs_store.memo_put(needs_path, "graph", graph, stamp)
+    return graph
+
+
+def _load_snapshot(needs_path: Path, build) -> CitationGraph:
+    snap = needs_store.snapshot_path(needs_path, "graph", suffix=".bin")
+    key = CitationGraph.read_source_key(snap)
+    if key is not None:
+        state = needs_store.check_source(needs_path, key)
+        if state != "stale":
+            try:
+                graph = CitationGraph.open_mapped(snap)
+            except (OSError, ValueError):
+                graph = None
+            if graph is not None:
+                if state == "touched":
+                    st = needs_path.stat()
+                    graph.save(snap, {**key, "mtime_ns": st.st_mtime_ns, "size": st.st_size})
+                return graph
+
+    key = needs_store.source_key(needs_path)
+    graph = build()
+    graph.save(snap, key)
+    return graph
+
+
+def load_needs_graph(needs_path: Path, use_index: bool = False) -> tuple:
+    """
+    Load needs and their citation adjacency for the per-tag tools.
+
+    Parameters
+    ----------
+    needs_path : Path
+        Path to needs.json.
+    use_index : bool
+        If True, answer both from the SQLite needs index.
+
+    Returns
+    -------
+    tuple
+        ``(needs, graph)``: ``load_records`` and ``load_graph`` results, or
+        the same ``NeedsIndex`` twice.
+    """
+    if use_index:
+        # Imported here: sqlite3 is a noticeable share of tool start-up.
+        from needs_index import open_index
+        index = open_index(needs_path)
+        return index, index
+    needs = needs_store.load_records(needs_path)
+    return needs, load_graph(needs_path, needs)
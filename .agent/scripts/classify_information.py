@@ -26,12 +26,11 @@ import argparse
 import json
 import re
 import sys
-from dataclasses import dataclass
-from typing import Optional
+from functools import lru_cache
+from typing import NamedTuple, Optional
 
 
-@dataclass
-class ClassificationResult:
+class ClassificationResult(NamedTuple):
     """Result of tier classification."""
     tier: str
     confidence: float
@@ -157,6 +156,13 @@ DEFAULT_TIER = "ISP"
 DEFAULT_QUESTION = "Is it executable code skeleton? (Stub implementation)"
 
 
+@lru_cache(maxsize=None)
+def _compiled_patterns(question_key: str) -> tuple[tuple[str, re.Pattern], ...]:
+    """Compile a question's patterns on first use rather than at import."""
+    return tuple((p, re.compile(p, re.IGNORECASE))
+                 for p in CLASSIFICATION_PATTERNS[question_key]["patterns"])
+
+
 def calculate_score(text: str, question_key: str) -> tuple[float, list[str]]:
     """
     Calculate the match score for a classification question.
@@ -183,8 +189,8 @@ def calculate_score(text: str, question_key: str) -> tuple[float, list[str]]:
             matched_terms.append(f"keyword:{keyword}")
 
     # Check patterns
-    for pattern in config["patterns"]:
-        if re.search(pattern, text_lower, re.IGNORECASE):
+    for pattern, regex in _compiled_patterns(question_key):
+        if regex.search(text_lower):
             matched_terms.append(f"pattern:{pattern[:30]}")
 
     # Calculate score based on matches
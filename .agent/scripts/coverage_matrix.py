@@ -0,0 +1,311 @@
+"""
+Coverage Matrix Tool.
+
+Reports how well the DDR citation graph covers each tier and each part of
+the documentation, for the doc-health dashboard:
+
+- ``matrix``: citations counted by (citing tier, cited tier). Unresolved
+  link targets are counted separately per citing tier.
+- ``tiers``: per tier, the fraction of tags cited by at least one child
+  (downward coverage) and the fraction citing at least one defined parent
+  (upward coverage).
+- ``docnames`` / ``sections``: the same two fractions per docname and per
+  (docname, section).
+
+Everything is computed in one pass as bincount aggregates over the CSR
+arrays of the citation graph (vectorized with NumPy when it is installed),
+instead of one ``find_tags_citing`` call per tag. The report is cached
+with the other needs.json snapshots.
+
+Meta
+----
+Tool Definition : .agent/tools/trace_coverage_matrix.md
+Knowledge Source: .agent/knowledge/sources/protocols/traceability_chain.md
+Architect       : Antigravity IDE
+
+Usage
+-----
+    python coverage_matrix.py
+    python coverage_matrix.py --format markdown > coverage.md
+
+    from coverage_matrix import load_coverage
+
+    report = load_coverage(Path("docs/_build/json/needs.json"))
+    report["tiers"][0]["downward"]
+
+Exit Codes
+----------
+0 : Success (report printed to stdout)
+1 : Error (Details printed to stderr)
+
+Notes
+-----
+- Tags whose ID has no known tier prefix are reported under ``OTHER``
+  (only present when such tags exist).
+- ISP is the leaf tier, so its downward coverage is expected to be 0.
+- Fractions are ``null`` for groups without tags.
+"""
+import argparse
+import json
+import sys
+from pathlib import Path
+
+import needs_store
+from citation_graph import CitationGraph, load_graph
+from needs_store import TIER_ORDER, get_tier
+
+try:
+    import numpy as np
+except ImportError:  # optional: pure-Python aggregation below
+    np = None
+
+# Snapshot kind for needs_store.cached; bump the suffix if the payload changes.
+SNAPSHOT_KIND: str = "coverage-v1"
+
+OTHER_TIER: str = "OTHER"
+HEAT_WIDTH: int = 10
+
+
+def _bincount(keys, size: int) -> list[int]:
+    """Occurrences of each key in ``0 .. size - 1``."""
+    if np is not None:
+        return np.bincount(keys, minlength=size).tolist()
+    out = [0] * size
+    for k in keys:
+        out[k] += 1
+    return out
+
+
+def _fraction(part: int, whole: int) -> float | None:
+    return round(part / whole, 3) if whole else None
+
+
+def _group_codes(values: list) -> tuple[list, list[int]]:
+    """Distinct values in first-seen order, and each value's position."""
+    position: dict = {}
+    codes = [position.setdefault(v, len(position)) for v in values]
+    return list(position), codes
+
+
+def coverage_report(graph: CitationGraph, needs: dict) -> dict:
+    """
+    Compute the coverage report for a citation graph.
+
+    Parameters
+    ----------
+    graph : CitationGraph
+        Citation graph for ``needs``.
+    needs : dict
+        Dictionary of need_id -> need data.
+
+    Returns
+    -------
+    dict
+        ``summary``, ``matrix`` (citing tier -> cited tier -> count),
+        ``unresolved`` (citing tier -> count), ``tiers``, ``docnames`` and
+        ``sections``.
+    """
+    count, ids = graph.need_count, graph.ids
+    tiers = [get_tier(ids[i]) for i in range(count)]
+    labels = list(TIER_ORDER) + ([OTHER_TIER] if None in tiers else [])
+    width = len(labels)
+    codes = [TIER_ORDER.index(t) if t else width - 1 for t in tiers]
+
+    p_off, p_idx, c_off = graph.parent_offsets, graph.parent_indices, graph.child_offsets
+    if np is not None:
+        offsets = np.frombuffer(p_off, dtype=np.int32)[:count + 1]
+        parents = np.frombuffer(p_idx, dtype=np.int32)[:offsets[-1]]
+        rows = np.repeat(np.arange(count), np.diff(offsets))
+        tier_of = np.array(codes, dtype=np.int64)
+        resolved = parents < count
+        pair_keys = tier_of[rows[resolved]] * width + tier_of[parents[resolved]]
+        unresolved_keys = tier_of[rows[~resolved]]
+        has_parent = (np.bincount(rows[resolved], minlength=count) > 0).tolist()
+        has_child = (np.diff(np.frombuffer(c_off, dtype=np.int32)[:count + 1]) > 0).tolist()
+    else:
+        pair_keys, unresolved_keys, has_parent = [], [], [False] * count
+        for i in range(count):
+            for k in range(p_off[i], p_off[i + 1]):
+                p = p_idx[k]
+                if p < count:
+                    pair_keys.append(codes[i] * width + codes[p])
+                    has_parent[i] = True
+                else:
+                    unresolved_keys.append(codes[i])
+        has_child = [c_off[i + 1] > c_off[i] for i in range(count)]
+
+    pairs = _bincount(pair_keys, width * width)
+    unresolved = _bincount(unresolved_keys, width)
+
+    def rows_for(group_codes: list[int], size: int) -> list[dict]:
+        tags, down, up = [0] * size, [0] * size, [0] * size
+        for i, g in enumerate(group_codes):
+            tags[g] += 1
+            down[g] += has_child[i]
+            up[g] += has_parent[i]
+        return [{"tags": tags[g], "with_children": down[g],
+                 "downward": _fraction(down[g], tags[g]),
+                 "with_parents": up[g], "upward": _fraction(up[g], tags[g])}
+                for g in range(size)]
+
+    tier_rows = [{"tier": label, **row, "unresolved_citations": unresolved[t]}
+                 for t, (label, row) in enumerate(zip(labels, rows_for(codes, width)))]
+
+    records = [needs[ids[i]] for i in range(count)]
+    docnames, doc_codes = _group_codes([r.get("docname") or "" for r in records])
+    sections, sec_codes = _group_codes([(r.get("docname") or "", r.get("section_name") or "")
+                                        for r in records])
+    doc_rows = sorted(({"docname": d, **row} for d, row
+                       in zip(docnames, rows_for(doc_codes, len(docnames)))),
+                      key=lambda row: row["docname"])
+    sec_order = {d: n for n, d in enumerate(row["docname"] for row in doc_rows)}
+    sec_rows = sorted(({"docname": d, "section": s, **row} for (d, s), row
+                       in zip(sections, rows_for(sec_codes, len(sections)))),
+                      key=lambda row: sec_order[row["docname"]])
+
+    citations = sum(pairs)
+    return {
+        "summary": {
+            "tags": count,
+            "citations": citations,
+            "unresolved_citations": sum(unresolved),
+            "downward": _fraction(sum(has_child), count),
+            "upward": _fraction(sum(has_parent), count),
+        },
+        "matrix": {child: {parent: pairs[c * width + p] for p, parent in enumerate(labels)}
+                   for c, child in enumerate(labels)},
+        "unresolved": dict(zip(labels, unresolved)),
+        "tiers": tier_rows,
+        "docnames": doc_rows,
+        "sections": sec_rows,
+    }
+
+
+def load_coverage(needs_path: Path, needs: dict | None = None,
+                  graph: CitationGraph | None = None, use_cache: bool = True) -> dict:
+    """
+    Load the coverage report for needs.json, reusing a valid snapshot.
+
+    Parameters
+    ----------
+    needs_path : Path
+        Path to needs.json.
+    needs : dict, optional
+        Already loaded needs; used on a cache miss.
+    graph : CitationGraph, optional
+        Already loaded graph; used on a cache miss.
+    use_cache : bool
+        If False, compute in memory and never touch snapshots.
+
+    Returns
+    -------
+    dict
+        Report as returned by ``coverage_report``.
+
+    Raises
+    ------
+    FileNotFoundError
+        If needs.json does not exist.
+    """
+    def build(path: Path) -> dict:
+        records = needs if needs is not None else needs_store.load_records(path, use_cache)
+        source = graph if graph is not None else load_graph(path, records, use_cache)
+        return coverage_report(source, records)
+
+    return needs_store.cached(Path(needs_path), SNAPSHOT_KIND, build, use_cache)
+
+
+def _percent(fraction: float | None) -> str:
+    return "-" if fraction is None else f"{fraction:.0%}"
+
+
+def _heat(fraction: float | None) -> str:
+    if fraction is None:
+        return ""
+    filled = round(fraction * HEAT_WIDTH)
+    return "`" + "#" * filled + "." * (HEAT_WIDTH - filled) + "`"
+
+
+def format_markdown(report: dict) -> str:
+    """Render the coverage report as markdown tables."""
+    summary = report["summary"]
+    labels = list(report["matrix"])
+    lines = ["# Citation Coverage", "",
+             f"- Tags: {summary['tags']}",
+             f"- Citations: {summary['citations']} "
+             f"({summary['unresolved_citations']} unresolved)",
+             f"- Downward coverage: {_percent(summary['downward'])}",
+             f"- Upward coverage: {_percent(summary['upward'])}",
+             "", "## Tier x Tier Citations", "",
+             "Rows are the citing tier, columns the cited tier.", "",
+             "| Citing \\ Cited | " + " | ".join(labels) + " | Unresolved |",
+             "|:--|" + "--:|" * (len(labels) + 1)]
+    for child, row in report["matrix"].items():
+        lines.append(f"| {child} | " + " | ".join(str(row[p]) for p in labels)
+                     + f" | {report['unresolved'][child]} |")
+
+    lines += ["", "## Tier Coverage", "",
+              "| Tier | Tags | Downward | | Upward | |",
+              "|:--|--:|--:|:--|--:|:--|"]
+    for row in report["tiers"]:
+        lines.append(f"| {row['tier']} | {row['tags']} | {_percent(row['downward'])} | "
+                     f"{_heat(row['downward'])} | {_percent(row['upward'])} | "
+                     f"{_heat(row['upward'])} |")
+
+    lines += ["", "## Section Coverage", "",
+              "| Docname | Section | Tags | Downward | | Upward | |",
+              "|:--|:--|--:|--:|:--|--:|:--|"]
+    for row in report["sections"]:
+        lines.append(f"| `{row['docname']}` | {row['section']} | {row['tags']} | "
+                     f"{_percent(row['downward'])} | {_heat(row['downward'])} | "
+                     f"{_percent(row['upward'])} | {_heat(row['upward'])} |")
+    return "\n".join(lines)
+
+
+def main() -> int:
+    """
+    CLI entry point for coverage_matrix.
+
+    Returns
+    -------
+    int
+        Exit code (0=success, 1=error).
+    """
+    parser = argparse.ArgumentParser(
+        description="Report tier x tier citation counts and coverage per tier and section."
+    )
+    parser.add_argument(
+        "--format",
+        choices=["json", "markdown"],
+        default="json",
+        help="Output format (default: json)"
+    )
+    parser.add_argument(
+        "--needs-json",
+        default="docs/_build/json/needs.json",
+        help="Path to needs.json file"
+    )
+
+    args = parser.parse_args()
+
+    try:
+        report = load_coverage(Path(args.needs_json))
+        if args.format == "markdown":
+            print(format_markdown(report))
+        else:
+            print(json.dumps({"success": True, **report}, indent=2))
+        return 0
+
+    except FileNotFoundError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    except ValueError as e:
+        print(f"Error parsing needs.json: {e}", file=sys.stderr)
+        return 1
+    except Exception as e:
+        print(f"Error computing coverage: {e}", file=sys.stderr)
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -29,6 +29,8 @@ import uuid
 from pathlib import Path
 from typing import Optional
 
+from needs_store import load_records
+
 # Valid DDR tiers and their full names
 VALID_TIERS = {
     "BRD": "Business Requirements Document",
@@ -123,20 +125,8 @@ def load_existing_needs(needs_path: Path) -> dict:
     dict
         Dictionary of need_id -> need_data.
     """
-    if not needs_path.exists():
-        return {}
-
     try:
-        with open(needs_path, "r", encoding="utf-8") as f:
-            data = json.load(f)
-
-        # Extract needs from version structure
-        versions = data.get("versions", {})
-        for version_data in versions.values():
-            needs = version_data.get("needs", {})
-            if needs:
-                return needs
-        return {}
+        return load_records(needs_path)
     except Exception:
         return {}
 
@@ -13,6 +13,7 @@ Usage
 -----
     python deprecate_tag.py --id FSD-001
     python deprecate_tag.py --id FSD-001 --replacement FSD-002
+    python deprecate_tag.py --batch deprecations.jsonl   # {"id": ..., "replacement": ...}
 
 Exit Codes
 ----------
@@ -25,40 +26,17 @@ import json
 import sys
 from datetime import datetime
 from pathlib import Path
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 
+from batch_io import add_batch_argument, is_batch, iter_requests, run_batch
+from citation_graph import CitationGraph, load_needs_graph
 
-# Valid DDR tiers
-VALID_TIERS = ["BRD", "NFR", "FSD", "SAD", "ICD", "TDD", "ISP"]
-
-
-def load_needs(needs_path: Path) -> dict:
-    """
-    Load all needs from needs.json.
-
-    Parameters
-    ----------
-    needs_path : Path
-        Path to needs.json file.
-
-    Returns
-    -------
-    dict
-        Dictionary of need_id -> need_data.
-    """
-    if not needs_path.exists():
-        raise FileNotFoundError(f"Needs file not found: {needs_path}")
-
-    with open(needs_path, "r", encoding="utf-8") as f:
-        data = json.load(f)
+if TYPE_CHECKING:
+    from needs_index import NeedsIndex
 
-    versions = data.get("versions", {})
-    for version_data in versions.values():
-        needs = version_data.get("needs", {})
-        if needs:
-            return needs
 
-    raise ValueError("No needs found in needs.json")
+# Valid DDR tiers
+VALID_TIERS = ["BRD", "NFR", "FSD", "SAD", "ICD", "TDD", "ISP"]
 
 
 def get_tier_from_id(tag_id: str) -> Optional[str]:
@@ -71,7 +49,11 @@ def get_tier_from_id(tag_id: str) -> Optional[str]:
     return None
 
 
-def find_downstream_dependents(target_id: str, needs: dict) -> list[dict]:
+def find_downstream_dependents(
+    target_id: str,
+    needs: dict,
+    graph: Optional["CitationGraph | NeedsIndex"] = None
+) -> list[dict]:
     """
     Find all tags that directly cite the target.
 
@@ -81,25 +63,27 @@ def find_downstream_dependents(target_id: str, needs: dict) -> list[dict]:
         The tag ID being deprecated.
     needs : dict
         Dictionary of all needs.
+    graph : CitationGraph or NeedsIndex, optional
+        Prebuilt citation graph (or SQLite index) for ``needs``. Built on
+        demand if omitted.
 
     Returns
     -------
     list[dict]
         List of dependent tags.
     """
+    if graph is None:
+        graph = CitationGraph.from_needs(needs)
+
     dependents = []
-    for need_id, need_data in needs.items():
-        links = need_data.get("links", [])
-        if isinstance(links, str):
-            links = [links] if links else []
-
-        if target_id in links:
-            dependents.append({
-                "id": need_id,
-                "tier": get_tier_from_id(need_id),
-                "title": need_data.get("title", ""),
-                "file": need_data.get("docname", "")
-            })
+    for need_id in graph.children_of(target_id):
+        need_data = needs[need_id]
+        dependents.append({
+            "id": need_id,
+            "tier": get_tier_from_id(need_id),
+            "title": need_data.get("title", ""),
+            "file": need_data.get("docname", "")
+        })
 
     return dependents
 
@@ -107,7 +91,10 @@ def find_downstream_dependents(target_id: str, needs: dict) -> list[dict]:
 def deprecate_tag(
     tag_id: str,
     replacement: Optional[str],
-    needs_path: Path
+    needs_path: Path,
+    use_index: bool = False,
+    needs: Optional[dict] = None,
+    graph: Optional["CitationGraph | NeedsIndex"] = None
 ) -> dict:
     """
     Prepare deprecation for a DDR tag.
@@ -123,6 +110,12 @@ def deprecate_tag(
         Replacement tag ID if available.
     needs_path : Path
         Path to needs.json.
+    use_index : bool
+        If True, answer from the SQLite needs index.
+    needs : dict, optional
+        Already loaded needs (batch mode); loaded from ``needs_path`` if omitted.
+    graph : CitationGraph or NeedsIndex, optional
+        Citation adjacency matching ``needs``.
 
     Returns
     -------
@@ -132,7 +125,8 @@ def deprecate_tag(
     tag_id = tag_id.strip()
 
     # Load needs
-    needs = load_needs(needs_path)
+    if needs is None:
+        needs, graph = load_needs_graph(needs_path, use_index)
 
     # Check tag exists
     if tag_id not in needs:
@@ -173,7 +167,7 @@ def deprecate_tag(
                 }
 
     # Find dependents that need migration
-    dependents = find_downstream_dependents(tag_id, needs)
+    dependents = find_downstream_dependents(tag_id, needs, graph)
 
     # Generate deprecation notice
     deprecation_notice = f"DEPRECATED: This tag is deprecated as of {datetime.now().strftime('%Y-%m-%d')}."
@@ -241,11 +235,7 @@ def main() -> int:
     parser = argparse.ArgumentParser(
         description="Mark a DDR tag as deprecated with optional replacement."
     )
-    parser.add_argument(
-        "--id",
-        required=True,
-        help="Tag ID to deprecate (e.g., FSD-001)"
-    )
+    add_batch_argument(parser)
     parser.add_argument(
         "--replacement",
         required=False,
@@ -258,16 +248,30 @@ def main() -> int:
         default="docs/_build/json/needs.json",
         help="Path to needs.json file"
     )
+    parser.add_argument(
+        "--use-index",
+        action="store_true",
+        help="Answer from the SQLite needs index instead of loading all needs"
+    )
 
     args = parser.parse_args()
 
     try:
         needs_path = Path(args.needs_json)
 
+        if is_batch(args):
+            needs, graph = load_needs_graph(needs_path, args.use_index)
+
+            def handle(id: str, replacement: Optional[str] = None) -> dict:
+                return deprecate_tag(id, replacement, needs_path, needs=needs, graph=graph)
+            requests = iter_requests(args, defaults={"replacement": args.replacement})
+            return run_batch(requests, handle, allowed={"id", "replacement"})
+
         result = deprecate_tag(
-            tag_id=args.id,
+            tag_id=args.id[0],
             replacement=args.replacement,
-            needs_path=needs_path
+            needs_path=needs_path,
+            use_index=args.use_index
         )
 
         print(json.dumps(result, indent=2))
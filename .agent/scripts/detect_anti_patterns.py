@@ -3,6 +3,13 @@ Detect Anti-Patterns Tool.
 
 Scans DDR tags for structural and content violations.
 
+Each anti-pattern is a rule on a ``rule_engine.RuleSet``: content checks
+are regexes merged into one scan per tier, the rest are predicates over
+``NeedFacts`` (tier, link tiers) derived once per need. The CLI keeps
+per-need results in a ``validation_cache`` table, so a run after an edit
+only re-scans the needs it touched; ``--jobs N`` scans the remaining
+needs in chunks across N processes (``chunked_eval``).
+
 Meta
 ----
 Tool Definition : .agent/tools/detect_anti_patterns.md
@@ -14,6 +21,9 @@ Architect       : Antigravity IDE
 Usage
 -----
     python detect_anti_patterns.py --needs-json docs/_build/json/needs.json
+    python detect_anti_patterns.py --no-cache
+    python detect_anti_patterns.py --jobs 8
+    python detect_anti_patterns.py --format sarif > anti_patterns.sarif
 
 Exit Codes
 ----------
@@ -24,61 +34,187 @@ import argparse
 import json
 import re
 import sys
+from functools import lru_cache
 from pathlib import Path
+from typing import Any, Iterable
+
+import rule_engine
+from chunked_eval import run_chunked
+from needs_store import iter_needs, load_records
+from rule_engine import RuleSet
+from validation_cache import ValidationCache, ruleset_version
+from violation_writer import WRITERS
 
 TIER_ORDER = ["BRD", "NFR", "FSD", "SAD", "ICD", "TDD", "ISP"]
+TIER_RANK = {tier: rank for rank, tier in enumerate(TIER_ORDER)}
+ALL_TIERS = (*TIER_ORDER, None)
+_LINK_RANK = {**TIER_RANK, None: -1}
+ID_FORMAT = re.compile(r"^[A-Z]{3}-\d+(\.\d+)?$")
+# Sources defining the rules; their digest versions the validation cache.
+RULESET_FILES = (__file__, rule_engine.__file__)
 
 
 def get_tier(tag_id: str) -> str | None:
     if not tag_id: return None
-    prefix = tag_id.split("-")[0].split(".")[0].upper()
-    return prefix if prefix in TIER_ORDER else None
-
-
-def load_needs(path: Path) -> dict:
-    with open(path, "r", encoding="utf-8") as f:
-        data = json.load(f)
-    return data.get("versions", {}).get("0.1", {}).get("needs", {})
-
-
-PATTERNS: dict[str, tuple[str, callable]] = {
-    "AP001": ("Vertical Pollution", lambda n: n["tier"] in ["BRD", "NFR", "FSD"]
-              and re.search(r"\b(def |class |import )\b", n.get("content", ""))),
-    "AP002": ("Orphan Tag", lambda n: n["tier"] != "BRD" and not n.get("links")),
-    "AP003": ("Sibling Citation", lambda n: any(get_tier(l) == n["tier"] for l in n.get("links", []))),
-    "AP004": ("Forward Reference", lambda n: any(
-        get_tier(l) and n["tier"] and TIER_ORDER.index(get_tier(l)) > TIER_ORDER.index(n["tier"])
-        for l in n.get("links", []) if get_tier(l))),
-    "AP005": ("Missing Title", lambda n: not n.get("title") or n["title"] == n["id"]),
-    "AP006": ("Dangling ISP", lambda n: n["tier"] == "ISP"
-              and not any(get_tier(l) == "TDD" for l in n.get("links", []))),
-    "AP007": ("ID Format Violation", lambda n: not re.match(r"^[A-Z]{3}-\d+(\.\d+)?$", n["id"])),
-    "AP008": ("Technology Leak in BRD", lambda n: n["tier"] == "BRD" and re.search(
-        r"\b(Python|Java|API|SQL|GPU|REST|JSON)\b", n.get("content", ""), re.I)),
-    "AP009": ("Empty Content", lambda n: not n.get("content", "").strip() and n["tier"] != "BRD"),
-}
-
-
-def detect(needs: dict, patterns: list | None = None) -> dict:
-    violations = []
-    check_patterns = patterns if patterns else list(PATTERNS.keys())
-
-    for nid, ndata in needs.items():
-        ndata["tier"] = get_tier(nid)
-        ndata["id"] = nid
-        for pid in check_patterns:
-            if pid not in PATTERNS: continue
-            name, check = PATTERNS[pid]
+    prefix = tag_id.partition("-")[0].partition(".")[0].upper()
+    return prefix if prefix in TIER_RANK else None
+
+
+# Link targets repeat across needs; derive each one's tier once.
+_link_tier = lru_cache(maxsize=1 << 16)(get_tier)
+
+
+# Need fields NeedFacts reads; workers receive only these.
+FACT_FIELDS = ("title", "content", "links")
+
+
+class NeedFacts:
+    """Per-need values the checks read, derived once per need."""
+    __slots__ = ("id", "tier", "title", "content", "links", "link_tiers", "links_valid",
+                 "deepest_link")
+
+    def __init__(self, nid: str, ndata: Any):
+        self.id = nid
+        self.tier = get_tier(nid)
+        self.title = ndata.get("title")
+        self.content = ndata.get("content", "")
+        self.links = links = ndata.get("links", [])
+        try:
+            tiers = set(map(_link_tier, links))
+            self.links_valid = True
+        except (TypeError, AttributeError):
+            # Malformed links (not a list, or non-string entries): keep the
+            # tiers of the entries before the first bad one.
+            tiers = set()
             try:
-                if check(ndata):
-                    violations.append({"id": nid, "pattern": pid, "name": name})
-            except: pass
+                for link in links:
+                    tiers.add(_link_tier(link))
+            except (TypeError, AttributeError):
+                pass
+            self.links_valid = False
+        self.link_tiers = tiers
+        # Rank of the lowest known tier cited, -1 if none.
+        self.deepest_link = max(map(_LINK_RANK.__getitem__, tiers), default=-1)
+
+
+PATTERNS = RuleSet(facts=NeedFacts)
+
+PATTERNS.regex("AP001", "Vertical Pollution", "content", r"\b(def |class |import )\b",
+               tiers=("BRD", "NFR", "FSD"))
+
+
+@PATTERNS.predicate("AP002", "Orphan Tag", tiers=[t for t in ALL_TIERS if t != "BRD"])
+def _orphan(n: NeedFacts) -> bool:
+    return not n.links
+
+
+@PATTERNS.predicate("AP003", "Sibling Citation")
+def _sibling_citation(n: NeedFacts) -> bool:
+    return n.tier in n.link_tiers
+
+
+@PATTERNS.predicate("AP004", "Forward Reference", tiers=TIER_ORDER)
+def _forward_reference(n: NeedFacts) -> bool:
+    return n.deepest_link > TIER_RANK[n.tier]
+
+
+@PATTERNS.predicate("AP005", "Missing Title")
+def _missing_title(n: NeedFacts) -> bool:
+    return not n.title or n.title == n.id
+
+
+@PATTERNS.predicate("AP006", "Dangling ISP", tiers=("ISP",))
+def _dangling_isp(n: NeedFacts) -> bool:
+    return n.links_valid and "TDD" not in n.link_tiers
+
+
+@PATTERNS.predicate("AP007", "ID Format Violation")
+def _id_format(n: NeedFacts) -> bool:
+    return not ID_FORMAT.match(n.id)
+
+
+PATTERNS.regex("AP008", "Technology Leak in BRD", "content",
+               r"\b(Python|Java|API|SQL|GPU|REST|JSON)\b", re.I, tiers=("BRD",))
+
+
+@PATTERNS.predicate("AP009", "Empty Content", tiers=[t for t in ALL_TIERS if t != "BRD"])
+def _empty_content(n: NeedFacts) -> bool:
+    return isinstance(n.content, str) and not n.content.strip()
+
+
+def scan_need(nid: str, ndata: Any, check_patterns: Iterable[str]) -> list[dict]:
+    """Return the anti-pattern violations of one need, in ``check_patterns`` order."""
+    return report_hits(nid, PATTERNS.evaluate(nid, ndata, check_patterns))
+
+
+def report_hits(nid: str, hits: list[str]) -> list[dict]:
+    """Return the violation records of a need's pattern hits."""
+    return [{"id": nid, "pattern": pid, "name": PATTERNS[pid].name} for pid in hits]
+
+
+def _check_chunk(chunk: list[tuple[str, Any]], patterns: tuple[str, ...] | None) -> list[list[str]]:
+    """Return the pattern hits of each need of a ``chunked_eval`` chunk."""
+    check = PATTERNS.checker(patterns)
+    return [check(nid, ndata) for nid, ndata in chunk]
+
+
+def detect(needs: dict | Iterable[tuple[str, Any]], patterns: list | None = None,
+           cache: ValidationCache | None = None, jobs: int = 1) -> dict:
+    """
+    Scan needs for anti-patterns. ``needs`` may be a dict or a stream of pairs.
+
+    With a ``cache``, each need's hits for all patterns are looked up by
+    content and parent set, and only new or changed needs are scanned.
+    With ``jobs`` > 1 the needs (or the cache misses) are scanned in
+    chunks across worker processes; the report is unchanged.
+    """
+    check_patterns = tuple(patterns) if patterns else tuple(PATTERNS)
+    pairs = needs.items() if isinstance(needs, dict) else needs
+    if jobs > 1:
+        pairs = list(pairs)
+    if cache is None:
+        if jobs > 1:
+            hits = run_chunked(_check_chunk, pairs, FACT_FIELDS, jobs, (check_patterns,))
+            return summarize(map(report_hits, [nid for nid, _ in pairs], hits))
+        check = PATTERNS.checker(check_patterns)
+        return summarize(report_hits(nid, check(nid, ndata)) for nid, ndata in pairs)
+
+    check_all = PATTERNS.checker()
+    if jobs > 1:
+        todo = cache.pending(pairs)
+        fresh = dict(zip([nid for nid, _ in todo],
+                         run_chunked(_check_chunk, todo, FACT_FIELDS, jobs, (None,))))
+        check_all = lambda nid, ndata: fresh[nid]  # noqa: E731
+
+    def cached_hits(nid: str, ndata: Any) -> list[str]:
+        hits = cache.get(nid, ndata, lambda: check_all(nid, ndata))
+        return [pid for pid in check_patterns if pid in hits] if hits else []
+
+    return summarize(report_hits(nid, cached_hits(nid, ndata)) for nid, ndata in pairs)
+
+
+def detect_cached(needs_path: Path, needs: dict, patterns: list | None = None,
+                  jobs: int = 1) -> dict:
+    """Run ``detect`` with the persistent validation cache of ``needs_path``."""
+    cache = ValidationCache(needs_path, "anti_patterns", ruleset_version(*RULESET_FILES), needs)
+    result = detect(needs, patterns, cache, jobs)
+    cache.save()
+    return result
+
+
+def summarize(per_need: Iterable[list[dict]]) -> dict:
+    """Assemble the result from per-need violation lists, one per scanned need."""
+    violations = []
+    scanned = 0
+    for found in per_need:
+        scanned += 1
+        violations.extend(found)
 
     by_pattern = {}
     for v in violations:
         by_pattern.setdefault(v["pattern"], []).append(v)
 
-    return {"scanned": len(needs), "violations": len(violations),
+    return {"scanned": scanned, "violations": len(violations),
             "by_pattern": {k: len(v) for k, v in by_pattern.items()},
             "details": violations}
 
@@ -87,6 +223,12 @@ def main() -> int:
     parser = argparse.ArgumentParser()
     parser.add_argument("--needs-json", default="docs/_build/json/needs.json")
     parser.add_argument("--patterns", help="Comma-separated pattern IDs")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Scan every need instead of reusing cached results")
+    parser.add_argument("--jobs", type=int, default=1,
+                        help="Worker processes scanning chunks of needs (default: 1)")
+    parser.add_argument("--format", choices=["json", *WRITERS], default="json",
+                        help="JSON report, or stream violations as ndjson, sarif or junit")
     args = parser.parse_args()
 
     path = Path(args.needs_json)
@@ -95,7 +237,16 @@ def main() -> int:
 
     try:
         patterns = args.patterns.split(",") if args.patterns else None
-        print(json.dumps(detect(load_needs(path), patterns), indent=2))
+        if args.format != "json":
+            from audit_engine import stream_check  # audit_engine imports this module
+            keep = (lambda f: f.rule in patterns) if patterns else None
+            return stream_check(load_records(path), "anti_patterns", args.format, sys.stdout,
+                                keep, needs_path=None if args.no_cache else path)
+        if args.no_cache:
+            result = detect(iter_needs(path), patterns, jobs=args.jobs)
+        else:
+            result = detect_cached(path, load_records(path), patterns, args.jobs)
+        print(json.dumps(result, indent=2))
         return 0
     except Exception as e:
         print(f"Error: {e}", file=sys.stderr); return 1
@@ -80,22 +80,32 @@ Module Usage
 >>> # print(TreeStyle.ASCII.value.middle)  # "+-- "
 """
 
+from __future__ import annotations
+
 import os
 import re
+from collections import namedtuple
 from enum import Enum
-import datetime
 from pathlib import Path
-from typing import (
-    Any, List, Optional, Pattern, Tuple, Union, Set, NamedTuple
-)
 
-# --- Type Aliases ---
-PatternInputType = Union[str, List[str], Pattern]
-# dev_t, ino_t
-DeviceInode = Tuple[int, int]
+# typing is only needed by type checkers; annotations are not evaluated at
+# runtime, so skip the import on every tool start-up.
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Any, List, Optional, Pattern, Tuple, Union, Set
+
+    # --- Type Aliases ---
+    PatternInputType = Union[str, List[str], Pattern]
+    # dev_t, ino_t
+    DeviceInode = Tuple[int, int]
+
+
+_TreePrefixes = namedtuple("TreePrefixes", [
+    "middle", "last", "parent_middle", "parent_last"
+])
 
 
-class TreePrefixes(NamedTuple):
+class TreePrefixes(_TreePrefixes):
     """
     Container for tree-drawing prefix characters.
 
@@ -110,10 +120,7 @@ class TreePrefixes(NamedTuple):
     parent_last : str
         Continuation prefix when parent was last (e.g., "    ").
     """
-    middle: str
-    last: str
-    parent_middle: str
-    parent_last: str
+    __slots__ = ()
 
 
 class TreeStyle(Enum):
@@ -203,7 +210,20 @@ def _configure_console_encoding() -> None:
     except (AttributeError, OSError, TypeError):
         pass  # stdout may not have buffer in some environments
 
-class TreeConfig(NamedTuple):
+
+_TreeConfig = namedtuple("TreeConfig", [
+    "root_path", "include_all_pattern", "exclude_all_pattern",
+    "include_files_pattern", "exclude_files_pattern",
+    "include_folders_pattern", "exclude_folders_pattern", "show_sizes_files",
+    "show_dates_files", "show_sizes_folders", "show_dates_folders",
+    "show_folder_file_count", "show_folder_total_file_count",
+    "show_folder_subfolder_count", "follow_symlinks", "mark_symlinks",
+    "mark_circular", "mark_errors", "hide_symlinks", "hide_circular_refs",
+    "prefixes"
+])
+
+
+class TreeConfig(_TreeConfig):
     """
     Configuration for tree generation.
 
@@ -264,30 +284,17 @@ class TreeConfig(NamedTuple):
         The tree-drawing character set (UTF-8 or ASCII) to use for
         generating tree line prefixes.
     """
-    root_path: Path
-    include_all_pattern: Pattern
-    exclude_all_pattern: Pattern
-    include_files_pattern: Pattern
-    exclude_files_pattern: Pattern
-    include_folders_pattern: Pattern
-    exclude_folders_pattern: Pattern
-    show_sizes_files: bool
-    show_dates_files: bool
-    show_sizes_folders: bool
-    show_dates_folders: bool
-    show_folder_file_count: bool
-    show_folder_total_file_count: bool
-    show_folder_subfolder_count: bool
-    follow_symlinks: bool
-    mark_symlinks: bool
-    mark_circular: bool
-    mark_errors: bool
-    hide_symlinks: bool
-    hide_circular_refs: bool
-    prefixes: TreePrefixes
-
-
-class PathDetails(NamedTuple):
+    __slots__ = ()
+
+
+_PathDetails = namedtuple("PathDetails", [
+    "path", "name", "is_dir", "is_file", "is_symlink", "size_bytes",
+    "mod_time", "symlink_target", "is_dangling_symlink", "access_error",
+    "dev_ino"
+])
+
+
+class PathDetails(_PathDetails):
     """
     Holds processed information about a path.
 
@@ -330,20 +337,16 @@ class PathDetails(NamedTuple):
         A tuple of (device ID, inode number) used for circular reference
         detection. None if an error occurred.
     """
-    path: Path
-    name: str
-    is_dir: bool
-    is_file: bool
-    is_symlink: bool
-    size_bytes: Optional[int]
-    mod_time: Optional[float]
-    symlink_target: Optional[str]
-    is_dangling_symlink: bool
-    access_error: Optional[str]
-    dev_ino: Optional[DeviceInode]
-
-
-class SubtreeStats(NamedTuple):
+    __slots__ = ()
+
+
+_SubtreeStats = namedtuple("SubtreeStats", [
+    "recursive_size_bytes", "recursive_files_count", "immediate_files_count",
+    "immediate_folders_count"
+])
+
+
+class SubtreeStats(_SubtreeStats):
     """
     Aggregated statistics for a directory subtree.
 
@@ -360,10 +363,7 @@ class SubtreeStats(NamedTuple):
     immediate_folders_count : int
         Number of subfolders directly within this directory.
     """
-    recursive_size_bytes: int
-    recursive_files_count: int
-    immediate_files_count: int
-    immediate_folders_count: int
+    __slots__ = ()
 
 
 # ───────────── Private Helper Functions: Compilation & Formatting ─────────────
@@ -412,7 +412,7 @@ def _compile_regex_pattern(
     """
     if pattern_input is None:
         return re.compile("(?!)")  # Match nothing
-    if isinstance(pattern_input, Pattern):
+    if isinstance(pattern_input, re.Pattern):
         return pattern_input
     if isinstance(pattern_input, str):
         try:
@@ -500,6 +500,8 @@ def _format_date_iso(timestamp: float) -> str:
     >>> isinstance(_format_date_iso(0), str)
     True
     """
+    import datetime  # only needed when dates are shown
+
     try:
         dt_obj = datetime.datetime.fromtimestamp(timestamp)
         return dt_obj.strftime("%Y-%m-%d %H:%M:%S")
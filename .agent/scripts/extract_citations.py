@@ -13,11 +13,20 @@ Usage
 -----
     python extract_citations.py --id FSD-001
     python extract_citations.py --id FSD-001 --needs-json path/to/needs.json
+    python extract_citations.py --id FSD-001 --id FSD-002      # NDJSON
+    python extract_citations.py --tag-id TDD-001 --recursive   # + root chains
+    python extract_citations.py --batch ids.txt                # NDJSON
 
 Exit Codes
 ----------
 0 : Success (JSON result printed to stdout)
 1 : Error (Details printed to stderr)
+
+Notes
+-----
+- ``--recursive`` adds ``chain`` (the shortest chain up to a BRD root, or
+  null) and ``root_chains`` (up to ``--max-paths`` chains, shortest first)
+  from the path engine in trace_paths.py.
 """
 
 import argparse
@@ -26,48 +35,16 @@ import sys
 from pathlib import Path
 from typing import Optional
 
+from batch_io import add_batch_argument, is_batch, iter_requests, run_batch
+from citation_graph import load_graph
+from needs_store import load_records
+from trace_paths import DEFAULT_MAX_PATHS, root_chain, root_chains
+
 
 # Valid DDR tiers
 VALID_TIERS = ["BRD", "NFR", "FSD", "SAD", "ICD", "TDD", "ISP"]
 
 
-def load_needs(needs_path: Path) -> dict:
-    """
-    Load all needs from needs.json.
-
-    Parameters
-    ----------
-    needs_path : Path
-        Path to needs.json file.
-
-    Returns
-    -------
-    dict
-        Dictionary of need_id -> need_data.
-
-    Raises
-    ------
-    FileNotFoundError
-        If needs.json does not exist.
-    ValueError
-        If needs.json cannot be parsed.
-    """
-    if not needs_path.exists():
-        raise FileNotFoundError(f"Needs file not found: {needs_path}")
-
-    with open(needs_path, "r", encoding="utf-8") as f:
-        data = json.load(f)
-
-    # Extract needs from version structure
-    versions = data.get("versions", {})
-    for version_data in versions.values():
-        needs = version_data.get("needs", {})
-        if needs:
-            return needs
-
-    raise ValueError("No needs found in needs.json")
-
-
 def get_tier_from_id(tag_id: str) -> Optional[str]:
     """
     Extract tier code from tag ID.
@@ -170,6 +147,33 @@ def extract_citations(tag_id: str, needs: dict) -> dict:
     }
 
 
+def add_root_chains(result: dict, graph, max_paths: int = DEFAULT_MAX_PATHS) -> dict:
+    """
+    Add the tag's chains up to BRD roots to an extraction result.
+
+    Parameters
+    ----------
+    result : dict
+        Output of ``extract_citations``; failed results are returned as is.
+    graph : CitationGraph
+        Citation graph of the same needs.
+    max_paths : int
+        Maximum number of chains listed in ``root_chains``.
+
+    Returns
+    -------
+    dict
+        ``result`` with ``chain``, ``root_chains`` and ``root_chains_truncated``.
+    """
+    if not result["success"]:
+        return result
+    chains, truncated = root_chains(graph, result["id"], max_paths)
+    result["chain"] = root_chain(graph, result["id"])
+    result["root_chains"] = chains
+    result["root_chains_truncated"] = truncated
+    return result
+
+
 def main() -> int:
     """
     CLI entry point for extract_citations.
@@ -182,25 +186,52 @@ def main() -> int:
     parser = argparse.ArgumentParser(
         description="Extract parent citations from a DDR tag."
     )
-    parser.add_argument(
-        "--id",
-        required=True,
-        help="Tag ID to extract citations from (e.g., FSD-001)"
-    )
+    add_batch_argument(parser, aliases=("--tag-id",))
     parser.add_argument(
         "--needs-json",
         required=False,
         default="docs/_build/json/needs.json",
         help="Path to needs.json file"
     )
+    parser.add_argument(
+        "--use-index",
+        action="store_true",
+        help="Answer from the SQLite needs index instead of loading all needs"
+    )
+    parser.add_argument(
+        "--recursive",
+        action="store_true",
+        help="Also trace the citation chains up to BRD roots"
+    )
+    parser.add_argument(
+        "--max-paths",
+        type=int,
+        default=DEFAULT_MAX_PATHS,
+        help=f"Maximum root chains listed with --recursive (default: {DEFAULT_MAX_PATHS})"
+    )
 
     args = parser.parse_args()
 
     try:
         needs_path = Path(args.needs_json)
-        needs = load_needs(needs_path)
+        if args.use_index:
+            from needs_index import open_index  # sqlite3 only when asked for
+            needs = open_index(needs_path)
+        else:
+            needs = load_records(needs_path)
+
+        def extract(id: str) -> dict:
+            result = extract_citations(id, needs)
+            if args.recursive:
+                add_root_chains(result, graph, args.max_paths)
+            return result
+
+        graph = load_graph(needs_path) if args.recursive else None
+
+        if is_batch(args):
+            return run_batch(iter_requests(args), extract, allowed={"id"})
 
-        result = extract_citations(args.id, needs)
+        result = extract(args.id[0])
 
         print(json.dumps(result, indent=2))
         return 0 if result["success"] else 1
@@ -13,6 +13,8 @@ Usage
 -----
     python find_tags_citing.py --id BRD-001
     python find_tags_citing.py --id BRD-001 --needs-json path/to/needs.json
+    python find_tags_citing.py --id BRD-001 --id BRD-002 --recursive   # NDJSON
+    python find_tags_citing.py --batch requests.jsonl                  # NDJSON
 
 Exit Codes
 ----------
@@ -23,50 +25,19 @@ Exit Codes
 import argparse
 import json
 import sys
-from collections import defaultdict
+from collections import defaultdict, deque
 from pathlib import Path
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 
+from batch_io import add_batch_argument, is_batch, iter_requests, run_batch
+from citation_graph import CitationGraph, load_needs_graph
 
-# Valid DDR tiers in hierarchy order
-VALID_TIERS = ["BRD", "NFR", "FSD", "SAD", "ICD", "TDD", "ISP"]
-
+if TYPE_CHECKING:
+    from needs_index import NeedsIndex
 
-def load_needs(needs_path: Path) -> dict:
-    """
-    Load all needs from needs.json.
 
-    Parameters
-    ----------
-    needs_path : Path
-        Path to needs.json file.
-
-    Returns
-    -------
-    dict
-        Dictionary of need_id -> need_data.
-
-    Raises
-    ------
-    FileNotFoundError
-        If needs.json does not exist.
-    ValueError
-        If needs.json cannot be parsed.
-    """
-    if not needs_path.exists():
-        raise FileNotFoundError(f"Needs file not found: {needs_path}")
-
-    with open(needs_path, "r", encoding="utf-8") as f:
-        data = json.load(f)
-
-    # Extract needs from version structure
-    versions = data.get("versions", {})
-    for version_data in versions.values():
-        needs = version_data.get("needs", {})
-        if needs:
-            return needs
-
-    raise ValueError("No needs found in needs.json")
+# Valid DDR tiers in hierarchy order
+VALID_TIERS = ["BRD", "NFR", "FSD", "SAD", "ICD", "TDD", "ISP"]
 
 
 def get_tier_from_id(tag_id: str) -> Optional[str]:
@@ -91,7 +62,80 @@ def get_tier_from_id(tag_id: str) -> Optional[str]:
     return None
 
 
-def find_tags_citing(target_id: str, needs: dict, recursive: bool = False) -> dict:
+def _indirect_descendants(target_id: str, direct_ids: list[str], needs: dict,
+                          graph: "CitationGraph | NeedsIndex") -> list[dict]:
+    """
+    Breadth-first closure below the direct citers of a tag.
+
+    Each node is marked when first discovered, so every need is reported
+    once, with the parent it was first reached from, and the walk is
+    O(V + E) over the reverse adjacency.
+
+    Parameters
+    ----------
+    target_id : str
+        Tag whose citers were already collected.
+    direct_ids : list[str]
+        Direct citers of ``target_id``, in graph order.
+    needs : dict
+        Dictionary of all needs.
+    graph : CitationGraph or NeedsIndex
+        Citation graph (or SQLite index) for ``needs``.
+
+    Returns
+    -------
+    list[dict]
+        Indirect descendants in BFS order with ``id``, ``tier``, ``title``
+        and ``parent``.
+    """
+    descendants = []
+
+    def record(need_id: str, parent_id: str) -> None:
+        descendants.append({
+            "id": need_id,
+            "tier": get_tier_from_id(need_id),
+            "title": needs[need_id].get("title", ""),
+            "parent": parent_id
+        })
+
+    if isinstance(graph, CitationGraph):
+        # Int-indexed walk straight over the CSR arrays.
+        ids, offsets, indices = graph.ids, graph.child_offsets, graph.child_indices
+        seen = bytearray(len(ids))
+        seen[graph.index[target_id]] = 1
+        queue = deque()
+        for need_id in direct_ids:
+            i = graph.index[need_id]
+            seen[i] = 1
+            queue.append(i)
+        while queue:
+            node = queue.popleft()
+            for k in range(offsets[node], offsets[node + 1]):
+                child = indices[k]
+                if not seen[child]:
+                    seen[child] = 1
+                    record(ids[child], ids[node])
+                    queue.append(child)
+        return descendants
+
+    visited = {target_id, *direct_ids}
+    queue = deque(direct_ids)
+    while queue:
+        current_id = queue.popleft()
+        for need_id in graph.children_of(current_id):
+            if need_id not in visited:
+                visited.add(need_id)
+                record(need_id, current_id)
+                queue.append(need_id)
+    return descendants
+
+
+def find_tags_citing(
+    target_id: str,
+    needs: dict,
+    recursive: bool = False,
+    graph: Optional["CitationGraph | NeedsIndex"] = None
+) -> dict:
     """
     Find all tags that cite the target as a parent.
 
@@ -103,6 +147,9 @@ def find_tags_citing(target_id: str, needs: dict, recursive: bool = False) -> di
         Dictionary of all needs.
     recursive : bool
         If True, also find indirect descendants.
+    graph : CitationGraph or NeedsIndex, optional
+        Prebuilt citation graph (or SQLite index) for ``needs``. Built on
+        demand if omitted.
 
     Returns
     -------
@@ -118,21 +165,20 @@ def find_tags_citing(target_id: str, needs: dict, recursive: bool = False) -> di
     if target_exists:
         target_title = needs[target_id].get("title", "")
 
-    # Find direct citations
+    if graph is None:
+        graph = CitationGraph.from_needs(needs)
+
+    # Direct citations come straight from the reverse adjacency.
+    direct_ids = graph.children_of(target_id)
     direct_citations = []
-    for need_id, need_data in needs.items():
-        links = need_data.get("links", [])
-        if isinstance(links, str):
-            links = [links] if links else []
-
-        if target_id in links:
-            citation = {
-                "id": need_id,
-                "tier": get_tier_from_id(need_id),
-                "title": need_data.get("title", ""),
-                "link_type": "direct"
-            }
-            direct_citations.append(citation)
+    for need_id in direct_ids:
+        citation = {
+            "id": need_id,
+            "tier": get_tier_from_id(need_id),
+            "title": needs[need_id].get("title", ""),
+            "link_type": "direct"
+        }
+        direct_citations.append(citation)
 
     # Group by tier
     by_tier = defaultdict(list)
@@ -155,31 +201,7 @@ def find_tags_citing(target_id: str, needs: dict, recursive: bool = False) -> di
     # Recursive descent if requested
     all_descendants = []
     if recursive and direct_citations:
-        visited = {target_id}
-        queue = [c["id"] for c in direct_citations]
-
-        while queue:
-            current_id = queue.pop(0)
-            if current_id in visited:
-                continue
-            visited.add(current_id)
-
-            # Find citations of this tag
-            for need_id, need_data in needs.items():
-                if need_id in visited:
-                    continue
-                links = need_data.get("links", [])
-                if isinstance(links, str):
-                    links = [links] if links else []
-                if current_id in links:
-                    all_descendants.append({
-                        "id": need_id,
-                        "tier": get_tier_from_id(need_id),
-                        "title": need_data.get("title", ""),
-                        "parent": current_id
-                    })
-                    queue.append(need_id)
-
+        all_descendants = _indirect_descendants(target_id, direct_ids, needs, graph)
     result = {
         "success": True,
         "target_id": target_id,
@@ -213,11 +235,7 @@ def main() -> int:
     parser = argparse.ArgumentParser(
         description="Find all DDR tags that cite a given parent tag."
     )
-    parser.add_argument(
-        "--id",
-        required=True,
-        help="Tag ID to find citations for (e.g., BRD-001)"
-    )
+    add_batch_argument(parser)
     parser.add_argument(
         "--needs-json",
         required=False,
@@ -229,17 +247,29 @@ def main() -> int:
         action="store_true",
         help="Include indirect descendants (transitive closure)"
     )
+    parser.add_argument(
+        "--use-index",
+        action="store_true",
+        help="Answer from the SQLite needs index instead of loading all needs"
+    )
 
     args = parser.parse_args()
 
     try:
         needs_path = Path(args.needs_json)
-        needs = load_needs(needs_path)
+        needs, graph = load_needs_graph(needs_path, args.use_index)
+
+        if is_batch(args):
+            def handle(id: str, recursive: bool = False) -> dict:
+                return find_tags_citing(id, needs, recursive=recursive, graph=graph)
+            requests = iter_requests(args, defaults={"recursive": args.recursive})
+            return run_batch(requests, handle, allowed={"id", "recursive"})
 
         result = find_tags_citing(
-            target_id=args.id,
+            target_id=args.id[0],
             needs=needs,
-            recursive=args.recursive
+            recursive=args.recursive,
+            graph=graph
         )
 
         print(json.dumps(result, indent=2))
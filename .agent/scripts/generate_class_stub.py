@@ -13,6 +13,7 @@ Architect       : Antigravity IDE
 Usage
 -----
     python generate_class_stub.py --tdd-id TDD-1 --needs-json docs/_build/json/needs.json
+    python generate_class_stub.py --tdd-id TDD-1 --tdd-id TDD-2      # NDJSON
 
 Exit Codes
 ----------
@@ -20,15 +21,11 @@ Exit Codes
 1 : Error
 """
 import argparse
-import json
 import sys
 from pathlib import Path
 
-
-def load_needs(path: Path) -> dict:
-    with open(path, "r", encoding="utf-8") as f:
-        data = json.load(f)
-    return data.get("versions", {}).get("0.1", {}).get("needs", {})
+from batch_io import add_batch_argument, is_batch, iter_requests, run_batch
+from needs_store import load_records
 
 
 TEMPLATE = '''class {class_name}:
@@ -44,28 +41,65 @@ TEMPLATE = '''class {class_name}:
 '''
 
 
+def generate_class_stub(tdd_id: str, needs: dict) -> dict:
+    """
+    Render the class stub for a TDD tag.
+
+    Parameters
+    ----------
+    tdd_id : str
+        TDD tag ID (e.g. ``TDD-1``).
+    needs : dict
+        Loaded needs.
+
+    Returns
+    -------
+    dict
+        ``tdd_id``, ``class_name`` and the stub ``code``.
+
+    Raises
+    ------
+    KeyError
+        If the tag does not exist.
+    """
+    if tdd_id not in needs:
+        raise KeyError(f"{tdd_id} not found")
+
+    tdd = needs[tdd_id]
+    title = tdd.get("title", tdd_id)
+    class_name = "".join(w.capitalize() for w in title.split()[:3])
+    desc = tdd.get("content", title)[:100]
+
+    code = TEMPLATE.format(class_name=class_name, description=desc, tdd_id=tdd_id)
+    return {"success": True, "tdd_id": tdd_id, "class_name": class_name, "code": code}
+
+
 def main() -> int:
     parser = argparse.ArgumentParser()
-    parser.add_argument("--tdd-id", required=True)
+    add_batch_argument(parser, key="tdd_id")
     parser.add_argument("--needs-json", default="docs/_build/json/needs.json")
     parser.add_argument("--output")
     args = parser.parse_args()
+    batch = is_batch(args, key="tdd_id")
+    if batch and args.output:
+        parser.error("--output applies to a single --tdd-id")
 
     path = Path(args.needs_json)
     if not path.exists():
         print(f"Error: {path} not found", file=sys.stderr); return 1
 
     try:
-        needs = load_needs(path)
-        if args.tdd_id not in needs:
-            print(f"Error: {args.tdd_id} not found", file=sys.stderr); return 1
+        needs = load_records(path)
+        if batch:
+            return run_batch(iter_requests(args, key="tdd_id"),
+                             lambda tdd_id: generate_class_stub(tdd_id, needs),
+                             allowed={"tdd_id"})
 
-        tdd = needs[args.tdd_id]
-        title = tdd.get("title", args.tdd_id)
-        class_name = "".join(w.capitalize() for w in title.split()[:3])
-        desc = tdd.get("content", title)[:100]
+        try:
+            code = generate_class_stub(args.tdd_id[0], needs)["code"]
+        except KeyError as e:
+            print(f"Error: {e.args[0]}", file=sys.stderr); return 1
 
-        code = TEMPLATE.format(class_name=class_name, description=desc, tdd_id=args.tdd_id)
         if args.output: Path(args.output).write_text(code)
         else: print(code)
         return 0
@@ -64,9 +64,11 @@ See Also
 - Sphinx-Needs JSON schema: https://sphinx-needs.readthedocs.io/en/latest/builders.html
 - docs/conf.py : Sphinx configuration with `needs_build_json = True`
 """
-import json
 import os
 import sys
+from pathlib import Path
+
+from needs_store import iter_needs
 
 
 def generate_context(needs_json_path, output_md_path):
@@ -104,14 +106,12 @@ def generate_context(needs_json_path, output_md_path):
     """
     print(f'Loading {needs_json_path}...')
     try:
-        with open(needs_json_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        # Stream projected records; only the fields rendered below are kept.
+        needs = dict(iter_needs(Path(needs_json_path)))
     except FileNotFoundError:
         print("Error: needs.json not found. Run sphinx-build first.")
         sys.exit(1)
 
-    needs = data.get('versions', {}).get('0.1', {}).get('needs', {})
-
     # Sort by ID (Hierarchical sort: BRD < NFR < FSD etc)
     # Define Section Order
     section_order = {
@@ -12,6 +12,8 @@ Architect       : Antigravity IDE
 Usage
 -----
     python generate_traceability_report.py --needs-json docs/_build/json/needs.json
+    python generate_traceability_report.py --format json --jobs 8
+    python generate_traceability_report.py --format sarif > traceability.sarif
 
 Exit Codes
 ----------
@@ -22,8 +24,15 @@ import argparse
 import json
 import sys
 from pathlib import Path
+from typing import Any, Container, Iterable
+
+from chunked_eval import run_chunked
+from needs_store import load_records
+from violation_writer import WRITERS
 
 TIER_ORDER = ["BRD", "NFR", "FSD", "SAD", "ICD", "TDD", "ISP"]
+# Need fields need_violations reads; workers receive only these.
+LINK_FIELDS = ("links",)
 
 
 def get_tier(tag_id: str) -> str | None:
@@ -36,40 +45,69 @@ def get_tier_idx(tier: str | None) -> int:
     return TIER_ORDER.index(tier) if tier in TIER_ORDER else -1
 
 
-def load_needs(path: Path) -> dict:
-    with open(path, "r", encoding="utf-8") as f:
-        data = json.load(f)
-    return data.get("versions", {}).get("0.1", {}).get("needs", {})
-
-
-def analyze(needs: dict, severity: str = "ALL") -> dict:
+def need_violations(nid: str, ndata: Any, needs_set: Container[str]) -> list[dict]:
+    """Return the traceability violations of one need (BRDs have none)."""
+    tier = get_tier(nid)
+    links = ndata.get("links", [])
+    if tier == "BRD": return []
+
+    nviol = []
+    if not links:
+        nviol.append({"id": nid, "type": "ORPHAN", "severity": "ERROR",
+                      "message": "No parent citations"})
+
+    for pid in links:
+        ptier = get_tier(pid)
+        if pid not in needs_set:
+            nviol.append({"id": nid, "type": "MISSING_PARENT", "severity": "ERROR",
+                          "message": f"Parent '{pid}' not found"})
+        elif ptier == tier:
+            nviol.append({"id": nid, "type": "SIBLING_CITATION", "severity": "WARNING",
+                          "message": f"Same-tier citation to '{pid}'"})
+        elif ptier and tier and get_tier_idx(ptier) > get_tier_idx(tier):
+            nviol.append({"id": nid, "type": "FORWARD_REFERENCE", "severity": "ERROR",
+                          "message": f"References lower-tier '{pid}'"})
+    return nviol
+
+
+def _check_chunk(chunk: list[tuple[str, Any]], cited: set[str]) -> list[list[dict]]:
+    """Return the violations of each need of a ``chunked_eval`` chunk."""
+    return [need_violations(nid, ndata, cited) for nid, ndata in chunk]
+
+
+def _cited(chunk: list[tuple[str, Any]], needs: dict) -> tuple[set[str]]:
+    # The chunk's citations that resolve: all need_violations asks of the tag set.
+    cited = set()
+    for _, ndata in chunk:
+        try:
+            cited.update(pid for pid in ndata.get("links", []) if pid in needs)
+        except TypeError:
+            pass  # raised again by need_violations in the worker
+    return (cited,)
+
+
+def analyze(needs: dict, severity: str = "ALL", jobs: int = 1) -> dict:
+    """
+    Build the traceability report of ``needs``.
+
+    With ``jobs`` > 1 the needs are checked in chunks across worker
+    processes, each receiving its needs' links and which cited tags exist;
+    the report is unchanged.
+    """
+    if jobs > 1:
+        per_need = run_chunked(_check_chunk, list(needs.items()), LINK_FIELDS, jobs,
+                               context=lambda chunk: _cited(chunk, needs))
+        return summarize(needs, per_need, severity)
+    return summarize(needs, (need_violations(nid, ndata, needs) for nid, ndata in needs.items()),
+                     severity)
+
+
+def summarize(needs: dict, per_need: Iterable[list[dict]], severity: str = "ALL") -> dict:
+    """Assemble the report from per-need violation lists given in needs order."""
     violations, valid = [], []
-    needs_set = set(needs.keys())
-
-    for nid, ndata in needs.items():
-        tier = get_tier(nid)
-        links = ndata.get("links", [])
-        if tier == "BRD": continue
-
-        nviol = []
-        if not links:
-            nviol.append({"id": nid, "type": "ORPHAN", "severity": "ERROR",
-                          "message": "No parent citations"})
-
-        for pid in links:
-            ptier = get_tier(pid)
-            if pid not in needs_set:
-                nviol.append({"id": nid, "type": "MISSING_PARENT", "severity": "ERROR",
-                              "message": f"Parent '{pid}' not found"})
-            elif ptier == tier:
-                nviol.append({"id": nid, "type": "SIBLING_CITATION", "severity": "WARNING",
-                              "message": f"Same-tier citation to '{pid}'"})
-            elif ptier and tier and get_tier_idx(ptier) > get_tier_idx(tier):
-                nviol.append({"id": nid, "type": "FORWARD_REFERENCE", "severity": "ERROR",
-                              "message": f"References lower-tier '{pid}'"})
-
+    for nid, nviol in zip(needs, per_need):
         if nviol: violations.extend(nviol)
-        else: valid.append(nid)
+        elif get_tier(nid) != "BRD": valid.append(nid)
 
     if severity != "ALL":
         violations = [v for v in violations if v["severity"] == severity]
@@ -90,7 +128,7 @@ def format_out(result: dict, fmt: str) -> str:
         for t, c in result["summary"]["by_type"].items(): lines.append(f"  {t}: {c}")
         return "\n".join(lines)
     lines = [f"# Traceability Report", f"- Violations: {result['summary']['violations']}"]
-    for v in result["violations"][:20]:
+    for v in result["violations"]:
         lines.append(f"- `{v['id']}` [{v['severity']}] {v['type']}")
     return "\n".join(lines)
 
@@ -98,8 +136,12 @@ def format_out(result: dict, fmt: str) -> str:
 def main() -> int:
     parser = argparse.ArgumentParser()
     parser.add_argument("--needs-json", default="docs/_build/json/needs.json")
-    parser.add_argument("--format", choices=["json", "markdown", "summary"], default="summary")
+    parser.add_argument("--format", choices=["json", "markdown", "summary", *WRITERS],
+                        default="summary",
+                        help="Report format; ndjson, sarif and junit stream the violations")
     parser.add_argument("--severity", choices=["ERROR", "WARNING", "ALL"], default="ALL")
+    parser.add_argument("--jobs", type=int, default=1,
+                        help="Worker processes checking chunks of needs (default: 1)")
     args = parser.parse_args()
 
     path = Path(args.needs_json)
@@ -107,7 +149,12 @@ def main() -> int:
         print(f"Error: {path} not found", file=sys.stderr); return 1
 
     try:
-        print(format_out(analyze(load_needs(path), args.severity), args.format))
+        if args.format in WRITERS:
+            from audit_engine import stream_check  # audit_engine imports this module
+            keep = None if args.severity == "ALL" else (lambda f: f.severity == args.severity)
+            return stream_check(load_records(path), "traceability_report", args.format,
+                                sys.stdout, keep)
+        print(format_out(analyze(load_records(path), args.severity, args.jobs), args.format))
         return 0
     except Exception as e:
         print(f"Error: {e}", file=sys.stderr); return 1
@@ -0,0 +1,658 @@
+"""
+Graph Query Tool.
+
+Small query language over the DDR traceability graph, so that compound
+questions ("ISP tags below BRD-5 that are not deprecated") are answered in
+one call instead of a chain of tool runs and Python loops.
+
+A query combines set expressions with ``&`` (and), ``|`` (or), ``!`` (not)
+and parentheses:
+
+    descendants(BRD-5) & tier=ISP & status!=deprecated
+    orphans() | sibling_citations()
+    children(FSD-1) & !title~"wake word"
+
+Every tag set is a Python int used as a bitset over the citation graph's
+node numbering, so intersections and unions cost one big-int operation.
+The planner answers each term from the cheapest structure that covers it
+rather than scanning the needs:
+
+=====================  ===============  ====================================
+Term                   Source           Notes
+=====================  ===============  ====================================
+descendants(ID)        reachability     Precomputed closure (reachability.py)
+ancestors(ID)          reachability
+descendants(ID, N)     reverse-index    BFS over the graph, N levels
+children(ID)           reverse-index    Direct citers (CSR adjacency)
+parents(ID)            reverse-index    Direct ``:links:``
+orphans() etc.         violation-index  Precomputed per needs.json
+field=value            field-index      tier, type, status, docname,
+field!=value                            section, id
+search("text")         fts              SQLite FTS5 index (needs_index.py)
+field~"text"           scan             Case-insensitive substring
+all()                  field-index      Every tag
+=====================  ===============  ====================================
+
+Within an ``&``, index-backed terms are evaluated smallest estimate first
+and the intersection stops as soon as it is empty; scan terms only filter
+the surviving candidates. Each index is loaded only if a term needs it.
+
+Meta
+----
+Tool Definition : .agent/tools/trace_query.md
+Knowledge Source: .agent/knowledge/sources/protocols/impact_analysis.md
+                  .agent/knowledge/sources/protocols/traceability_chain.md
+Architect       : Antigravity IDE
+
+Usage
+-----
+    python graph_query.py "descendants(BRD-5) & tier=ISP"
+    python graph_query.py "orphans() | sibling_citations()" --explain
+
+Exit Codes
+----------
+0 : Success (JSON result printed to stdout)
+1 : Error (Details printed to stderr)
+
+Notes
+-----
+- Results are defined tags in needs.json order; unresolved link targets
+  never match.
+- Named sets: ``orphans()`` (non-BRD tags without ``:links:``),
+  ``missing_parents()`` (cites a tag that does not exist),
+  ``sibling_citations()`` (cites a tag of its own tier) and
+  ``forward_references()`` (cites a lower tier).
+- Tags without a ``:status:`` never match ``status=...`` and always match
+  ``status!=...``.
+"""
+import argparse
+import json
+import re
+import sys
+from pathlib import Path
+from typing import Any
+
+import needs_store
+from citation_graph import CitationGraph, load_graph
+from needs_store import TIER_ORDER, get_tier
+from reachability import _bits_to_indices, load_reachability
+
+# Snapshot kind for needs_store.cached; bump the suffix if the payload changes.
+SNAPSHOT_KIND: str = "query-index-v1"
+
+# Query field -> Need attribute. Fields in INDEXED_FIELDS are answered from
+# the field index for = and !=; every field can be scanned.
+FIELDS: dict[str, str] = {
+    "id": "id", "tier": "tier", "type": "type", "status": "status",
+    "docname": "docname", "section": "section_name",
+    "title": "title", "content": "content",
+}
+INDEXED_FIELDS: frozenset[str] = frozenset({"id", "tier", "type", "status", "docname", "section"})
+
+NAMED_SETS: tuple[str, ...] = ("orphans", "missing_parents", "sibling_citations",
+                               "forward_references")
+
+# Function name -> (min args, max args).
+FUNCTIONS: dict[str, tuple[int, int]] = {
+    "all": (0, 0), "descendants": (1, 2), "ancestors": (1, 2),
+    "children": (1, 1), "parents": (1, 1), "search": (1, 1),
+    **{name: (0, 0) for name in NAMED_SETS},
+}
+
+_TOKEN = re.compile(r'\s*(?:(?P<op>!=|[()&|!=~,])|"(?P<str>(?:[^"\\]|\\.)*)"'
+                    r'|(?P<word>[^\s()&|!=~,"]+))')
+
+
+# ---------------------------------------------------------------- parsing
+
+def tokenize(text: str) -> list[tuple[str, str]]:
+    """
+    Split a query into ``(kind, value)`` tokens.
+
+    Raises
+    ------
+    ValueError
+        On an unterminated string or a stray character.
+    """
+    tokens, pos, end = [], 0, len(text.rstrip())
+    while pos < end:
+        m = _TOKEN.match(text, pos)
+        if m is None or m.end() == pos:
+            raise ValueError(f"Unexpected character at {pos}: {text[pos:pos + 10]!r}")
+        if m.group("op") is not None:
+            tokens.append(("op", m.group("op")))
+        elif m.group("str") is not None:
+            tokens.append(("str", re.sub(r"\\(.)", r"\1", m.group("str"))))
+        else:
+            tokens.append(("word", m.group("word")))
+        pos = m.end()
+    return tokens
+
+
+class _Parser:
+    # expr := term ("|" term)* ; term := factor ("&" factor)*
+    # factor := "!" factor | "(" expr ")" | NAME "(" args ")" | FIELD OP VALUE
+
+    def __init__(self, tokens: list[tuple[str, str]]):
+        self.tokens = tokens
+        self.pos = 0
+
+    def peek(self) -> tuple[str, str] | None:
+        return self.tokens[self.pos] if self.pos < len(self.tokens) else None
+
+    def take(self, value: str | None = None) -> tuple[str, str]:
+        token = self.peek()
+        if token is None:
+            raise ValueError("Unexpected end of query" + (f", expected {value!r}" if value else ""))
+        if value is not None and token != ("op", value):
+            raise ValueError(f"Expected {value!r}, got {token[1]!r}")
+        self.pos += 1
+        return token
+
+    def expr(self) -> tuple:
+        terms = [self.term()]
+        while self.peek() == ("op", "|"):
+            self.take()
+            terms.append(self.term())
+        return terms[0] if len(terms) == 1 else ("or", terms)
+
+    def term(self) -> tuple:
+        factors = [self.factor()]
+        while self.peek() == ("op", "&"):
+            self.take()
+            factors.append(self.factor())
+        return factors[0] if len(factors) == 1 else ("and", factors)
+
+    def factor(self) -> tuple:
+        kind, value = self.take()
+        if (kind, value) == ("op", "!"):
+            return ("not", self.factor())
+        if (kind, value) == ("op", "("):
+            node = self.expr()
+            self.take(")")
+            return node
+        if kind != "word":
+            raise ValueError(f"Unexpected {value!r}")
+        if self.peek() == ("op", "("):
+            return self.call(value)
+        return self.compare(value)
+
+    def call(self, name: str) -> tuple:
+        if name not in FUNCTIONS:
+            raise ValueError(f"Unknown function: {name}()")
+        self.take("(")
+        args = []
+        if self.peek() != ("op", ")"):
+            args.append(self.value())
+            while self.peek() == ("op", ","):
+                self.take()
+                args.append(self.value())
+        self.take(")")
+        low, high = FUNCTIONS[name]
+        if not low <= len(args) <= high:
+            raise ValueError(f"{name}() takes {low}-{high} arguments, got {len(args)}"
+                             if low != high else
+                             f"{name}() takes {low} arguments, got {len(args)}")
+        if name in ("descendants", "ancestors") and len(args) == 2:
+            if not args[1].isdigit():
+                raise ValueError(f"{name}() depth must be a non-negative integer")
+            args[1] = int(args[1])
+        return ("call", name, tuple(args))
+
+    def compare(self, field: str) -> tuple:
+        if field not in FIELDS:
+            raise ValueError(f"Unknown field: {field}")
+        kind, op = self.take()
+        if kind != "op" or op not in ("=", "!=", "~"):
+            raise ValueError(f"Expected =, != or ~ after {field}, got {op!r}")
+        value = self.value()
+        if field == "tier":
+            value = value.upper()
+        return ("cmp", field, op, value)
+
+    def value(self) -> str:
+        kind, value = self.take()
+        if kind == "op":
+            raise ValueError(f"Expected a value, got {value!r}")
+        return value
+
+
+def parse(text: str) -> tuple:
+    """
+    Parse a query into its syntax tree.
+
+    Parameters
+    ----------
+    text : str
+        Query text.
+
+    Returns
+    -------
+    tuple
+        ``("or", [...])``, ``("and", [...])``, ``("not", node)``,
+        ``("call", name, args)`` or ``("cmp", field, op, value)``.
+
+    Raises
+    ------
+    ValueError
+        If the query is malformed.
+    """
+    parser = _Parser(tokenize(text))
+    if parser.peek() is None:
+        raise ValueError("Empty query")
+    node = parser.expr()
+    if parser.peek() is not None:
+        raise ValueError(f"Unexpected {parser.peek()[1]!r}")
+    return node
+
+
+def _quote(value: Any) -> str:
+    value = str(value)
+    if re.fullmatch(r'[^\s()&|!=~,"]+', value):
+        return value
+    return '"' + value.replace("\\", "\\\\").replace('"', '\\"') + '"'
+
+
+def to_text(node: tuple) -> str:
+    """Render a syntax tree back to query text."""
+    op = node[0]
+    if op == "cmp":
+        return f"{node[1]}{node[2]}{_quote(node[3])}"
+    if op == "call":
+        return f"{node[1]}({', '.join(_quote(a) for a in node[2])})"
+    if op == "not":
+        inner = to_text(node[1])
+        return f"!({inner})" if node[1][0] in ("and", "or") else f"!{inner}"
+    joiner = " & " if op == "and" else " | "
+    return joiner.join(f"({to_text(c)})" if c[0] == "or" and op == "and" else to_text(c)
+                       for c in node[1])
+
+
+# ---------------------------------------------------------------- indexes
+
+def build_query_index(needs: dict, graph: CitationGraph) -> dict:
+    """
+    Build the field and violation bitsets answered without a scan.
+
+    Parameters
+    ----------
+    needs : dict
+        Dictionary of need_id -> need data.
+    graph : CitationGraph
+        Citation graph for ``needs``.
+
+    Returns
+    -------
+    dict
+        ``fields`` (field -> value -> bitset) and ``named`` (set name -> bitset).
+    """
+    fields: dict[str, dict[str, int]] = {f: {} for f in INDEXED_FIELDS}
+    named = dict.fromkeys(NAMED_SETS, 0)
+    rank = {tier: r for r, tier in enumerate(TIER_ORDER)}
+    ids, p_off, p_idx = graph.ids, graph.parent_offsets, graph.parent_indices
+    tiers = [get_tier(ids[i]) for i in range(len(ids))]
+
+    for i in range(graph.need_count):
+        need, bit, tier = needs[ids[i]], 1 << i, tiers[i]
+        values = {"id": ids[i], "tier": tier, "type": need.get("type"),
+                  "status": need.get("status"), "docname": need.get("docname"),
+                  "section": need.get("section_name")}
+        for field, value in values.items():
+            if value:
+                fields[field][value] = fields[field].get(value, 0) | bit
+
+        start, stop = p_off[i], p_off[i + 1]
+        if start == stop and tier != "BRD":
+            named["orphans"] |= bit
+        for k in range(start, stop):
+            p = p_idx[k]
+            if not graph.is_resolved(p):
+                named["missing_parents"] |= bit
+            if tier is not None and tiers[p] is not None:
+                if tiers[p] == tier:
+                    named["sibling_citations"] |= bit
+                elif rank[tiers[p]] > rank[tier]:
+                    named["forward_references"] |= bit
+    return {"fields": fields, "named": named}
+
+
+class QueryEngine:
+    """
+    Plans and evaluates queries for one needs.json.
+
+    Indexes are loaded on first use, so a query only pays for the
+    structures its terms need.
+
+    Parameters
+    ----------
+    needs_path : Path
+        Path to needs.json.
+    use_cache : bool
+        If False, build every index in memory and never touch snapshots.
+    """
+
+    def __init__(self, needs_path: Path, use_cache: bool = True):
+        self.needs_path = Path(needs_path)
+        self.use_cache = use_cache
+        self._graph = None
+        self._reach = None
+        self._index = None
+        self._records = None
+        self._fts = None
+
+    @property
+    def graph(self) -> CitationGraph:
+        if self._graph is None:
+            self._graph = load_graph(self.needs_path, use_cache=self.use_cache)
+        return self._graph
+
+    @property
+    def reach(self):
+        if self._reach is None:
+            self._reach = load_reachability(self.needs_path, use_cache=self.use_cache)
+        return self._reach
+
+    @property
+    def index(self) -> dict:
+        if self._index is None:
+            def build(path: Path) -> dict:
+                return build_query_index(self.records, self.graph)
+            self._index = needs_store.cached(self.needs_path, SNAPSHOT_KIND, build,
+                                             self.use_cache)
+        return self._index
+
+    @property
+    def records(self) -> dict:
+        if self._records is None:
+            self._records = needs_store.load_records(self.needs_path, self.use_cache)
+        return self._records
+
+    @property
+    def universe(self) -> int:
+        return (1 << self.graph.need_count) - 1
+
+    def close(self) -> None:
+        """Close the FTS index connection, if one was opened."""
+        if self._fts is not None:
+            self._fts.close()
+            self._fts = None
+
+    # ------------------------------------------------------------ planning
+
+    def source(self, node: tuple) -> str:
+        """Return the structure a leaf term is answered from."""
+        if node[0] == "cmp":
+            return "field-index" if node[1] in INDEXED_FIELDS and node[2] != "~" else "scan"
+        name, args = node[1], node[2]
+        if name in ("descendants", "ancestors"):
+            return "reachability" if len(args) == 1 else "reverse-index"
+        if name in ("children", "parents"):
+            return "reverse-index"
+        if name == "search":
+            return "fts"
+        if name in NAMED_SETS:
+            return "violation-index"
+        return "field-index"
+
+    def is_scan(self, node: tuple) -> bool:
+        """Return True if a node can only be answered by scanning records."""
+        if node[0] == "not":
+            return self.is_scan(node[1])
+        if node[0] in ("and", "or"):
+            return all(self.is_scan(c) for c in node[1])
+        return self.source(node) == "scan"
+
+    def estimate(self, node: tuple) -> int:
+        """Estimate the number of tags a node matches, without evaluating it."""
+        op, total = node[0], self.graph.need_count
+        if op == "and":
+            return min(self.estimate(c) for c in node[1])
+        if op == "or":
+            return min(total, sum(self.estimate(c) for c in node[1]))
+        if op == "not":
+            return total - self.estimate(node[1])
+        source = self.source(node)
+        if source in ("scan", "fts"):
+            return total
+        if op == "cmp":
+            bits = self.index["fields"][node[1]].get(node[3], 0).bit_count()
+            return bits if node[2] == "=" else total - bits
+        name, args = node[1], node[2]
+        if name in NAMED_SETS:
+            return self.index["named"][name].bit_count()
+        if name == "all":
+            return total
+        i = self._node(args[0])
+        if source == "reachability":
+            bits = self.reach.descendant_bits if name == "descendants" else self.reach.ancestor_bits
+            return bits[i].bit_count()
+        # Direct neighbours: exact for children/parents, a lower bound for
+        # depth-limited walks.
+        graph = self.graph
+        down = name in ("children", "descendants")
+        return len(graph.children(i) if down else graph.parents(i))
+
+    def plan(self, node: tuple) -> dict:
+        """
+        Describe how a query will be evaluated.
+
+        Parameters
+        ----------
+        node : tuple
+            Syntax tree from ``parse``.
+
+        Returns
+        -------
+        dict
+            Nested steps in evaluation order, each with ``term``, ``source``
+            (leaves) or ``op`` and ``steps`` (combinations) and ``estimate``.
+        """
+        op = node[0]
+        if op in ("cmp", "call"):
+            return {"term": to_text(node), "source": self.source(node),
+                    "estimate": self.estimate(node)}
+        if op == "not":
+            return {"op": "not", "estimate": self.estimate(node),
+                    "steps": [self.plan(node[1])]}
+        children = self._order(node[1]) if op == "and" else node[1]
+        return {"op": op, "estimate": self.estimate(node),
+                "steps": [self.plan(c) for c in children]}
+
+    def _order(self, children: list[tuple]) -> list[tuple]:
+        # Index-backed terms smallest first, then scan filters.
+        indexed = [c for c in children if not self.is_scan(c)]
+        scans = [c for c in children if self.is_scan(c)]
+        return sorted(indexed, key=self.estimate) + scans
+
+    # ---------------------------------------------------------- evaluation
+
+    def _node(self, tag_id: str) -> int:
+        i = self.graph.index.get(tag_id)
+        if i is None:
+            raise KeyError(f"Unknown tag: {tag_id}")
+        return i
+
+    def evaluate(self, node: tuple, candidates: int | None = None) -> int:
+        """
+        Evaluate a syntax tree to a bitset of matching defined tags.
+
+        Parameters
+        ----------
+        node : tuple
+            Syntax tree from ``parse``.
+        candidates : int, optional
+            Bitset the result is restricted to; scan terms only visit these.
+
+        Returns
+        -------
+        int
+            Bitset over the citation graph's node numbering.
+
+        Raises
+        ------
+        KeyError
+            If a function names a tag that is not in the graph.
+        """
+        scope = self.universe if candidates is None else candidates
+        op = node[0]
+        if op == "and":
+            for child in self._order(node[1]):
+                if not scope:
+                    break
+                scope &= self.evaluate(child, scope)
+            return scope
+        if op == "or":
+            bits = 0
+            for child in node[1]:
+                bits |= self.evaluate(child, scope & ~bits)
+            return bits
+        if op == "not":
+            return scope & ~self.evaluate(node[1], scope)
+        if self.source(node) == "scan":
+            return self._scan(node, scope)
+        return scope & self._lookup(node)
+
+    def _lookup(self, node: tuple) -> int:
+        if node[0] == "cmp":
+            bits = self.index["fields"][node[1]].get(node[3], 0)
+            return bits if node[2] == "=" else self.universe & ~bits
+        name, args = node[1], node[2]
+        if name == "all":
+            return self.universe
+        if name in NAMED_SETS:
+            return self.index["named"][name]
+        if name == "search":
+            return self._search(args[0])
+        i = self._node(args[0])
+        if name in ("descendants", "ancestors") and len(args) == 1:
+            bits = self.reach.descendant_bits if name == "descendants" else self.reach.ancestor_bits
+            return bits[i]
+        graph = self.graph
+        down = name in ("children", "descendants")
+        if name in ("children", "parents"):
+            return sum(1 << j for j in set(graph.children(i) if down else graph.parents(i)))
+        start = graph.children(i) if down else graph.parents(i)
+        if args[1] == 0:
+            return 0
+        found = graph.traverse([graph.ids[j] for j in start], "down" if down else "up",
+                               args[1] - 1)
+        return sum(1 << j for j in set(found))
+
+    def _scan(self, node: tuple, scope: int) -> int:
+        _, field, op, value = node
+        attr, ids, records = FIELDS[field], self.graph.ids, self.records
+        needle = value.lower()
+        bits = 0
+        for i in _bits_to_indices(scope):
+            if field == "tier":
+                have = get_tier(ids[i])
+            else:
+                have = records[ids[i]].get(attr)
+            if op == "~":
+                hit = have is not None and needle in str(have).lower()
+            else:
+                hit = (have == value) == (op == "=")
+            if hit:
+                bits |= 1 << i
+        return bits
+
+    def _search(self, text: str) -> int:
+        if self._fts is None:
+            from needs_index import open_index  # sqlite3 only when asked for
+            self._fts = open_index(self.needs_path)
+        index = self.graph.index
+        matches = self._fts.search(text, limit=self.graph.need_count)
+        return sum(1 << index[m["id"]] for m in matches if m["id"] in index)
+
+    def ids(self, bits: int) -> list[str]:
+        """Return the tag IDs of a result bitset in needs.json order."""
+        ids = self.graph.ids
+        return [ids[i] for i in _bits_to_indices(bits)]
+
+    def query(self, text: str) -> list[str]:
+        """
+        Parse and evaluate a query.
+
+        Parameters
+        ----------
+        text : str
+            Query text.
+
+        Returns
+        -------
+        list[str]
+            Matching tag IDs in needs.json order.
+
+        Raises
+        ------
+        ValueError
+            If the query is malformed.
+        KeyError
+            If a function names a tag that is not in the graph.
+        """
+        return self.ids(self.evaluate(parse(text)))
+
+
+def main() -> int:
+    """
+    CLI entry point for graph_query.
+
+    Returns
+    -------
+    int
+        Exit code (0=success, 1=error).
+    """
+    parser = argparse.ArgumentParser(
+        description="Answer set queries over the DDR traceability graph."
+    )
+    parser.add_argument(
+        "query",
+        help='Query, e.g. "descendants(BRD-5) & tier=ISP & status!=deprecated"'
+    )
+    parser.add_argument(
+        "--explain",
+        action="store_true",
+        help="Include the evaluation plan in the output"
+    )
+    parser.add_argument(
+        "--needs-json",
+        default="docs/_build/json/needs.json",
+        help="Path to needs.json file"
+    )
+
+    args = parser.parse_args()
+
+    try:
+        tree = parse(args.query)
+    except ValueError as e:
+        print(f"Error: Invalid query: {e}", file=sys.stderr)
+        return 1
+
+    engine = QueryEngine(Path(args.needs_json))
+    try:
+        result: dict[str, Any] = {"success": True, "query": to_text(tree)}
+        if args.explain:
+            result["plan"] = engine.plan(tree)
+        ids = engine.ids(engine.evaluate(tree))
+        result.update(count=len(ids), ids=ids)
+        print(json.dumps(result, indent=2))
+        return 0
+
+    except KeyError as e:
+        print(f"Error: {e.args[0]}", file=sys.stderr)
+        return 1
+    except FileNotFoundError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    except ValueError as e:
+        print(f"Error parsing needs.json: {e}", file=sys.stderr)
+        return 1
+    except Exception as e:
+        print(f"Error evaluating query: {e}", file=sys.stderr)
+        return 1
+    finally:
+        engine.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
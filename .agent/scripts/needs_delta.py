@@ -0,0 +1,497 @@
+"""
+Needs Delta Tool.
+
+Keeps the citation adjacency, reachability sets and per-need violation
+lists of a needs.json export up to date by applying the difference to the
+previous export instead of rebuilding them.
+
+Each need is fingerprinted by a content hash. On every run the current
+export is diffed against the fingerprints of the previous one (kept in a
+state snapshot) into added, removed and changed needs, and only the
+derived data those needs can influence is recomputed:
+
+- adjacency     : parent/child lists of the touched needs and of the
+                  parents they gained or lost
+- reachability  : descendant sets of everything upstream of a changed
+                  citation and ancestor sets of everything downstream of it
+- violations    : anti-pattern (``detect_anti_patterns``) and traceability
+                  (``generate_traceability_report``) results of the touched
+                  needs and of the needs citing an added or removed one
+
+The report lists the derived results each step invalidated, so an
+edit-audit loop costs time proportional to the edit rather than to the
+project.
+
+Meta
+----
+Tool Definition : .agent/tools/trace_needs_delta.md
+Knowledge Source: .agent/knowledge/sources/protocols/impact_analysis.md
+                  .agent/knowledge/sources/protocols/reconciliation_dirty_flag.md
+Architect       : Antigravity IDE
+
+Usage
+-----
+    python needs_delta.py --needs-json docs/_build/json/needs.json
+    python needs_delta.py --rebuild
+
+    from needs_delta import DeltaState
+
+    state = DeltaState.from_needs(old_needs)
+    report = state.apply(new_needs)
+
+Exit Codes
+----------
+0 : Success (JSON report printed to stdout)
+1 : Error (Details printed to stderr)
+
+Notes
+-----
+- The first run, or ``--rebuild``, builds the state from scratch and
+  reports ``full_rebuild: true``.
+- ``links_back`` and ``lineno`` are not part of the fingerprint: they
+  change whenever a neighbouring need is edited or moved, but nothing
+  derived here depends on them.
+- A changed citation inside a cycle falls back to recomputing all
+  reachability sets; cycles are violations and should be rare.
+- Node slots are never reused, so heavy churn slowly widens the bitsets
+  until the next ``--rebuild``.
+"""
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Iterable, NamedTuple
+
+import needs_store
+from citation_graph import CitationGraph
+from detect_anti_patterns import PATTERNS
+from detect_anti_patterns import scan_need, summarize as summarize_anti_patterns
+from generate_traceability_report import need_violations, summarize as summarize_traceability
+from needs_store import need_hash
+from reachability import Reachability, _bits_to_indices
+
+STATE_KIND: str = "delta-state-v1"
+
+ALL_PATTERNS: tuple[str, ...] = tuple(PATTERNS)
+
+
+class NeedsDelta(NamedTuple):
+    """Need IDs added, removed and changed between two exports."""
+
+    added: list[str]
+    removed: list[str]
+    changed: list[str]
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.removed or self.changed)
+
+
+def diff_needs(old_hashes: dict[str, str], new_hashes: dict[str, str]) -> NeedsDelta:
+    """
+    Compare two fingerprint maps.
+
+    Parameters
+    ----------
+    old_hashes, new_hashes : dict[str, str]
+        Need ID -> ``need_hash`` for the previous and current export.
+
+    Returns
+    -------
+    NeedsDelta
+        IDs in current-export order (removed IDs in previous-export order).
+    """
+    added = [n for n in new_hashes if n not in old_hashes]
+    removed = [n for n in old_hashes if n not in new_hashes]
+    changed = [n for n, h in new_hashes.items() if n in old_hashes and old_hashes[n] != h]
+    return NeedsDelta(added, removed, changed)
+
+
+def _dedupe(links: Iterable[str]) -> list[str]:
+    if isinstance(links, str):
+        links = [links] if links else []
+    return list(dict.fromkeys(links))
+
+
+class DeltaState:
+    """
+    Derived indexes of one export, patched forward by ``apply``.
+
+    Attributes
+    ----------
+    order : list[str]
+        Need IDs in export order.
+    hashes : dict[str, str]
+        Need ID -> content fingerprint.
+    parents : dict[str, list[str]]
+        Need ID -> cited IDs (deduplicated ``:links:``).
+    children : dict[str, list[str]]
+        Node ID -> citing need IDs; includes unresolved link targets.
+    slots : dict[str, int]
+        Node ID -> bit position in the reachability sets.
+    ids : list[str]
+        Bit position -> node ID.
+    descendant_bits, ancestor_bits : list[int]
+        Per slot, the transitive citers / cited nodes as bitsets.
+    anti_patterns, traceability : dict[str, list[dict]]
+        Need ID -> violations found by each checker.
+    """
+
+    __slots__ = ("order", "hashes", "parents", "children", "slots", "ids",
+                 "descendant_bits", "ancestor_bits", "anti_patterns", "traceability")
+
+    def __init__(self, state: dict):
+        for name in self.__slots__:
+            setattr(self, name, state[name])
+
+    def to_state(self) -> dict:
+        """Return the plain-data state stored in the snapshot."""
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    @classmethod
+    def from_needs(cls, needs: dict) -> "DeltaState":
+        """
+        Build every index from scratch.
+
+        Parameters
+        ----------
+        needs : dict
+            Dictionary of need_id -> need data.
+
+        Returns
+        -------
+        DeltaState
+            Fresh state for ``needs``.
+        """
+        graph = CitationGraph.from_needs(needs)
+        reach = Reachability.from_graph(graph)
+        ids = list(graph.ids)
+        return cls({
+            "order": list(needs),
+            "hashes": {nid: need_hash(ndata) for nid, ndata in needs.items()},
+            "parents": {nid: graph.parents_of(nid) for nid in needs},
+            "children": {tag_id: graph.children_of(tag_id) for tag_id in ids},
+            "slots": {tag_id: i for i, tag_id in enumerate(ids)},
+            "ids": ids,
+            "descendant_bits": reach.descendant_bits,
+            "ancestor_bits": reach.ancestor_bits,
+            "anti_patterns": {nid: scan_need(nid, ndata, ALL_PATTERNS)
+                              for nid, ndata in needs.items()},
+            "traceability": {nid: need_violations(nid, ndata, needs)
+                             for nid, ndata in needs.items()},
+        })
+
+    def _slot(self, tag_id: str) -> int:
+        slot = self.slots.get(tag_id)
+        if slot is None:
+            slot = self.slots[tag_id] = len(self.ids)
+            self.ids.append(tag_id)
+            self.descendant_bits.append(0)
+            self.ancestor_bits.append(0)
+        return slot
+
+    def apply(self, needs: dict) -> dict:
+        """
+        Bring the state up to date with the current export.
+
+        Parameters
+        ----------
+        needs : dict
+            Dictionary of need_id -> need data for the current export.
+
+        Returns
+        -------
+        dict
+            ``delta`` (added/removed/changed IDs), ``invalidated`` (IDs
+            whose adjacency, descendants, ancestors, anti-pattern or
+            traceability results changed) and ``full_rebuild``.
+        """
+        hashes = {nid: need_hash(ndata) for nid, ndata in needs.items()}
+        delta = diff_needs(self.hashes, hashes)
+        invalidated: dict[str, set[str]] = {
+            "adjacency": set(), "descendants": set(), "ancestors": set(),
+            "anti_patterns": set(), "traceability": set(),
+        }
+        full_rebuild = False
+
+        # 1. Adjacency: re-link every need whose :links: changed.
+        cited_changed: set[str] = set()
+        citing_changed: set[str] = set()
+        old_parents: dict[str, list[str]] = {}
+        for nid in (*delta.added, *delta.changed, *delta.removed):
+            before = self.parents.get(nid, [])
+            after = _dedupe(needs[nid].get("links", [])) if nid in needs else []
+            if nid in needs:
+                self.parents[nid] = after
+            else:
+                self.parents.pop(nid, None)
+            if set(before) == set(after):
+                continue
+            old_parents[nid] = before
+            citing_changed.add(nid)
+            for pid in set(before) - set(after):
+                self.children[pid].remove(nid)
+                cited_changed.add(pid)
+            for pid in after:
+                if pid not in before:
+                    self.children.setdefault(pid, []).append(nid)
+                    self._slot(pid)
+                    cited_changed.add(pid)
+        for nid in delta.added:
+            self.children.setdefault(nid, [])
+            self._slot(nid)
+        invalidated["adjacency"] = citing_changed | cited_changed
+
+        # 2. Reachability: close upward from every cited endpoint and
+        # downward from every citing one, in the old and the new graph.
+        if citing_changed:
+            if not self._patch_reachability(cited_changed, citing_changed,
+                                            old_parents, invalidated):
+                full_rebuild = True
+                self._rebuild_reachability(invalidated)
+
+        # 3. Violations: anti-patterns only look at the need itself;
+        # traceability also depends on whether each parent exists.
+        rescan = set(delta.added) | set(delta.changed)
+        for nid in (*delta.added, *delta.removed):
+            rescan.update(c for c in self.children.get(nid, []) if c in needs)
+        for nid in delta.removed:
+            for name in ("anti_patterns", "traceability"):
+                if getattr(self, name).pop(nid, None):
+                    invalidated[name].add(nid)
+        for nid in rescan:
+            ndata = needs[nid]
+            for name, result in (("anti_patterns", scan_need(nid, ndata, ALL_PATTERNS)),
+                                 ("traceability", need_violations(nid, ndata, needs))):
+                index = getattr(self, name)
+                if index.get(nid) != result:
+                    invalidated[name].add(nid)
+                index[nid] = result
+
+        # Drop nodes that are neither needs nor cited any more; their slot
+        # stays allocated but empty.
+        for tag_id in cited_changed.union(delta.removed):
+            if tag_id not in needs and not self.children.get(tag_id):
+                self.children.pop(tag_id, None)
+                self.slots.pop(tag_id, None)
+        self.order = list(needs)
+        self.hashes = hashes
+
+        position = {nid: i for i, nid in enumerate(self.order)}
+
+        def ordered(ids: set[str]) -> list[str]:
+            return sorted(ids, key=lambda t: (position.get(t, len(position)), t))
+
+        return {
+            "delta": delta._asdict(),
+            "invalidated": {k: ordered(v) for k, v in invalidated.items()},
+            "full_rebuild": full_rebuild,
+        }
+
+    def _patch_reachability(self, cited: set[str], citing: set[str],
+                            old_parents: dict[str, list[str]],
+                            invalidated: dict[str, set[str]]) -> bool:
+        slots, ids = self.slots, self.ids
+        desc, anc = self.descendant_bits, self.ancestor_bits
+
+        # Old closures come from the stored bitsets, new ones from a walk
+        # of the updated adjacency.
+        up = 0
+        for tag_id in cited:
+            s = slots[tag_id]
+            up |= anc[s] | (1 << s)
+        down = 0
+        for tag_id in citing:
+            s = slots[tag_id]
+            down |= desc[s] | (1 << s)
+        upward = {ids[i] for i in _bits_to_indices(up)} | self._walk(cited, self.parents)
+        downward = {ids[i] for i in _bits_to_indices(down)} | self._walk(citing, self.children)
+
+        # Recompute within each region, children (resp. parents) first.
+        # Neighbours outside the region keep their old, still valid sets.
+        for region, bits, inward, outward, name in (
+                (upward, desc, self.children, self.parents, "descendants"),
+                (downward, anc, self.parents, self.children, "ancestors")):
+            order = self._region_order(region, inward)
+            if order is None:
+                return False
+            for tag_id in order:
+                s = slots[tag_id]
+                value = 0
+                for n in inward.get(tag_id, []):
+                    t = slots[n]
+                    value |= bits[t] | (1 << t)
+                if bits[s] != value:
+                    bits[s] = value
+                    invalidated[name].add(tag_id)
+        return True
+
+    @staticmethod
+    def _walk(start: Iterable[str], adjacency: dict[str, list[str]]) -> set[str]:
+        seen = set(start)
+        stack = list(seen)
+        while stack:
+            for n in adjacency.get(stack.pop(), []):
+                if n not in seen:
+                    seen.add(n)
+                    stack.append(n)
+        return seen
+
+    @staticmethod
+    def _region_order(region: set[str], inward: dict[str, list[str]]) -> list[str] | None:
+        # Kahn within the region: a node is ready once every inward
+        # neighbour inside the region is done. None if the region has a cycle.
+        pending = {t: sum(1 for n in inward.get(t, []) if n in region) for t in region}
+        outward: dict[str, list[str]] = {}
+        for t in region:
+            for n in inward.get(t, []):
+                if n in region:
+                    outward.setdefault(n, []).append(t)
+        ready = [t for t, k in pending.items() if not k]
+        order = []
+        while ready:
+            t = ready.pop()
+            order.append(t)
+            for n in outward.get(t, []):
+                pending[n] -= 1
+                if not pending[n]:
+                    ready.append(n)
+        return order if len(order) == len(region) else None
+
+    def _rebuild_reachability(self, invalidated: dict[str, set[str]]) -> None:
+        graph = CitationGraph.from_needs({nid: {"links": links}
+                                          for nid, links in self.parents.items()})
+        reach = Reachability.from_graph(graph)
+        self.ids = list(graph.ids)
+        self.slots = {tag_id: i for i, tag_id in enumerate(self.ids)}
+        self.descendant_bits = reach.descendant_bits
+        self.ancestor_bits = reach.ancestor_bits
+        self.children = {tag_id: graph.children_of(tag_id) for tag_id in self.ids}
+        # Slots were renumbered, so every set counts as replaced.
+        invalidated["descendants"].update(self.ids)
+        invalidated["ancestors"].update(self.ids)
+
+    # Queries
+
+    def descendants(self, tag_id: str) -> list[str]:
+        """Return every ID citing ``tag_id`` directly or transitively."""
+        return self._members(self.descendant_bits[self.slots[tag_id]])
+
+    def ancestors(self, tag_id: str) -> list[str]:
+        """Return every ID that ``tag_id`` cites directly or transitively."""
+        return self._members(self.ancestor_bits[self.slots[tag_id]])
+
+    def _members(self, bits: int) -> list[str]:
+        found = {self.ids[i] for i in _bits_to_indices(bits)}
+        ordered = [nid for nid in self.order if nid in found]
+        return ordered + sorted(found.difference(ordered))
+
+    def anti_pattern_report(self, patterns: list | None = None) -> dict:
+        """Return the ``detect_anti_patterns.detect`` result for the export."""
+        if not patterns:
+            return summarize_anti_patterns(self.anti_patterns[nid] for nid in self.order)
+        # Same per-need order as a detect() run restricted to ``patterns``.
+        rank = {pid: i for i, pid in reversed(list(enumerate(patterns)))}
+        return summarize_anti_patterns(
+            sorted((v for v in self.anti_patterns[nid] if v["pattern"] in rank),
+                   key=lambda v: rank[v["pattern"]])
+            for nid in self.order)
+
+    def traceability_report(self, severity: str = "ALL") -> dict:
+        """Return the ``generate_traceability_report.analyze`` result for the export."""
+        return summarize_traceability(dict.fromkeys(self.order),
+                                      (self.traceability[nid] for nid in self.order), severity)
+
+
+def update(needs_path: Path, rebuild: bool = False) -> tuple[DeltaState, dict]:
+    """
+    Apply the changes in needs.json to its saved state and save the result.
+
+    Parameters
+    ----------
+    needs_path : Path
+        Path to needs.json.
+    rebuild : bool
+        Ignore the saved state and build from scratch.
+
+    Returns
+    -------
+    tuple[DeltaState, dict]
+        Updated state and the ``apply`` report (plus ``timings_ms``).
+
+    Raises
+    ------
+    FileNotFoundError
+        If needs.json does not exist.
+    ValueError
+        If needs.json cannot be parsed.
+    """
+    needs_path = Path(needs_path)
+    start = time.perf_counter()
+    key = needs_store.source_key(needs_path)
+    needs = needs_store.load_records(needs_path)
+    loaded = time.perf_counter()
+
+    saved = None if rebuild else needs_store.load_state(needs_path, STATE_KIND)
+    unchanged = saved is not None and saved[0].get("sha256") == key["sha256"]
+    if saved is None:
+        state = DeltaState.from_needs(needs)
+        report = {"delta": NeedsDelta([], [], [])._asdict(), "invalidated": {},
+                  "full_rebuild": True}
+    else:
+        state = DeltaState(saved[1])
+        report = ({"delta": NeedsDelta([], [], [])._asdict(), "invalidated": {},
+                   "full_rebuild": False} if unchanged else state.apply(needs))
+    applied = time.perf_counter()
+
+    if not unchanged or saved[0].get("mtime_ns") != key["mtime_ns"]:
+        needs_store.save_state(needs_path, STATE_KIND, state.to_state(), key)
+    report["timings_ms"] = {"load": round((loaded - start) * 1000, 3),
+                            "apply": round((applied - loaded) * 1000, 3)}
+    return state, report
+
+
+def main() -> int:
+    """
+    CLI entry point for needs_delta.
+
+    Returns
+    -------
+    int
+        Exit code (0=success, 1=error).
+    """
+    parser = argparse.ArgumentParser(
+        description="Apply needs.json changes to the saved graph, reachability and violation indexes."
+    )
+    parser.add_argument(
+        "--needs-json",
+        default="docs/_build/json/needs.json",
+        help="Path to needs.json file"
+    )
+    parser.add_argument(
+        "--rebuild",
+        action="store_true",
+        help="Discard the saved state and rebuild every index"
+    )
+
+    args = parser.parse_args()
+
+    path = Path(args.needs_json)
+    if not path.exists():
+        print(f"Error: {path} not found", file=sys.stderr)
+        return 1
+
+    try:
+        _, report = update(path, args.rebuild)
+        print(json.dumps({"success": True, **report}, indent=2))
+        return 0
+    except ValueError as e:
+        print(f"Error parsing needs.json: {e}", file=sys.stderr)
+        return 1
+    except Exception as e:
+        print(f"Error applying needs delta: {e}", file=sys.stderr)
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,469 @@
+"""
+Needs Index Tool.
+
+Builds and queries an optional SQLite index over needs.json.
+
+The index holds the projected needs, their citation links and RST sections,
+with B-tree indexes on tier, docname and status plus an FTS5 full-text index
+over title and content. Per-tag tools (``--use-index``) answer lookups with
+indexed queries instead of loading every need, and agents get ranked
+free-text search over the whole documentation set.
+
+Meta
+----
+Tool Definition : .agent/tools/tag_search.md
+Knowledge Source: .agent/knowledge/sources/protocols/impact_analysis.md
+Architect       : Antigravity IDE
+
+Usage
+-----
+    python needs_index.py --search "wake word" --tier FSD
+    python needs_index.py --rebuild --needs-json docs/_build/json/needs.json
+
+Exit Codes
+----------
+0 : Success (JSON result printed to stdout)
+1 : Error (Details printed to stderr)
+
+Notes
+-----
+- The database lives in ``<needs dir>/.ddr_cache/needs.index.sqlite`` and is
+  rebuilt automatically when needs.json changes (same key as needs_store).
+  A touch that leaves the content unchanged only updates the stored key.
+- Rebuilds stream needs.json (``needs_store.iter_needs``) and swap the new
+  database in atomically.
+- Without FTS5 support in the local SQLite build, search falls back to
+  ``LIKE`` matching.
+"""
+import argparse
+import json
+import os
+import re
+import sqlite3
+import sys
+import tempfile
+from pathlib import Path
+from typing import Iterator, Optional
+
+from needs_store import (
+    ALL_FIELDS, Need, check_source, get_tier, iter_needs, snapshot_path, source_key
+)
+
+# Bump when the schema changes; older databases are rebuilt.
+INDEX_SCHEMA_VERSION: int = 2
+
+# Text columns stored as NULL when the need lacks the field.
+_OPTIONAL_TEXT: tuple[str, ...] = ("type", "title", "content", "docname")
+
+_SCHEMA = """
+CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE sections (
+    section_id INTEGER PRIMARY KEY,
+    docname    TEXT NOT NULL,
+    name       TEXT NOT NULL,
+    UNIQUE (docname, name)
+);
+CREATE TABLE needs (
+    seq          INTEGER PRIMARY KEY,
+    id           TEXT NOT NULL UNIQUE,
+    tier         TEXT,
+    type         TEXT,
+    title        TEXT,
+    content      TEXT,
+    docname      TEXT,
+    lineno       INTEGER,
+    section_id   INTEGER REFERENCES sections (section_id),
+    status       TEXT
+);
+CREATE TABLE links (
+    child_seq INTEGER NOT NULL REFERENCES needs (seq),
+    parent    TEXT NOT NULL,
+    position  INTEGER NOT NULL,
+    PRIMARY KEY (child_seq, parent)
+) WITHOUT ROWID;
+CREATE INDEX links_by_parent ON links (parent, child_seq);
+CREATE INDEX needs_by_tier ON needs (tier);
+CREATE INDEX needs_by_docname ON needs (docname);
+CREATE INDEX needs_by_status ON needs (status);
+"""
+
+_FTS_SCHEMA = """
+CREATE VIRTUAL TABLE needs_fts USING fts5(
+    title, content, content='needs', content_rowid='seq'
+);
+"""
+
+_NEED_COLUMNS = ("n.id, n.type, n.title, n.content, n.docname, n.lineno, "
+                 "s.name, n.status")
+
+
+def index_path(needs_path: Path) -> Path:
+    """
+    Return the index database path for a needs.json file.
+
+    Parameters
+    ----------
+    needs_path : Path
+        Path to needs.json.
+
+    Returns
+    -------
+    Path
+        SQLite database path inside the needs cache directory.
+    """
+    return snapshot_path(needs_path, "index", suffix=".sqlite")
+
+
+def _has_fts5(conn: sqlite3.Connection) -> bool:
+    try:
+        conn.execute("CREATE VIRTUAL TABLE temp._fts_probe USING fts5(x)")
+        conn.execute("DROP TABLE temp._fts_probe")
+        return True
+    except sqlite3.OperationalError:
+        return False
+
+
+def _connect_ro(db_path: Path) -> sqlite3.Connection:
+    return sqlite3.connect(f"{Path(db_path).resolve().as_uri()}?mode=ro", uri=True)
+
+
+def build_index(needs_path: Path, db_path: Path) -> Path:
+    """
+    Build the SQLite index for needs.json.
+
+    Parameters
+    ----------
+    needs_path : Path
+        Path to needs.json.
+    db_path : Path
+        Destination database; replaced atomically.
+
+    Returns
+    -------
+    Path
+        ``db_path``.
+    """
+    needs_path, db_path = Path(needs_path), Path(db_path)
+    key = source_key(needs_path)
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=db_path.parent, prefix=db_path.name, suffix=".tmp")
+    os.close(fd)
+    try:
+        conn = sqlite3.connect(tmp)
+        try:
+            conn.executescript(_SCHEMA)
+            fts = _has_fts5(conn)
+            if fts:
+                conn.executescript(_FTS_SCHEMA)
+
+            sections: dict[tuple[str, str], int] = {}
+            with conn:
+                for seq, (need_id, need) in enumerate(iter_needs(needs_path)):
+                    if not isinstance(need, Need):
+                        need = Need.from_dict({"id": need_id, **need})
+                    section_id = None
+                    if need.section_name:
+                        skey = (need.docname, need.section_name)
+                        section_id = sections.get(skey)
+                        if section_id is None:
+                            section_id = sections[skey] = len(sections) + 1
+                            conn.execute("INSERT INTO sections VALUES (?, ?, ?)",
+                                         (section_id, *skey))
+                    conn.execute(
+                        "INSERT INTO needs VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                        (seq, need_id, get_tier(need_id), need.get("type"), need.get("title"),
+                         need.get("content"), need.get("docname"), need.lineno, section_id,
+                         need.status))
+                    conn.executemany(
+                        "INSERT OR IGNORE INTO links VALUES (?, ?, ?)",
+                        ((seq, parent, pos) for pos, parent in enumerate(need.links)))
+                if fts:
+                    conn.execute("INSERT INTO needs_fts (needs_fts) VALUES ('rebuild')")
+                conn.executemany("INSERT INTO meta VALUES (?, ?)", [
+                    ("schema_version", str(INDEX_SCHEMA_VERSION)),
+                    ("source_key", json.dumps(key)),
+                    ("fts5", "1" if fts else "0"),
+                ])
+        finally:
+            conn.close()
+        os.replace(tmp, db_path)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+    return db_path
+
+
+class NeedsIndex:
+    """
+    Read-only view of the SQLite needs index.
+
+    Behaves like the ``need_id -> Need`` mapping returned by
+    ``needs_store.load_records`` and exposes ``parents_of``/``children_of``
+    like ``CitationGraph``, so per-tag tools accept it in place of both.
+
+    Parameters
+    ----------
+    db_path : Path
+        Index database built by ``build_index``.
+    """
+
+    def __init__(self, db_path: Path):
+        self.db_path = Path(db_path)
+        self._conn = _connect_ro(self.db_path)
+        meta = dict(self._conn.execute("SELECT key, value FROM meta"))
+        self.has_fts = meta.get("fts5") == "1"
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self._conn.close()
+
+    @staticmethod
+    def _row_to_need(row: tuple) -> Need:
+        need_id, type_, title, content, docname, lineno, section, status = row
+        present = ALL_FIELDS
+        for field, value in zip(_OPTIONAL_TEXT, (type_, title, content, docname)):
+            if value is None:
+                present &= ~Need.bit(field)
+        return Need(need_id, type_ or "", title or "", content or "", (), (),
+                    docname or "", lineno, section or "", status, present)
+
+    def _fetch(self, need_id: str) -> Optional[Need]:
+        row = self._conn.execute(
+            f"SELECT {_NEED_COLUMNS}, n.seq FROM needs n "
+            "LEFT JOIN sections s USING (section_id) WHERE n.id = ?", (need_id,)
+        ).fetchone()
+        if row is None:
+            return None
+        need = self._row_to_need(row[:-1])
+        need.links = tuple(p for (p,) in self._conn.execute(
+            "SELECT parent FROM links WHERE child_seq = ? ORDER BY position", (row[-1],)))
+        need.links_back = tuple(self.children_of(need_id))
+        return need
+
+    def get(self, need_id: str, default=None):
+        """Return the record for ``need_id``, or ``default``."""
+        need = self._fetch(need_id)
+        return default if need is None else need
+
+    def __getitem__(self, need_id: str) -> Need:
+        need = self._fetch(need_id)
+        if need is None:
+            raise KeyError(need_id)
+        return need
+
+    def __contains__(self, need_id: str) -> bool:
+        return self._conn.execute(
+            "SELECT 1 FROM needs WHERE id = ?", (need_id,)).fetchone() is not None
+
+    def __len__(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM needs").fetchone()[0]
+
+    def __iter__(self) -> Iterator[str]:
+        return (i for (i,) in self._conn.execute("SELECT id FROM needs ORDER BY seq"))
+
+    def parents_of(self, need_id: str) -> list[str]:
+        """Return parent IDs cited by ``need_id`` in ``:links:`` order."""
+        return [p for (p,) in self._conn.execute(
+            "SELECT l.parent FROM links l JOIN needs n ON n.seq = l.child_seq "
+            "WHERE n.id = ? ORDER BY l.position", (need_id,))]
+
+    def children_of(self, need_id: str) -> list[str]:
+        """Return IDs of needs citing ``need_id``, in needs.json order."""
+        return [c for (c,) in self._conn.execute(
+            "SELECT n.id FROM links l JOIN needs n ON n.seq = l.child_seq "
+            "WHERE l.parent = ? ORDER BY l.child_seq", (need_id,))]
+
+    def ids_where(self, tier: Optional[str] = None, docname: Optional[str] = None,
+                  status: Optional[str] = None) -> list[str]:
+        """Return IDs matching indexed column filters, in needs.json order."""
+        clauses, params = [], []
+        for column, value in (("tier", tier), ("docname", docname), ("status", status)):
+            if value is not None:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        return [i for (i,) in self._conn.execute(
+            f"SELECT id FROM needs {where} ORDER BY seq", params)]
+
+    def search(self, text: str, tier: Optional[str] = None, limit: int = 20) -> list[dict]:
+        """
+        Free-text search over title and content.
+
+        Parameters
+        ----------
+        text : str
+            Words to match; all words must occur (any order).
+        tier : str, optional
+            Restrict results to one tier.
+        limit : int
+            Maximum number of results.
+
+        Returns
+        -------
+        list[dict]
+            Matches with ``id``, ``tier``, ``title``, ``docname``, ``lineno``
+            and ``snippet``, best first.
+        """
+        words = re.findall(r"\w+", text)
+        if not words:
+            return []
+        tier_clause = "AND n.tier = ?" if tier else ""
+        tier_param = [tier.upper()] if tier else []
+
+        if self.has_fts:
+            query = " ".join('"' + w.replace('"', '""') + '"' for w in words)
+            rows = self._conn.execute(
+                "SELECT n.id, n.tier, n.title, n.docname, n.lineno, "
+                "snippet(needs_fts, -1, '**', '**', '...', 12) "
+                "FROM needs_fts JOIN needs n ON n.seq = needs_fts.rowid "
+                f"WHERE needs_fts MATCH ? {tier_clause} "
+                "ORDER BY bm25(needs_fts, 5.0, 1.0) LIMIT ?",
+                [query, *tier_param, limit])
+        else:
+            like = " AND ".join("(n.title LIKE ? OR n.content LIKE ?)" for _ in words)
+            params = [p for w in words for p in (f"%{w}%", f"%{w}%")]
+            rows = self._conn.execute(
+                "SELECT n.id, n.tier, n.title, n.docname, n.lineno, "
+                "substr(n.content, 1, 120) FROM needs n "
+                f"WHERE {like} {tier_clause} ORDER BY n.seq LIMIT ?",
+                [*params, *tier_param, limit])
+
+        return [{"id": i, "tier": t, "title": title, "docname": doc,
+                 "lineno": line, "snippet": snip}
+                for i, t, title, doc, line, snip in rows]
+
+
+def _refresh_source_key(db_path: Path, needs_path: Path, key: dict) -> None:
+    """Record needs.json's new mtime and size after a same-content touch."""
+    st = needs_path.stat()
+    key = {**key, "mtime_ns": st.st_mtime_ns, "size": st.st_size}
+    try:
+        conn = sqlite3.connect(db_path)
+        try:
+            with conn:
+                conn.execute("UPDATE meta SET value = ? WHERE key = 'source_key'",
+                             (json.dumps(key),))
+        finally:
+            conn.close()
+    except sqlite3.Error:
+        pass  # read-only cache dir: the digest is just recomputed next time
+
+
+def open_index(needs_path: Path, rebuild: bool = False) -> NeedsIndex:
+    """
+    Open the index for needs.json, building or refreshing it when stale.
+
+    Parameters
+    ----------
+    needs_path : Path
+        Path to needs.json.
+    rebuild : bool
+        Force a rebuild.
+
+    Returns
+    -------
+    NeedsIndex
+        Open index.
+
+    Raises
+    ------
+    FileNotFoundError
+        If needs.json does not exist.
+    """
+    needs_path = Path(needs_path)
+    if not needs_path.exists():
+        raise FileNotFoundError(f"Needs file not found: {needs_path}")
+
+    db_path = index_path(needs_path)
+    if not rebuild and db_path.exists():
+        try:
+            conn = _connect_ro(db_path)
+            try:
+                meta = dict(conn.execute("SELECT key, value FROM meta"))
+            finally:
+                conn.close()
+            if meta.get("schema_version") == str(INDEX_SCHEMA_VERSION):
+                key = json.loads(meta["source_key"])
+                state = check_source(needs_path, key)
+                if state == "touched":
+                    _refresh_source_key(db_path, needs_path, key)
+                if state != "stale":
+                    return NeedsIndex(db_path)
+        except (sqlite3.Error, KeyError, ValueError):
+            pass
+
+    build_index(needs_path, db_path)
+    return NeedsIndex(db_path)
+
+
+def main() -> int:
+    """
+    CLI entry point for needs_index.
+
+    Returns
+    -------
+    int
+        Exit code (0=success, 1=error).
+    """
+    parser = argparse.ArgumentParser(
+        description="Build or search the SQLite index over needs.json."
+    )
+    parser.add_argument(
+        "--search",
+        required=False,
+        help="Free-text query over tag titles and content (e.g., \"wake word\")"
+    )
+    parser.add_argument(
+        "--tier",
+        required=False,
+        help="Restrict search results to one tier (e.g., FSD)"
+    )
+    parser.add_argument(
+        "--limit",
+        type=int,
+        default=20,
+        help="Maximum number of search results"
+    )
+    parser.add_argument(
+        "--rebuild",
+        action="store_true",
+        help="Rebuild the index even if it is current"
+    )
+    parser.add_argument(
+        "--needs-json",
+        required=False,
+        default="docs/_build/json/needs.json",
+        help="Path to needs.json file"
+    )
+
+    args = parser.parse_args()
+
+    try:
+        index = open_index(Path(args.needs_json), rebuild=args.rebuild)
+        try:
+            if args.search:
+                results = index.search(args.search, tier=args.tier, limit=args.limit)
+                result = {"success": True, "query": args.search, "tier": args.tier,
+                          "count": len(results), "results": results}
+            else:
+                result = {"success": True, "index": str(index.db_path),
+                          "needs": len(index), "fts5": index.has_fts}
+        finally:
+            index.close()
+
+        print(json.dumps(result, indent=2))
+        return 0
+
+    except FileNotFoundError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    except ValueError as e:
+        print(f"Error parsing needs.json: {e}", file=sys.stderr)
+        return 1
+    except Exception as e:
+        print(f"Error indexing needs: {e}", file=sys.stderr)
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,936 @@
+"""
+Needs Store.
+
+Shared loader for the Sphinx-Needs JSON export used by every DDR tool.
+
+Parsing ``needs.json`` is the dominant cost of a short tool call. The store
+parses the export once and keeps a binary (pickle) snapshot next to it,
+keyed on the file's mtime, size and SHA-256 digest. Subsequent tool calls
+load the snapshot instead of re-parsing the JSON.
+
+Sphinx-Needs stores ~60 fields per need, but the tools only read a handful.
+``load_records`` projects each need onto a slotted ``Need`` record while
+parsing, so the full per-need dicts are never held in memory.
+
+Scan-style tools that look at one need at a time use ``iter_needs``, an
+incremental reader that walks the export with a bounded buffer and yields
+``(need_id, Need)`` pairs without ever materialising the whole document.
+
+Meta
+----
+Knowledge Source: .agent/knowledge/sources/protocols/traceability_chain.md
+Architect       : Antigravity IDE
+
+Usage
+-----
+    from needs_store import load_records
+
+    needs = load_records(Path("docs/_build/json/needs.json"))
+    needs["FSD-1"].title
+    needs["FSD-1"].get("links", [])
+
+    for need_id, need in iter_needs(Path("docs/_build/json/needs.json")):
+        ...
+
+Notes
+-----
+- Snapshots live in ``<needs dir>/.ddr_cache/`` and are safe to delete.
+- A snapshot is reused when mtime and size match. When they differ the
+  file digest is compared, so a rebuild that produces identical output
+  still hits the cache.
+- Snapshot writes are atomic (temp file + rename), so concurrent agents
+  never observe a partially written snapshot.
+- Long-running hosts can call ``enable_memo`` to also keep payloads in
+  memory between calls.
+"""
+import json
+import os
+import pickle
+import sys
+from pathlib import Path
+from typing import Any, Callable, Iterator
+
+# Bump when the snapshot layout or any cached payload format changes.
+SNAPSHOT_VERSION: int = 2
+
+CACHE_DIR_NAME: str = ".ddr_cache"
+
+_DIGEST_CHUNK: int = 1 << 20
+
+# Characters read per refill by the streaming reader.
+STREAM_CHUNK: int = 1 << 16
+
+# Fields projected from each sphinx-needs entry. Changing this tuple changes
+# the "records" payload, so bump SNAPSHOT_VERSION with it.
+NEED_FIELDS: tuple[str, ...] = (
+    "id", "type", "title", "content", "links", "links_back",
+    "docname", "lineno", "section_name", "status",
+)
+
+# DDR tiers in hierarchy order.
+TIER_ORDER: tuple[str, ...] = ("BRD", "NFR", "FSD", "SAD", "ICD", "TDD", "ISP")
+
+# In-process payload memo: (resolved path, kind) -> ((mtime_ns, size), payload).
+# None until enable_memo() is called.
+_memo: dict[tuple[str, str], tuple[tuple[int, int], Any]] | None = None
+
+# Bit of each field in ``Need.present``.
+_FIELD_BITS: dict[str, int] = {f: 1 << i for i, f in enumerate(NEED_FIELDS)}
+ALL_FIELDS: int = (1 << len(NEED_FIELDS)) - 1
+
+# Keys that identify a need object inside the export.
+_NEED_MARKER_KEYS: frozenset[str] = frozenset({"id", "type", "docname", "links"})
+
+
+class Need:
+    """
+    Compact, read-only projection of a sphinx-needs entry.
+
+    Supports the ``need.get(key, default)`` / ``need[key]`` / ``key in need``
+    access used by the tools on raw need dicts, so records are drop-in
+    replacements: a field the source entry lacks reads as missing there,
+    while its attribute holds the empty default.
+
+    Attributes
+    ----------
+    id : str
+        Interned tag ID (e.g. ``FSD-1``).
+    type : str
+        Directive type (e.g. ``fsd``).
+    title : str
+        Tag title.
+    content : str
+        Directive body.
+    links : tuple[str, ...]
+        Interned parent IDs cited by this tag.
+    links_back : tuple[str, ...]
+        Interned child IDs citing this tag, as exported by sphinx-needs.
+    docname : str
+        Source document without ``.rst`` suffix.
+    lineno : int or None
+        Line of the directive in the source document.
+    section_name : str
+        Enclosing RST section title.
+    status : str or None
+        Directive ``:status:`` value.
+    present : int
+        Bit mask of the ``NEED_FIELDS`` the source entry had.
+    """
+
+    __slots__ = (*NEED_FIELDS, "present")
+
+    def __init__(self, id: str, type: str = "", title: str = "", content: str = "",
+                 links: tuple = (), links_back: tuple = (), docname: str = "",
+                 lineno: int | None = None, section_name: str = "",
+                 status: str | None = None, present: int = ALL_FIELDS):
+        self.id = sys.intern(id)
+        self.type = sys.intern(type or "")
+        self.title = title
+        self.content = content
+        self.links = _intern_ids(links)
+        self.links_back = _intern_ids(links_back)
+        self.docname = sys.intern(docname or "")
+        self.lineno = lineno
+        self.section_name = sys.intern(section_name or "")
+        self.status = status
+        self.present = present
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Need":
+        """
+        Project a raw sphinx-needs dict onto a record.
+
+        Parameters
+        ----------
+        data : dict
+            Raw need entry from needs.json.
+
+        Returns
+        -------
+        Need
+            Projected record.
+        """
+        fields = {f: data[f] for f in NEED_FIELDS if f in data}
+        return cls(**fields, present=sum(_FIELD_BITS[f] for f in fields))
+
+    @staticmethod
+    def bit(field: str) -> int:
+        """Return the ``present`` bit of one of ``NEED_FIELDS``."""
+        return _FIELD_BITS[field]
+
+    def get(self, key: str, default=None):
+        """Return a field the source entry had, or ``default``."""
+        if self.present & _FIELD_BITS.get(key, 0):
+            return getattr(self, key)
+        return default
+
+    def __getitem__(self, key: str):
+        if not self.present & _FIELD_BITS.get(key, 0):
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __contains__(self, key: str) -> bool:
+        return bool(self.present & _FIELD_BITS.get(key, 0))
+
+    def to_dict(self) -> dict:
+        """Return the fields the source entry had as a plain dict."""
+        return {f: getattr(self, f) for f in NEED_FIELDS if f in self}
+
+    def __reduce__(self):
+        return (Need, (*(getattr(self, f) for f in NEED_FIELDS), self.present))
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Need):
+            return NotImplemented
+        return (self.present == other.present
+                and all(getattr(self, f) == getattr(other, f) for f in NEED_FIELDS))
+
+    def __repr__(self) -> str:
+        return f"Need(id={self.id!r}, title={self.title!r}, links={self.links!r})"
+
+
+def get_tier(tag_id: str) -> str | None:
+    """
+    Extract the tier code from a tag ID.
+
+    Parameters
+    ----------
+    tag_id : str
+        Tag ID (e.g. ``FSD-1.2``).
+
+    Returns
+    -------
+    str or None
+        Tier code if valid, None otherwise.
+    """
+    if not tag_id:
+        return None
+    prefix = tag_id.split("-")[0].split(".")[0].upper()
+    return prefix if prefix in TIER_ORDER else None
+
+
+# Need fields whose change can alter a derived result (see ``need_hash``).
+HASH_FIELDS: tuple[str, ...] = (
+    "id", "type", "title", "content", "links", "docname", "section_name", "status",
+)
+
+
+def need_hash(ndata: Any) -> str:
+    """
+    Return the content fingerprint of a need.
+
+    Parameters
+    ----------
+    ndata : Any
+        ``Need`` record or raw need dict.
+
+    Returns
+    -------
+    str
+        Hex digest over the ``HASH_FIELDS`` values.
+    """
+    import hashlib  # only needed for digests; keeps start-up lean
+
+    values = [ndata.get(f) for f in HASH_FIELDS]
+    blob = json.dumps(values, default=list, ensure_ascii=False).encode("utf-8")
+    return hashlib.blake2b(blob, digest_size=16).hexdigest()
+
+
+def _intern_ids(ids) -> tuple[str, ...]:
+    if isinstance(ids, str):
+        ids = [ids] if ids else []
+    return tuple(sys.intern(i) for i in ids)
+
+
+def file_digest(path: Path) -> str:
+    """
+    Compute the SHA-256 hex digest of a file.
+
+    Parameters
+    ----------
+    path : Path
+        File to hash.
+
+    Returns
+    -------
+    str
+        Hexadecimal SHA-256 digest.
+    """
+    import hashlib  # only needed when mtime/size disagree; keeps start-up lean
+
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(_DIGEST_CHUNK), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def cache_dir(needs_path: Path) -> Path:
+    """
+    Return the snapshot directory for a needs.json file.
+
+    Parameters
+    ----------
+    needs_path : Path
+        Path to needs.json.
+
+    Returns
+    -------
+    Path
+        ``<needs dir>/.ddr_cache``.
+    """
+    return Path(needs_path).resolve().parent / CACHE_DIR_NAME
+
+
+def snapshot_path(needs_path: Path, kind: str, suffix: str = ".pickle") -> Path:
+    """
+    Return the snapshot file path for a payload kind.
+
+    Parameters
+    ----------
+    needs_path : Path
+        Path to needs.json.
+    kind : str
+        Payload kind (e.g. ``"needs"``).
+    suffix : str
+        File suffix; non-pickle snapshots use their own.
+
+    Returns
+    -------
+    Path
+        Snapshot file path.
+    """
+    needs_path = Path(needs_path)
+    return cache_dir(needs_path) / f"{needs_path.stem}.{kind}{suffix}"
+
+
+def source_key(needs_path: Path) -> dict:
+    """
+    Return the mtime/size/digest key a snapshot of needs.json is stored under.
+
+    Parameters
+    ----------
+    needs_path : Path
+        Path to needs.json.
+
+    Returns
+    -------
+    dict
+        ``{"mtime_ns": int, "size": int, "sha256": str}``.
+    """
+    st = Path(needs_path).stat()
+    return {"mtime_ns": st.st_mtime_ns, "size": st.st_size,
+            "sha256": file_digest(needs_path)}
+
+
+def check_source(needs_path: Path, key: dict) -> str:
+    """
+    Compare a snapshot key against the current needs.json.
+
+    Parameters
+    ----------
+    needs_path : Path
+        Path to needs.json.
+    key : dict
+        Key stored with the snapshot (see ``source_key``).
+
+    Returns
+    -------
+    str
+        ``"fresh"`` if mtime and size match, ``"touched"`` if only the
+        content digest matches (the key should be refreshed), otherwise
+        ``"stale"``.
+    """
+    st = Path(needs_path).stat()
+    if (key.get("mtime_ns"), key.get("size")) == (st.st_mtime_ns, st.st_size):
+        return "fresh"
+    if key.get("sha256") == file_digest(needs_path):
+        return "touched"
+    return "stale"
+
+
+def extract_needs(data: dict) -> dict:
+    """
+    Extract the need_id -> need_data mapping from a parsed export.
+
+    The ``current_version`` entry is preferred; otherwise the first version
+    containing needs is used.
+
+    Parameters
+    ----------
+    data : dict
+        Parsed needs.json document.
+
+    Returns
+    -------
+    dict
+        Dictionary of need_id -> need_data.
+
+    Raises
+    ------
+    ValueError
+        If no version contains needs.
+    """
+    versions = data.get("versions", {})
+    current = versions.get(data.get("current_version", ""), {})
+    if current.get("needs"):
+        return current["needs"]
+
+    for version_data in versions.values():
+        needs = version_data.get("needs", {})
+        if needs:
+            return needs
+
+    raise ValueError("No needs found in needs.json")
+
+
+def parse_needs(needs_path: Path) -> dict:
+    """
+    Parse needs.json without consulting the snapshot cache.
+
+    Parameters
+    ----------
+    needs_path : Path
+        Path to needs.json file.
+
+    Returns
+    -------
+    dict
+        Dictionary of need_id -> need_data.
+    """
+    with open(needs_path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    return extract_needs(data)
+
+
+def _project_hook(pairs: list) -> dict | Need:
+    """``object_pairs_hook`` that turns need-shaped objects into records."""
+    obj = dict(pairs)
+    if _NEED_MARKER_KEYS.issubset(obj) and isinstance(obj["id"], str):
+        return Need.from_dict(obj)
+    return obj
+
+
+def parse_records(needs_path: Path) -> dict[str, Need]:
+    """
+    Parse needs.json into projected records, bypassing the snapshot cache.
+
+    Each need object is projected as soon as the decoder finishes it, so
+    only one full-width need dict is alive at a time.
+
+    Parameters
+    ----------
+    needs_path : Path
+        Path to needs.json file.
+
+    Returns
+    -------
+    dict[str, Need]
+        Dictionary of need_id -> Need.
+    """
+    with open(needs_path, "r", encoding="utf-8") as f:
+        data = json.load(f, object_pairs_hook=_project_hook)
+    return extract_needs(data)
+
+
+def source_stamp(needs_path: Path) -> tuple[int, int]:
+    """Return ``(mtime_ns, size)`` of needs.json, the cheap freshness check."""
+    st = Path(needs_path).stat()
+    return st.st_mtime_ns, st.st_size
+
+
+def enable_memo(enabled: bool = True) -> None:
+    """
+    Keep loaded payloads in memory for the life of the process.
+
+    Off by default, so one-shot tool runs behave exactly as before. Long-
+    running hosts (``tool_server``) switch it on; every lookup re-checks the
+    needs.json mtime and size, so an edited export is picked up on the next
+    call without restarting the host.
+
+    Parameters
+    ----------
+    enabled : bool
+        False drops the memo and disables it again.
+    """
+    global _memo
+    _memo = {} if enabled else None
+
+
+def memo_get(needs_path: Path, kind: str) -> Any | None:
+    """
+    Return an in-memory payload if the memo is on and needs.json is unchanged.
+
+    Parameters
+    ----------
+    needs_path : Path
+        Path to needs.json.
+    kind : str
+        Payload kind.
+
+    Returns
+    -------
+    Any or None
+        The memoised payload, or None on a miss.
+    """
+    if _memo is None:
+        return None
+    key = (str(Path(needs_path).resolve()), kind)
+    entry = _memo.get(key)
+    try:
+        if entry is not None and entry[0] == source_stamp(needs_path):
+            return entry[1]
+    except OSError:
+        pass
+    _memo.pop(key, None)
+    return None
+
+
+def memo_put(needs_path: Path, kind: str, payload: Any, stamp: tuple[int, int]) -> None:
+    """
+    Remember a payload built from needs.json as it was at ``stamp``.
+
+    Parameters
+    ----------
+    needs_path : Path
+        Path to needs.json.
+    kind : str
+        Payload kind.
+    payload : Any
+        Loaded payload; must not be mutated by callers.
+    stamp : tuple[int, int]
+        ``(mtime_ns, size)`` of needs.json taken before the payload was read.
+    """
+    if _memo is not None:
+        _memo[(str(Path(needs_path).resolve()), kind)] = (stamp, payload)
+
+
+def _read_header(handle) -> dict | None:
+    try:
+        header = pickle.load(handle)
+    except Exception:
+        return None
+    if not isinstance(header, dict) or header.get("version") != SNAPSHOT_VERSION:
+        return None
+    return header
+
+
+def write_atomic(path: Path, write: Callable[[Any], None]) -> bool:
+    """
+    Atomically write a cache file via a temp file and rename.
+
+    Parameters
+    ----------
+    path : Path
+        Destination file.
+    write : Callable
+        Called with the open binary temp file.
+
+    Returns
+    -------
+    bool
+        False if the file could not be written (read-only checkout, full
+        disk, file mapped by another process on Windows). The cache is an
+        optimisation only, so callers carry on either way.
+    """
+    import tempfile  # only needed on cache writes; pulls in shutil and random
+
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=path.name, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                write(f)
+            os.replace(tmp, path)
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)
+            raise
+    except OSError:
+        return False
+    return True
+
+
+def _write_snapshot(path: Path, header: dict, payload: Any) -> bool:
+    def write(f) -> None:
+        pickle.dump(header, f, protocol=pickle.HIGHEST_PROTOCOL)
+        pickle.dump(payload, f, protocol=pickle.HIGHEST_PROTOCOL)
+    return write_atomic(path, write)
+
+
+def cached(needs_path: Path, kind: str, build: Callable[[Path], Any],
+           use_cache: bool = True) -> Any:
+    """
+    Return a payload derived from needs.json, reusing a valid snapshot.
+
+    Parameters
+    ----------
+    needs_path : Path
+        Path to needs.json file.
+    kind : str
+        Payload kind; each kind has its own snapshot file.
+    build : Callable[[Path], Any]
+        Builds the payload from needs.json on a cache miss. The result
+        must be picklable.
+    use_cache : bool
+        If False, always build and never touch the snapshot.
+
+    Returns
+    -------
+    Any
+        The cached or freshly built payload.
+
+    Raises
+    ------
+    FileNotFoundError
+        If needs.json does not exist.
+    """
+    needs_path = Path(needs_path)
+    if not needs_path.exists():
+        raise FileNotFoundError(f"Needs file not found: {needs_path}")
+    if not use_cache:
+        return build(needs_path)
+
+    payload = memo_get(needs_path, kind)
+    if payload is None:
+        stamp = source_stamp(needs_path)
+        payload = _load_snapshot(needs_path, kind, build)
+        memo_put(needs_path, kind, payload, stamp)
+    return payload
+
+
+def _load_snapshot(needs_path: Path, kind: str, build: Callable[[Path], Any]) -> Any:
+    snap = snapshot_path(needs_path, kind)
+
+    if snap.exists():
+        try:
+            with open(snap, "rb") as f:
+                header = _read_header(f)
+                if header and header.get("kind") == kind:
+                    state = check_source(needs_path, header)
+                    if state == "fresh":
+                        return pickle.load(f)
+                    if state == "touched":
+                        payload = pickle.load(f)
+                        st = needs_path.stat()
+                        _write_snapshot(snap, {**header, "mtime_ns": st.st_mtime_ns,
+                                               "size": st.st_size}, payload)
+                        return payload
+        except (OSError, EOFError, pickle.UnpicklingError):
+            pass
+
+    key = source_key(needs_path)
+    payload = build(needs_path)
+    _write_snapshot(snap, {"version": SNAPSHOT_VERSION, "kind": kind, **key}, payload)
+    return payload
+
+
+def load_state(needs_path: Path, kind: str) -> tuple[dict, Any] | None:
+    """
+    Read a state snapshot regardless of whether needs.json has changed.
+
+    State snapshots carry data derived from an earlier needs.json that a
+    tool patches forward (see ``save_state``); their header records the
+    source key of the export they reflect.
+
+    Parameters
+    ----------
+    needs_path : Path
+        Path to needs.json file.
+    kind : str
+        Payload kind.
+
+    Returns
+    -------
+    tuple[dict, Any] or None
+        Header (``mtime_ns``, ``size``, ``sha256`` of the reflected export)
+        and payload, or None if no readable snapshot exists.
+    """
+    try:
+        with open(snapshot_path(needs_path, kind), "rb") as f:
+            header = _read_header(f)
+            if not header or header.get("kind") != kind:
+                return None
+            return header, pickle.load(f)
+    except (OSError, EOFError, pickle.UnpicklingError):
+        return None
+
+
+def save_state(needs_path: Path, kind: str, payload: Any, key: dict) -> bool:
+    """
+    Write a state snapshot for the export identified by ``key``.
+
+    Parameters
+    ----------
+    needs_path : Path
+        Path to needs.json file.
+    kind : str
+        Payload kind.
+    payload : Any
+        Picklable plain data.
+    key : dict
+        Source key of the export the payload reflects (see ``source_key``).
+
+    Returns
+    -------
+    bool
+        False if the snapshot could not be written.
+    """
+    return _write_snapshot(snapshot_path(needs_path, kind),
+                           {"version": SNAPSHOT_VERSION, "kind": kind, **key}, payload)
+
+
+def cached_if_fresh(needs_path: Path, kind: str) -> Any | None:
+    """
+    Return a snapshot payload only if it matches needs.json by mtime and size.
+
+    Never parses needs.json and never writes a snapshot.
+
+    Parameters
+    ----------
+    needs_path : Path
+        Path to needs.json file.
+    kind : str
+        Payload kind.
+
+    Returns
+    -------
+    Any or None
+        The payload, or None if no fresh snapshot exists.
+    """
+    payload = memo_get(needs_path, kind)
+    if payload is not None:
+        return payload
+    snap = snapshot_path(needs_path, kind)
+    try:
+        with open(snap, "rb") as f:
+            header = _read_header(f)
+            if not header or header.get("kind") != kind:
+                return None
+            st = Path(needs_path).stat()
+            if (header["mtime_ns"], header["size"]) != (st.st_mtime_ns, st.st_size):
+                return None
+            return pickle.load(f)
+    except (OSError, EOFError, pickle.UnpicklingError):
+        return None
+
+
+def load_needs(needs_path: Path, use_cache: bool = True) -> dict:
+    """
+    Load all needs from needs.json.
+
+    Parameters
+    ----------
+    needs_path : Path
+        Path to needs.json file.
+    use_cache : bool
+        If False, bypass the binary snapshot.
+
+    Returns
+    -------
+    dict
+        Dictionary of need_id -> need_data.
+
+    Raises
+    ------
+    FileNotFoundError
+        If needs.json does not exist.
+    ValueError
+        If needs.json cannot be parsed.
+    """
+    return cached(needs_path, "needs", parse_needs, use_cache)
+
+
+def load_records(needs_path: Path, use_cache: bool = True) -> dict[str, Need]:
+    """
+    Load all needs from needs.json as projected ``Need`` records.
+
+    Parameters
+    ----------
+    needs_path : Path
+        Path to needs.json file.
+    use_cache : bool
+        If False, bypass the binary snapshot.
+
+    Returns
+    -------
+    dict[str, Need]
+        Dictionary of need_id -> Need.
+
+    Raises
+    ------
+    FileNotFoundError
+        If needs.json does not exist.
+    ValueError
+        If needs.json cannot be parsed.
+    """
+    return cached(needs_path, "records", parse_records, use_cache)
+
+
+class _JsonStream:
+    """
+    Minimal pull parser over a text file for navigating nested objects.
+
+    Containers on the navigation path are walked key by key; every other
+    value is decoded on its own with ``raw_decode``, so memory is bounded by
+    the largest single value (one need) plus one read chunk.
+    """
+
+    def __init__(self, handle, chunk_size: int):
+        self._handle = handle
+        self._chunk = chunk_size
+        self._buf = ""
+        self._pos = 0
+        self._eof = False
+        self._decoder = json.JSONDecoder(object_pairs_hook=_project_hook)
+
+    def _fill(self) -> bool:
+        if self._eof:
+            return False
+        data = self._handle.read(self._chunk)
+        if not data:
+            self._eof = True
+            return False
+        self._buf = self._buf[self._pos:] + data
+        self._pos = 0
+        return True
+
+    def peek(self) -> str:
+        """Return the next non-whitespace character ('' at EOF)."""
+        while True:
+            buf, pos = self._buf, self._pos
+            while pos < len(buf) and buf[pos] in " \t\r\n":
+                pos += 1
+            self._pos = pos
+            if pos < len(buf):
+                return buf[pos]
+            if not self._fill():
+                return ""
+
+    def expect(self, char: str) -> None:
+        if self.peek() != char:
+            raise ValueError(f"Malformed needs.json: expected {char!r}")
+        self._pos += 1
+
+    def value(self) -> Any:
+        """Decode the next complete JSON value."""
+        self.peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buf, self._pos)
+            except json.JSONDecodeError:
+                if self._fill():
+                    continue
+                raise
+            # A scalar ending exactly at the buffer edge may be truncated.
+            if end == len(self._buf) and self._fill():
+                continue
+            self._pos = end
+            return value
+
+    def members(self) -> Iterator[str]:
+        """Iterate the keys of the object at the cursor.
+
+        The caller must consume each key's value (``value()`` or a nested
+        ``members()``) before advancing.
+        """
+        self.expect("{")
+        if self.peek() == "}":
+            self._pos += 1
+            return
+        while True:
+            key = self.value()
+            if not isinstance(key, str):
+                raise ValueError("Malformed needs.json: expected object key")
+            self.expect(":")
+            yield key
+            sep = self.peek()
+            self._pos += 1
+            if sep == "}":
+                return
+            if sep != ",":
+                raise ValueError("Malformed needs.json: expected ',' or '}'")
+
+
+def _stream_version_needs(needs_path: Path, chunk_size: int,
+                          only_current: bool) -> Iterator[tuple[str, Any]]:
+    """Yield needs of the first eligible version that has any."""
+    with open(needs_path, "r", encoding="utf-8") as f:
+        stream = _JsonStream(f, chunk_size)
+        current = None
+        for key in stream.members():
+            if key == "current_version":
+                current = stream.value()
+            elif key == "versions" and stream.peek() == "{":
+                for version in stream.members():
+                    eligible = not only_current or current is None or version == current
+                    found = False
+                    if stream.peek() != "{":
+                        stream.value()
+                        continue
+                    for vkey in stream.members():
+                        if vkey == "needs" and eligible and stream.peek() == "{":
+                            for need_id in stream.members():
+                                found = True
+                                yield need_id, stream.value()
+                        else:
+                            stream.value()
+                    if found:
+                        return
+            else:
+                stream.value()
+
+
+def iter_needs(needs_path: Path, use_cache: bool = True,
+               chunk_size: int = STREAM_CHUNK) -> Iterator[tuple[str, Need]]:
+    """
+    Stream ``(need_id, Need)`` pairs from needs.json with bounded memory.
+
+    Version selection follows ``extract_needs``: the ``current_version``
+    needs when present, otherwise the first version containing needs.
+    ``current_version`` is only honoured if it precedes ``versions`` in the
+    file, which is how sphinx-needs writes it.
+
+    Parameters
+    ----------
+    needs_path : Path
+        Path to needs.json file.
+    use_cache : bool
+        If True and a fresh records snapshot exists, iterate it instead of
+        parsing. A missing or stale snapshot is never rebuilt here.
+    chunk_size : int
+        Characters read per refill.
+
+    Yields
+    ------
+    tuple[str, Need]
+        Need ID and projected record, in needs.json order.
+
+    Raises
+    ------
+    FileNotFoundError
+        If needs.json does not exist.
+    ValueError
+        If needs.json is malformed or contains no needs.
+    """
+    needs_path = Path(needs_path)
+    if not needs_path.exists():
+        raise FileNotFoundError(f"Needs file not found: {needs_path}")
+
+    if use_cache:
+        records = cached_if_fresh(needs_path, "records")
+        if records is not None:
+            yield from records.items()
+            return
+
+    found = False
+    for pair in _stream_version_needs(needs_path, chunk_size, only_current=True):
+        found = True
+        yield pair
+    if not found:
+        # current_version named a version without needs: fall back to the
+        # first version that has some.
+        for pair in _stream_version_needs(needs_path, chunk_size, only_current=False):
+            found = True
+            yield pair
+    if not found:
+        raise ValueError("No needs found in needs.json")
@@ -0,0 +1,433 @@
+"""
+Partition Graph Tool.
+
+Splits the DDR citation graph into shards and runs per-need audits
+shard-parallel across worker processes.
+
+Two partitions are available:
+
+- ``components``: weakly connected components. No citation crosses a
+  shard, so any check is local to its shard, but one large component
+  (a shared hub tag) limits the parallelism.
+- ``roots``: one shard per top-level BRD (a BRD citing no existing tag).
+  Each tag joins the shard of its nearest root, found by a breadth-first
+  walk down from all roots at once; tags no root reaches share a final
+  ``unrooted`` shard. Citations between shards are recorded as
+  ``cross_edges``.
+
+``run_sharded`` packs the shards into one bin per worker (largest shard
+first, into the lightest bin) and ships each bin's needs to a
+``ProcessPoolExecutor`` together with the halo the task needs from other
+shards: the cited parents for the traceability check, the full ancestor
+closure for chain completeness. Workers return one result per need and
+the merge re-orders them by needs.json position, so the output is
+identical to the single-process tool whatever the partition or worker
+count.
+
+Meta
+----
+Tool Definition : .agent/tools/trace_partition_graph.md
+Knowledge Source: .agent/knowledge/sources/protocols/traceability_chain.md
+Architect       : Antigravity IDE
+
+Usage
+-----
+    python partition_graph.py --mode roots
+    python partition_graph.py --task anti_patterns --jobs 8
+
+    from partition_graph import run_sharded
+
+    result = run_sharded(needs, graph, "chain_completeness", jobs=8)
+
+Exit Codes
+----------
+0 : Success (JSON result printed to stdout)
+1 : Error (Details printed to stderr)
+
+Notes
+-----
+- Shards hold defined needs only; unresolved link targets belong to no
+  shard and are never shipped.
+- ``jobs=1`` runs the bins in-process, which is also the fallback for
+  graphs smaller than ``MIN_SHARDED_NEEDS``.
+"""
+import argparse
+import json
+import os
+import sys
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, NamedTuple
+
+import check_chain_completeness
+import detect_anti_patterns
+import generate_traceability_report
+import validate_tier_compliance
+from citation_graph import CitationGraph, load_graph
+from needs_store import get_tier, load_records
+
+MODES: tuple[str, ...] = ("components", "roots")
+
+# Task -> context needed beyond the shard: None, "parents" or "ancestors".
+TASKS: dict[str, str | None] = {
+    "anti_patterns": None,
+    "tier_compliance": None,
+    "traceability_report": "parents",
+    "chain_completeness": "ancestors",
+}
+
+# Below this many needs the process start-up outweighs the work.
+MIN_SHARDED_NEEDS: int = 2000
+
+
+class Partition(NamedTuple):
+    """
+    Shards of a citation graph.
+
+    Attributes
+    ----------
+    mode : str
+        ``components`` or ``roots``.
+    shards : list[list[int]]
+        Node indices of defined needs per shard, ascending.
+    labels : list[str]
+        Per shard, its smallest tag ID (components) or root tag ID (roots;
+        ``unrooted`` for the leftover shard).
+    shard_of : list[int]
+        Node index -> shard, -1 for unresolved link targets.
+    cross_edges : list[tuple[int, int]]
+        ``(child, parent)`` citations between defined needs of different shards.
+    """
+    mode: str
+    shards: list[list[int]]
+    labels: list[str]
+    shard_of: list[int]
+    cross_edges: list[tuple[int, int]]
+
+
+def weak_components(graph: CitationGraph) -> Partition:
+    """
+    Partition the defined needs into weakly connected components.
+
+    Parameters
+    ----------
+    graph : CitationGraph
+        Citation graph.
+
+    Returns
+    -------
+    Partition
+        One shard per component, ordered by smallest member; no cross edges.
+    """
+    parent = list(range(len(graph.ids)))
+
+    def find(x: int) -> int:
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    for child, cited in graph.edges():
+        a, b = find(child), find(cited)
+        if a != b:
+            parent[max(a, b)] = min(a, b)
+
+    shard_of = [-1] * len(graph.ids)
+    slot: dict[int, int] = {}
+    shards: list[list[int]] = []
+    for i in range(graph.need_count):
+        root = find(i)
+        if root not in slot:
+            slot[root] = len(shards)
+            shards.append([])
+        shard_of[i] = slot[root]
+        shards[shard_of[i]].append(i)
+    labels = [graph.ids[members[0]] for members in shards]
+    return Partition("components", shards, labels, shard_of, [])
+
+
+def root_shards(graph: CitationGraph) -> Partition:
+    """
+    Partition the defined needs by their nearest top-level BRD.
+
+    Parameters
+    ----------
+    graph : CitationGraph
+        Citation graph.
+
+    Returns
+    -------
+    Partition
+        One shard per top-level BRD in needs.json order, plus an
+        ``unrooted`` shard if some tags reach no root. Ties between equally
+        near roots go to the root listed first.
+    """
+    count, ids, resolved = graph.need_count, graph.ids, graph.is_resolved
+    c_off, c_idx = graph.child_offsets, graph.child_indices
+    roots = [i for i in range(count) if get_tier(ids[i]) == "BRD"
+             and not any(resolved(p) for p in graph.parents(i))]
+
+    shard_of = [-1] * len(ids)
+    queue = deque()
+    for s, r in enumerate(roots):
+        shard_of[r] = s
+        queue.append(r)
+    while queue:
+        u = queue.popleft()
+        for k in range(c_off[u], c_off[u + 1]):
+            v = c_idx[k]
+            if shard_of[v] == -1:
+                shard_of[v] = shard_of[u]
+                queue.append(v)
+
+    labels = [ids[r] for r in roots]
+    if any(shard_of[i] == -1 for i in range(count)):
+        for i in range(count):
+            if shard_of[i] == -1:
+                shard_of[i] = len(roots)
+        labels.append("unrooted")
+
+    shards: list[list[int]] = [[] for _ in labels]
+    for i in range(count):
+        shards[shard_of[i]].append(i)
+    cross = [(c, p) for c, p in graph.edges()
+             if resolved(p) and shard_of[c] != shard_of[p]]
+    return Partition("roots", shards, labels, shard_of, cross)
+
+
+def partition(graph: CitationGraph, mode: str = "roots") -> Partition:
+    """Partition ``graph`` by ``mode`` (see ``MODES``)."""
+    if mode not in MODES:
+        raise ValueError(f"Invalid mode: {mode}. Valid: {list(MODES)}")
+    return weak_components(graph) if mode == "components" else root_shards(graph)
+
+
+def pack(part: Partition, bins: int) -> list[list[int]]:
+    """
+    Pack shards into at most ``bins`` balanced bins.
+
+    Returns
+    -------
+    list[list[int]]
+        Non-empty bins of node indices, each ascending.
+    """
+    loads = [0] * max(1, bins)
+    packed: list[list[int]] = [[] for _ in loads]
+    for s in sorted(range(len(part.shards)), key=lambda s: (-len(part.shards[s]), s)):
+        b = min(range(len(loads)), key=lambda b: (loads[b], b))
+        packed[b].extend(part.shards[s])
+        loads[b] += len(part.shards[s])
+    return [sorted(members) for members in packed if members]
+
+
+def _halo(graph: CitationGraph, members: list[int], scope: str | None) -> list[int]:
+    # Defined needs outside ``members`` that the task reads.
+    if scope is None:
+        return []
+    p_off, p_idx = graph.parent_offsets, graph.parent_indices
+    seen = bytearray(len(graph.ids))
+    for i in members:
+        seen[i] = 1
+    extra, queue = [], deque(members)
+    while queue:
+        u = queue.popleft()
+        for k in range(p_off[u], p_off[u + 1]):
+            v = p_idx[k]
+            if not seen[v]:
+                seen[v] = 1
+                if graph.is_resolved(v):
+                    extra.append(v)
+                    if scope == "ancestors":
+                        queue.append(v)
+    return extra
+
+
+def check_shard(task: str, context: list[tuple[str, Any]], member_ids: list[str]) -> list[Any]:
+    """
+    Run a per-need task over one bin of needs.
+
+    Parameters
+    ----------
+    task : str
+        Task name (see ``TASKS``).
+    context : list[tuple[str, Any]]
+        ``(need_id, record)`` pairs of the bin and its halo, in needs.json order.
+    member_ids : list[str]
+        Needs to report on, in needs.json order.
+
+    Returns
+    -------
+    list
+        One per-need result per member, in ``member_ids`` order.
+    """
+    needs = dict(context)
+    if task == "anti_patterns":
+        patterns = list(detect_anti_patterns.PATTERNS)
+        return [detect_anti_patterns.scan_need(nid, needs[nid], patterns) for nid in member_ids]
+    if task == "tier_compliance":
+        return [validate_tier_compliance.validate([(nid, needs[nid])]) for nid in member_ids]
+    if task == "traceability_report":
+        return [generate_traceability_report.need_violations(nid, needs[nid], needs)
+                for nid in member_ids]
+    if task == "chain_completeness":
+        by_id = {r["id"]: r for r in check_chain_completeness.check_chains(needs)}
+        return [by_id[nid] for nid in member_ids]
+    raise ValueError(f"Unknown task: {task}. Valid: {list(TASKS)}")
+
+
+def merge(task: str, needs: dict, per_need: list[Any]) -> dict:
+    """
+    Assemble a task's report from per-need results in needs.json order.
+
+    Returns
+    -------
+    dict
+        The same report the stand-alone tool produces with default options.
+    """
+    if task == "anti_patterns":
+        return detect_anti_patterns.summarize(per_need)
+    if task == "tier_compliance":
+        details = [v for r in per_need for v in r["details"]]
+        return {"checked": sum(r["checked"] for r in per_need),
+                "violations": len(details), "details": details}
+    if task == "traceability_report":
+        return generate_traceability_report.summarize(needs, per_need)
+    if task == "chain_completeness":
+        return {"summary": check_chain_completeness.summarize(per_need), "results": per_need}
+    raise ValueError(f"Unknown task: {task}. Valid: {list(TASKS)}")
+
+
+def run_sharded(needs: dict, graph: CitationGraph | None, task: str, jobs: int | None = None,
+                mode: str = "roots", executor: Executor | None = None) -> dict:
+    """
+    Run a per-need audit task shard-parallel and merge the results.
+
+    Parameters
+    ----------
+    needs : dict
+        Dictionary of need_id -> need data, in needs.json order.
+    graph : CitationGraph, optional
+        Citation graph for ``needs``. Built on demand if omitted.
+    task : str
+        Task name (see ``TASKS``).
+    jobs : int, optional
+        Worker processes; defaults to the CPU count. 1 runs in-process.
+    mode : str
+        Partition mode (see ``MODES``).
+    executor : Executor, optional
+        Pool to submit bins to instead of creating one.
+
+    Returns
+    -------
+    dict
+        The task's report, identical to the single-process tool's output.
+    """
+    if task not in TASKS:
+        raise ValueError(f"Unknown task: {task}. Valid: {list(TASKS)}")
+    graph = graph or CitationGraph.from_needs(needs)
+    jobs = jobs or os.cpu_count() or 1
+    if executor is None and len(needs) < MIN_SHARDED_NEEDS:
+        jobs = 1
+
+    ids = graph.ids
+    bins = pack(partition(graph, mode), jobs)
+    calls = []
+    for members in bins:
+        context = sorted(members + _halo(graph, members, TASKS[task]))
+        calls.append((task, [(ids[i], needs[ids[i]]) for i in context],
+                      [ids[i] for i in members]))
+
+    if executor is not None:
+        outputs = [f.result() for f in [executor.submit(check_shard, *c) for c in calls]]
+    elif jobs == 1 or len(calls) == 1:
+        outputs = [check_shard(*c) for c in calls]
+    else:
+        with ProcessPoolExecutor(max_workers=min(jobs, len(calls))) as pool:
+            outputs = list(pool.map(check_shard, *zip(*calls)))
+
+    per_need: list[Any] = [None] * graph.need_count
+    for members, results in zip(bins, outputs):
+        for i, result in zip(members, results):
+            per_need[i] = result
+    return merge(task, needs, per_need)
+
+
+def describe(part: Partition, graph: CitationGraph, bins: int) -> dict:
+    """Summarize a partition for the CLI."""
+    ids = graph.ids
+    return {
+        "mode": part.mode,
+        "shard_count": len(part.shards),
+        "shards": [{"label": label, "size": len(members)}
+                   for label, members in zip(part.labels, part.shards)],
+        "cross_edge_count": len(part.cross_edges),
+        "cross_edges": [[ids[c], ids[p]] for c, p in part.cross_edges],
+        "bins": [len(members) for members in pack(part, bins)],
+    }
+
+
+def main() -> int:
+    """
+    CLI entry point for partition_graph.
+
+    Returns
+    -------
+    int
+        Exit code (0=success, 1=error).
+    """
+    parser = argparse.ArgumentParser(
+        description="Partition the citation graph and run per-need audits shard-parallel."
+    )
+    parser.add_argument(
+        "--needs-json",
+        default="docs/_build/json/needs.json",
+        help="Path to needs.json file"
+    )
+    parser.add_argument(
+        "--mode",
+        choices=MODES,
+        default="roots",
+        help="Partition by weakly connected component or by top-level BRD (default: roots)"
+    )
+    parser.add_argument(
+        "--task",
+        choices=list(TASKS),
+        help="Run this audit sharded and print its report instead of the partition"
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=None,
+        help="Worker processes / bins (default: CPU count)"
+    )
+
+    args = parser.parse_args()
+
+    path = Path(args.needs_json)
+    if not path.exists():
+        print(f"Error: {path} not found", file=sys.stderr)
+        return 1
+
+    try:
+        needs = load_records(path)
+        graph = load_graph(path, needs)
+        jobs = args.jobs or os.cpu_count() or 1
+
+        if args.task:
+            result = run_sharded(needs, graph, args.task, jobs, args.mode)
+        else:
+            result = {"success": True, **describe(partition(graph, args.mode), graph, jobs)}
+        print(json.dumps(result, indent=2))
+        return 0
+
+    except ValueError as e:
+        print(f"Error parsing needs.json: {e}", file=sys.stderr)
+        return 1
+    except Exception as e:
+        print(f"Error partitioning graph: {e}", file=sys.stderr)
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,332 @@
+"""
+Reachability Index.
+
+Precomputed transitive closure of the DDR citation graph, for impact
+queries ("every descendant of X", "every ancestor of X", "is X upstream of
+Y") that answer without walking the graph.
+
+Each node of the citation graph gets two bitsets stored as Python ints:
+bit ``j`` of ``descendant_bits[i]`` is set if node ``j`` cites node ``i``
+directly or transitively, and ``ancestor_bits`` is the same relation in
+the other direction. The graph is condensed into its strongly connected
+components, which come out of Tarjan's algorithm in topological order, and
+the sets are filled in one pass each over that order by OR-ing in the sets
+of the neighbouring components already processed. Building costs
+O(V + E) big-int operations, cycles included.
+
+The index is persisted with the other needs.json snapshots and rebuilt
+only when needs.json changes.
+
+Meta
+----
+Tool Definition : .agent/tools/trace_reachability.md
+Knowledge Source: .agent/knowledge/sources/protocols/impact_analysis.md
+                  .agent/knowledge/sources/protocols/traceability_chain.md
+Architect       : Antigravity IDE
+
+Usage
+-----
+    python reachability.py --descendants BRD-5
+    python reachability.py --ancestors TDD-1 --needs-json path/to/needs.json
+    python reachability.py --is-upstream BRD-5 TDD-1
+
+    from reachability import load_reachability
+
+    reach = load_reachability(Path("docs/_build/json/needs.json"))
+    reach.is_upstream("BRD-5", "TDD-1")
+
+Exit Codes
+----------
+0 : Success (JSON result printed to stdout)
+1 : Error (Details printed to stderr)
+
+Notes
+-----
+- Results are in needs.json order, followed by unresolved link targets
+  (which only appear as ancestors). They exclude the queried tag itself
+  unless it lies on a citation cycle.
+- All members of a citation cycle share the same sets.
+- Memory is at most V^2 / 8 bytes; real DDR graphs are far sparser.
+"""
+import argparse
+import json
+import sys
+from pathlib import Path
+
+import needs_store
+from citation_graph import CitationGraph, load_graph
+
+# Snapshot kind for needs_store.cached; bump the suffix if the payload changes.
+SNAPSHOT_KIND: str = "reachability-v1"
+
+
+def _bits_to_indices(bits: int) -> list[int]:
+    # Reversed binary string: character i is bit i.
+    text = bin(bits)[:1:-1]
+    out, pos = [], text.find("1")
+    while pos != -1:
+        out.append(pos)
+        pos = text.find("1", pos + 1)
+    return out
+
+
+class Reachability:
+    """
+    Descendant and ancestor bitsets for every node of a citation graph.
+
+    Attributes
+    ----------
+    ids : list[str]
+        Node index -> tag ID (same numbering as the ``CitationGraph``).
+    index : dict[str, int]
+        Tag ID -> node index.
+    need_count : int
+        Number of defined needs; higher indices are unresolved link targets.
+    descendant_bits : list[int]
+        Per node, the set of nodes that cite it transitively.
+    ancestor_bits : list[int]
+        Per node, the set of nodes it cites transitively.
+    acyclic : bool
+        False if the graph contains a citation cycle.
+    """
+
+    __slots__ = ("ids", "index", "need_count", "descendant_bits", "ancestor_bits", "acyclic")
+
+    def __init__(self, ids: list[str], need_count: int, descendant_bits: list[int],
+                 ancestor_bits: list[int], acyclic: bool = True):
+        self.ids = ids
+        self.index = {tag_id: i for i, tag_id in enumerate(ids)}
+        self.need_count = need_count
+        self.descendant_bits = descendant_bits
+        self.ancestor_bits = ancestor_bits
+        self.acyclic = acyclic
+
+    def to_state(self) -> tuple:
+        """Return the plain-data state stored in the snapshot."""
+        return (self.ids, self.need_count, self.descendant_bits,
+                self.ancestor_bits, self.acyclic)
+
+    @classmethod
+    def from_graph(cls, graph: CitationGraph) -> "Reachability":
+        """
+        Compute the transitive closure of a citation graph.
+
+        Parameters
+        ----------
+        graph : CitationGraph
+            Citation graph.
+
+        Returns
+        -------
+        Reachability
+            Index with one descendant and one ancestor set per node.
+        """
+        count = len(graph.ids)
+        p_off, p_idx = graph.parent_offsets, graph.parent_indices
+        c_off, c_idx = graph.child_offsets, graph.child_indices
+        components = graph.strongly_connected_components()
+        comp_of = [0] * count
+        for c, members in enumerate(components):
+            for node in members:
+                comp_of[node] = c
+
+        # Closure over the condensation DAG: components come parents-first,
+        # so cited components are complete before the ones citing them, and
+        # the reverse holds in reverse order. A cyclic component reaches
+        # all of its own members, itself included.
+        member_bits = [sum(1 << n for n in members) for members in components]
+        inner = [member_bits[c] if graph.is_cyclic(members) else 0
+                 for c, members in enumerate(components)]
+        comp_anc = [0] * len(components)
+        comp_desc = [0] * len(components)
+        for c, members in enumerate(components):
+            bits = inner[c]
+            for node in members:
+                for k in range(p_off[node], p_off[node + 1]):
+                    d = comp_of[p_idx[k]]
+                    if d != c:
+                        bits |= comp_anc[d] | member_bits[d]
+            comp_anc[c] = bits
+        for c in range(len(components) - 1, -1, -1):
+            bits = inner[c]
+            for node in components[c]:
+                for k in range(c_off[node], c_off[node + 1]):
+                    d = comp_of[c_idx[k]]
+                    if d != c:
+                        bits |= comp_desc[d] | member_bits[d]
+            comp_desc[c] = bits
+
+        # Members of a component share one int per direction.
+        desc = [comp_desc[comp_of[i]] for i in range(count)]
+        anc = [comp_anc[comp_of[i]] for i in range(count)]
+        acyclic = not any(inner)
+        return cls(list(graph.ids), graph.need_count, desc, anc, acyclic=acyclic)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __contains__(self, tag_id: str) -> bool:
+        return tag_id in self.index
+
+    def _node(self, tag_id: str) -> int:
+        i = self.index.get(tag_id)
+        if i is None:
+            raise KeyError(f"Unknown tag: {tag_id}")
+        return i
+
+    def descendants(self, tag_id: str) -> list[str]:
+        """
+        Return every tag that cites ``tag_id`` directly or transitively.
+
+        Raises
+        ------
+        KeyError
+            If the tag is not in the graph.
+        """
+        ids = self.ids
+        return [ids[j] for j in _bits_to_indices(self.descendant_bits[self._node(tag_id)])]
+
+    def ancestors(self, tag_id: str) -> list[str]:
+        """
+        Return every tag that ``tag_id`` cites directly or transitively.
+
+        Raises
+        ------
+        KeyError
+            If the tag is not in the graph.
+        """
+        ids = self.ids
+        return [ids[j] for j in _bits_to_indices(self.ancestor_bits[self._node(tag_id)])]
+
+    def descendant_count(self, tag_id: str) -> int:
+        """Return the number of transitive descendants of ``tag_id``."""
+        return self.descendant_bits[self._node(tag_id)].bit_count()
+
+    def ancestor_count(self, tag_id: str) -> int:
+        """Return the number of transitive ancestors of ``tag_id``."""
+        return self.ancestor_bits[self._node(tag_id)].bit_count()
+
+    def is_upstream(self, upstream: str, downstream: str) -> bool:
+        """
+        Return True if ``downstream`` cites ``upstream`` directly or transitively.
+
+        Raises
+        ------
+        KeyError
+            If either tag is not in the graph.
+        """
+        return bool(self.descendant_bits[self._node(upstream)] >> self._node(downstream) & 1)
+
+
+def load_reachability(needs_path: Path, graph: CitationGraph | None = None,
+                      use_cache: bool = True) -> Reachability:
+    """
+    Load the reachability index for needs.json, reusing a valid snapshot.
+
+    Parameters
+    ----------
+    needs_path : Path
+        Path to needs.json.
+    graph : CitationGraph, optional
+        Already loaded graph; used to build the index on a cache miss.
+    use_cache : bool
+        If False, build in memory and never touch the snapshot.
+
+    Returns
+    -------
+    Reachability
+        Index for the current needs.json.
+
+    Raises
+    ------
+    FileNotFoundError
+        If needs.json does not exist.
+    """
+    # The snapshot holds plain data so that it does not depend on the
+    # module this class was imported as (``__main__`` for the CLI).
+    def build(path: Path) -> tuple:
+        source = graph if graph is not None else load_graph(path, use_cache=use_cache)
+        return Reachability.from_graph(source).to_state()
+
+    return Reachability(*needs_store.cached(Path(needs_path), SNAPSHOT_KIND, build, use_cache))
+
+
+def main() -> int:
+    """
+    CLI entry point for reachability.
+
+    Returns
+    -------
+    int
+        Exit code (0=success, 1=error).
+    """
+    parser = argparse.ArgumentParser(
+        description="Answer transitive citation queries from the reachability index."
+    )
+    query = parser.add_mutually_exclusive_group(required=True)
+    query.add_argument(
+        "--descendants",
+        metavar="ID",
+        help="List every tag citing ID directly or transitively"
+    )
+    query.add_argument(
+        "--ancestors",
+        metavar="ID",
+        help="List every tag ID cites directly or transitively"
+    )
+    query.add_argument(
+        "--is-upstream",
+        nargs=2,
+        metavar=("UPSTREAM", "DOWNSTREAM"),
+        help="Check whether DOWNSTREAM cites UPSTREAM directly or transitively"
+    )
+    parser.add_argument(
+        "--needs-json",
+        default="docs/_build/json/needs.json",
+        help="Path to needs.json file"
+    )
+
+    args = parser.parse_args()
+
+    try:
+        reach = load_reachability(Path(args.needs_json))
+
+        if args.is_upstream:
+            upstream, downstream = args.is_upstream
+            result = {
+                "success": True,
+                "upstream": upstream,
+                "downstream": downstream,
+                "is_upstream": reach.is_upstream(upstream, downstream)
+            }
+        else:
+            tag_id = args.descendants or args.ancestors
+            direction = "descendants" if args.descendants else "ancestors"
+            ids = reach.descendants(tag_id) if args.descendants else reach.ancestors(tag_id)
+            result = {
+                "success": True,
+                "id": tag_id,
+                "query": direction,
+                "count": len(ids),
+                direction: ids
+            }
+
+        print(json.dumps(result, indent=2))
+        return 0
+
+    except KeyError as e:
+        print(f"Error: {e.args[0]}", file=sys.stderr)
+        return 1
+    except FileNotFoundError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    except ValueError as e:
+        print(f"Error parsing needs.json: {e}", file=sys.stderr)
+        return 1
+    except Exception as e:
+        print(f"Error building reachability index: {e}", file=sys.stderr)
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,290 @@
+"""
+Rule Engine.
+
+Declarative per-need rules for the scanning tools (detect_anti_patterns).
+
+A ``RuleSet`` holds two kinds of rules, each restricted to a set of tiers:
+
+- regex rules: a pattern searched in one text field of the need's facts.
+  Patterns are compiled once at registration.
+- predicate rules: a function of the need's facts.
+
+Facts are built once per need by the caller's ``facts`` function and must
+expose ``tier`` plus every field a regex rule scans. For each (tier, rule
+selection) the set plans once which rules apply and merges the regex rules
+of each field into a single alternation with one named group per rule, so
+a need's text is scanned in one pass however many rules look at it.
+
+Meta
+----
+Knowledge Source: .agent/knowledge/sources/protocols/traceability_chain.md
+Architect       : Antigravity IDE
+
+Usage
+-----
+    rules = RuleSet(facts=lambda nid, ndata: ...)
+    rules.regex("AP001", "Vertical Pollution", "content",
+                r"\\b(def |class |import )\\b", tiers={"BRD", "NFR", "FSD"})
+
+    @rules.predicate("AP002", "Orphan Tag")
+    def _orphan(facts):
+        return not facts.links
+
+    rules.evaluate("FSD-1", ndata, ["AP001", "AP002"])
+
+Notes
+-----
+- Rule patterns must not define named groups of their own; numbered
+  groups are fine. Only the ``re.I``, ``re.M``, ``re.S`` and ``re.X``
+  flags can be merged.
+- Regex rules skip fields that are not strings.
+- A leading ``\\b`` shared by all rules of a field is tested once, unless
+  a rule has a top-level alternation whose other branches lack it.
+- A match of one merged rule can hide another rule matching at the same
+  position; the scanner then resumes there with the remaining rules, so
+  results always equal a separate ``search`` per rule.
+"""
+import re
+from typing import Any, Callable, Iterable, NamedTuple
+
+try:
+    from re import _parser as sre_parse
+except ImportError:  # Python < 3.11
+    import sre_parse
+
+# Flags expressible as a scoped inline group, e.g. ``(?i:...)``.
+_INLINE_FLAGS: dict[int, str] = {re.I: "i", re.M: "m", re.S: "s", re.X: "x"}
+_BOUNDARY: str = r"\b"
+
+
+class Rule(NamedTuple):
+    """One registered rule; exactly one of ``pattern`` and ``check`` is set."""
+    id: str
+    name: str
+    tiers: frozenset | None
+    field: str | None = None
+    pattern: re.Pattern | None = None
+    check: Callable[[Any], bool] | None = None
+
+
+def _scoped(pattern: re.Pattern, source: str) -> str:
+    """Return ``source`` wrapped in a group carrying the pattern's flags."""
+    flags = pattern.flags & ~re.U
+    letters = "".join(letter for flag, letter in _INLINE_FLAGS.items() if flags & flag)
+    if flags & ~sum(_INLINE_FLAGS):
+        raise ValueError(f"Unsupported flags for a merged rule: {pattern.pattern!r}")
+    # A trailing verbose-mode comment would swallow the closing parenthesis.
+    tail = "\n" if flags & re.X else ""
+    return f"(?{letters}:{source}{tail})" if letters else f"(?:{source})"
+
+
+def _leads_with_boundary(pattern: re.Pattern) -> bool:
+    """Whether every match of ``pattern`` starts at a ``\\b`` it opens with."""
+    if not pattern.pattern.startswith(_BOUNDARY):
+        return False
+    # ``\bfoo|bar`` parses to a single branch, ``\bfoo|\bbar`` to the
+    # boundary followed by the branch.
+    parsed = sre_parse.parse(pattern.pattern, pattern.flags)
+    return len(parsed) > 0 and parsed[0] == (sre_parse.AT, sre_parse.AT_BOUNDARY)
+
+
+class Scanner:
+    """
+    Merged regex rules of one text field.
+
+    Attributes
+    ----------
+    rule_ids : tuple[str, ...]
+        Rules in alternation order.
+    """
+
+    def __init__(self, rules: list[Rule]):
+        self.rule_ids = tuple(rule.id for rule in rules)
+        self._groups = {f"r{n}": rule.id for n, rule in enumerate(rules)}
+        # re has no prefix scan for a leading \b; test it once for all rules.
+        sources = [rule.pattern.pattern for rule in rules]
+        self._anchor = all(_leads_with_boundary(rule.pattern) for rule in rules)
+        if self._anchor:
+            sources = [src[len(_BOUNDARY):] for src in sources]
+        self._sources = {g: _scoped(rule.pattern, src)
+                         for g, rule, src in zip(self._groups, rules, sources)}
+        self._merged: dict[frozenset, re.Pattern] = {}
+        self._single = rules[0].pattern if len(rules) == 1 else None
+
+    def _pattern(self, groups: frozenset) -> re.Pattern:
+        merged = self._merged.get(groups)
+        if merged is None:
+            merged = "|".join(f"(?P<{g}>{self._sources[g]})"
+                              for g in self._sources if g in groups)
+            merged = re.compile(rf"{_BOUNDARY}(?:{merged})" if self._anchor else merged)
+            self._merged[groups] = merged
+        return merged
+
+    def scan(self, text: str) -> set[str]:
+        """Return the IDs of the rules whose pattern occurs in ``text``."""
+        if self._single is not None:
+            return set(self.rule_ids) if self._single.search(text) else set()
+        remaining = frozenset(self._groups)
+        found, pos = set(), 0
+        while remaining:
+            m = self._pattern(remaining).search(text, pos)
+            if m is None:
+                break
+            # Other rules may also match at m.start(); look again from there.
+            found.add(self._groups[m.lastgroup])
+            remaining = remaining - {m.lastgroup}
+            pos = m.start()
+        return found
+
+
+class _Plan(NamedTuple):
+    emit: tuple[Rule, ...]
+    scanners: tuple[tuple[str, Scanner], ...]
+
+
+class RuleSet:
+    """
+    Registry of rules evaluated against per-need facts.
+
+    Parameters
+    ----------
+    facts : Callable[[str, Any], Any]
+        Builds the facts object of a need from its ID and data.
+
+    Attributes
+    ----------
+    rules : dict[str, Rule]
+        Registered rules in registration order.
+    """
+
+    def __init__(self, facts: Callable[[str, Any], Any]):
+        self.facts = facts
+        self.rules: dict[str, Rule] = {}
+        self._checkers: dict[tuple, Callable[[str, Any], list[str]]] = {}
+
+    def __contains__(self, rule_id: str) -> bool:
+        return rule_id in self.rules
+
+    def __iter__(self):
+        return iter(self.rules)
+
+    def __len__(self) -> int:
+        return len(self.rules)
+
+    def __getitem__(self, rule_id: str) -> Rule:
+        return self.rules[rule_id]
+
+    def _add(self, rule: Rule) -> Rule:
+        if rule.id in self.rules:
+            raise ValueError(f"Duplicate rule: {rule.id}")
+        self.rules[rule.id] = rule
+        self._checkers.clear()
+        return rule
+
+    def regex(self, rule_id: str, name: str, field: str, pattern: str, flags: int = 0,
+              tiers: Iterable[str | None] | None = None) -> Rule:
+        """
+        Register a rule matching when ``pattern`` occurs in ``facts.<field>``.
+
+        Parameters
+        ----------
+        rule_id : str
+            Unique rule ID.
+        name : str
+            Human-readable rule name.
+        field : str
+            Facts attribute searched.
+        pattern : str
+            Regular expression, searched anywhere in the field.
+        flags : int
+            ``re`` flags (see Notes).
+        tiers : Iterable[str | None], optional
+            Tiers the rule applies to (``None`` for unknown tiers). Default: all.
+
+        Returns
+        -------
+        Rule
+            The registered rule.
+        """
+        compiled = re.compile(pattern, flags)
+        if compiled.groupindex:
+            raise ValueError(f"Rule {rule_id} pattern must not define named groups")
+        _scoped(compiled, pattern)
+        return self._add(Rule(rule_id, name, None if tiers is None else frozenset(tiers),
+                              field=field, pattern=compiled))
+
+    def predicate(self, rule_id: str, name: str,
+                  tiers: Iterable[str | None] | None = None) -> Callable:
+        """
+        Decorator registering a function of the facts as a rule.
+
+        Parameters
+        ----------
+        rule_id : str
+            Unique rule ID.
+        name : str
+            Human-readable rule name.
+        tiers : Iterable[str | None], optional
+            Tiers the rule applies to (``None`` for unknown tiers). Default: all.
+        """
+        def register(check: Callable[[Any], bool]) -> Callable[[Any], bool]:
+            self._add(Rule(rule_id, name, None if tiers is None else frozenset(tiers),
+                           check=check))
+            return check
+        return register
+
+    def plan(self, tier: str | None, rule_ids: tuple[str, ...]) -> _Plan:
+        """Return the rules of ``rule_ids`` applying to ``tier`` and their scanners."""
+        emit = tuple(rule for rule in (self.rules[r] for r in rule_ids if r in self.rules)
+                     if rule.tiers is None or tier in rule.tiers)
+        by_field: dict[str, dict[str, Rule]] = {}
+        for rule in emit:
+            if rule.pattern is not None:
+                by_field.setdefault(rule.field, {})[rule.id] = rule
+        return _Plan(emit, tuple((field, Scanner(list(group.values())))
+                                 for field, group in by_field.items()))
+
+    def checker(self, rule_ids: Iterable[str] | None = None) -> Callable[[str, Any], list[str]]:
+        """
+        Return a function listing the rules a need violates.
+
+        Parameters
+        ----------
+        rule_ids : Iterable[str], optional
+            Rules to check, in output order; unknown IDs are ignored and
+            repeated IDs repeat in the output. Default: all, in registration
+            order.
+
+        Returns
+        -------
+        Callable[[str, Any], list[str]]
+            ``check(nid, ndata)`` returning the matching rule IDs. Plans are
+            built once per tier on first use.
+        """
+        order = tuple(self.rules) if rule_ids is None else tuple(rule_ids)
+        check = self._checkers.get(order)
+        if check is not None:
+            return check
+
+        plans: dict[str | None, _Plan] = {}
+        build_facts = self.facts
+
+        def check(nid: str, ndata: Any) -> list[str]:
+            facts = build_facts(nid, ndata)
+            plan = plans.get(facts.tier)
+            if plan is None:
+                plan = plans[facts.tier] = self.plan(facts.tier, order)
+            hits = set()
+            for field, scanner in plan.scanners:
+                text = getattr(facts, field)
+                if isinstance(text, str):
+                    hits |= scanner.scan(text)
+            return [rule.id for rule in plan.emit
+                    if (rule.id in hits if rule.check is None else rule.check(facts))]
+
+        self._checkers[order] = check
+        return check
+
+    def evaluate(self, nid: str, ndata: Any, rule_ids: Iterable[str] | None = None) -> list[str]:
+        """Return the IDs of the rules a need violates (see ``checker``)."""
+        return self.checker(rule_ids)(nid, ndata)
@@ -0,0 +1,289 @@
+"""
+Run Audit Tool.
+
+Runs the Comprehensive Traceability Audit phases in one process.
+
+needs.json is loaded once and the records and citation graph are shared by
+every phase, which runs as a library call:
+
+- ``dependency_graph``    : build_dependency_graph.build_graph
+- ``manifest_integrity``  : check_manifest_integrity.check_manifests
+- ``anti_patterns``       : detect_anti_patterns.detect (validation-cached)
+- ``tier_compliance``     : validate_tier_compliance.validate (validation-cached)
+- ``traceability_report`` : generate_traceability_report.analyze
+- ``chain_completeness``  : check_chain_completeness.report
+
+The manifest, anti-pattern, tier-compliance and traceability phases are
+checks of one ``audit_engine.Audit`` pass that visits each need once; their
+outputs are views over its findings (timed as ``audit_pass`` plus the view
+of each phase). The remaining work units only read the shared data, so
+they run concurrently in a thread pool. The result is one combined report
+with each phase's usual output, a summary and per-phase timings.
+
+Meta
+----
+Tool Definition : .agent/tools/trace_run_audit.md
+Knowledge Source: .agent/knowledge/sources/protocols/traceability_chain.md
+                  .agent/knowledge/sources/protocols/reconciliation_dirty_flag.md
+Architect       : Antigravity IDE
+
+Usage
+-----
+    python run_audit.py --needs-json docs/_build/json/needs.json
+    python run_audit.py --report docs/_build/traceability_report.md
+    python run_audit.py --phases dependency_graph,anti_patterns --jobs 1
+    python run_audit.py --processes 32
+
+Exit Codes
+----------
+0 : Success (combined JSON report printed to stdout)
+1 : Error (a phase failed or needs.json could not be loaded)
+
+Notes
+-----
+- Threads rather than processes per phase: the phases are short and a
+  process per phase would have to ship or reload all the needs, which is
+  the cost this runner exists to avoid. The manifest phase's file reads
+  overlap with the CPU-bound phases.
+- ``--processes N`` instead runs the per-need phases (anti_patterns,
+  tier_compliance, traceability_report, chain_completeness) shard-parallel in one shared
+  pool of N worker processes (partition_graph.run_sharded); each worker
+  receives only its shard of the needs.
+- Phase outputs are identical to the stand-alone tools run with default
+  options.
+"""
+import argparse
+import json
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable
+
+from audit_engine import CHECKS, VIEWS, Audit
+from build_dependency_graph import build_graph
+from check_chain_completeness import report as chain_report
+from citation_graph import load_graph
+from generate_traceability_report import format_out
+from needs_store import load_records
+from partition_graph import run_sharded
+
+PHASES: tuple[str, ...] = (
+    "dependency_graph", "manifest_integrity", "anti_patterns", "tier_compliance",
+    "traceability_report", "chain_completeness",
+)
+
+# Phases whose work is per need and can run shard-parallel (--processes).
+SHARDED_PHASES: tuple[str, ...] = (
+    "anti_patterns", "tier_compliance", "traceability_report", "chain_completeness",
+)
+
+
+def _timed(run: Callable[[], Any]) -> tuple[Any, float, str | None]:
+    start = time.perf_counter()
+    try:
+        result, error = run(), None
+    except Exception as e:
+        result, error = None, f"{type(e).__name__}: {e}"
+    return result, round((time.perf_counter() - start) * 1000, 3), error
+
+
+def run_audit(needs_path: Path, manifest_dir: Path,
+              phases: tuple[str, ...] = PHASES, jobs: int | None = None,
+              processes: int | None = None) -> dict:
+    """
+    Run audit phases against one loaded needs set.
+
+    Parameters
+    ----------
+    needs_path : Path
+        Path to needs.json.
+    manifest_dir : Path
+        Directory scanned for reconciliation manifests.
+    phases : tuple[str, ...]
+        Phases to run (subset of ``PHASES``).
+    jobs : int, optional
+        Worker threads; defaults to one per phase. 1 runs them in order.
+    processes : int, optional
+        If given, run the per-need phases shard-parallel across this many
+        worker processes.
+
+    Returns
+    -------
+    dict
+        ``success``, ``summary``, ``timings_ms`` (``load``, one entry per
+        phase and ``audit_pass`` if the audit engine ran), ``phases`` (each
+        phase's output) and ``errors``.
+
+    Raises
+    ------
+    FileNotFoundError
+        If needs.json does not exist.
+    ValueError
+        If needs.json cannot be parsed or a phase name is unknown.
+    """
+    unknown = [p for p in phases if p not in PHASES]
+    if unknown:
+        raise ValueError(f"Unknown phase(s): {', '.join(unknown)}. Valid: {', '.join(PHASES)}")
+
+    start = time.perf_counter()
+    needs = load_records(needs_path)
+    graph = load_graph(needs_path, needs)
+    timings = {"load": round((time.perf_counter() - start) * 1000, 3)}
+
+    work: dict[str, Callable[[], Any]] = {
+        "dependency_graph": lambda: build_graph(needs, False, graph),
+        "chain_completeness": lambda: chain_report(needs, graph),
+    }
+
+    selected = [p for p in PHASES if p in phases]
+    shard_pool = ProcessPoolExecutor(processes) if processes and processes > 1 else None
+    if shard_pool is not None:
+        for phase in SHARDED_PHASES:
+            work[phase] = (lambda task: lambda: run_sharded(
+                needs, graph, task, processes, executor=shard_pool))(phase)
+    # The stand-alone CLI adds "success" to the report it prints.
+    chain = work["chain_completeness"]
+    work["chain_completeness"] = lambda: {"success": True, **chain()}
+    checks = tuple(p for p in selected if p in CHECKS and p not in work)
+    units = [p for p in selected if p in work]
+    if checks:
+        work["audit_pass"] = lambda: Audit(needs, checks, manifest_dir, needs_path).run()
+        units.append("audit_pass")
+    try:
+        with ThreadPoolExecutor(max_workers=jobs or len(units) or 1) as pool:
+            futures = {u: pool.submit(_timed, work[u]) for u in units}
+            outcomes = {u: f.result() for u, f in futures.items()}
+    finally:
+        if shard_pool is not None:
+            shard_pool.shutdown()
+
+    if checks:
+        audit, timings["audit_pass"], error = outcomes["audit_pass"]
+        for check in checks:
+            if error or check in audit.errors:
+                outcomes[check] = (None, 0.0, error or audit.errors[check])
+            else:
+                outcomes[check] = _timed(lambda: VIEWS[check](audit))
+
+    results, errors = {}, {}
+    for phase in selected:
+        result, elapsed, error = outcomes[phase]
+        timings[phase] = elapsed
+        if error is None:
+            results[phase] = result
+        else:
+            errors[phase] = error
+    timings["total"] = round((time.perf_counter() - start) * 1000, 3)
+
+    return {"success": not errors, "needs_json": str(needs_path),
+            "summary": summarize(results), "timings_ms": timings,
+            "phases": results, "errors": errors}
+
+
+def summarize(results: dict) -> dict:
+    """
+    Collect the headline counts of the audit phases that ran.
+
+    Parameters
+    ----------
+    results : dict
+        Phase name -> phase output.
+
+    Returns
+    -------
+    dict
+        Counts keyed as in the audit workflow outputs.
+    """
+    summary = {}
+    if "dependency_graph" in results:
+        stats = results["dependency_graph"]["stats"]
+        summary.update(orphan_count=stats["orphan_count"], has_cycles=stats["has_cycles"])
+    if "manifest_integrity" in results:
+        summary["manifest_issues"] = results["manifest_integrity"]["issues"]
+    if "anti_patterns" in results:
+        summary["anti_patterns"] = results["anti_patterns"]["violations"]
+    if "tier_compliance" in results:
+        summary["tier_violations"] = results["tier_compliance"]["violations"]
+    if "traceability_report" in results:
+        summary["violations"] = results["traceability_report"]["summary"]["violations"]
+    if "chain_completeness" in results:
+        summary["broken_chains"] = results["chain_completeness"]["summary"]["invalid"]
+    return summary
+
+
+def main() -> int:
+    """
+    CLI entry point for run_audit.
+
+    Returns
+    -------
+    int
+        Exit code (0=success, 1=error).
+    """
+    parser = argparse.ArgumentParser(
+        description="Run the traceability audit phases against one loaded needs.json."
+    )
+    parser.add_argument(
+        "--needs-json",
+        default="docs/_build/json/needs.json",
+        help="Path to needs.json file"
+    )
+    parser.add_argument(
+        "--manifest-dir",
+        default="docs/",
+        help="Directory to scan for reconciliation manifests"
+    )
+    parser.add_argument(
+        "--phases",
+        help=f"Comma-separated phases to run (default: all of {', '.join(PHASES)})"
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=None,
+        help="Worker threads (default: one per phase; 1 runs phases in order)"
+    )
+    parser.add_argument(
+        "--processes",
+        type=int,
+        default=None,
+        help="Run per-need phases shard-parallel across this many processes"
+    )
+    parser.add_argument(
+        "--report",
+        help="Also write the markdown traceability report to this path"
+    )
+
+    args = parser.parse_args()
+
+    path = Path(args.needs_json)
+    if not path.exists():
+        print(f"Error: {path} not found", file=sys.stderr)
+        return 1
+
+    try:
+        phases = tuple(p.strip() for p in args.phases.split(",")) if args.phases else PHASES
+        result = run_audit(path, Path(args.manifest_dir), phases, args.jobs,
+                           args.processes)
+
+        if args.report and "traceability_report" in result["phases"]:
+            report = format_out(result["phases"]["traceability_report"], "markdown")
+            Path(args.report).write_text(report + "\n", encoding="utf-8")
+            result["report_path"] = args.report
+
+        print(json.dumps(result, indent=2))
+        for phase, error in result["errors"].items():
+            print(f"Error in phase {phase}: {error}", file=sys.stderr)
+        return 0 if result["success"] else 1
+
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    except Exception as e:
+        print(f"Error running audit: {e}", file=sys.stderr)
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -23,12 +23,11 @@ import argparse
 import json
 import re
 import sys
-from dataclasses import dataclass
-from typing import Optional
+from functools import lru_cache
+from typing import NamedTuple, Optional
 
 
-@dataclass
-class ScoringResult:
+class ScoringResult(NamedTuple):
     """Result of scoring matrix resolution."""
     winner: str
     scores: dict[str, float]
@@ -107,6 +106,13 @@ TIER_PRECEDENCE = ["ISP", "TDD", "ICD", "SAD", "FSD", "NFR", "BRD"]
 VALID_TIERS = ["BRD", "NFR", "FSD", "SAD", "ICD", "TDD", "ISP"]
 
 
+@lru_cache(maxsize=None)
+def _compiled_patterns(factor_key: str) -> tuple[tuple[str, re.Pattern], ...]:
+    """Compile a factor's patterns on first use rather than at import."""
+    return tuple((p, re.compile(p, re.IGNORECASE))
+                 for p in SCORING_MATRIX[factor_key].get("patterns", []))
+
+
 def evaluate_factor(text: str, factor_key: str) -> tuple[bool, list[str]]:
     """
     Evaluate whether a factor is present in the text.
@@ -128,8 +134,8 @@ def evaluate_factor(text: str, factor_key: str) -> tuple[bool, list[str]]:
     indicators = []
 
     # Check patterns
-    for pattern in factor.get("patterns", []):
-        if re.search(pattern, text_lower, re.IGNORECASE):
+    for pattern, regex in _compiled_patterns(factor_key):
+        if regex.search(text_lower):
             indicators.append(f"pattern:{pattern[:25]}")
 
     # Check keywords
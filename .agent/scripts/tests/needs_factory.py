@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Randomized needs shared by the tests that compare two ways of checking them."""
+
+import random
+
+TIERS = ("BRD", "NFR", "FSD", "SAD", "ICD", "TDD", "ISP")
+
+# Tags outside the DDR tiers: a glossary term and a malformed ID.
+EXTRA_IDS = ("TERM-1", "fsd-x")
+
+TITLES = ("T", None, "")  # None: the tag's own ID
+CONTENTS = ("", "The user shall see it.", "def f(): pass", "Uses a REST API",
+            '"""Stub."""\npass')
+DANGLING = ("TDD-999", "ISP-999")
+
+
+def random_needs(seed: int, size: int = 120, with_id: bool = True,
+                 missing: float = 0.0) -> dict:
+    """
+    Return DDR-shaped needs with every link and content shape the checkers meet.
+
+    Links cross tiers, cite siblings, point at undefined tags or are absent.
+    Titles repeat the ID or are empty; content trips the anti-pattern and
+    tier rules.
+
+    Parameters
+    ----------
+    seed : int
+        Random seed; equal seeds give equal needs.
+    size : int
+        Number of tier tags (``EXTRA_IDS`` are added).
+    with_id : bool
+        Whether each need repeats its ID under ``id``.
+    missing : float
+        Chance that each of ``title``, ``content`` and ``links`` is left out.
+
+    Returns
+    -------
+    dict
+        Need ID -> raw need dict, with ``docname`` and ``lineno``.
+    """
+    rng = random.Random(seed)
+    ids = [f"{rng.choice(TIERS)}-{i}" for i in range(size)] + list(EXTRA_IDS)
+    needs = {}
+    for lineno, nid in enumerate(ids):
+        need = {"id": nid} if with_id else {}
+        title = rng.choice(TITLES)
+        links = [link for link in rng.sample(ids, rng.randrange(0, 3)) if link != nid]
+        if rng.random() < 0.2:
+            links.append(rng.choice(DANGLING))
+        fields = {"title": nid if title is None else title,
+                  "content": rng.choice(CONTENTS), "links": links}
+        need.update((k, v) for k, v in fields.items() if rng.random() >= missing)
+        need.update(docname="doc", lineno=lineno)
+        needs[nid] = need
+    return needs
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Unit tests for audit_engine.py."""
+
+import json
+import shutil
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from audit_engine import CHECKS, VIEWS, Audit, report  # noqa: E402
+from check_manifest_integrity import check_manifests  # noqa: E402
+from detect_anti_patterns import detect  # noqa: E402
+from generate_traceability_report import analyze  # noqa: E402
+from needs_factory import random_needs  # noqa: E402
+from needs_store import load_records  # noqa: E402
+from validate_tier_compliance import validate  # noqa: E402
+
+NEEDS = {
+    "BRD-1": {"title": "Root", "content": "Business KPI for the user", "links": [],
+              "docname": "01_brd/brd", "lineno": 7},
+    "FSD-1": {"title": "Wake", "content": "When the user speaks, then wake", "links": ["BRD-1"],
+              "docname": "03_fsd/fsd", "lineno": 3},
+    "FSD-2": {"title": "Echo", "content": "The user can hear it", "links": ["FSD-1"],
+              "docname": "03_fsd/fsd", "lineno": 12},
+    "FSD-3": {"title": "Lost", "content": "The user can see it", "links": ["FSD-99"],
+              "docname": "03_fsd/fsd", "lineno": 20},
+}
+
+
+class TestAudit(unittest.TestCase):
+    def setUp(self):
+        self.tmp = Path(tempfile.mkdtemp())
+        (self.tmp / "sec").mkdir()
+        (self.tmp / "sec" / "reconciliation_manifest.rst").write_text(
+            ':section_id: x\n:integrity_status: "MAYBE"\n'
+            ':pending_items: [{"target_tag": "FSD-404"}]\n', encoding="utf-8")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def test_views_equal_standalone_tools(self):
+        for seed in range(3):
+            needs = random_needs(seed, 100, with_id=False)
+            audit = Audit(needs, manifest_dir=self.tmp).run()
+            expected = {"anti_patterns": detect(needs), "tier_compliance": validate(needs),
+                        "traceability_report": analyze(needs),
+                        "manifest_integrity": check_manifests(self.tmp, needs)}
+            for check in CHECKS:
+                self.assertEqual(json.dumps(VIEWS[check](audit)), json.dumps(expected[check]))
+            self.assertEqual(VIEWS["traceability_report"](audit, "ERROR"), analyze(needs, "ERROR"))
+
+    def test_cached_run_matches(self):
+        path = self.tmp / "needs.json"
+        path.write_text(json.dumps({"current_version": "1",
+                                    "versions": {"1": {"needs": random_needs(4, 100, with_id=False)}}}))
+        needs = load_records(path)
+        for _ in range(2):
+            audit = Audit(needs, ("anti_patterns", "tier_compliance"), needs_path=path).run()
+            self.assertEqual(VIEWS["anti_patterns"](audit), detect(needs))
+            self.assertEqual(VIEWS["tier_compliance"](audit), validate(needs))
+        self.assertEqual(audit._caches["anti_patterns"].misses, 0)
+
+    def test_stream_order_and_location(self):
+        findings = Audit(NEEDS, manifest_dir=self.tmp).run().findings
+        self.assertEqual([(f.id, f.check) for f in findings if f.id == "FSD-2"],
+                         [("FSD-2", "anti_patterns"), ("FSD-2", "traceability_report")])
+        self.assertEqual((findings[0].docname, findings[0].lineno), ("03_fsd/fsd", 12))
+        self.assertEqual(findings[-1].message, "Pending item targets unknown tag 'FSD-404'")
+
+    def test_combined_report_drops_restated_anti_patterns(self):
+        result = report(Audit(NEEDS, manifest_dir=self.tmp).run())
+        rules = [(f["id"], f["rule"]) for f in result["findings"]]
+        # FSD-2's sibling citation is reported once; FSD-3's link does not
+        # resolve, so its AP003 is not a SIBLING_CITATION and stays.
+        self.assertNotIn(("FSD-2", "AP003"), rules)
+        self.assertIn(("FSD-2", "SIBLING_CITATION"), rules)
+        self.assertIn(("FSD-3", "AP003"), rules)
+        self.assertIn(("FSD-3", "MISSING_PARENT"), rules)
+        self.assertEqual(result["summary"]["duplicates_dropped"], 1)
+        self.assertEqual(result["summary"]["checked"]["tier_compliance"], 4)
+
+    def test_failing_check_stops_alone(self):
+        needs = {**NEEDS, "FSD-9": {"title": "Bad", "content": "x", "links": [["BRD-1"]]}}
+        audit = Audit(needs, ("anti_patterns", "traceability_report")).run()
+        self.assertIn("traceability_report", audit.errors)
+        self.assertEqual(VIEWS["anti_patterns"](audit), detect(needs))
+        with self.assertRaises(RuntimeError):
+            VIEWS["traceability_report"](audit)
+
+    def test_arguments(self):
+        with self.assertRaises(ValueError):
+            Audit(NEEDS, ("lint",))
+        with self.assertRaises(ValueError):
+            Audit(NEEDS, ("manifest_integrity",))
+        with self.assertRaises(ValueError):
+            VIEWS["anti_patterns"](Audit(NEEDS, ("tier_compliance",)).run())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Unit tests for batch_io.py."""
+
+import argparse
+import io
+import json
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from batch_io import add_batch_argument, is_batch, read_requests, run_batch  # noqa: E402
+
+
+def make_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser()
+    add_batch_argument(parser)
+    return parser
+
+
+class TestArguments(unittest.TestCase):
+    def test_single_id_is_not_batch(self):
+        self.assertFalse(is_batch(make_parser().parse_args(["--id", "FSD-1"])))
+
+    def test_repeated_id_or_batch_file_is_batch(self):
+        self.assertTrue(is_batch(make_parser().parse_args(["--id", "A", "--id", "B"])))
+        self.assertTrue(is_batch(make_parser().parse_args(["--batch", "-"])))
+
+
+class TestReadRequests(unittest.TestCase):
+    def test_line_formats(self):
+        stream = io.StringIO('FSD-1\n"FSD-2"\n\n# comment\n{"id": "FSD-3", "recursive": true}\n{"id": }\n')
+        requests = list(read_requests(stream))
+        self.assertEqual(requests[:3], [{"id": "FSD-1"}, {"id": "FSD-2"},
+                                        {"id": "FSD-3", "recursive": True}])
+        self.assertIn("line 6", requests[3]["_error"])
+
+
+class TestRunBatch(unittest.TestCase):
+    def test_streams_results_and_failures_in_order(self):
+        def handle(id):
+            if id == "BAD":
+                raise ValueError("Tag not found: BAD")
+            return {"success": True, "id": id}
+
+        out = io.StringIO()
+        code = run_batch([{"id": "A"}, {"id": "BAD"}, {"id": "B", "x": 1}, {"id": "C"}],
+                         handle, allowed={"id"}, out=out)
+        lines = [json.loads(line) for line in out.getvalue().splitlines()]
+        self.assertEqual(code, 1)
+        self.assertEqual([r["success"] for r in lines], [True, False, False, True])
+        self.assertEqual(lines[1]["error"], "Tag not found: BAD")
+        self.assertIn("Unknown request keys: x", lines[2]["error"])
+
+    def test_wrong_field_types_fail_alone(self):
+        def handle(id, recursive=False):
+            return {"success": True, "id": id.strip(), "recursive": recursive}
+
+        requests = [{"id": 5}, {"id": "A", "recursive": "false"}, {"id": None},
+                    {"id": "B", "recursive": None}, {"id": "C", "recursive": True}]
+        out = io.StringIO()
+        code = run_batch(requests, handle, allowed={"id", "recursive"}, out=out)
+        lines = [json.loads(line) for line in out.getvalue().splitlines()]
+        self.assertEqual(code, 1)
+        self.assertEqual([r["success"] for r in lines], [False, False, False, True, True])
+        self.assertEqual(lines[0]["error"], "Request field 'id' must be a string, not 5")
+        self.assertIn("'recursive' must be true or false", lines[1]["error"])
+
+    def test_all_success_exits_zero(self):
+        out = io.StringIO()
+        self.assertEqual(run_batch([{"id": "A"}], lambda id: {"success": True}, {"id"}, out), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Unit tests for blast_radius.py."""
+
+import json
+import random
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import blast_radius  # noqa: E402
+from blast_radius import BlastRadius, discounted_fanout, score_graph  # noqa: E402
+from citation_graph import CitationGraph  # noqa: E402
+from update_tag import update_tag  # noqa: E402
+
+NEEDS = {
+    "BRD-1": {"docname": "01_brd/brd", "links": []},
+    "FSD-1": {"docname": "03_fsd/fsd", "links": ["BRD-1"]},
+    "FSD-2": {"docname": "03_fsd/fsd", "links": ["BRD-1"]},
+    "TDD-1": {"docname": "06_tdd/tdd", "links": ["FSD-1", "FSD-2"]},
+    "ISP-1": {"docname": "07_isp/isp", "links": ["TDD-1"]},
+    "NFR-1": {"docname": "02_nfr/nfr", "links": ["NFR-2"]},
+    "NFR-2": {"docname": "02_nfr/nfr", "links": ["NFR-1"]},
+}
+
+
+def path_counts(graph, node, depth):
+    """Reference: citation paths of each length 1..depth ending at ``node``."""
+    counts, frontier = [], {node: 1}
+    for _ in range(depth):
+        nxt = {}
+        for u, n in frontier.items():
+            for c in graph.children(u):
+                nxt[c] = nxt.get(c, 0) + n
+        counts.append(sum(nxt.values()))
+        frontier = nxt
+    return counts
+
+
+class TestBlastRadius(unittest.TestCase):
+    def setUp(self):
+        self.graph = CitationGraph.from_needs(NEEDS)
+        self.radius = BlastRadius(*score_graph(self.graph, NEEDS))
+
+    def test_metrics(self):
+        brd = self.radius.entry("BRD-1")
+        self.assertEqual(brd["descendants"], 4)
+        # FSD 2 + 2, TDD 3, ISP 4.
+        self.assertEqual(brd["weighted_descendants"], 11.0)
+        # Paths: 2 of length 1, 2 of length 2, 2 of length 3.
+        self.assertEqual(brd["fanout"], 2 + 0.5 * 2 + 0.25 * 2)
+        self.assertEqual(brd["manifests"], ["01_brd", "03_fsd", "06_tdd", "07_isp"])
+        self.assertEqual(brd["score"], 11.0 + 3.5 + 5.0 * 4)
+        self.assertEqual(brd["rank"], 1)
+        self.assertTrue(brd["high_risk"])
+
+    def test_leaf_and_cycle(self):
+        leaf = self.radius.entry("ISP-1")
+        self.assertEqual((leaf["descendants"], leaf["fanout"], leaf["manifests"]),
+                         (0, 0.0, ["07_isp"]))
+        self.assertFalse(leaf["high_risk"])
+        # Cycle members reach each other and themselves.
+        self.assertEqual(self.radius.entry("NFR-1")["descendants"], 2)
+
+    def test_unknown_tag(self):
+        with self.assertRaises(KeyError):
+            self.radius.entry("XXX-1")
+
+    def test_top_and_tier_filter(self):
+        self.assertEqual([e["id"] for e in self.radius.top(2)], ["BRD-1", "FSD-1"])
+        self.assertEqual([e["id"] for e in self.radius.top(5, "TDD")], ["TDD-1"])
+
+    def test_fanout_matches_path_counts(self):
+        rng = random.Random(3)
+        ids = [f"N-{i}" for i in range(60)]
+        needs = {n: {"links": rng.sample(ids, rng.randrange(0, 4))} for n in ids}
+        graph = CitationGraph.from_needs(needs)
+        for depth in (1, 3, 6):
+            fanout = discounted_fanout(graph, depth, 0.5)
+            for i in range(len(graph.ids)):
+                expected = sum(0.5 ** k * n for k, n in enumerate(path_counts(graph, i, depth)))
+                self.assertAlmostEqual(fanout[i], expected, places=6)
+
+    def test_pure_python_matches_numpy(self):
+        if blast_radius.np is None:
+            self.skipTest("numpy not installed")
+        vectorized = discounted_fanout(self.graph)
+        saved, blast_radius.np = blast_radius.np, None
+        try:
+            self.assertEqual(discounted_fanout(self.graph), vectorized)
+        finally:
+            blast_radius.np = saved
+
+
+class TestUpdateTagBlastRadius(unittest.TestCase):
+    def test_update_reports_blast_radius(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "needs.json"
+            needs = {k: {"id": k, "title": k, **v} for k, v in NEEDS.items()}
+            path.write_text(json.dumps(
+                {"current_version": "1", "versions": {"1": {"needs": needs}}}), encoding="utf-8")
+            result = update_tag("BRD-1", "title", "New", path)
+        self.assertEqual(result["update"]["blast_radius"]["rank"], 1)
+        self.assertIn("blast_radius_warning", result)
+        self.assertEqual([c["blast_radius"] for c in result["update"]["affected_children"]],
+                         [3 * 1.0 + 4.0 + 1 + 0.5 + 5.0 * 3] * 2)
+
+    def test_index_mode_only_reuses_a_fresh_snapshot(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "needs.json"
+            needs = {k: {"id": k, "title": k, **v} for k, v in NEEDS.items()}
+            path.write_text(json.dumps(
+                {"current_version": "1", "versions": {"1": {"needs": needs}}}), encoding="utf-8")
+            cold = update_tag("BRD-1", "title", "New", path, use_index=True)
+            blast_radius.load_blast_radius(path)
+            warm = update_tag("BRD-1", "title", "New", path, use_index=True)
+        self.assertNotIn("blast_radius", cold["update"])
+        self.assertEqual(warm["update"]["blast_radius"]["rank"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
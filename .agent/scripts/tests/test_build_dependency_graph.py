@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Unit tests for build_dependency_graph.py."""
+
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from build_dependency_graph import build_graph  # noqa: E402
+
+
+class TestBuildGraph(unittest.TestCase):
+    def test_reports_cycle_members_and_edges(self):
+        needs = {
+            "BRD-1": {"title": "Root", "links": []},
+            "FSD-1": {"title": "A", "links": ["BRD-1", "FSD-2"]},
+            "FSD-2": {"title": "B", "links": ["FSD-1"]},
+            "SAD-1": {"title": "C", "links": ["FSD-2"]},
+        }
+        result = build_graph(needs)
+        self.assertTrue(result["stats"]["has_cycles"])
+        self.assertEqual(result["cycles"], [{
+            "members": ["FSD-1", "FSD-2"],
+            "edges": [{"source": "FSD-1", "target": "FSD-2"},
+                      {"source": "FSD-2", "target": "FSD-1"}],
+        }])
+
+    def test_acyclic(self):
+        result = build_graph({"BRD-1": {"links": []}, "FSD-1": {"links": ["BRD-1"]}})
+        self.assertFalse(result["stats"]["has_cycles"])
+        self.assertEqual(result["cycles"], [])
+
+
+if __name__ == "__main__":
+    unittest.main()
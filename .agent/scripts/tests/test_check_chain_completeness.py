@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Unit tests for check_chain_completeness.py."""
+
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from check_chain_completeness import check_chains, report  # noqa: E402
+
+NEEDS = {
+    "BRD-1": {"links": []},
+    "NFR-1": {"links": ["BRD-1"]},
+    "FSD-1": {"links": ["NFR-1", "BRD-1"]},
+    "SAD-1": {"links": ["FSD-1"]},
+    "ICD-1": {"links": ["NFR-1"]},
+    "TDD-1": {"links": ["SAD-1", "ICD-1"]},
+    "ISP-1": {"links": ["TDD-1"]},
+    "FSD-2": {"links": ["FSD-1"]},          # sibling step only
+    "SAD-2": {"links": ["FSD-2"]},          # legal step onto a broken parent
+    "TDD-2": {"links": []},
+    "ISP-2": {"links": ["TDD-9"]},
+    "DOC-1": {"links": ["BRD-1"]},
+}
+
+
+class TestCheckChains(unittest.TestCase):
+    def setUp(self):
+        self.results = {r["id"]: r for r in check_chains(NEEDS)}
+
+    def test_shortest_chain_prefers_first_link_on_ties(self):
+        self.assertEqual(self.results["FSD-1"]["chain"], ["FSD-1", "BRD-1"])
+        self.assertEqual(self.results["TDD-1"]["chain"], ["TDD-1", "SAD-1", "FSD-1", "BRD-1"])
+        self.assertEqual(self.results["ISP-1"]["length"], 4)
+        self.assertEqual(self.results["BRD-1"]["chain"], ["BRD-1"])
+
+    def test_failure_reasons(self):
+        reasons = {k: r.get("reason") for k, r in self.results.items() if not r["valid"]}
+        self.assertEqual(reasons, {
+            "FSD-2": "ILLEGAL_TIER_STEP",
+            "SAD-2": "BROKEN_CHAIN",
+            "TDD-2": "ORPHAN",
+            "ISP-2": "MISSING_PARENT",
+            "DOC-1": "UNKNOWN_TIER",
+        })
+
+    def test_summary(self):
+        summary = report(NEEDS, invalid_only=True)["summary"]
+        self.assertEqual((summary["valid"], summary["invalid"], summary["max_length"]), (7, 5, 4))
+
+    def test_cycle_is_not_followed(self):
+        needs = {"BRD-1": {"links": []}, "SAD-1": {"links": ["SAD-2"]},
+                 "SAD-2": {"links": ["SAD-1"]}}
+        results = {r["id"]: r for r in check_chains(needs)}
+        self.assertEqual(results["SAD-1"]["reason"], "ILLEGAL_TIER_STEP")
+
+
+if __name__ == "__main__":
+    unittest.main()
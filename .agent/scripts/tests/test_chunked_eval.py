@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Unit tests for chunked_eval.py and the tools' --jobs mode."""
+
+import json
+import shutil
+import sys
+import tempfile
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import chunked_eval  # noqa: E402
+from chunked_eval import ABSENT, project, restore, run_chunked  # noqa: E402
+from detect_anti_patterns import detect  # noqa: E402
+from generate_traceability_report import analyze  # noqa: E402
+from needs_factory import random_needs  # noqa: E402
+from needs_store import Need, load_records  # noqa: E402
+from validate_tier_compliance import validate  # noqa: E402
+from validation_cache import ValidationCache  # noqa: E402
+
+def one(chunk):
+    return [nid for nid, _ in chunk]
+
+
+def keys(chunk, suffix, size):
+    return [f"{sorted(ndata)}{suffix}{size}" for _, ndata in chunk]
+
+
+def chunk_len(chunk):
+    return (len(chunk),)
+
+
+class TestRunChunked(unittest.TestCase):
+    def setUp(self):
+        self.min_chunk, chunked_eval.MIN_CHUNK = chunked_eval.MIN_CHUNK, 1
+
+    def tearDown(self):
+        chunked_eval.MIN_CHUNK = self.min_chunk
+
+    def test_projection(self):
+        need = {"title": "T", "links": ["BRD-1"], "docname": "doc"}
+        row = project(need, ("title", "content", "links"))
+        self.assertEqual(row, ("T", ABSENT, ["BRD-1"]))
+        self.assertEqual(restore(("title", "content", "links"), row),
+                         {"title": "T", "links": ["BRD-1"]})
+        self.assertEqual(project(Need("FSD-1", content="x"), ("content", "status")), ("x", None))
+
+    def test_order_and_context(self):
+        pairs = [(f"N-{i}", {"title": str(i), "content": "x"}) for i in range(23)]
+        with ProcessPoolExecutor(2) as pool:
+            self.assertEqual(run_chunked(one, pairs, (), chunk_size=4, executor=pool),
+                             [nid for nid, _ in pairs])
+            results = run_chunked(keys, pairs, ("title",), args=(":",), context=chunk_len,
+                                  chunk_size=5, executor=pool)
+        self.assertEqual(results, ["['title']:5"] * 20 + ["['title']:3"] * 3)
+        # In-process runs see the unprojected needs.
+        self.assertEqual(run_chunked(keys, pairs, ("title",), 1, (":",), chunk_len)[0],
+                         "['content', 'title']:23")
+
+
+class TestJobs(unittest.TestCase):
+    def setUp(self):
+        self.min_chunk, chunked_eval.MIN_CHUNK = chunked_eval.MIN_CHUNK, 1
+
+    def tearDown(self):
+        chunked_eval.MIN_CHUNK = self.min_chunk
+
+    def assertSameReport(self, serial, parallel):
+        self.assertEqual(json.dumps(parallel, indent=2), json.dumps(serial, indent=2))
+
+    def test_reports_equal_serial(self):
+        for seed in range(3):
+            needs = random_needs(seed, missing=0.1)
+            self.assertSameReport(detect(needs), detect(needs, jobs=3))
+            self.assertSameReport(detect(needs, ["AP006", "AP002"]),
+                                  detect(needs, ["AP006", "AP002"], jobs=3))
+            self.assertSameReport(validate(needs), validate(needs, jobs=3))
+            self.assertSameReport(validate(needs, target_tier="ISP"),
+                                  validate(needs, target_tier="ISP", jobs=3))
+            self.assertSameReport(analyze(needs), analyze(needs, jobs=3))
+            self.assertSameReport(analyze(needs, "WARNING"), analyze(needs, "WARNING", jobs=3))
+
+    def test_malformed_links_fail_alike(self):
+        needs = {**random_needs(4, missing=0.1), "FSD-900": {"links": [["BRD-1"]]}}
+        with self.assertRaises(AttributeError):
+            analyze(needs)
+        with self.assertRaises(AttributeError):
+            analyze(needs, jobs=3)
+
+    def test_cache_misses_only(self):
+        tmp = Path(tempfile.mkdtemp())
+        try:
+            path = tmp / "needs.json"
+            path.write_text(json.dumps({"current_version": "1",
+                                        "versions": {"1": {"needs": random_needs(5, missing=0.1)}}}))
+            needs = load_records(path)
+            for _ in range(2):
+                anti = ValidationCache(path, "anti_patterns", "v1", needs)
+                tier = ValidationCache(path, "tier_compliance", "v1", needs)
+                self.assertSameReport(detect(needs), detect(needs, cache=anti, jobs=3))
+                self.assertSameReport(validate(needs), validate(needs, cache=tier, jobs=3))
+                anti.save()
+                tier.save()
+            self.assertEqual((anti.misses, tier.misses), (0, 0))
+            self.assertEqual(anti.pending(needs.items()), [])
+        finally:
+            shutil.rmtree(tmp)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Unit tests for citation_graph.py."""
+
+import json
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from citation_graph import CitationGraph, load_graph  # noqa: E402
+
+
+def make_needs(links: dict[str, list[str]]) -> dict:
+    """Build raw need dicts from an id -> links mapping."""
+    return {nid: {"id": nid, "title": nid, "links": plist} for nid, plist in links.items()}
+
+
+NEEDS = make_needs({
+    "BRD-1": [],
+    "FSD-1": ["BRD-1"],
+    "FSD-2": ["BRD-1", "BRD-1"],
+    "SAD-1": ["FSD-1", "FSD-2"],
+    "TDD-1": ["SAD-1", "ICD-9"],
+})
+
+
+class TestCitationGraph(unittest.TestCase):
+    def setUp(self):
+        self.graph = CitationGraph.from_needs(NEEDS)
+
+    def test_forward_and_reverse_adjacency(self):
+        self.assertEqual(self.graph.parents_of("SAD-1"), ["FSD-1", "FSD-2"])
+        self.assertEqual(self.graph.children_of("BRD-1"), ["FSD-1", "FSD-2"])
+        self.assertEqual(self.graph.children_of("UNKNOWN"), [])
+
+    def test_duplicate_links_collapse(self):
+        self.assertEqual(self.graph.parents_of("FSD-2"), ["BRD-1"])
+        self.assertEqual(self.graph.edge_count, 6)
+
+    def test_unresolved_targets_are_appended(self):
+        self.assertEqual(self.graph.need_count, 5)
+        i = self.graph.index["ICD-9"]
+        self.assertFalse(self.graph.is_resolved(i))
+        self.assertEqual(self.graph.children_of("ICD-9"), ["TDD-1"])
+
+    def test_traverse_depth_and_direction(self):
+        down = [self.graph.ids[i] for i in self.graph.traverse(["BRD-1"], "down", 1)]
+        self.assertEqual(down, ["BRD-1", "FSD-1", "FSD-2"])
+        up = {self.graph.ids[i] for i in self.graph.traverse(["TDD-1"], "up")}
+        self.assertEqual(up, {"TDD-1", "SAD-1", "ICD-9", "FSD-1", "FSD-2", "BRD-1"})
+
+    def test_invalid_direction_raises(self):
+        with self.assertRaises(ValueError):
+            self.graph.traverse(["BRD-1"], "sideways")
+
+    def test_acyclic_components_are_parents_first(self):
+        components = self.graph.strongly_connected_components()
+        self.assertTrue(all(len(c) == 1 for c in components))
+        position = {c[0]: k for k, c in enumerate(components)}
+        for child, parent in self.graph.edges():
+            self.assertLess(position[parent], position[child])
+        self.assertEqual(self.graph.cycles(), [])
+
+
+class TestCycles(unittest.TestCase):
+    def test_cycles_and_self_loop(self):
+        graph = CitationGraph.from_needs(make_needs({
+            "FSD-1": ["FSD-3"],
+            "FSD-2": ["FSD-1"],
+            "FSD-3": ["FSD-2"],
+            "SAD-1": ["FSD-3", "SAD-1"],
+            "TDD-1": ["SAD-1"],
+        }))
+        found = [[graph.ids[n] for n in c] for c in graph.cycles()]
+        self.assertEqual(found, [["FSD-1", "FSD-2", "FSD-3"], ["SAD-1"]])
+
+    def test_deep_chain_does_not_recurse(self):
+        depth = sys.getrecursionlimit() * 5
+        links = {f"TDD-{i}": [f"TDD-{i - 1}"] if i else [] for i in range(depth)}
+        links["TDD-0"] = [f"TDD-{depth - 1}"]
+        graph = CitationGraph.from_needs(make_needs(links))
+        cycles = graph.cycles()
+        self.assertEqual(len(cycles), 1)
+        self.assertEqual(len(cycles[0]), depth)
+
+
+class TestMappedSnapshot(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.path = Path(self._tmp.name) / "needs.json"
+        data = {"current_version": "0.1",
+                "versions": {"0.1": {"needs": NEEDS}}}
+        self.path.write_text(json.dumps(data), encoding="utf-8")
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_second_load_is_mapped_and_equivalent(self):
+        built = load_graph(self.path, NEEDS)
+        mapped = load_graph(self.path)
+        self.assertFalse(built.is_mapped)
+        self.assertTrue(mapped.is_mapped)
+        self.assertEqual(list(mapped.ids), built.ids)
+        for tag_id in built.ids:
+            self.assertEqual(mapped.index[tag_id], built.index[tag_id])
+            self.assertEqual(mapped.parents_of(tag_id), built.parents_of(tag_id))
+            self.assertEqual(mapped.children_of(tag_id), built.children_of(tag_id))
+        self.assertNotIn("NFR-404", mapped.index)
+
+    def test_changed_source_rebuilds(self):
+        load_graph(self.path, NEEDS)
+        changed = make_needs({"BRD-1": [], "NFR-1": ["BRD-1"]})
+        data = {"current_version": "0.1", "versions": {"0.1": {"needs": changed}}}
+        self.path.write_text(json.dumps(data), encoding="utf-8")
+        graph = load_graph(self.path)
+        self.assertFalse(graph.is_mapped)
+        self.assertEqual(graph.children_of("BRD-1"), ["NFR-1"])
+
+
+if __name__ == "__main__":
+    unittest.main()
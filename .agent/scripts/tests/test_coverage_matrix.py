@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Unit tests for coverage_matrix.py."""
+
+import random
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import coverage_matrix  # noqa: E402
+from citation_graph import CitationGraph  # noqa: E402
+from coverage_matrix import coverage_report, format_markdown  # noqa: E402
+
+NEEDS = {
+    "BRD-1": {"docname": "01_brd/brd", "section_name": "Goals", "links": []},
+    "BRD-2": {"docname": "01_brd/brd", "section_name": "Scope", "links": ["BRD-1"]},
+    "FSD-1": {"docname": "03_fsd/fsd", "section_name": "Voice", "links": ["BRD-1", "BRD-2"]},
+    "FSD-2": {"docname": "03_fsd/fsd", "section_name": "Voice", "links": ["XXX-9"]},
+    "TDD-1": {"docname": "06_tdd/tdd", "section_name": "Core", "links": ["FSD-1"]},
+    "ISP-1": {"docname": "07_isp/isp", "section_name": "Stubs", "links": ["TDD-1", "FSD-1"]},
+}
+
+
+def naive_report(needs):
+    """Reference: one scan of all needs per tag, like repeated find_tags_citing."""
+    pairs, down, up = {}, {}, {}
+    for nid, data in needs.items():
+        tier = coverage_matrix.get_tier(nid)
+        for pid in data["links"]:
+            if pid in needs:
+                key = (tier, coverage_matrix.get_tier(pid))
+                pairs[key] = pairs.get(key, 0) + 1
+        cited = any(nid in other["links"] for other in needs.values())
+        down[nid], up[nid] = cited, any(p in needs for p in data["links"])
+    return pairs, down, up
+
+
+class TestCoverageReport(unittest.TestCase):
+    def setUp(self):
+        self.report = coverage_report(CitationGraph.from_needs(NEEDS), NEEDS)
+
+    def test_matrix(self):
+        matrix = self.report["matrix"]
+        self.assertEqual(matrix["BRD"]["BRD"], 1)
+        self.assertEqual(matrix["FSD"]["BRD"], 2)
+        self.assertEqual(matrix["ISP"], {"BRD": 0, "NFR": 0, "FSD": 1, "SAD": 0,
+                                         "ICD": 0, "TDD": 1, "ISP": 0})
+        self.assertEqual(self.report["unresolved"]["FSD"], 1)
+        self.assertEqual(self.report["summary"]["citations"], 6)
+
+    def test_tier_coverage(self):
+        tiers = {row["tier"]: row for row in self.report["tiers"]}
+        self.assertEqual((tiers["BRD"]["with_children"], tiers["BRD"]["downward"]), (2, 1.0))
+        self.assertEqual((tiers["FSD"]["downward"], tiers["FSD"]["upward"]), (0.5, 0.5))
+        self.assertEqual(tiers["ISP"]["downward"], 0.0)
+        self.assertIsNone(tiers["NFR"]["downward"])
+
+    def test_sections(self):
+        self.assertEqual([row["docname"] for row in self.report["docnames"]],
+                         ["01_brd/brd", "03_fsd/fsd", "06_tdd/tdd", "07_isp/isp"])
+        self.assertEqual([(row["section"], row["tags"], row["upward"])
+                          for row in self.report["sections"][:3]],
+                         [("Goals", 1, 0.0), ("Scope", 1, 1.0), ("Voice", 2, 0.5)])
+
+    def test_other_tier_only_when_present(self):
+        self.assertNotIn("OTHER", self.report["matrix"])
+        needs = {**NEEDS, "TERM-1": {"links": ["BRD-1"]}}
+        report = coverage_report(CitationGraph.from_needs(needs), needs)
+        self.assertEqual(report["matrix"]["OTHER"]["BRD"], 1)
+        self.assertEqual(report["docnames"][0], {"docname": "", "tags": 1, "with_children": 0,
+                                                 "downward": 0.0, "with_parents": 1,
+                                                 "upward": 1.0})
+
+    def test_matches_naive_scan(self):
+        rng = random.Random(11)
+        ids = [f"{rng.choice(coverage_matrix.TIER_ORDER)}-{i}" for i in range(80)]
+        needs = {n: {"docname": n.split("-")[0].lower(),
+                     "links": rng.sample(ids, rng.randrange(0, 4)) + ["XXX-1"] * rng.randrange(2)}
+                 for n in ids}
+        report = coverage_report(CitationGraph.from_needs(needs), needs)
+        pairs, down, up = naive_report(needs)
+        for child, row in report["matrix"].items():
+            for parent, n in row.items():
+                self.assertEqual(n, pairs.get((child, parent), 0))
+        for row in report["docnames"]:
+            members = [n for n in ids if needs[n]["docname"] == row["docname"]]
+            self.assertEqual(row["with_children"], sum(down[n] for n in members))
+            self.assertEqual(row["with_parents"], sum(up[n] for n in members))
+
+    def test_pure_python_matches_numpy(self):
+        if coverage_matrix.np is None:
+            self.skipTest("numpy not installed")
+        graph = CitationGraph.from_needs(NEEDS)
+        saved, coverage_matrix.np = coverage_matrix.np, None
+        try:
+            self.assertEqual(coverage_report(graph, NEEDS), self.report)
+        finally:
+            coverage_matrix.np = saved
+
+    def test_markdown(self):
+        text = format_markdown(self.report)
+        self.assertIn("| FSD | 2 | 0 | 0 | 0 | 0 | 0 | 0 | 1 |", text)
+        self.assertIn("| `03_fsd/fsd` | Voice | 2 | 50% | `#####.....` | 50% |", text)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Unit tests for find_tags_citing.py."""
+
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from citation_graph import CitationGraph  # noqa: E402
+from find_tags_citing import find_tags_citing  # noqa: E402
+
+# Diamond below BRD-1 plus a direct citer that also cites another citer.
+NEEDS = {
+    "BRD-1": {"title": "Root", "links": []},
+    "FSD-1": {"title": "A", "links": ["BRD-1"]},
+    "FSD-2": {"title": "B", "links": ["BRD-1", "FSD-1"]},
+    "SAD-1": {"title": "C", "links": ["FSD-1", "FSD-2"]},
+    "TDD-1": {"title": "D", "links": ["SAD-1"]},
+}
+
+
+class TestFindTagsCiting(unittest.TestCase):
+    def test_direct(self):
+        result = find_tags_citing("BRD-1", NEEDS)
+        self.assertEqual([c["id"] for c in result["cited_by"]], ["FSD-1", "FSD-2"])
+        self.assertEqual(result["count"], 2)
+        self.assertNotIn("all_descendants", result)
+
+    def test_recursive_lists_each_descendant_once(self):
+        result = find_tags_citing("BRD-1", NEEDS, recursive=True)
+        self.assertEqual([(d["id"], d["parent"]) for d in result["all_descendants"]],
+                         [("SAD-1", "FSD-1"), ("TDD-1", "SAD-1")])
+        self.assertEqual(result["total_impact"], 4)
+
+    def test_prebuilt_graph_matches(self):
+        graph = CitationGraph.from_needs(NEEDS)
+        for tag_id in NEEDS:
+            self.assertEqual(find_tags_citing(tag_id, NEEDS, True, graph),
+                             find_tags_citing(tag_id, NEEDS, True))
+
+    def test_unknown_target(self):
+        result = find_tags_citing("BRD-9", NEEDS, recursive=True)
+        self.assertFalse(result["target_exists"])
+        self.assertEqual(result["all_descendants"], [])
+
+
+if __name__ == "__main__":
+    unittest.main()
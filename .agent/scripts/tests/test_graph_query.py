@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Unit tests for graph_query.py."""
+
+import json
+import shutil
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from graph_query import QueryEngine, parse, to_text  # noqa: E402
+
+NEEDS = {
+    "BRD-1": {"id": "BRD-1", "type": "brd", "title": "Root", "links": []},
+    "FSD-1": {"id": "FSD-1", "type": "fsd", "title": "Wake word", "links": ["BRD-1"]},
+    "FSD-2": {"id": "FSD-2", "type": "fsd", "title": "Hub", "links": ["FSD-1"]},
+    "SAD-1": {"id": "SAD-1", "type": "sad", "title": "Topology", "links": []},
+    "TDD-1": {"id": "TDD-1", "type": "tdd", "title": "Core", "links": ["FSD-2", "ISP-9"]},
+    "ISP-1": {"id": "ISP-1", "type": "isp", "title": "Impl", "links": ["TDD-1"],
+              "status": "deprecated"},
+    "ISP-2": {"id": "ISP-2", "type": "isp", "title": "Impl two", "links": ["TDD-1"]},
+    "FSD-3": {"id": "FSD-3", "type": "fsd", "title": "Back", "links": ["TDD-1"]},
+}
+
+
+class TestParse(unittest.TestCase):
+    def test_precedence(self):
+        tree = parse("all() | tier=FSD & !status=open")
+        self.assertEqual(tree[0], "or")
+        self.assertEqual(tree[1][1], ("and", [("cmp", "tier", "=", "FSD"),
+                                              ("not", ("cmp", "status", "=", "open"))]))
+
+    def test_round_trip(self):
+        for text in ('descendants(BRD-5, 2) & tier=ISP & status!=deprecated',
+                     'orphans() | sibling_citations()',
+                     '!(tier=BRD | tier=NFR) & title~"wake word"',
+                     'search("say \\"hi\\"")'):
+            self.assertEqual(parse(to_text(parse(text))), parse(text))
+
+    def test_tier_is_case_insensitive(self):
+        self.assertEqual(parse("tier=isp"), ("cmp", "tier", "=", "ISP"))
+
+    def test_errors(self):
+        for text in ("", "tier=", "descendants(", "bogus()", "colour=red",
+                     "orphans(BRD-1)", "descendants(BRD-1, x)", "tier=FSD )",
+                     'title~"open'):
+            with self.assertRaises(ValueError, msg=text):
+                parse(text)
+
+
+class TestQueryEngine(unittest.TestCase):
+    def setUp(self):
+        self.tmp = Path(tempfile.mkdtemp())
+        path = self.tmp / "needs.json"
+        path.write_text(json.dumps({"current_version": "1.0",
+                                    "versions": {"1.0": {"needs": NEEDS}}}),
+                        encoding="utf-8")
+        self.engine = QueryEngine(path)
+
+    def tearDown(self):
+        self.engine.close()
+        shutil.rmtree(self.tmp)
+
+    def test_compound(self):
+        q = self.engine.query
+        self.assertEqual(q("descendants(BRD-1) & tier=ISP & status!=deprecated"), ["ISP-2"])
+        self.assertEqual(q("descendants(BRD-1, 2)"), ["FSD-1", "FSD-2"])
+        self.assertEqual(q("ancestors(ISP-1)"), ["BRD-1", "FSD-1", "FSD-2", "TDD-1"])
+        self.assertEqual(q("children(TDD-1) & !title~two"), ["ISP-1", "FSD-3"])
+        self.assertEqual(q("parents(TDD-1)"), ["FSD-2"])
+        self.assertEqual(q("!(tier=FSD | tier=ISP) & type!=brd"), ["SAD-1", "TDD-1"])
+
+    def test_named_sets(self):
+        q = self.engine.query
+        self.assertEqual(q("orphans()"), ["SAD-1"])
+        self.assertEqual(q("missing_parents()"), ["TDD-1"])
+        self.assertEqual(q("sibling_citations()"), ["FSD-2"])
+        self.assertEqual(q("forward_references()"), ["TDD-1", "FSD-3"])
+        self.assertEqual(q("orphans() | sibling_citations()"), ["FSD-2", "SAD-1"])
+
+    def test_unresolved_targets_never_match(self):
+        self.assertEqual(self.engine.query("descendants(ISP-9)"),
+                         ["TDD-1", "ISP-1", "ISP-2", "FSD-3"])
+        self.assertNotIn("ISP-9", self.engine.query("ancestors(ISP-1) | all()"))
+
+    def test_unknown_tag(self):
+        with self.assertRaises(KeyError):
+            self.engine.query("children(XXX-1)")
+
+    def test_plan_orders_by_estimate(self):
+        plan = self.engine.plan(parse("title~Impl & all() & descendants(TDD-1) & tier=SAD"))
+        self.assertEqual([s["term"] for s in plan["steps"]],
+                         ["tier=SAD", "descendants(TDD-1)", "all()", "title~Impl"])
+        self.assertEqual([s["source"] for s in plan["steps"]],
+                         ["field-index", "reachability", "field-index", "scan"])
+
+    def test_empty_intersection_skips_remaining_terms(self):
+        # tier=NFR is empty, so the FTS index is never opened.
+        self.assertEqual(self.engine.query('tier=NFR & search("wake")'), [])
+        self.assertIsNone(self.engine._fts)
+        self.assertEqual(self.engine.query('tier=FSD & search("wake")'), ["FSD-1"])
+
+
+if __name__ == "__main__":
+    unittest.main()
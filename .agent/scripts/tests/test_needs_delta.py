@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Unit tests for needs_delta.py."""
+
+import copy
+import json
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from citation_graph import CitationGraph  # noqa: E402
+from detect_anti_patterns import detect  # noqa: E402
+from generate_traceability_report import analyze  # noqa: E402
+from needs_delta import DeltaState, update  # noqa: E402
+from reachability import Reachability  # noqa: E402
+
+NEEDS = {
+    "BRD-1": {"id": "BRD-1", "title": "Root", "content": "Why.", "links": []},
+    "BRD-2": {"id": "BRD-2", "title": "Other", "content": "Why.", "links": []},
+    "FSD-1": {"id": "FSD-1", "title": "A", "content": "What.", "links": ["BRD-1"]},
+    "SAD-1": {"id": "SAD-1", "title": "B", "content": "How.", "links": ["FSD-1"]},
+    "TDD-1": {"id": "TDD-1", "title": "C", "content": "Build.", "links": ["SAD-1", "ICD-9"]},
+}
+
+
+class TestDeltaState(unittest.TestCase):
+    def assert_matches_rebuild(self, state, needs):
+        reach = Reachability.from_graph(CitationGraph.from_needs(needs))
+        for tag_id in reach.ids:
+            self.assertEqual(set(state.descendants(tag_id)), set(reach.descendants(tag_id)))
+            self.assertEqual(set(state.ancestors(tag_id)), set(reach.ancestors(tag_id)))
+        self.assertEqual(state.anti_pattern_report(), detect(needs))
+        self.assertEqual(state.traceability_report(), analyze(needs))
+
+    def test_relink_patches_reachability(self):
+        state = DeltaState.from_needs(NEEDS)
+        needs = copy.deepcopy(NEEDS)
+        needs["FSD-1"]["links"] = ["BRD-2"]
+        report = state.apply(needs)
+        self.assertEqual(report["delta"]["changed"], ["FSD-1"])
+        self.assertFalse(report["full_rebuild"])
+        self.assertEqual(report["invalidated"]["adjacency"], ["BRD-1", "BRD-2", "FSD-1"])
+        self.assertEqual(report["invalidated"]["descendants"], ["BRD-1", "BRD-2"])
+        self.assertEqual(report["invalidated"]["ancestors"], ["FSD-1", "SAD-1", "TDD-1"])
+        self.assert_matches_rebuild(state, needs)
+
+    def test_add_and_remove_rescan_citers(self):
+        state = DeltaState.from_needs(NEEDS)
+        needs = copy.deepcopy(NEEDS)
+        del needs["SAD-1"]
+        needs["ICD-9"] = {"id": "ICD-9", "title": "Port", "content": "Iface.", "links": ["SAD-1"]}
+        report = state.apply(needs)
+        self.assertEqual(report["delta"], {"added": ["ICD-9"], "removed": ["SAD-1"],
+                                           "changed": []})
+        # TDD-1 lost SAD-1 and gained ICD-9 as a resolved parent.
+        self.assertIn("TDD-1", report["invalidated"]["traceability"])
+        self.assert_matches_rebuild(state, needs)
+
+    def test_content_edit_only_rescans_need(self):
+        state = DeltaState.from_needs(NEEDS)
+        needs = copy.deepcopy(NEEDS)
+        needs["FSD-1"]["content"] = "class Foo"
+        report = state.apply(needs)
+        self.assertEqual(report["invalidated"]["anti_patterns"], ["FSD-1"])
+        self.assertEqual(report["invalidated"]["descendants"], [])
+        self.assert_matches_rebuild(state, needs)
+
+    def test_cycle_falls_back_to_rebuild(self):
+        state = DeltaState.from_needs(NEEDS)
+        needs = copy.deepcopy(NEEDS)
+        needs["FSD-1"]["links"] = ["BRD-1", "TDD-1"]
+        self.assertTrue(state.apply(needs)["full_rebuild"])
+        self.assert_matches_rebuild(state, needs)
+
+
+class TestUpdate(unittest.TestCase):
+    def test_state_persists_between_runs(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "needs.json"
+
+            def write(needs):
+                path.write_text(json.dumps(
+                    {"current_version": "0.1", "versions": {"0.1": {"needs": needs}}}),
+                    encoding="utf-8")
+
+            write(NEEDS)
+            self.assertTrue(update(path)[1]["full_rebuild"])
+            needs = copy.deepcopy(NEEDS)
+            needs["SAD-1"]["title"] = "SAD-1"
+            write(needs)
+            _, report = update(path)
+            self.assertFalse(report["full_rebuild"])
+            self.assertEqual(report["delta"]["changed"], ["SAD-1"])
+            self.assertEqual(update(path)[1]["delta"]["changed"], [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Unit tests for needs_index.py."""
+
+import json
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import needs_store  # noqa: E402
+from needs_index import open_index  # noqa: E402
+from needs_store import load_records  # noqa: E402
+
+NEEDS = {
+    "BRD-1": {"id": "BRD-1", "type": "brd", "title": "Offline assistant",
+              "content": "Runs without network access.", "docname": "01_brd/brd",
+              "links": [], "section_name": "Purpose"},
+    "FSD-1": {"id": "FSD-1", "type": "fsd", "title": "Wake Word",
+              "content": "Always-on detection.", "docname": "03_fsd/fsd",
+              "links": ["BRD-1"], "lineno": 7, "status": "deprecated"},
+    "FSD-2": {"id": "FSD-2", "type": "fsd", "title": "Speech output",
+              "content": "Reads the wake word reply aloud.", "docname": "03_fsd/fsd",
+              "links": ["BRD-1", "FSD-1"]},
+}
+
+
+class TestNeedsIndex(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.path = Path(self._tmp.name) / "needs.json"
+        data = {"current_version": "0.1", "versions": {"0.1": {"needs": NEEDS}}}
+        self.path.write_text(json.dumps(data), encoding="utf-8")
+        self.index = open_index(self.path)
+
+    def tearDown(self):
+        self.index.close()
+        self._tmp.cleanup()
+
+    def test_records_match_loader(self):
+        records = load_records(self.path, use_cache=False)
+        self.assertEqual(list(self.index), list(records))
+        fsd = self.index["FSD-2"]
+        self.assertEqual(fsd.links, ("BRD-1", "FSD-1"))
+        self.assertEqual(self.index["BRD-1"].section_name, "Purpose")
+        self.assertNotIn("ICD-1", self.index)
+        self.assertIsNone(self.index.get("ICD-1"))
+
+    def test_missing_fields_read_as_missing(self):
+        self.index.close()
+        needs = {"TDD-1": {"id": "TDD-1", "type": "tdd", "docname": "06_tdd/tdd", "links": []}}
+        data = {"current_version": "0.1", "versions": {"0.1": {"needs": needs}}}
+        self.path.write_text(json.dumps(data), encoding="utf-8")
+        self.index = open_index(self.path)
+        tdd = self.index["TDD-1"]
+        self.assertEqual(tdd.get("title", "TDD-1"), "TDD-1")
+        self.assertNotIn("content", tdd)
+        self.assertEqual(tdd.get("docname"), "06_tdd/tdd")
+
+    def test_adjacency(self):
+        self.assertEqual(self.index.children_of("BRD-1"), ["FSD-1", "FSD-2"])
+        self.assertEqual(self.index.parents_of("FSD-2"), ["BRD-1", "FSD-1"])
+        self.assertEqual(self.index["FSD-1"].links_back, ("FSD-2",))
+
+    def test_filters(self):
+        self.assertEqual(self.index.ids_where(tier="FSD"), ["FSD-1", "FSD-2"])
+        self.assertEqual(self.index.ids_where(status="deprecated"), ["FSD-1"])
+
+    def test_search_ranks_title_matches_first(self):
+        hits = [r["id"] for r in self.index.search("wake word")]
+        self.assertEqual(hits, ["FSD-1", "FSD-2"])
+        self.assertEqual(self.index.search("wake", tier="BRD"), [])
+
+    def test_touch_refreshes_source_key(self):
+        self.index.close()
+        os.utime(self.path, ns=(1, 1))
+        digests = []
+        saved = needs_store.file_digest
+        needs_store.file_digest = lambda path: digests.append(path) or saved(path)
+        try:
+            for _ in range(3):
+                self.index = open_index(self.path)
+                self.index.close()
+        finally:
+            needs_store.file_digest = saved
+        self.index = open_index(self.path)
+        self.assertEqual(len(digests), 1)
+        self.assertEqual(self.index["FSD-1"].title, "Wake Word")
+
+
+if __name__ == "__main__":
+    unittest.main()
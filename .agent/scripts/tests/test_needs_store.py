@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Unit tests for needs_store.py."""
+
+import json
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import needs_store  # noqa: E402
+
+
+def write_needs(path: Path, needs: dict, version: str = "0.1") -> None:
+    """Write a minimal sphinx-needs export."""
+    data = {"current_version": version, "project": "Test",
+            "versions": {version: {"needs": needs}}}
+    path.write_text(json.dumps(data), encoding="utf-8")
+
+
+class TestLoadNeeds(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.path = Path(self._tmp.name) / "needs.json"
+        write_needs(self.path, {"BRD-1": {"id": "BRD-1", "title": "Root", "links": []}})
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_missing_file_raises(self):
+        with self.assertRaises(FileNotFoundError):
+            needs_store.load_needs(self.path.with_name("absent.json"))
+
+    def test_empty_export_raises_valueerror(self):
+        write_needs(self.path, {})
+        with self.assertRaises(ValueError):
+            needs_store.load_needs(self.path)
+
+    def test_writes_snapshot_and_reuses_it(self):
+        needs = needs_store.load_needs(self.path)
+        self.assertEqual(needs["BRD-1"]["title"], "Root")
+        snap = needs_store.snapshot_path(self.path, "needs")
+        self.assertTrue(snap.exists())
+
+        calls = []
+        payload = needs_store.cached(self.path, "needs", lambda p: calls.append(p))
+        self.assertEqual(calls, [])
+        self.assertEqual(payload["BRD-1"]["title"], "Root")
+
+    def test_content_change_invalidates_snapshot(self):
+        needs_store.load_needs(self.path)
+        write_needs(self.path, {"BRD-2": {"id": "BRD-2", "title": "New", "links": []}})
+        os.utime(self.path, ns=(1, 1))
+        self.assertIn("BRD-2", needs_store.load_needs(self.path))
+
+    def test_touch_without_change_reuses_snapshot(self):
+        needs_store.load_needs(self.path)
+        os.utime(self.path, ns=(1, 1))
+        calls = []
+        needs_store.cached(self.path, "needs", lambda p: calls.append(p))
+        self.assertEqual(calls, [])
+
+
+class TestMemo(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.path = Path(self._tmp.name) / "needs.json"
+        write_needs(self.path, {"BRD-1": {"id": "BRD-1", "title": "Root", "links": []}})
+        needs_store.enable_memo()
+
+    def tearDown(self):
+        needs_store.enable_memo(False)
+        self._tmp.cleanup()
+
+    def test_memo_returns_same_object_until_source_changes(self):
+        first = needs_store.load_records(self.path)
+        self.assertIs(needs_store.load_records(self.path), first)
+        write_needs(self.path, {"BRD-2": {"id": "BRD-2", "title": "Other", "links": []}})
+        self.assertIn("BRD-2", needs_store.load_records(self.path))
+
+
+class TestLoadRecords(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.path = Path(self._tmp.name) / "needs.json"
+        write_needs(self.path, {
+            "BRD-1": {"id": "BRD-1", "type": "brd", "title": "Root", "content": "x",
+                      "docname": "01_brd/brd", "links": [], "avatar": "",
+                      "parts": {}, "sections": ["Context"]},
+            "FSD-1": {"id": "FSD-1", "type": "fsd", "title": "Feature", "content": "y",
+                      "docname": "03_fsd/fsd", "links": ["BRD-1"], "lineno": 12},
+        })
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_projects_fields(self):
+        needs = needs_store.load_records(self.path, use_cache=False)
+        fsd = needs["FSD-1"]
+        self.assertIsInstance(fsd, needs_store.Need)
+        self.assertEqual(fsd.links, ("BRD-1",))
+        self.assertEqual(fsd.get("lineno"), 12)
+        self.assertIsNone(fsd.get("avatar"))
+        self.assertEqual(fsd.get("avatar", ""), "")
+        self.assertFalse(hasattr(fsd, "__dict__"))
+
+    def test_missing_fields_read_as_missing(self):
+        write_needs(self.path, {"TDD-1": {"id": "TDD-1", "type": "tdd", "docname": "06_tdd/tdd",
+                                           "links": []}})
+        for _ in range(2):  # parsed, then from the snapshot
+            tdd = needs_store.load_records(self.path)["TDD-1"]
+            self.assertIsInstance(tdd, needs_store.Need)
+            self.assertEqual(tdd.get("title", "TDD-1"), "TDD-1")
+            self.assertEqual(tdd.get("content", "-"), "-")
+            self.assertEqual(tdd.get("status", "draft"), "draft")
+            self.assertEqual(tdd.get("links", None), ())
+            self.assertNotIn("title", tdd)
+            self.assertIn("type", tdd)
+            self.assertEqual(tdd.title, "")
+            with self.assertRaises(KeyError):
+                tdd["content"]
+            self.assertEqual(tdd.to_dict(), {"id": "TDD-1", "type": "tdd",
+                                             "docname": "06_tdd/tdd", "links": ()})
+
+    def test_snapshot_round_trip(self):
+        first = needs_store.load_records(self.path)
+        second = needs_store.load_records(self.path)
+        self.assertEqual(first, second)
+
+    def test_ids_are_interned(self):
+        needs = needs_store.load_records(self.path, use_cache=False)
+        self.assertIs(needs["FSD-1"].links[0], needs["BRD-1"].id)
+
+
+class TestIterNeeds(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.path = Path(self._tmp.name) / "needs.json"
+        self.needs = {
+            f"FSD-{i}": {"id": f"FSD-{i}", "type": "fsd", "title": f"T \\ {i} \"q\"",
+                         "content": "x" * i, "docname": "03_fsd/fsd",
+                         "links": ["BRD-1"], "lineno": i, "parts": {"a": [1, {"b": 2}]}}
+            for i in range(1, 40)
+        }
+        write_needs(self.path, self.needs)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_stream_matches_full_parse(self):
+        expected = needs_store.parse_records(self.path)
+        for chunk_size in (1, 5, 64, 4096):
+            pairs = list(needs_store.iter_needs(self.path, use_cache=False,
+                                                chunk_size=chunk_size))
+            self.assertEqual([k for k, _ in pairs], list(expected))
+            self.assertTrue(all(v == expected[k] for k, v in pairs))
+
+    def test_prefers_current_version(self):
+        data = {"versions": {"0.1": {"needs": {"BRD-1": self.needs["FSD-1"]}},
+                             "0.2": {"needs": {"BRD-2": self.needs["FSD-2"]}}},
+                "current_version": "0.2"}
+        self.path.write_text(json.dumps(data), encoding="utf-8")
+        ids = [k for k, _ in needs_store.iter_needs(self.path, use_cache=False)]
+        self.assertEqual(ids, ["BRD-1"])
+        data = {"current_version": "0.2",
+                "versions": {"0.1": {"needs": {"BRD-1": self.needs["FSD-1"]}},
+                             "0.2": {"needs": {"BRD-2": self.needs["FSD-2"]}}}}
+        self.path.write_text(json.dumps(data), encoding="utf-8")
+        ids = [k for k, _ in needs_store.iter_needs(self.path, use_cache=False)]
+        self.assertEqual(ids, ["BRD-2"])
+
+    def test_empty_export_raises_valueerror(self):
+        write_needs(self.path, {})
+        with self.assertRaises(ValueError):
+            list(needs_store.iter_needs(self.path, use_cache=False))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Unit tests for partition_graph.py."""
+
+import sys
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from check_chain_completeness import report as chain_report  # noqa: E402
+from citation_graph import CitationGraph  # noqa: E402
+from detect_anti_patterns import detect  # noqa: E402
+from generate_traceability_report import analyze  # noqa: E402
+from needs_factory import random_needs  # noqa: E402
+from partition_graph import (MODES, TASKS, pack, root_shards, run_sharded,  # noqa: E402
+                             weak_components)
+from validate_tier_compliance import validate  # noqa: E402
+
+NEEDS = {
+    "BRD-1": {"links": []},
+    "BRD-1.1": {"links": ["BRD-1"]},
+    "BRD-2": {"links": []},
+    "FSD-1": {"links": ["BRD-1.1"]},
+    "FSD-2": {"links": ["BRD-2"]},
+    "SAD-1": {"links": ["FSD-1", "FSD-2"]},
+    "NFR-1": {"links": ["BRD-9"]},
+    "NFR-2": {"links": ["NFR-1"]},
+    "ISP-1": {"links": []},
+}
+
+class TestPartition(unittest.TestCase):
+    def setUp(self):
+        self.graph = CitationGraph.from_needs(NEEDS)
+        self.ids = self.graph.ids
+
+    def labelled(self, part):
+        return {label: [self.ids[i] for i in members]
+                for label, members in zip(part.labels, part.shards)}
+
+    def test_weak_components(self):
+        part = weak_components(self.graph)
+        self.assertEqual(list(self.labelled(part).values()), [
+            ["BRD-1", "BRD-1.1", "BRD-2", "FSD-1", "FSD-2", "SAD-1"],
+            ["NFR-1", "NFR-2"],
+            ["ISP-1"],
+        ])
+        self.assertEqual(part.cross_edges, [])
+
+    def test_root_shards(self):
+        # SAD-1 is two hops from BRD-2 but three from BRD-1.
+        part = root_shards(self.graph)
+        self.assertEqual(self.labelled(part), {
+            "BRD-1": ["BRD-1", "BRD-1.1", "FSD-1"],
+            "BRD-2": ["BRD-2", "FSD-2", "SAD-1"],
+            "unrooted": ["NFR-1", "NFR-2", "ISP-1"],
+        })
+        self.assertEqual([(self.ids[c], self.ids[p]) for c, p in part.cross_edges],
+                         [("SAD-1", "FSD-1")])
+        self.assertEqual(part.shard_of[self.graph.index["BRD-9"]], -1)
+
+    def test_pack_balances_largest_first(self):
+        part = root_shards(self.graph)
+        self.assertEqual([len(b) for b in pack(part, 2)], [6, 3])
+        self.assertEqual(sorted(i for b in pack(part, 5) for i in b),
+                         list(range(self.graph.need_count)))
+
+
+class TestRunSharded(unittest.TestCase):
+    def test_matches_single_process_tools(self):
+        with ProcessPoolExecutor(2) as pool:
+            for seed in range(3):
+                needs = random_needs(seed, 150)
+                graph = CitationGraph.from_needs(needs)
+                expected = {"anti_patterns": detect(needs), "tier_compliance": validate(needs),
+                            "traceability_report": analyze(needs),
+                            "chain_completeness": chain_report(needs, graph)}
+                for mode in MODES:
+                    for jobs in (1, 4):
+                        for task in TASKS:
+                            self.assertEqual(
+                                run_sharded(needs, graph, task, jobs, mode, executor=pool),
+                                expected[task], (seed, mode, jobs, task))
+
+    def test_unknown_task(self):
+        with self.assertRaises(ValueError):
+            run_sharded(NEEDS, None, "bogus", 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Unit tests for reachability.py."""
+
+import json
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import needs_store  # noqa: E402
+from citation_graph import CitationGraph  # noqa: E402
+from reachability import SNAPSHOT_KIND, Reachability, load_reachability  # noqa: E402
+
+DAG = {
+    "BRD-1": {"links": []},
+    "FSD-1": {"links": ["BRD-1"]},
+    "FSD-2": {"links": ["BRD-1", "BRD-9"]},
+    "SAD-1": {"links": ["FSD-1", "FSD-2"]},
+    "TDD-1": {"links": ["SAD-1"]},
+    "NFR-1": {"links": []},
+}
+
+# A -> C -> B -> A cycle, D below it, F below D and E.
+CYCLIC = {
+    "A": {"links": ["C"]},
+    "B": {"links": ["A"]},
+    "C": {"links": ["B"]},
+    "D": {"links": ["C"]},
+    "E": {"links": []},
+    "F": {"links": ["E", "D"]},
+}
+
+
+class TestReachability(unittest.TestCase):
+    def assert_matches_bfs(self, needs):
+        graph = CitationGraph.from_needs(needs)
+        reach = Reachability.from_graph(graph)
+        for tag_id in graph.ids:
+            neighbours = graph.children_of(tag_id)
+            down = {graph.ids[i] for i in graph.traverse(neighbours, "down")}
+            self.assertEqual(set(reach.descendants(tag_id)), down, tag_id)
+            parents = graph.parents_of(tag_id)
+            up = {graph.ids[i] for i in graph.traverse(parents, "up")}
+            self.assertEqual(set(reach.ancestors(tag_id)), up, tag_id)
+        return reach
+
+    def test_dag(self):
+        reach = self.assert_matches_bfs(DAG)
+        self.assertTrue(reach.acyclic)
+        self.assertEqual(reach.descendants("BRD-1"), ["FSD-1", "FSD-2", "SAD-1", "TDD-1"])
+        self.assertEqual(reach.ancestors("TDD-1"), ["BRD-1", "FSD-1", "FSD-2", "SAD-1", "BRD-9"])
+        self.assertEqual(reach.descendant_count("FSD-2"), 2)
+        self.assertTrue(reach.is_upstream("BRD-1", "TDD-1"))
+        self.assertFalse(reach.is_upstream("TDD-1", "BRD-1"))
+        self.assertFalse(reach.is_upstream("NFR-1", "TDD-1"))
+
+    def test_cyclic_graph(self):
+        reach = self.assert_matches_bfs(CYCLIC)
+        self.assertFalse(reach.acyclic)
+        self.assertIn("A", reach.descendants("A"))
+        self.assertEqual(reach.descendants("D"), ["F"])
+
+    def test_cycle_members_share_sets(self):
+        reach = Reachability.from_graph(CitationGraph.from_needs(CYCLIC))
+        self.assertEqual(reach.ancestors("A"), ["A", "B", "C"])
+        self.assertIs(reach.descendant_bits[reach.index["A"]],
+                      reach.descendant_bits[reach.index["C"]])
+
+    def test_unknown_tag(self):
+        reach = Reachability.from_graph(CitationGraph.from_needs(DAG))
+        with self.assertRaises(KeyError):
+            reach.descendants("BRD-404")
+
+    def test_snapshot_round_trip(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "needs.json"
+            path.write_text(json.dumps(
+                {"current_version": "0.1", "versions": {"0.1": {"needs": DAG}}}), encoding="utf-8")
+            first = load_reachability(path)
+            self.assertTrue(needs_store.snapshot_path(path, SNAPSHOT_KIND).exists())
+            second = load_reachability(path)
+            self.assertEqual(second.to_state(), first.to_state())
+
+
+if __name__ == "__main__":
+    unittest.main()
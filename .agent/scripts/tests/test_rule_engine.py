@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Unit tests for rule_engine.py and the detect_anti_patterns rules."""
+
+import random
+import re
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from detect_anti_patterns import PATTERNS, detect, scan_need  # noqa: E402
+from rule_engine import Rule, RuleSet, Scanner  # noqa: E402
+
+TIER_ORDER = ["BRD", "NFR", "FSD", "SAD", "ICD", "TDD", "ISP"]
+
+
+def reference_tier(tag_id):
+    if not tag_id: return None
+    prefix = tag_id.split("-")[0].split(".")[0].upper()
+    return prefix if prefix in TIER_ORDER else None
+
+
+# The checks as originally written: one lambda per pattern, errors meaning
+# "no violation".
+REFERENCE = {
+    "AP001": lambda n: n["tier"] in ["BRD", "NFR", "FSD"]
+    and re.search(r"\b(def |class |import )\b", n.get("content", "")),
+    "AP002": lambda n: n["tier"] != "BRD" and not n.get("links"),
+    "AP003": lambda n: any(reference_tier(l) == n["tier"] for l in n.get("links", [])),
+    "AP004": lambda n: any(
+        reference_tier(l) and n["tier"]
+        and TIER_ORDER.index(reference_tier(l)) > TIER_ORDER.index(n["tier"])
+        for l in n.get("links", []) if reference_tier(l)),
+    "AP005": lambda n: not n.get("title") or n["title"] == n["id"],
+    "AP006": lambda n: n["tier"] == "ISP"
+    and not any(reference_tier(l) == "TDD" for l in n.get("links", [])),
+    "AP007": lambda n: not re.match(r"^[A-Z]{3}-\d+(\.\d+)?$", n["id"]),
+    "AP008": lambda n: n["tier"] == "BRD" and re.search(
+        r"\b(Python|Java|API|SQL|GPU|REST|JSON)\b", n.get("content", ""), re.I),
+    "AP009": lambda n: not n.get("content", "").strip() and n["tier"] != "BRD",
+}
+
+
+def reference_scan(nid, ndata, patterns):
+    facts = {"id": nid, "tier": reference_tier(nid), "title": ndata.get("title"),
+             "content": ndata.get("content", ""), "links": ndata.get("links", [])}
+    found = []
+    for pid in patterns:
+        if pid not in REFERENCE: continue
+        try:
+            if REFERENCE[pid](facts):
+                found.append(pid)
+        except (TypeError, AttributeError):
+            pass
+    return found
+
+
+class TestScanner(unittest.TestCase):
+    def test_merged_scan_equals_separate_searches(self):
+        rng = random.Random(7)
+        atoms = ["a", "b", "ab", "ba", "a+", "b?a", "\\ba", "(a|b)b", "[ab]{2}", "a$", "^b"]
+        for _ in range(300):
+            rules = [Rule(f"R{n}", "", None, "text",
+                          re.compile("".join(rng.sample(atoms, rng.randrange(1, 3))),
+                                     rng.choice([0, re.I, re.M])))
+                     for n in range(rng.randrange(2, 5))]
+            scanner = Scanner(rules)
+            for _ in range(10):
+                text = "".join(rng.choice("abAB \n") for _ in range(rng.randrange(12)))
+                expected = {r.id for r in rules if r.pattern.search(text)}
+                self.assertEqual(scanner.scan(text), expected, (text, rules))
+
+    def test_shared_boundary_is_hoisted(self):
+        scanner = Scanner([Rule("A", "", None, "t", re.compile(r"\bdef ")),
+                           Rule("B", "", None, "t", re.compile(r"\bapi\b", re.I))])
+        self.assertTrue(scanner._pattern(frozenset(scanner._groups)).pattern.startswith(r"\b(?:"))
+        self.assertEqual(scanner.scan("undef API"), {"B"})
+
+    def test_boundary_not_hoisted_over_alternation(self):
+        rules = [Rule("A", "", None, "t", re.compile(r"\bfoo|bar")),
+                 Rule("B", "", None, "t", re.compile(r"\bbaz"))]
+        scanner = Scanner(rules)
+        self.assertFalse(scanner._anchor)
+        self.assertEqual(scanner.scan("xbar"), {"A"})
+        self.assertTrue(Scanner([Rule("A", "", None, "t", re.compile(r"\bfoo|\bbar")),
+                                 rules[1]])._anchor)
+
+
+class TestRuleSet(unittest.TestCase):
+    def setUp(self):
+        class Facts:
+            def __init__(self, nid, ndata):
+                self.tier, self.text = nid[:1], ndata
+        self.rules = RuleSet(facts=Facts)
+        self.rules.regex("R1", "Foo", "text", r"foo", tiers=("A",))
+        self.rules.regex("R2", "Bar", "text", r"bar", re.I)
+
+        @self.rules.predicate("R3", "Short", tiers=("A", "B"))
+        def _short(facts):
+            return len(facts.text) < 5
+
+    def test_tiers_and_order(self):
+        self.assertEqual(self.rules.evaluate("A1", "foo"), ["R1", "R3"])
+        self.assertEqual(self.rules.evaluate("B1", "foo BAR"), ["R2"])
+        self.assertEqual(self.rules.evaluate("A1", "foo", ["R3", "X", "R1", "R3"]),
+                         ["R3", "R1", "R3"])
+
+    def test_non_string_field_skips_regex_rules(self):
+        self.assertEqual(self.rules.evaluate("C1", None), [])
+
+    def test_registration_errors(self):
+        with self.assertRaises(ValueError):
+            self.rules.regex("R1", "Again", "text", "x")
+        with self.assertRaises(ValueError):
+            self.rules.regex("R4", "Named", "text", "(?P<x>x)")
+        with self.assertRaises(ValueError):
+            self.rules.regex("R5", "Ascii", "text", r"\w", re.A)
+
+
+class TestAntiPatternRules(unittest.TestCase):
+    def test_matches_reference_checks(self):
+        rng = random.Random(5)
+        ids = ["BRD-1", "NFR-2", "FSD-3", "SAD-1", "TDD-4", "ISP-5", "TERM-1", "fsd-1",
+               "BRD-1.2", "XX", "", "ISP-1.1.1"]
+        contents = ["", "  ", None, 5, "def foo", "use Python api", "import os\nclass X",
+                    "classy", "JSON import  def "]
+        links = ids + [None, 0, 5, ["a"], "BRD-9"]
+        for _ in range(5000):
+            nid = rng.choice(ids)
+            ndata = {}
+            if rng.random() < .8: ndata["title"] = rng.choice([None, "", nid, "T"])
+            if rng.random() < .9: ndata["content"] = rng.choice(contents)
+            if rng.random() < .8:
+                ndata["links"] = [rng.choice(links) for _ in range(rng.randrange(4))]
+            else:
+                ndata["links"] = rng.choice([None, "BRD-1", 5, {"TDD-1": 1}])
+            patterns = rng.sample(list(REFERENCE) + ["AP999"], rng.randrange(1, 10))
+            self.assertEqual([v["pattern"] for v in scan_need(nid, ndata, patterns)],
+                             reference_scan(nid, ndata, patterns), (nid, ndata))
+
+    def test_detect(self):
+        needs = {"BRD-1": {"title": "Root", "content": "Expose a REST API", "links": []},
+                 "ISP-1": {"title": "ISP-1", "content": "import os", "links": ["FSD-9"]}}
+        result = detect(needs)
+        self.assertEqual(result["by_pattern"], {"AP008": 1, "AP005": 1, "AP006": 1})
+        self.assertEqual(detect(needs, ["AP006", "AP008"])["violations"], 2)
+        self.assertEqual(list(PATTERNS), list(REFERENCE))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Unit tests for run_audit.py."""
+
+import json
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from build_dependency_graph import build_graph  # noqa: E402
+from check_chain_completeness import report as chain_report  # noqa: E402
+from citation_graph import CitationGraph  # noqa: E402
+from detect_anti_patterns import detect  # noqa: E402
+from generate_traceability_report import analyze  # noqa: E402
+from run_audit import PHASES, run_audit  # noqa: E402
+from validate_tier_compliance import validate  # noqa: E402
+
+NEEDS = {
+    "BRD-1": {"id": "BRD-1", "title": "Root", "content": "Why.", "links": []},
+    "FSD-1": {"id": "FSD-1", "title": "Feature", "content": "What.", "links": ["BRD-1"]},
+    "FSD-2": {"id": "FSD-2", "title": "FSD-2", "content": "", "links": ["FSD-1", "TDD-9"]},
+    "SAD-1": {"id": "SAD-1", "title": "Orphan", "content": "How.", "links": []},
+}
+
+
+class TestRunAudit(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        root = Path(self._tmp.name)
+        self.path = root / "needs.json"
+        self.path.write_text(json.dumps(
+            {"current_version": "0.1", "versions": {"0.1": {"needs": NEEDS}}}), encoding="utf-8")
+        self.manifests = root / "docs"
+        self.manifests.mkdir()
+        (self.manifests / "reconciliation_manifest.rst").write_text(
+            ':section_id: x\n:integrity_status: "MAYBE"\n', encoding="utf-8")
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_phases_match_standalone_tools(self):
+        result = run_audit(self.path, self.manifests)
+        self.assertTrue(result["success"])
+        phases = result["phases"]
+        self.assertEqual(json.loads(json.dumps(phases["anti_patterns"])), detect(NEEDS))
+        self.assertEqual(phases["traceability_report"], analyze(NEEDS))
+        self.assertEqual(json.loads(json.dumps(phases["dependency_graph"])),
+                         json.loads(json.dumps(build_graph(NEEDS))))
+        self.assertEqual(phases["manifest_integrity"]["by_type"],
+                         {"MISSING_FIELD": 4, "INVALID_STATUS": 1})
+        self.assertEqual(result["summary"]["orphan_count"], 1)
+        self.assertEqual(phases["tier_compliance"], validate(NEEDS))
+        self.assertEqual(phases["chain_completeness"],
+                         {"success": True, **chain_report(NEEDS, CitationGraph.from_needs(NEEDS))})
+        self.assertEqual(set(result["timings_ms"]), {"load", "total", "audit_pass", *PHASES})
+
+    def test_sequential_and_subset(self):
+        result = run_audit(self.path, self.manifests, ("anti_patterns",), jobs=1)
+        self.assertEqual(list(result["phases"]), ["anti_patterns"])
+        self.assertEqual(set(result["summary"]), {"anti_patterns"})
+
+    def test_processes_match_in_process_run(self):
+        serial = run_audit(self.path, self.manifests)
+        sharded = run_audit(self.path, self.manifests, processes=2)
+        self.assertEqual(sharded["phases"], serial["phases"])
+
+    def test_unknown_phase_raises(self):
+        with self.assertRaises(ValueError):
+            run_audit(self.path, self.manifests, ("lint",))
+
+
+if __name__ == "__main__":
+    unittest.main()
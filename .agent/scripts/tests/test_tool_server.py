@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Unit tests for tool_registry.py and tool_server.py."""
+
+import io
+import json
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from tool_registry import resolve_tool, run_tool  # noqa: E402
+from tool_server import (  # noqa: E402
+    INVALID_PARAMS, METHOD_NOT_FOUND, PARSE_ERROR, UNAUTHORIZED, ToolServer, serve_stdio,
+)
+
+
+def request(method: str, req_id=1, **params) -> str:
+    return json.dumps({"jsonrpc": "2.0", "id": req_id, "method": method, "params": params})
+
+
+class TestRunTool(unittest.TestCase):
+    def test_resolve_accepts_script_paths(self):
+        self.assertEqual(resolve_tool(".agent/scripts/generate_uuid.py"), "generate_uuid")
+        self.assertEqual(resolve_tool("generate-uuid"), "generate_uuid")
+        with self.assertRaises(KeyError):
+            resolve_tool("rm")
+
+    def test_captures_output_and_exit_code(self):
+        code, out, err = run_tool("generate_uuid", [])
+        self.assertEqual((code, err), (0, ""))
+        self.assertEqual(len(out), 36)
+
+    def test_argparse_errors_exit_two(self):
+        code, out, err = run_tool("find_tags_citing", [])
+        self.assertEqual(code, 2)
+        self.assertIn("--id", err)
+
+
+class TestToolServer(unittest.TestCase):
+    def test_dispatch(self):
+        server = ToolServer()
+        run = json.loads(server.handle_line(request("run", tool="generate_uuid", argv=[])))
+        self.assertEqual(run["result"]["exit_code"], 0)
+        self.assertIn("generate_uuid", json.loads(server.handle_line(request("tools")))["result"])
+
+        def code(line):
+            return json.loads(server.handle_line(line))["error"]["code"]
+
+        self.assertEqual(code("{"), PARSE_ERROR)
+        self.assertEqual(code(request("nope")), METHOD_NOT_FOUND)
+        self.assertEqual(code(request("run", tool="rm", argv=[])), INVALID_PARAMS)
+
+    def test_notifications_get_no_response(self):
+        line = json.dumps({"jsonrpc": "2.0", "method": "ping"})
+        self.assertIsNone(ToolServer().handle_line(line))
+
+    def test_token_required(self):
+        server = ToolServer(token="secret")
+        denied = json.loads(server.handle_line(request("ping")))
+        self.assertEqual(denied["error"]["code"], UNAUTHORIZED)
+        allowed = json.loads(server.handle_line(request("ping", token="secret")))
+        self.assertIn("pid", allowed["result"])
+
+    def test_stdio_stops_on_shutdown(self):
+        stdin = io.StringIO("\n".join([request("ping"), request("shutdown", 2),
+                                       request("ping", 3)]) + "\n")
+        stdout = io.StringIO()
+        serve_stdio(ToolServer(), stdin, stdout)
+        ids = [json.loads(line)["id"] for line in stdout.getvalue().splitlines()]
+        self.assertEqual(ids, [1, 2])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Unit tests for trace_paths.py."""
+
+import random
+import sys
+import unittest
+from collections import deque
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from citation_graph import CitationGraph  # noqa: E402
+from extract_citations import add_root_chains, extract_citations  # noqa: E402
+from trace_paths import root_chain, root_chains, shortest_path  # noqa: E402
+
+NEEDS = {
+    "BRD-1": {"links": []},
+    "BRD-2": {"links": []},
+    "NFR-1": {"links": ["BRD-2"]},
+    "FSD-1": {"links": ["BRD-1"]},
+    "FSD-2": {"links": ["FSD-1", "NFR-1"]},
+    "SAD-1": {"links": ["FSD-2", "BRD-1"]},
+    "TDD-1": {"links": ["SAD-1", "FSD-2"]},
+    "TDD-2": {"links": ["NFR-9"]},
+    "ISP-1": {"links": ["TDD-1"]},
+}
+
+
+def bfs_length(graph, source, target, up=True):
+    """Reference one-sided BFS distance, or None."""
+    step = graph.parents if up else graph.children
+    dist = {source: 0}
+    queue = deque([source])
+    while queue:
+        u = queue.popleft()
+        if u == target:
+            return dist[u]
+        for v in step(u):
+            if v not in dist:
+                dist[v] = dist[u] + 1
+                queue.append(v)
+    return None
+
+
+class TestRootChain(unittest.TestCase):
+    def setUp(self):
+        self.graph = CitationGraph.from_needs(NEEDS)
+
+    def test_shortest_chain(self):
+        self.assertEqual(root_chain(self.graph, "TDD-1"), ["TDD-1", "SAD-1", "BRD-1"])
+        self.assertEqual(root_chain(self.graph, "ISP-1"), ["ISP-1", "TDD-1", "SAD-1", "BRD-1"])
+
+    def test_root_and_unrooted(self):
+        self.assertEqual(root_chain(self.graph, "BRD-2"), ["BRD-2"])
+        self.assertIsNone(root_chain(self.graph, "TDD-2"))
+
+    def test_unknown_tag(self):
+        with self.assertRaises(KeyError):
+            root_chain(self.graph, "XX-1")
+
+
+class TestRootChains(unittest.TestCase):
+    def setUp(self):
+        self.graph = CitationGraph.from_needs(NEEDS)
+
+    def test_all_chains_shortest_first(self):
+        chains, truncated = root_chains(self.graph, "TDD-1")
+        self.assertFalse(truncated)
+        self.assertEqual(chains, [
+            ["TDD-1", "SAD-1", "BRD-1"],
+            ["TDD-1", "FSD-2", "FSD-1", "BRD-1"],
+            ["TDD-1", "FSD-2", "NFR-1", "BRD-2"],
+            ["TDD-1", "SAD-1", "FSD-2", "FSD-1", "BRD-1"],
+            ["TDD-1", "SAD-1", "FSD-2", "NFR-1", "BRD-2"],
+        ])
+
+    def test_max_paths(self):
+        chains, truncated = root_chains(self.graph, "TDD-1", max_paths=2)
+        self.assertTrue(truncated)
+        self.assertEqual(len(chains), 2)
+        chains, truncated = root_chains(self.graph, "TDD-1", max_paths=5)
+        self.assertFalse(truncated)
+
+    def test_unrooted(self):
+        self.assertEqual(root_chains(self.graph, "TDD-2"), ([], False))
+
+    def test_cycle_terminates(self):
+        graph = CitationGraph.from_needs({
+            "BRD-1": {"links": []},
+            "FSD-1": {"links": ["FSD-2", "BRD-1"]},
+            "FSD-2": {"links": ["FSD-1"]},
+        })
+        self.assertEqual(root_chains(graph, "FSD-2"),
+                         ([["FSD-2", "FSD-1", "BRD-1"]], False))
+
+    def test_fan_in_hub_is_bounded(self):
+        # 2^20 routes through a ladder of diamonds; only k are produced.
+        needs = {"BRD-1": {"links": []}}
+        below = "BRD-1"
+        for i in range(20):
+            needs[f"FSD-{i}a"] = {"links": [below]}
+            needs[f"FSD-{i}b"] = {"links": [below]}
+            below = f"SAD-{i}"
+            needs[below] = {"links": [f"FSD-{i}a", f"FSD-{i}b"]}
+        chains, truncated = root_chains(CitationGraph.from_needs(needs), below, 3)
+        self.assertTrue(truncated)
+        self.assertEqual(len(chains), 3)
+        self.assertTrue(all(len(c) == 41 for c in chains))
+
+
+class TestShortestPath(unittest.TestCase):
+    def test_directions(self):
+        graph = CitationGraph.from_needs(NEEDS)
+        up = shortest_path(graph, "ISP-1", "FSD-1")
+        self.assertEqual(up, {"direction": "up",
+                              "path": ["ISP-1", "TDD-1", "FSD-2", "FSD-1"]})
+        down = shortest_path(graph, "BRD-2", "TDD-1")
+        self.assertEqual(down, {"direction": "down",
+                                "path": ["BRD-2", "NFR-1", "FSD-2", "TDD-1"]})
+        self.assertIsNone(shortest_path(graph, "BRD-1", "BRD-2"))
+
+    def test_matches_one_sided_bfs(self):
+        rng = random.Random(7)
+        for _ in range(20):
+            size = 40
+            needs = {f"N-{i}": {"links": [f"N-{j}" for j in rng.sample(range(size), 3)
+                                          if j != i]}
+                     for i in range(size)}
+            graph = CitationGraph.from_needs(needs)
+            for _ in range(20):
+                a, b = rng.randrange(size), rng.randrange(size)
+                found = shortest_path(graph, graph.ids[a], graph.ids[b])
+                up, down = bfs_length(graph, a, b), bfs_length(graph, a, b, up=False)
+                if up is not None:
+                    self.assertEqual(found["direction"], "up")
+                    self.assertEqual(len(found["path"]) - 1, up)
+                elif down is not None:
+                    self.assertEqual(found["direction"], "down")
+                    self.assertEqual(len(found["path"]) - 1, down)
+                else:
+                    self.assertIsNone(found)
+                    continue
+                path = [graph.index[t] for t in found["path"]]
+                step = graph.parents if found["direction"] == "up" else graph.children
+                for u, v in zip(path, path[1:]):
+                    self.assertIn(v, step(u))
+
+
+class TestExtractCitationsRecursive(unittest.TestCase):
+    def test_add_root_chains(self):
+        graph = CitationGraph.from_needs(NEEDS)
+        result = add_root_chains(extract_citations("ISP-1", NEEDS), graph, max_paths=1)
+        self.assertEqual(result["chain"], ["ISP-1", "TDD-1", "SAD-1", "BRD-1"])
+        self.assertEqual(result["root_chains"], [result["chain"]])
+        self.assertTrue(result["root_chains_truncated"])
+
+    def test_failed_result_unchanged(self):
+        graph = CitationGraph.from_needs(NEEDS)
+        result = add_root_chains(extract_citations("XX-1", NEEDS), graph)
+        self.assertNotIn("chain", result)
+
+
+if __name__ == "__main__":
+    unittest.main()
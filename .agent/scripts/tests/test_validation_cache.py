@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Unit tests for validation_cache.py."""
+
+import json
+import shutil
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from detect_anti_patterns import detect  # noqa: E402
+from needs_store import load_records  # noqa: E402
+from validate_tier_compliance import validate  # noqa: E402
+from validation_cache import ValidationCache, content_hash, parent_mask  # noqa: E402
+
+NEEDS = {
+    "BRD-1": {"id": "BRD-1", "title": "Goal", "content": "Business success for the user",
+              "links": []},
+    "FSD-1": {"id": "FSD-1", "title": "Wake", "content": "When the user speaks, then wake",
+              "links": ["BRD-1"]},
+    "FSD-2": {"id": "FSD-2", "title": "Sleep", "content": "def sleep(): pass",
+              "links": ["BRD-2"]},
+    "ISP-1": {"id": "ISP-1", "title": "Stub", "content": '"""Doc."""\npass',
+              "links": ["FSD-1"]},
+}
+
+
+class TestValidationCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp = Path(tempfile.mkdtemp())
+        self.path = self.tmp / "needs.json"
+        self.needs = json.loads(json.dumps(NEEDS))
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def run_checks(self, version="v1"):
+        self.path.write_text(json.dumps(
+            {"current_version": "1", "versions": {"1": {"needs": self.needs}}}), encoding="utf-8")
+        needs = load_records(self.path)
+        anti = ValidationCache(self.path, "anti_patterns", version, needs)
+        tier = ValidationCache(self.path, "tier_compliance", version, needs)
+        results = detect(needs, cache=anti), validate(needs, cache=tier)
+        anti.save()
+        tier.save()
+        self.assertEqual(results, (detect(needs), validate(needs)))
+        return anti, tier
+
+    def test_only_touched_needs_are_rechecked(self):
+        anti, tier = self.run_checks()
+        self.assertEqual((anti.misses, tier.misses), (4, 4))
+        anti, tier = self.run_checks()
+        self.assertEqual((anti.hits, anti.misses, tier.misses), (4, 0, 0))
+
+        self.needs["FSD-1"]["content"] = "import os"
+        anti, tier = self.run_checks()
+        self.assertEqual((anti.misses, tier.misses), (1, 1))
+
+        # Defining BRD-2 changes FSD-2's resolved parents.
+        self.needs["BRD-2"] = {"id": "BRD-2", "title": "Two", "content": "KPI", "links": []}
+        anti, _ = self.run_checks()
+        self.assertEqual((anti.hits, anti.misses), (3, 2))
+
+    def test_rule_change_discards_table(self):
+        self.run_checks("v1")
+        anti, _ = self.run_checks("v2")
+        self.assertEqual(anti.misses, 4)
+
+    def test_partial_run_keeps_other_entries(self):
+        self.run_checks()
+        needs = load_records(self.path)
+        cache = ValidationCache(self.path, "tier_compliance", "v1", needs)
+        validate(needs, target_tier="ISP", cache=cache)
+        cache.save(prune=False)
+        _, tier = self.run_checks()
+        self.assertEqual(tier.misses, 0)
+
+    def test_keys(self):
+        self.assertEqual(parent_mask(["BRD-1", "BRD-9"], {"BRD-1"}), "10")
+        self.assertEqual(parent_mask("BRD-1", {"BRD-1"}), "1")
+        self.assertEqual(parent_mask([["x"]], {"BRD-1"}), "")
+        self.assertNotEqual(content_hash(NEEDS["FSD-1"]), content_hash(NEEDS["FSD-2"]))
+
+
+if __name__ == "__main__":
+    unittest.main()
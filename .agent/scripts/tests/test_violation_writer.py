@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Unit tests for violation_writer.py and the streaming audit output."""
+
+import io
+import json
+import shutil
+import sys
+import tempfile
+import unittest
+import xml.etree.ElementTree as ET
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from audit_engine import Audit, combined, deduplicated, stream_check  # noqa: E402
+from generate_traceability_report import analyze, format_out  # noqa: E402
+from violation_writer import write_findings  # noqa: E402
+
+NEEDS = {
+    "BRD-1": {"title": "Root", "content": "Business KPI for the user", "links": [],
+              "docname": "01_brd/brd", "lineno": 7},
+    "FSD-1": {"title": "Wake", "content": "When the user speaks, then wake", "links": ["BRD-1"],
+              "docname": "03_fsd/fsd", "lineno": 3},
+    "FSD-2": {"title": "Echo", "content": "The user can hear it", "links": ["FSD-1"],
+              "docname": "03_fsd/fsd", "lineno": 12},
+    "FSD-3": {"title": "Lost", "content": "The user can see it", "links": ["FSD-99"],
+              "docname": "03_fsd/fsd", "lineno": 20},
+}
+
+
+class TestWriters(unittest.TestCase):
+    def setUp(self):
+        self.tmp = Path(tempfile.mkdtemp())
+        (self.tmp / "sec").mkdir()
+        (self.tmp / "sec" / "reconciliation_manifest.rst").write_text(
+            ':section_id: x\n:integrity_status: "MAYBE"\n'
+            ':pending_items: [{"target_tag": "FSD-404"}]\n', encoding="utf-8")
+        self.audit = Audit(NEEDS, manifest_dir=self.tmp).run()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def write(self, fmt, errors=None):
+        out = io.StringIO()
+        count = write_findings(iter(self.audit.findings), fmt, out, "src", errors)
+        self.assertEqual(count, len(self.audit.findings))
+        return out.getvalue()
+
+    def test_ndjson(self):
+        lines = [json.loads(line) for line in self.write("ndjson").splitlines()]
+        self.assertEqual(len(lines), len(self.audit.findings))
+        first = lines[0]
+        self.assertEqual((first["id"], first["path"], first["lineno"]),
+                         ("FSD-2", "src/03_fsd/fsd.rst", 12))
+        self.assertEqual(lines[-1]["check"], "manifest_integrity")
+        self.assertTrue(lines[-1]["path"].endswith("reconciliation_manifest.rst"))
+
+    def test_sarif(self):
+        log = json.loads(self.write("sarif", {"tier_compliance": "boom"}))
+        run = log["runs"][0]
+        self.assertEqual(log["version"], "2.1.0")
+        self.assertEqual(len(run["results"]), len(self.audit.findings))
+        location = run["results"][0]["locations"][0]["physicalLocation"]
+        self.assertEqual(location, {"artifactLocation": {"uri": "src/03_fsd/fsd.rst"},
+                                    "region": {"startLine": 12}})
+        rules = {rule["id"] for rule in run["tool"]["driver"]["rules"]}
+        self.assertEqual(rules, {r["ruleId"] for r in run["results"]})
+        self.assertFalse(run["invocations"][0]["executionSuccessful"])
+
+    def test_empty_sarif(self):
+        out = io.StringIO()
+        write_findings(iter(()), "sarif", out)
+        log = json.loads(out.getvalue())
+        self.assertEqual(log["runs"][0]["results"], [])
+        self.assertTrue(log["runs"][0]["invocations"][0]["executionSuccessful"])
+
+    def test_junit(self):
+        root = ET.fromstring(self.write("junit", {"tier_compliance": "boom"}))
+        cases = root.find("testsuite").findall("testcase")
+        self.assertEqual(len(cases), len(self.audit.findings) + 1)
+        self.assertEqual((cases[0].get("file"), cases[0].get("line")),
+                         ("src/03_fsd/fsd.rst", "12"))
+        self.assertIsNotNone(cases[0].find("failure"))
+        self.assertIsNotNone(cases[-1].find("error"))
+
+    def test_unknown_format(self):
+        with self.assertRaises(ValueError):
+            write_findings(iter(()), "csv", io.StringIO())
+
+
+class TestStreaming(unittest.TestCase):
+    def test_deduplicated_equals_combined(self):
+        audit = Audit(NEEDS, ("anti_patterns", "tier_compliance", "traceability_report")).run()
+        streamed = list(deduplicated(Audit(NEEDS, audit.checks).stream()))
+        self.assertEqual(streamed, combined(audit.findings)[0])
+
+    def test_stream_check_filters(self):
+        out = io.StringIO()
+        code = stream_check(NEEDS, "traceability_report", "ndjson", out,
+                            keep=lambda f: f.severity == "ERROR")
+        lines = [json.loads(line) for line in out.getvalue().splitlines()]
+        self.assertEqual(code, 0)
+        self.assertEqual([(f["id"], f["rule"]) for f in lines], [("FSD-3", "MISSING_PARENT")])
+
+    def test_markdown_lists_every_violation(self):
+        needs = {f"FSD-{i}": {"title": "T", "content": "", "links": []} for i in range(30)}
+        text = format_out(analyze(needs), "markdown")
+        self.assertEqual(text.count("ORPHAN"), 30)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,159 @@
+"""
+Tool Client.
+
+Thin shim that runs a DDR tool through a running ``tool_server``.
+
+Takes the same arguments as the tool script itself, prints the same stdout
+and stderr and exits with the same code. When no server is running it runs
+the tool in this process instead, so command lines work either way.
+
+Meta
+----
+Tool Definition : .agent/tools/tool_server.md
+Knowledge Source: .agent/knowledge/sources/protocols/traceability_chain.md
+Architect       : Antigravity IDE
+
+Usage
+-----
+    python tool_client.py find_tags_citing --id BRD-1
+    python tool_client.py extract_citations.py --id FSD-1 --needs-json path/to/needs.json
+
+Exit Codes
+----------
+Exit code of the tool; 1 if the tool is unknown or the server rejects the call.
+"""
+import json
+import os
+import socket
+import sys
+from pathlib import Path
+from typing import Optional
+
+from tool_registry import resolve_tool, run_tool
+
+DEFAULT_ADDRESS_FILE: Path = Path(__file__).resolve().parent.parent / ".tool_server.json"
+
+CONNECT_TIMEOUT: float = 0.5
+
+
+def connect(address_file: Path = DEFAULT_ADDRESS_FILE) -> Optional[tuple[socket.socket, str]]:
+    """
+    Connect to the server published in ``address_file``.
+
+    Parameters
+    ----------
+    address_file : Path
+        Address file written by ``tool_server``.
+
+    Returns
+    -------
+    tuple[socket, str] or None
+        Connected socket and the server token, or None if no server answers.
+    """
+    try:
+        record = json.loads(Path(address_file).read_text(encoding="utf-8"))
+        if record["transport"] == "unix":
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            target = record["path"]
+        else:
+            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            target = (record["host"], record["port"])
+        sock.settimeout(CONNECT_TIMEOUT)
+        try:
+            sock.connect(target)
+        except OSError:
+            sock.close()
+            raise
+        sock.settimeout(None)
+        return sock, record["token"]
+    except (OSError, ValueError, KeyError, AttributeError):
+        return None
+
+
+def call(sock: socket.socket, token: str, method: str, params: Optional[dict] = None,
+         req_id: int = 1) -> dict:
+    """
+    Send one JSON-RPC request and wait for its response.
+
+    Parameters
+    ----------
+    sock : socket.socket
+        Connected socket (see ``connect``).
+    token : str
+        Server token.
+    method : str
+        JSON-RPC method.
+    params : dict, optional
+        Method parameters (the token is added).
+    req_id : int
+        Request id.
+
+    Returns
+    -------
+    dict
+        Decoded response object.
+
+    Raises
+    ------
+    ConnectionError
+        If the server closes the connection before answering.
+    """
+    request = {"jsonrpc": "2.0", "id": req_id, "method": method,
+               "params": {**(params or {}), "token": token}}
+    sock.sendall(json.dumps(request).encode("utf-8") + b"\n")
+    with sock.makefile("rb") as stream:
+        line = stream.readline()
+    if not line:
+        raise ConnectionError("Tool server closed the connection")
+    return json.loads(line)
+
+
+def main() -> int:
+    """
+    CLI entry point for tool_client.
+
+    Returns
+    -------
+    int
+        Exit code of the tool.
+    """
+    if len(sys.argv) < 2 or sys.argv[1] in ("-h", "--help"):
+        print("Usage: tool_client.py <tool> [tool arguments...]", file=sys.stderr)
+        return 1
+
+    try:
+        tool = resolve_tool(sys.argv[1])
+    except KeyError as e:
+        print(f"Error: {e.args[0]}", file=sys.stderr)
+        return 1
+    argv = sys.argv[2:]
+
+    conn = connect()
+    if conn is not None:
+        sock, token = conn
+        try:
+            response = call(sock, token, "run",
+                            {"tool": tool, "argv": argv, "cwd": os.getcwd()})
+        except (OSError, ValueError) as e:
+            # The tool may already have run; never re-run it locally.
+            print(f"Error talking to tool server: {e}", file=sys.stderr)
+            return 1
+        finally:
+            sock.close()
+        if "error" in response:
+            print(f"Error: {response['error']['message']}", file=sys.stderr)
+            return 1
+        result = response["result"]
+        sys.stdout.write(result["stdout"])
+        sys.stderr.write(result["stderr"])
+        return result["exit_code"]
+
+    # No server: run the tool here.
+    code, out, err = run_tool(tool, argv)
+    sys.stdout.write(out)
+    sys.stderr.write(err)
+    return code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
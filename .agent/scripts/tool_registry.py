@@ -0,0 +1,181 @@
+"""
+Tool Registry.
+
+Maps tool names to the script modules that implement them and runs a tool's
+``main()`` in the current interpreter with captured stdout/stderr.
+
+Used by hosts that serve many tool calls from one process (``tool_server``)
+and by the client shim when no server is running. A tool run through
+``run_tool`` produces exactly the output and exit code of
+``python <tool>.py <argv...>``.
+
+Meta
+----
+Knowledge Source: .agent/knowledge/sources/protocols/traceability_chain.md
+Architect       : Antigravity IDE
+
+Usage
+-----
+    from tool_registry import run_tool
+
+    code, out, err = run_tool("find_tags_citing", ["--id", "BRD-1"])
+
+Notes
+-----
+- Modules are imported on first use and stay imported. Only the chosen
+  tool's module is imported, and this module keeps its own imports minimal
+  because ``python .agent/scripts <tool>`` loads it on every call.
+- ``run_tool`` swaps process-wide state (``sys.argv``, ``sys.stdout``,
+  ``sys.stderr``, working directory); callers running tools from several
+  threads must serialize calls (``tool_server`` holds a lock).
+"""
+import importlib
+import os
+import sys
+from pathlib import Path
+from typing import Optional
+
+# Tool name -> module exposing ``main() -> int``. Names are the script stems
+# used on existing command lines.
+TOOLS: dict[str, str] = {
+    name: name for name in (
+        "abstract_to_business",
+        "add_implementation_hints",
+        "ast_compare",
+        "audit_engine",
+        "blast_radius",
+        "build_dependency_graph",
+        "check_chain_completeness",
+        "check_manifest_integrity",
+        "classify_information",
+        "clean_source",
+        "coverage_matrix",
+        "create_tag",
+        "deprecate_tag",
+        "derive_success_metrics",
+        "detect_anti_patterns",
+        "directory_tree",
+        "extract_citations",
+        "find_tags_citing",
+        "generate_class_stub",
+        "generate_method_stub",
+        "generate_traceability_report",
+        "generate_uuid",
+        "graph_query",
+        "needs_delta",
+        "needs_index",
+        "partition_graph",
+        "reachability",
+        "route_to_specialist",
+        "run_audit",
+        "scoring_matrix",
+        "trace_paths",
+        "update_tag",
+        "validate_tier_compliance",
+        "visualize_traceability",
+    )
+}
+
+SCRIPTS_DIR: Path = Path(__file__).resolve().parent
+
+
+def resolve_tool(name: str) -> str:
+    """
+    Normalise a tool name as written on a command line.
+
+    Parameters
+    ----------
+    name : str
+        Tool name, hyphenated name, script file name or script path
+        (``find_tags_citing``, ``find-tags-citing``, ``find_tags_citing.py``,
+        ``.agent/scripts/find_tags_citing.py``).
+
+    Returns
+    -------
+    str
+        Registered tool name.
+
+    Raises
+    ------
+    KeyError
+        If no such tool is registered.
+    """
+    stem = Path(name).stem if name.endswith(".py") else name.replace("-", "_")
+    if stem not in TOOLS:
+        raise KeyError(f"Unknown tool: {name}")
+    return stem
+
+
+def load_tool(name: str):
+    """
+    Import and return the module implementing a tool.
+
+    Parameters
+    ----------
+    name : str
+        Tool name (see ``resolve_tool``).
+
+    Returns
+    -------
+    module
+        Module exposing ``main() -> int``.
+    """
+    if str(SCRIPTS_DIR) not in sys.path:
+        sys.path.insert(0, str(SCRIPTS_DIR))
+    return importlib.import_module(TOOLS[resolve_tool(name)])
+
+
+def run_tool(name: str, argv: list[str],
+             cwd: Optional[str] = None) -> tuple[int, str, str]:
+    """
+    Run a tool's ``main()`` in-process.
+
+    Parameters
+    ----------
+    name : str
+        Tool name (see ``resolve_tool``).
+    argv : list[str]
+        Command-line arguments after the script name.
+    cwd : str, optional
+        Working directory for the run (relative ``--needs-json`` etc.);
+        defaults to the current one.
+
+    Returns
+    -------
+    tuple[int, str, str]
+        Exit code, captured stdout, captured stderr.
+
+    Raises
+    ------
+    KeyError
+        If no such tool is registered.
+    """
+    # Output capture is only needed by hosts, not by plain dispatch.
+    import contextlib
+    import io
+    import traceback
+
+    name = resolve_tool(name)
+    out, err = io.StringIO(), io.StringIO()
+    saved_argv, saved_cwd = sys.argv, os.getcwd()
+    sys.argv = [f"{name}.py", *argv]
+    try:
+        if cwd:
+            os.chdir(cwd)
+        with contextlib.redirect_stdout(out), contextlib.redirect_stderr(err):
+            try:
+                code = load_tool(name).main()
+            except SystemExit as e:
+                # argparse errors and tools that call sys.exit()
+                if e.code is None or isinstance(e.code, int):
+                    code = e.code
+                else:
+                    print(e.code, file=sys.stderr)
+                    code = 1
+            except Exception:
+                traceback.print_exc()
+                code = 1
+    finally:
+        sys.argv = saved_argv
+        os.chdir(saved_cwd)
+    return (code or 0), out.getvalue(), err.getvalue()
@@ -0,0 +1,329 @@
+"""
+Tool Server.
+
+Long-running JSON-RPC 2.0 host for every DDR tool.
+
+Each workflow step otherwise starts a fresh interpreter, re-imports the tool
+and reloads needs.json. The server imports each tool once and keeps the
+parsed needs and citation graph in memory (``needs_store.enable_memo``);
+every call re-checks needs.json and reloads it only when it changed.
+
+Meta
+----
+Tool Definition : .agent/tools/tool_server.md
+Knowledge Source: .agent/knowledge/sources/protocols/traceability_chain.md
+Architect       : Antigravity IDE
+
+Usage
+-----
+    python tool_server.py                      # Unix socket (TCP on Windows)
+    python tool_server.py --stdio              # requests on stdin
+    python tool_server.py --preload docs/_build/json/needs.json
+
+    python tool_client.py find_tags_citing --id BRD-1
+
+Protocol
+--------
+One JSON-RPC 2.0 request per line, one response per line.
+
+run      : {"tool": str, "argv": [str], "cwd": str}
+           -> {"exit_code": int, "stdout": str, "stderr": str}
+tools    : {} -> [str]
+ping     : {} -> {"pid": int}
+shutdown : {} -> true
+
+Socket requests must carry the ``token`` from the address file in
+``params``.
+
+Exit Codes
+----------
+0 : Server stopped normally
+1 : Error (Details printed to stderr)
+
+Notes
+-----
+- The address file (default ``.agent/.tool_server.json``) records the
+  transport, address, token and pid; ``tool_client`` reads it.
+- Where ``AF_UNIX`` is unavailable (Windows) or the socket path is too long,
+  the server listens on an ephemeral ``127.0.0.1`` TCP port instead.
+- Tool calls are serialized: tools share process-wide stdout, argv and
+  working directory while they run.
+- Tool modules are imported once; restart the server after editing a script.
+"""
+import argparse
+import json
+import os
+import secrets
+import socket
+import socketserver
+import sys
+import threading
+from pathlib import Path
+from typing import Optional, TextIO
+
+import needs_store
+from citation_graph import load_graph
+from tool_registry import TOOLS, run_tool
+
+DEFAULT_ADDRESS_FILE: Path = Path(__file__).resolve().parent.parent / ".tool_server.json"
+
+# JSON-RPC 2.0 error codes
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+UNAUTHORIZED = -32001
+
+
+class ToolServer:
+    """
+    JSON-RPC dispatcher shared by the socket and stdio transports.
+
+    Parameters
+    ----------
+    token : str, optional
+        Shared secret required in ``params.token``; None disables the check
+        (stdio, where the caller owns the pipe).
+    """
+
+    def __init__(self, token: Optional[str] = None):
+        self.token = token
+        self.stopping = threading.Event()
+        self._lock = threading.Lock()
+
+    def handle_line(self, line: str) -> Optional[str]:
+        """
+        Handle one request line.
+
+        Parameters
+        ----------
+        line : str
+            Serialized JSON-RPC request.
+
+        Returns
+        -------
+        str or None
+            Serialized response, or None for notifications and blank lines.
+        """
+        if not line.strip():
+            return None
+        try:
+            request = json.loads(line)
+        except ValueError as e:
+            return json.dumps(_error(None, PARSE_ERROR, f"Parse error: {e}"))
+        response = self.handle(request)
+        return None if response is None else json.dumps(response)
+
+    def handle(self, request) -> Optional[dict]:
+        """
+        Dispatch a decoded JSON-RPC request.
+
+        Parameters
+        ----------
+        request : Any
+            Decoded request object.
+
+        Returns
+        -------
+        dict or None
+            Response object, or None for notifications (no ``id``).
+        """
+        if not isinstance(request, dict) or request.get("jsonrpc") != "2.0" \
+                or not isinstance(request.get("method"), str):
+            return _error(None, INVALID_REQUEST, "Invalid request")
+
+        req_id = request.get("id")
+        params = request.get("params") or {}
+        if not isinstance(params, dict):
+            response = _error(req_id, INVALID_PARAMS, "params must be an object")
+        elif self.token is not None and not secrets.compare_digest(
+                str(params.get("token", "")), self.token):
+            response = _error(req_id, UNAUTHORIZED, "Missing or invalid token")
+        else:
+            response = self._dispatch(req_id, request["method"], params)
+        return response if "id" in request else None
+
+    def _dispatch(self, req_id, method: str, params: dict) -> dict:
+        if method == "run":
+            tool, argv = params.get("tool"), params.get("argv", [])
+            if not isinstance(tool, str) or not isinstance(argv, list) \
+                    or not all(isinstance(a, str) for a in argv):
+                return _error(req_id, INVALID_PARAMS, "run expects tool: str, argv: [str]")
+            with self._lock:
+                try:
+                    code, out, err = run_tool(tool, argv, params.get("cwd"))
+                except KeyError as e:
+                    return _error(req_id, INVALID_PARAMS, str(e.args[0]))
+            return _result(req_id, {"exit_code": code, "stdout": out, "stderr": err})
+        if method == "tools":
+            return _result(req_id, sorted(TOOLS))
+        if method == "ping":
+            return _result(req_id, {"pid": os.getpid()})
+        if method == "shutdown":
+            self.stopping.set()
+            return _result(req_id, True)
+        return _error(req_id, METHOD_NOT_FOUND, f"Unknown method: {method}")
+
+
+def _result(req_id, result) -> dict:
+    return {"jsonrpc": "2.0", "id": req_id, "result": result}
+
+
+def _error(req_id, code: int, message: str) -> dict:
+    return {"jsonrpc": "2.0", "id": req_id, "error": {"code": code, "message": message}}
+
+
+def serve_stdio(server: ToolServer, stdin: TextIO, stdout: TextIO) -> None:
+    """
+    Serve requests read line by line from ``stdin`` until EOF or shutdown.
+
+    Parameters
+    ----------
+    server : ToolServer
+        Dispatcher.
+    stdin, stdout : TextIO
+        Request and response streams. Held here because tool runs redirect
+        ``sys.stdout``.
+    """
+    for line in stdin:
+        response = server.handle_line(line)
+        if response is not None:
+            stdout.write(response + "\n")
+            stdout.flush()
+        if server.stopping.is_set():
+            break
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    def handle(self) -> None:
+        tool_server: ToolServer = self.server.tool_server
+        for raw in self.rfile:
+            response = tool_server.handle_line(raw.decode("utf-8"))
+            if response is not None:
+                self.wfile.write(response.encode("utf-8") + b"\n")
+                self.wfile.flush()
+            if tool_server.stopping.is_set():
+                threading.Thread(target=self.server.shutdown, daemon=True).start()
+                break
+
+
+class _UnixServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+class _TCPServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+
+
+def open_listener(socket_path: Path) -> tuple[socketserver.BaseServer, dict]:
+    """
+    Bind the socket server, preferring a Unix socket.
+
+    Parameters
+    ----------
+    socket_path : Path
+        Unix socket path to try first.
+
+    Returns
+    -------
+    tuple[BaseServer, dict]
+        The bound server and its address record for the address file.
+    """
+    if hasattr(socket, "AF_UNIX"):
+        try:
+            socket_path.unlink(missing_ok=True)
+            listener = _UnixServer(str(socket_path), _Handler)
+            os.chmod(socket_path, 0o600)
+            return listener, {"transport": "unix", "path": str(socket_path)}
+        except OSError:
+            pass
+    listener = _TCPServer(("127.0.0.1", 0), _Handler)
+    host, port = listener.server_address[:2]
+    return listener, {"transport": "tcp", "host": host, "port": port}
+
+
+def serve_socket(server: ToolServer, address_file: Path) -> None:
+    """
+    Serve socket clients until a ``shutdown`` request or interrupt.
+
+    Parameters
+    ----------
+    server : ToolServer
+        Dispatcher (its ``token`` is published in the address file).
+    address_file : Path
+        Where to publish the listening address.
+    """
+    listener, address = open_listener(address_file.with_suffix(".sock"))
+    listener.tool_server = server
+    record = {**address, "token": server.token, "pid": os.getpid()}
+    payload = json.dumps(record, indent=2).encode("utf-8")
+    if not needs_store.write_atomic(address_file, lambda f: f.write(payload)):
+        listener.server_close()
+        raise OSError(f"Cannot write address file: {address_file}")
+    try:
+        os.chmod(address_file, 0o600)
+        print(json.dumps({"success": True, **address, "pid": os.getpid()}), flush=True)
+        listener.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        listener.server_close()
+        address_file.unlink(missing_ok=True)
+        if address["transport"] == "unix":
+            Path(address["path"]).unlink(missing_ok=True)
+
+
+def main() -> int:
+    """
+    CLI entry point for tool_server.
+
+    Returns
+    -------
+    int
+        Exit code (0=stopped normally, 1=error).
+    """
+    parser = argparse.ArgumentParser(
+        description="Serve DDR tools over JSON-RPC from one warm process."
+    )
+    parser.add_argument(
+        "--stdio",
+        action="store_true",
+        help="Read requests from stdin and write responses to stdout"
+    )
+    parser.add_argument(
+        "--address-file",
+        default=str(DEFAULT_ADDRESS_FILE),
+        help="Where to publish the socket address for clients"
+    )
+    parser.add_argument(
+        "--preload",
+        metavar="NEEDS_JSON",
+        help="Load needs and the citation graph before accepting requests"
+    )
+
+    args = parser.parse_args()
+    needs_store.enable_memo()
+
+    try:
+        if args.preload:
+            load_graph(Path(args.preload), needs_store.load_records(Path(args.preload)))
+
+        if args.stdio:
+            serve_stdio(ToolServer(), sys.stdin, sys.stdout)
+        else:
+            serve_socket(ToolServer(secrets.token_hex(16)), Path(args.address_file))
+        return 0
+
+    except FileNotFoundError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    except ValueError as e:
+        print(f"Error parsing needs.json: {e}", file=sys.stderr)
+        return 1
+    except OSError as e:
+        print(f"Error starting tool server: {e}", file=sys.stderr)
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,386 @@
+"""
+Trace Paths Tool.
+
+Citation path engine: the shortest root chain of a tag, up to ``k`` root
+chains, or the shortest path between any two tags, over the cached
+citation graph.
+
+Single paths come from a bidirectional breadth-first search. One frontier
+grows up the ``:links:`` from the tag, the other grows down from the
+target (every BRD at once for a root chain), and each round expands the
+smaller frontier, so a query touches roughly the square root of the nodes
+a one-sided search would on a wide graph. The round in which the frontiers
+first meet is completed before the path is chosen, which keeps the result
+a shortest one.
+
+Root chains are enumerated in order of length. The ancestor subgraph of
+the tag is collected first, together with each node's distance to the
+nearest BRD; a depth-bounded search then lists the simple chains of each
+length in turn and prunes any branch that can no longer reach a BRD
+within the bound. It stops after ``k`` chains, so tags below a fan-in hub
+with thousands of routes to the roots cost no more than ``k`` chains do.
+
+Meta
+----
+Tool Definition : .agent/tools/trace_paths.md
+Knowledge Source: .agent/knowledge/sources/protocols/traceability_chain.md
+Architect       : Antigravity IDE
+
+Usage
+-----
+    python trace_paths.py --id TDD-1
+    python trace_paths.py --id TDD-1 --all --max-paths 20
+    python trace_paths.py --from TDD-1 --to BRD-5
+
+Exit Codes
+----------
+0 : Success (JSON result printed to stdout)
+1 : Error (Details printed to stderr)
+
+Notes
+-----
+- Chains run from the tag up to a BRD root and stop at the first BRD.
+- ``--from``/``--to`` follows citations up from ``--from`` first; if
+  ``--to`` is not upstream, it looks downstream. Ties go to the link listed
+  first in ``:links:``.
+"""
+import argparse
+import json
+import sys
+from collections import deque
+from pathlib import Path
+
+from citation_graph import CitationGraph, load_graph
+from needs_store import get_tier
+
+ROOT_TIER: str = "BRD"
+
+# Default --max-paths for root chain enumeration.
+DEFAULT_MAX_PATHS: int = 10
+
+
+def _node(graph: CitationGraph, tag_id: str) -> int:
+    i = graph.index.get(tag_id)
+    if i is None:
+        raise KeyError(f"Unknown tag: {tag_id}")
+    return i
+
+
+def _roots(graph: CitationGraph) -> list[int]:
+    ids = graph.ids
+    return [i for i in range(graph.need_count) if get_tier(ids[i]) == ROOT_TIER]
+
+
+def _bidirectional(graph: CitationGraph, sources: list[int], targets: list[int],
+                   up: bool = True) -> list[int] | None:
+    """
+    Shortest directed path from any source to any target, as node indices.
+
+    ``up`` follows parents from the sources (and children from the
+    targets); otherwise the reverse. Returns None if no path exists.
+    """
+    if up:
+        f_off, f_idx = graph.parent_offsets, graph.parent_indices
+        b_off, b_idx = graph.child_offsets, graph.child_indices
+    else:
+        f_off, f_idx = graph.child_offsets, graph.child_indices
+        b_off, b_idx = graph.parent_offsets, graph.parent_indices
+
+    # Predecessor maps: forward node -> node it was reached from, backward
+    # node -> next node towards a target. -1 marks a frontier origin.
+    fwd = dict.fromkeys(sources, -1)
+    bwd = dict.fromkeys(targets, -1)
+    for s in sources:
+        if s in bwd:
+            return [s]
+    f_front, b_front = list(fwd), list(bwd)
+
+    while f_front and b_front:
+        forward = len(f_front) <= len(b_front)
+        if forward:
+            front, off, idx, seen, other = f_front, f_off, f_idx, fwd, bwd
+        else:
+            front, off, idx, seen, other = b_front, b_off, b_idx, bwd, fwd
+        best, best_len = None, -1
+        nxt = []
+        for u in front:
+            for k in range(off[u], off[u + 1]):
+                v = idx[k]
+                if v in other:
+                    # Length through edge u -> v, with v already on the
+                    # other side; finish the round before choosing.
+                    length = _depth(seen, u) + 1 + _depth(other, v)
+                    if best is None or length < best_len:
+                        best, best_len = (u, v), length
+                if v not in seen:
+                    seen[v] = u
+                    nxt.append(v)
+        if best is not None:
+            u, v = best
+            near = _walk(seen, u)[::-1]
+            far = _walk(other, v)
+            return near + far if forward else far[::-1] + near[::-1]
+        if forward:
+            f_front = nxt
+        else:
+            b_front = nxt
+    return None
+
+
+def _walk(pred: dict, node: int) -> list[int]:
+    path = [node]
+    while pred[node] != -1:
+        node = pred[node]
+        path.append(node)
+    return path
+
+
+def _depth(pred: dict, node: int) -> int:
+    depth = 0
+    while pred[node] != -1:
+        node = pred[node]
+        depth += 1
+    return depth
+
+
+def root_chain(graph: CitationGraph, tag_id: str) -> list[str] | None:
+    """
+    Return the shortest citation chain from a tag up to a BRD root.
+
+    Parameters
+    ----------
+    graph : CitationGraph
+        Citation graph.
+    tag_id : str
+        Tag to trace.
+
+    Returns
+    -------
+    list[str] or None
+        Tag IDs from ``tag_id`` to its BRD root, or None if no BRD is upstream.
+
+    Raises
+    ------
+    KeyError
+        If the tag is not in the graph.
+    """
+    path = _bidirectional(graph, [_node(graph, tag_id)], _roots(graph))
+    return None if path is None else [graph.ids[i] for i in path]
+
+
+def root_chains(graph: CitationGraph, tag_id: str,
+                max_paths: int = DEFAULT_MAX_PATHS) -> tuple[list[list[str]], bool]:
+    """
+    Enumerate citation chains from a tag up to BRD roots, shortest first.
+
+    Parameters
+    ----------
+    graph : CitationGraph
+        Citation graph.
+    tag_id : str
+        Tag to trace.
+    max_paths : int
+        Stop after this many chains.
+
+    Returns
+    -------
+    tuple[list[list[str]], bool]
+        Up to ``max_paths`` simple chains (tag IDs from ``tag_id`` to a BRD),
+        ordered by length and then by ``:links:`` order, and whether more
+        chains exist.
+
+    Raises
+    ------
+    KeyError
+        If the tag is not in the graph.
+    """
+    start = _node(graph, tag_id)
+    p_off, p_idx = graph.parent_offsets, graph.parent_indices
+    c_off, c_idx = graph.child_offsets, graph.child_indices
+    ids, count = graph.ids, graph.need_count
+
+    # Ancestor subgraph of the tag; BRDs end a chain, so are not expanded.
+    is_root = {}
+    sub, queue = {start}, deque([start])
+    while queue:
+        u = queue.popleft()
+        is_root[u] = u < count and get_tier(ids[u]) == ROOT_TIER
+        if is_root[u] and u != start:
+            continue
+        for k in range(p_off[u], p_off[u + 1]):
+            v = p_idx[k]
+            if v not in sub:
+                sub.add(v)
+                queue.append(v)
+
+    # Hops from each subgraph node to its nearest BRD, walking down from the
+    # roots inside the subgraph.
+    dist = {u: 0 for u in sub if is_root[u]}
+    queue = deque(dist)
+    while queue:
+        u = queue.popleft()
+        for k in range(c_off[u], c_off[u + 1]):
+            v = c_idx[k]
+            if v in sub and v not in dist and not is_root[v]:
+                dist[v] = dist[u] + 1
+                queue.append(v)
+    if start not in dist:
+        return [], False
+    if is_root[start]:
+        return [[tag_id]], False
+
+    chains: list[list[str]] = []
+    limit = dist[start]
+    while True:
+        # Depth-first over chains of exactly ``limit`` hops; ``cut`` records
+        # whether the bound, not a dead end, stopped some branch.
+        cut = False
+        path, on_path = [start], {start}
+        stack = [(start, p_off[start])]
+        while stack:
+            u, k = stack[-1]
+            if k == p_off[u + 1]:
+                stack.pop()
+                on_path.discard(path.pop())
+                continue
+            stack[-1] = (u, k + 1)
+            v = p_idx[k]
+            if v in on_path or v not in dist:
+                continue
+            if len(path) + dist[v] > limit:
+                cut = True
+                continue
+            if is_root[v]:
+                if len(path) == limit:
+                    if len(chains) == max_paths:
+                        return chains, True
+                    chains.append([ids[i] for i in path] + [ids[v]])
+                continue
+            path.append(v)
+            on_path.add(v)
+            stack.append((v, p_off[v]))
+        if not cut:
+            return chains, False
+        limit += 1
+
+
+def shortest_path(graph: CitationGraph, source: str, target: str) -> dict | None:
+    """
+    Return the shortest citation path between two tags.
+
+    Parameters
+    ----------
+    graph : CitationGraph
+        Citation graph.
+    source, target : str
+        Tags to connect.
+
+    Returns
+    -------
+    dict or None
+        ``path`` (tag IDs from ``source`` to ``target``) and ``direction``
+        (``"up"`` if ``source`` cites towards ``target``, else ``"down"``),
+        or None if neither is upstream of the other.
+
+    Raises
+    ------
+    KeyError
+        If either tag is not in the graph.
+    """
+    a, b = _node(graph, source), _node(graph, target)
+    for direction, up in (("up", True), ("down", False)):
+        path = _bidirectional(graph, [a], [b], up)
+        if path is not None:
+            return {"direction": direction, "path": [graph.ids[i] for i in path]}
+    return None
+
+
+def main() -> int:
+    """
+    CLI entry point for trace_paths.
+
+    Returns
+    -------
+    int
+        Exit code (0=success, 1=error).
+    """
+    parser = argparse.ArgumentParser(
+        description="Trace citation chains to BRD roots or between two tags."
+    )
+    query = parser.add_mutually_exclusive_group(required=True)
+    query.add_argument(
+        "--id",
+        help="Tag to trace up to its BRD root"
+    )
+    query.add_argument(
+        "--from",
+        dest="source",
+        metavar="ID",
+        help="Start of a tag-to-tag path (requires --to)"
+    )
+    parser.add_argument(
+        "--to",
+        metavar="ID",
+        help="End of a tag-to-tag path"
+    )
+    parser.add_argument(
+        "--all",
+        action="store_true",
+        help="With --id, list root chains shortest first instead of one"
+    )
+    parser.add_argument(
+        "--max-paths",
+        type=int,
+        default=DEFAULT_MAX_PATHS,
+        help=f"Maximum chains listed by --all (default: {DEFAULT_MAX_PATHS})"
+    )
+    parser.add_argument(
+        "--needs-json",
+        default="docs/_build/json/needs.json",
+        help="Path to needs.json file"
+    )
+
+    args = parser.parse_args()
+    if args.source and not args.to:
+        parser.error("--from requires --to")
+    if args.max_paths < 1:
+        parser.error("--max-paths must be at least 1")
+
+    try:
+        graph = load_graph(Path(args.needs_json))
+
+        if args.source:
+            found = shortest_path(graph, args.source, args.to)
+            result = {"success": True, "from": args.source, "to": args.to,
+                      "connected": found is not None}
+            if found is not None:
+                result.update(length=len(found["path"]) - 1, **found)
+        elif args.all:
+            chains, truncated = root_chains(graph, args.id, args.max_paths)
+            result = {"success": True, "id": args.id, "chain_count": len(chains),
+                      "truncated": truncated, "chains": chains}
+        else:
+            chain = root_chain(graph, args.id)
+            result = {"success": True, "id": args.id, "rooted": chain is not None,
+                      "length": None if chain is None else len(chain) - 1,
+                      "chain": chain}
+
+        print(json.dumps(result, indent=2))
+        return 0
+
+    except KeyError as e:
+        print(f"Error: {e.args[0]}", file=sys.stderr)
+        return 1
+    except FileNotFoundError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    except ValueError as e:
+        print(f"Error parsing needs.json: {e}", file=sys.stderr)
+        return 1
+    except Exception as e:
+        print(f"Error tracing paths: {e}", file=sys.stderr)
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
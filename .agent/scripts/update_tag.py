@@ -13,6 +13,7 @@ Usage
 -----
     python update_tag.py --id FSD-001 --field title --value "New Title"
     python update_tag.py --id FSD-001 --field description --value "Updated content"
+    python update_tag.py --batch updates.jsonl     # {"id": ..., "field": ..., "value": ...}
 
 Exit Codes
 ----------
@@ -25,7 +26,15 @@ import json
 import sys
 from datetime import datetime
 from pathlib import Path
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
+
+import needs_store
+from batch_io import add_batch_argument, is_batch, iter_requests, run_batch
+from citation_graph import CitationGraph, load_needs_graph
+
+if TYPE_CHECKING:
+    from blast_radius import BlastRadius
+    from needs_index import NeedsIndex
 
 
 # Valid DDR tiers
@@ -38,35 +47,6 @@ UPDATEABLE_FIELDS = ["title", "description", "status", "content"]
 RECONCILIATION_TRIGGERS = ["title", "description", "content"]
 
 
-def load_needs(needs_path: Path) -> dict:
-    """
-    Load all needs from needs.json.
-
-    Parameters
-    ----------
-    needs_path : Path
-        Path to needs.json file.
-
-    Returns
-    -------
-    dict
-        Dictionary of need_id -> need_data.
-    """
-    if not needs_path.exists():
-        raise FileNotFoundError(f"Needs file not found: {needs_path}")
-
-    with open(needs_path, "r", encoding="utf-8") as f:
-        data = json.load(f)
-
-    versions = data.get("versions", {})
-    for version_data in versions.values():
-        needs = version_data.get("needs", {})
-        if needs:
-            return needs
-
-    raise ValueError("No needs found in needs.json")
-
-
 def get_tier_from_id(tag_id: str) -> Optional[str]:
     """Extract tier code from tag ID."""
     parts = tag_id.split("-")
@@ -77,7 +57,12 @@ def get_tier_from_id(tag_id: str) -> Optional[str]:
     return None
 
 
-def find_downstream_dependents(target_id: str, needs: dict) -> list[dict]:
+def find_downstream_dependents(
+    target_id: str,
+    needs: dict,
+    graph: Optional["CitationGraph | NeedsIndex"] = None,
+    radius: Optional["BlastRadius"] = None
+) -> list[dict]:
     """
     Find all tags that directly cite the target.
 
@@ -87,25 +72,31 @@ def find_downstream_dependents(target_id: str, needs: dict) -> list[dict]:
         The tag ID being updated.
     needs : dict
         Dictionary of all needs.
+    graph : CitationGraph or NeedsIndex, optional
+        Prebuilt citation graph (or SQLite index) for ``needs``. Built on
+        demand if omitted.
+    radius : BlastRadius, optional
+        Blast-radius scores; adds each dependent's ``blast_radius`` score.
 
     Returns
     -------
     list[dict]
         List of dependent tags.
     """
+    if graph is None:
+        graph = CitationGraph.from_needs(needs)
+
     dependents = []
-    for need_id, need_data in needs.items():
-        links = need_data.get("links", [])
-        if isinstance(links, str):
-            links = [links] if links else []
-
-        if target_id in links:
-            dependents.append({
-                "id": need_id,
-                "tier": get_tier_from_id(need_id),
-                "title": need_data.get("title", ""),
-                "file": need_data.get("docname", "")
-            })
+    for need_id in graph.children_of(target_id):
+        need_data = needs[need_id]
+        dependents.append({
+            "id": need_id,
+            "tier": get_tier_from_id(need_id),
+            "title": need_data.get("title", ""),
+            "file": need_data.get("docname", "")
+        })
+        if radius is not None and need_id in radius:
+            dependents[-1]["blast_radius"] = radius.score(need_id)
 
     return dependents
 
@@ -115,7 +106,8 @@ def generate_update_diff(
     field: str,
     old_value: str,
     new_value: str,
-    dependents: list[dict]
+    dependents: list[dict],
+    blast_radius: Optional[dict] = None
 ) -> dict:
     """
     Generate a diff showing the proposed update.
@@ -132,6 +124,8 @@ def generate_update_diff(
         New value.
     dependents : list[dict]
         Tags that will need reconciliation.
+    blast_radius : dict, optional
+        The tag's ``BlastRadius.entry``, reported as ``blast_radius``.
 
     Returns
     -------
@@ -140,7 +134,7 @@ def generate_update_diff(
     """
     requires_reconciliation = field in RECONCILIATION_TRIGGERS and len(dependents) > 0
 
-    return {
+    diff = {
         "tag_id": tag_id,
         "tier": get_tier_from_id(tag_id),
         "field": field,
@@ -155,13 +149,58 @@ def generate_update_diff(
             if requires_reconciliation else None
         )
     }
+    if blast_radius is not None:
+        diff["blast_radius"] = blast_radius
+    return diff
+
+
+def load_radius(
+    needs_path: Path,
+    needs: "dict | NeedsIndex",
+    graph: "CitationGraph | NeedsIndex",
+    use_index: bool = False
+) -> Optional["BlastRadius"]:
+    """
+    Load blast-radius scores for needs.json.
+
+    Parameters
+    ----------
+    needs_path : Path
+        Path to needs.json.
+    needs : dict or NeedsIndex
+        Loaded needs; used to score on a snapshot miss.
+    graph : CitationGraph or NeedsIndex
+        Citation adjacency matching ``needs``.
+    use_index : bool
+        If True, only reuse a fresh snapshot: scoring the whole graph would
+        load every need, which the index exists to avoid.
+
+    Returns
+    -------
+    BlastRadius or None
+        The scores, or None with ``use_index`` and no fresh snapshot.
+    """
+    from blast_radius import SNAPSHOT_KIND, BlastRadius, load_blast_radius  # NumPy only here
+
+    if use_index:
+        payload = needs_store.cached_if_fresh(Path(needs_path), SNAPSHOT_KIND)
+        return BlastRadius(*payload) if payload is not None else None
+    return load_blast_radius(
+        needs_path,
+        needs if isinstance(needs, dict) else None,
+        graph if isinstance(graph, CitationGraph) else None
+    )
 
 
 def update_tag(
     tag_id: str,
     field: str,
     value: str,
-    needs_path: Path
+    needs_path: Path,
+    use_index: bool = False,
+    needs: Optional[dict] = None,
+    graph: Optional["CitationGraph | NeedsIndex"] = None,
+    radius: Optional["BlastRadius"] = None
 ) -> dict:
     """
     Prepare an update for a DDR tag.
@@ -179,6 +218,15 @@ def update_tag(
         The new value.
     needs_path : Path
         Path to needs.json.
+    use_index : bool
+        If True, answer from the SQLite needs index.
+    needs : dict, optional
+        Already loaded needs (batch mode); loaded from ``needs_path`` if omitted.
+    graph : CitationGraph or NeedsIndex, optional
+        Citation adjacency matching ``needs``.
+    radius : BlastRadius, optional
+        Blast-radius scores (batch mode); loaded with ``load_radius`` if
+        omitted and the file exists.
 
     Returns
     -------
@@ -195,7 +243,8 @@ def update_tag(
         )
 
     # Load needs
-    needs = load_needs(needs_path)
+    if needs is None:
+        needs, graph = load_needs_graph(needs_path, use_index)
 
     # Check tag exists
     if tag_id not in needs:
@@ -212,11 +261,16 @@ def update_tag(
     elif field == "status":
         old_value = need.get("status", "") or ""
 
+    # Score the blast radius so risky edits are flagged up front
+    if radius is None and Path(needs_path).exists():
+        radius = load_radius(needs_path, needs, graph, use_index)
+    entry = radius.entry(tag_id) if radius is not None and tag_id in radius else None
+
     # Find dependents for reconciliation
-    dependents = find_downstream_dependents(tag_id, needs)
+    dependents = find_downstream_dependents(tag_id, needs, graph, radius)
 
     # Generate update diff
-    diff = generate_update_diff(tag_id, field, old_value, value, dependents)
+    diff = generate_update_diff(tag_id, field, old_value, value, dependents, entry)
 
     # Build result
     result = {
@@ -231,6 +285,13 @@ def update_tag(
         ]
     }
 
+    if entry is not None and entry["high_risk"]:
+        result["blast_radius_warning"] = (
+            f"{tag_id} has a large blast radius (rank {entry['rank']}, score "
+            f"{entry['score']}): {entry['descendants']} transitive dependents across "
+            f"{len(entry['manifests'])} manifests"
+        )
+
     if diff["requires_reconciliation"]:
         result["reconciliation_required"] = True
         result["reconciliation_instructions"] = [
@@ -255,19 +316,15 @@ def main() -> int:
     parser = argparse.ArgumentParser(
         description="Update a DDR tag and identify reconciliation needs."
     )
-    parser.add_argument(
-        "--id",
-        required=True,
-        help="Tag ID to update (e.g., FSD-001)"
-    )
+    add_batch_argument(parser)
     parser.add_argument(
         "--field",
-        required=True,
+        required=False,
         help=f"Field to update. Valid: {', '.join(UPDATEABLE_FIELDS)}"
     )
     parser.add_argument(
         "--value",
-        required=True,
+        required=False,
         help="New value for the field"
     )
     parser.add_argument(
@@ -276,17 +333,39 @@ def main() -> int:
         default="docs/_build/json/needs.json",
         help="Path to needs.json file"
     )
+    parser.add_argument(
+        "--use-index",
+        action="store_true",
+        help="Answer from the SQLite needs index instead of loading all needs"
+    )
 
     args = parser.parse_args()
+    batch = is_batch(args)
+    if not batch and (args.field is None or args.value is None):
+        parser.error("--field and --value are required with a single --id")
 
     try:
         needs_path = Path(args.needs_json)
 
+        if batch:
+            needs, graph = load_needs_graph(needs_path, args.use_index)
+            radius = load_radius(needs_path, needs, graph, args.use_index)
+
+            def handle(id: str, field: Optional[str] = None,
+                       value: Optional[str] = None) -> dict:
+                if field is None or value is None:
+                    raise ValueError("Request needs field and value")
+                return update_tag(id, field, value, needs_path, needs=needs, graph=graph,
+                                  radius=radius)
+            requests = iter_requests(args, defaults={"field": args.field, "value": args.value})
+            return run_batch(requests, handle, allowed={"id", "field", "value"})
+
         result = update_tag(
-            tag_id=args.id,
+            tag_id=args.id[0],
             field=args.field,
             value=args.value,
-            needs_path=needs_path
+            needs_path=needs_path,
+            use_index=args.use_index
         )
 
         print(json.dumps(result, indent=2))
@@ -3,6 +3,10 @@ Validate Tier Compliance Tool.
 
 Validates DDR tag content against tier-specific constraints.
 
+The CLI keeps per-need results in a ``validation_cache`` table, so a run
+after an edit only re-checks the needs it touched; ``--jobs N`` checks the
+remaining needs in chunks across N processes (``chunked_eval``).
+
 Meta
 ----
 Tool Definition : .agent/tools/validate_tier_compliance.md
@@ -15,6 +19,9 @@ Architect       : Antigravity IDE
 Usage
 -----
     python validate_tier_compliance.py --needs-json docs/_build/json/needs.json --all
+    python validate_tier_compliance.py --all --no-cache
+    python validate_tier_compliance.py --all --jobs 8
+    python validate_tier_compliance.py --all --format junit > tier_compliance.xml
 
 Exit Codes
 ----------
@@ -26,6 +33,12 @@ import json
 import re
 import sys
 from pathlib import Path
+from typing import Any, Iterable
+
+from chunked_eval import run_chunked
+from needs_store import iter_needs, load_records
+from validation_cache import ValidationCache, ruleset_version
+from violation_writer import WRITERS
 
 TIER_ORDER = ["BRD", "NFR", "FSD", "SAD", "ICD", "TDD", "ISP"]
 
@@ -63,45 +76,95 @@ RULES: dict[str, list[tuple[str, callable]]] = {
 }
 
 
+# Need fields the rules read; workers receive only these.
+RULE_FIELDS = ("content", "title")
+
+
 def get_tier(tag_id: str) -> str | None:
     if not tag_id: return None
     prefix = tag_id.split("-")[0].split(".")[0].upper()
     return prefix if prefix in TIER_ORDER else None
 
 
-def load_needs(path: Path) -> dict:
-    with open(path, "r", encoding="utf-8") as f:
-        data = json.load(f)
-    return data.get("versions", {}).get("0.1", {}).get("needs", {})
-
-
-def validate(needs: dict, target_id: str = None, target_tier: str = None) -> dict:
+def check_need(nid: str, ndata: Any, tier: str) -> list[dict]:
+    """Return the tier-rule violations of one need of a tier in ``RULES``."""
+    violations = []
+    content = ndata.get("content", "") + " " + ndata.get("title", "")
+    for rule_name, check in RULES[tier]:
+        try:
+            if not check(content):
+                violations.append({"id": nid, "tier": tier, "rule": rule_name})
+        except: pass
+    return violations
+
+
+def _check_chunk(chunk: list[tuple[str, Any]]) -> list[list[dict]]:
+    """Return the violations of each need of a ``chunked_eval`` chunk."""
+    return [check_need(nid, ndata, get_tier(nid)) for nid, ndata in chunk]
+
+
+def validate(needs: dict | Iterable[tuple[str, Any]], target_id: str = None,
+             target_tier: str = None, cache: ValidationCache | None = None,
+             jobs: int = 1) -> dict:
+    """
+    Check tier rules. ``needs`` may be a dict or a stream of pairs.
+
+    With a ``cache``, results are looked up by content and parent set, and
+    only new or changed needs are checked. With ``jobs`` > 1 the selected
+    needs (or the cache misses) are checked in chunks across worker
+    processes; the report is unchanged.
+    """
     violations = []
     checked = 0
-
-    for nid, ndata in needs.items():
+    pairs = needs.items() if isinstance(needs, dict) else needs
+    check = check_need
+
+    if jobs > 1:
+        pairs = [(nid, ndata) for nid, ndata in pairs
+                 if (not target_id or nid == target_id)
+                 and (not target_tier or get_tier(nid) == target_tier)
+                 and get_tier(nid) in RULES]
+        todo = pairs if cache is None else cache.pending(pairs)
+        fresh = dict(zip([nid for nid, _ in todo],
+                         run_chunked(_check_chunk, todo, RULE_FIELDS, jobs)))
+        check = lambda nid, ndata, tier: fresh[nid]  # noqa: E731
+
+    for nid, ndata in pairs:
         tier = get_tier(nid)
         if target_id and nid != target_id: continue
         if target_tier and tier != target_tier: continue
         if tier not in RULES: continue
 
         checked += 1
-        content = ndata.get("content", "") + " " + ndata.get("title", "")
-        for rule_name, check in RULES[tier]:
-            try:
-                if not check(content):
-                    violations.append({"id": nid, "tier": tier, "rule": rule_name})
-            except: pass
+        if cache is None:
+            violations.extend(check(nid, ndata, tier))
+        else:
+            violations.extend(cache.get(nid, ndata, lambda: check(nid, ndata, tier)))
 
     return {"checked": checked, "violations": len(violations), "details": violations}
 
 
+def validate_cached(needs_path: Path, needs: dict, target_id: str = None,
+                    target_tier: str = None, jobs: int = 1) -> dict:
+    """Run ``validate`` with the persistent validation cache of ``needs_path``."""
+    cache = ValidationCache(needs_path, "tier_compliance", ruleset_version(__file__), needs)
+    result = validate(needs, target_id, target_tier, cache, jobs)
+    cache.save(prune=not (target_id or target_tier))
+    return result
+
+
 def main() -> int:
     parser = argparse.ArgumentParser()
     parser.add_argument("--needs-json", default="docs/_build/json/needs.json")
     parser.add_argument("--id", help="Single tag ID")
     parser.add_argument("--tier", help="All in tier")
     parser.add_argument("--all", action="store_true")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Check every need instead of reusing cached results")
+    parser.add_argument("--jobs", type=int, default=1,
+                        help="Worker processes checking chunks of needs (default: 1)")
+    parser.add_argument("--format", choices=["json", *WRITERS], default="json",
+                        help="JSON report, or stream violations as ndjson, sarif or junit")
     args = parser.parse_args()
 
     path = Path(args.needs_json)
@@ -109,7 +172,18 @@ def main() -> int:
         print(f"Error: {path} not found", file=sys.stderr); return 1
 
     try:
-        print(json.dumps(validate(load_needs(path), args.id, args.tier), indent=2))
+        if args.format != "json":
+            from audit_engine import stream_check  # audit_engine imports this module
+            def keep(f):
+                return (not args.id or f.id == args.id) and \
+                    (not args.tier or get_tier(f.id) == args.tier)
+            return stream_check(load_records(path), "tier_compliance", args.format, sys.stdout,
+                                keep, needs_path=None if args.no_cache else path)
+        if args.no_cache:
+            result = validate(iter_needs(path), args.id, args.tier, jobs=args.jobs)
+        else:
+            result = validate_cached(path, load_records(path), args.id, args.tier, args.jobs)
+        print(json.dumps(result, indent=2))
         return 0
     except Exception as e:
         print(f"Error: {e}", file=sys.stderr); return 1
@@ -0,0 +1,231 @@
+"""
+Validation Cache.
+
+Persistent per-need results for the rule checkers (detect_anti_patterns,
+validate_tier_compliance), so a run after an edit re-checks only the needs
+the edit touched.
+
+A result is stored under the need's ID, content hash and resolved parent
+set, in a table belonging to one rule-set version. A need is therefore
+re-checked when
+
+- its own fields change,
+- one of the tags it cites is added or removed (its parent set changes), or
+- the rules change (the version, a digest of the checker's source files,
+  no longer matches and the table is discarded).
+
+Every other need is answered from the table, and the checker still emits
+its complete report. Entries of needs that no longer exist are dropped on
+the next full run.
+
+Meta
+----
+Knowledge Source: .agent/knowledge/sources/protocols/traceability_chain.md
+Architect       : Antigravity IDE
+
+Usage
+-----
+    from validation_cache import ValidationCache, ruleset_version
+
+    needs = load_records(path)
+    cache = ValidationCache(path, "anti_patterns", ruleset_version(*RULESET_FILES), needs)
+    result = detect(needs, cache=cache)
+    cache.save()
+
+Notes
+-----
+- Tables live next to the other snapshots in ``<needs dir>/.ddr_cache/``
+  and are safe to delete.
+- Any edit to a checker's source files, comments included, invalidates its
+  table.
+"""
+import hashlib
+from operator import attrgetter
+from pathlib import Path
+from typing import Any, Callable, Container, Iterable
+
+import needs_store
+from needs_store import HASH_FIELDS, Need
+
+_MISSING = object()
+_record_values = attrgetter(*HASH_FIELDS)
+
+
+def ruleset_version(*paths: str | Path) -> str:
+    """
+    Return a digest identifying the rules defined in ``paths``.
+
+    Parameters
+    ----------
+    *paths : str or Path
+        Source files defining the rules (e.g. the checker module's ``__file__``).
+
+    Returns
+    -------
+    str
+        Hex digest over the files' contents.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    for path in paths:
+        digest.update(Path(path).read_bytes())
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def content_hash(ndata: Any) -> bytes:
+    """
+    Return the fingerprint of a need's ``needs_store.HASH_FIELDS``.
+
+    Parameters
+    ----------
+    ndata : Any
+        ``Need`` record or raw need dict.
+
+    Returns
+    -------
+    bytes
+        16-byte digest. Records and raw dicts of the same need may differ.
+    """
+    values = (*_record_values(ndata), ndata.present) if isinstance(ndata, Need) else \
+        [ndata.get(f) for f in HASH_FIELDS]
+    return hashlib.blake2b(repr(values).encode("utf-8"), digest_size=16).digest()
+
+
+def parent_mask(links: Any, defined: Container[str]) -> str:
+    """
+    Return which of a need's ``:links:`` name a defined tag.
+
+    Together with the links themselves (part of ``content_hash``) this
+    identifies the need's set of resolved parents.
+
+    Parameters
+    ----------
+    links : Any
+        The need's ``links`` value; malformed values count as no parents.
+    defined : Container[str]
+        IDs of the needs in the export.
+
+    Returns
+    -------
+    str
+        One ``1``/``0`` per link, in link order.
+    """
+    if isinstance(links, str):
+        links = [links]
+    try:
+        return "".join(["1" if link in defined else "0" for link in links])
+    except TypeError:
+        return ""
+
+
+class ValidationCache:
+    """
+    Per-need results of one checker for one needs.json location.
+
+    Parameters
+    ----------
+    needs_path : Path
+        Path to needs.json; the table is stored next to its snapshots.
+    checker : str
+        Checker name (part of the snapshot kind).
+    version : str
+        Rule-set version (see ``ruleset_version``).
+    defined : Container[str]
+        IDs of the needs in the current export.
+    use_cache : bool
+        If False, start from an empty table.
+
+    Attributes
+    ----------
+    hits, misses : int
+        Lookups answered from the table / computed in this run.
+    """
+
+    def __init__(self, needs_path: Path, checker: str, version: str,
+                 defined: Container[str], use_cache: bool = True):
+        self.needs_path = Path(needs_path)
+        self.kind = f"validation-{checker}-v2"
+        self.version = version
+        self.defined = defined
+        self.entries: dict[tuple[str, bytes, str], Any] = {}
+        self.used: dict[tuple[str, bytes, str], Any] = {}
+        self.hits = self.misses = 0
+        saved = needs_store.load_state(self.needs_path, self.kind) if use_cache else None
+        if saved is not None and saved[1].get("version") == version:
+            self.entries = saved[1]["entries"]
+
+    def _key(self, nid: str, ndata: Any) -> tuple[str, bytes, str]:
+        # The rules read the tier from the ID, which a raw need may lack.
+        return nid, content_hash(ndata), parent_mask(ndata.get("links", []), self.defined)
+
+    def pending(self, pairs: Iterable[tuple[str, Any]]) -> list[tuple[str, Any]]:
+        """
+        Return the needs of ``pairs`` without a stored result.
+
+        Lets a caller compute all misses in one batch (e.g. across worker
+        processes) and answer ``get`` from it.
+
+        Parameters
+        ----------
+        pairs : Iterable[tuple[str, Any]]
+            ``(need_id, need)`` pairs.
+
+        Returns
+        -------
+        list[tuple[str, Any]]
+            The pairs that ``get`` would compute, in input order.
+        """
+        entries = self.entries
+        return [(nid, ndata) for nid, ndata in pairs if self._key(nid, ndata) not in entries]
+
+    def get(self, nid: str, ndata: Any, compute: Callable[[], Any]) -> Any:
+        """
+        Return the stored result of a need, computing it on a miss.
+
+        Parameters
+        ----------
+        nid : str
+            Need ID.
+        ndata : Any
+            Need data (``Need`` or raw dict).
+        compute : Callable[[], Any]
+            Produces the result; must depend only on the need and the set
+            of its parents that exist.
+
+        Returns
+        -------
+        Any
+            The result (shared with the table; do not mutate).
+        """
+        key = self._key(nid, ndata)
+        result = self.entries.get(key, _MISSING)
+        if result is _MISSING:
+            result = compute()
+            self.misses += 1
+        else:
+            self.hits += 1
+        self.used[key] = result
+        return result
+
+    def save(self, prune: bool = True) -> bool:
+        """
+        Persist the table.
+
+        Parameters
+        ----------
+        prune : bool
+            Keep only the entries looked up in this run. Pass False after a
+            run that checked a subset of the needs.
+
+        Returns
+        -------
+        bool
+            False if the snapshot could not be written.
+        """
+        entries = self.used if prune else {**self.entries, **self.used}
+        if not self.misses and len(entries) == len(self.entries):
+            return True
+        self.entries = entries
+        return needs_store.save_state(self.needs_path, self.kind,
+                                      {"version": self.version, "entries": entries},
+                                      needs_store.source_key(self.needs_path))
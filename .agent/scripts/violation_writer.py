@@ -0,0 +1,221 @@
+"""
+Violation Writer.
+
+Streams audit findings to NDJSON, SARIF 2.1.0 or JUnit XML as they are
+found, for CI artifacts and editor annotations.
+
+A writer emits its header on creation, one record per ``write`` and the
+closing part on ``close``; nothing is buffered but the set of rule IDs
+seen (SARIF lists them in ``tool.driver.rules``, which JSON allows after
+``results``). Memory use is therefore independent of the number of
+findings. Every record points at the need's source file and line: the
+docname resolved under ``source_dir`` with the ``.rst`` suffix, and
+``lineno``.
+
+Meta
+----
+Knowledge Source: .agent/knowledge/sources/protocols/traceability_chain.md
+Architect       : Antigravity IDE
+
+Usage
+-----
+    from violation_writer import write_findings
+
+    audit = Audit(needs, manifest_dir=Path("docs"))
+    write_findings(audit.stream(), "sarif", sys.stdout, errors=audit.errors)
+
+Notes
+-----
+- Findings are duck-typed: any object with the ``audit_engine.Finding``
+  attributes ``check``, ``id``, ``rule``, ``severity``, ``message``,
+  ``docname`` and ``lineno``.
+- Manifest findings have no docname; their ``id`` is the manifest path.
+- JUnit ``tests``/``failures`` counts are unknown until the end of the
+  stream and are omitted; JUnit consumers count the test cases.
+"""
+import json
+from pathlib import PurePath
+from typing import Any, Iterable, TextIO
+from xml.sax.saxutils import escape, quoteattr
+
+SARIF_SCHEMA: str = "https://json.schemastore.org/sarif-2.1.0.json"
+SARIF_LEVELS: dict[str, str] = {"ERROR": "error", "WARNING": "warning"}
+TOOL_NAME: str = "ddr-audit"
+SOURCE_SUFFIX: str = ".rst"
+
+
+class ViolationWriter:
+    """
+    Base class: streams findings to ``out``.
+
+    Parameters
+    ----------
+    out : TextIO
+        Destination stream.
+    source_dir : str
+        Directory the docnames are relative to (the Sphinx source dir).
+
+    Attributes
+    ----------
+    count : int
+        Findings written so far.
+    """
+
+    def __init__(self, out: TextIO, source_dir: str = "docs"):
+        self.out = out
+        self.source_dir = source_dir
+        self.count = 0
+        self._open()
+
+    def path(self, finding: Any) -> str | None:
+        """Return the file a finding points at, as a forward-slash path."""
+        if finding.docname:
+            return PurePath(self.source_dir, finding.docname + SOURCE_SUFFIX).as_posix()
+        if finding.check == "manifest_integrity":
+            return PurePath(finding.id).as_posix()
+        return None
+
+    def write(self, finding: Any) -> None:
+        """Write one finding."""
+        self._write(finding)
+        self.count += 1
+
+    def close(self, errors: dict[str, str] | None = None) -> None:
+        """
+        Finish the document.
+
+        Parameters
+        ----------
+        errors : dict[str, str], optional
+            Check -> error of checks that failed during the run.
+        """
+        self._close(errors or {})
+        self.out.flush()
+
+    def _open(self) -> None:
+        pass
+
+    def _write(self, finding: Any) -> None:
+        raise NotImplementedError
+
+    def _close(self, errors: dict[str, str]) -> None:
+        pass
+
+
+class NdjsonWriter(ViolationWriter):
+    """One JSON object per line; failed checks as ``{"error": ...}`` lines."""
+
+    def _write(self, finding: Any) -> None:
+        record = {"check": finding.check, "id": finding.id, "rule": finding.rule,
+                  "severity": finding.severity, "message": finding.message,
+                  "docname": finding.docname, "lineno": finding.lineno,
+                  "path": self.path(finding)}
+        self.out.write(json.dumps(record) + "\n")
+
+    def _close(self, errors: dict[str, str]) -> None:
+        for check, error in errors.items():
+            self.out.write(json.dumps({"check": check, "error": error}) + "\n")
+
+
+class SarifWriter(ViolationWriter):
+    """A SARIF 2.1.0 log with one run."""
+
+    def _open(self) -> None:
+        self._rules: dict[str, str] = {}
+        self.out.write(f'{{"$schema": {json.dumps(SARIF_SCHEMA)}, "version": "2.1.0", '
+                       '"runs": [{"results": [')
+
+    def _write(self, finding: Any) -> None:
+        self._rules.setdefault(finding.rule, finding.check)
+        result = {"ruleId": finding.rule,
+                  "level": SARIF_LEVELS.get(finding.severity, "warning"),
+                  "message": {"text": f"{finding.id}: {finding.message}"},
+                  "properties": {"check": finding.check, "tag": finding.id}}
+        path = self.path(finding)
+        if path:
+            location = {"artifactLocation": {"uri": path}}
+            if finding.lineno:
+                location["region"] = {"startLine": finding.lineno}
+            result["locations"] = [{"physicalLocation": location}]
+        self.out.write(("," if self.count else "") + "\n" + json.dumps(result))
+
+    def _close(self, errors: dict[str, str]) -> None:
+        rules = [{"id": rule, "properties": {"check": check}}
+                 for rule, check in self._rules.items()]
+        invocation = {"executionSuccessful": not errors,
+                      "toolExecutionNotifications": [
+                          {"level": "error", "message": {"text": f"{check}: {error}"}}
+                          for check, error in errors.items()]}
+        self.out.write(f'\n], "tool": {{"driver": {{"name": {json.dumps(TOOL_NAME)}, '
+                       f'"rules": {json.dumps(rules)}}}}}, '
+                       f'"invocations": [{json.dumps(invocation)}]}}]}}\n')
+
+
+class JunitWriter(ViolationWriter):
+    """A JUnit XML suite with one failing test case per finding."""
+
+    def _open(self) -> None:
+        self.out.write('<?xml version="1.0" encoding="UTF-8"?>\n'
+                       f'<testsuites name={quoteattr(TOOL_NAME)}>\n'
+                       f'<testsuite name={quoteattr(TOOL_NAME)}>\n')
+
+    def _write(self, finding: Any) -> None:
+        path = self.path(finding)
+        where = f"{path}:{finding.lineno}" if path and finding.lineno else path or finding.id
+        # Manifest findings are identified by their path already.
+        subject = "" if where == finding.id else f"{finding.id}: "
+        attrs = f' file={quoteattr(path)}' if path else ""
+        if path and finding.lineno:
+            attrs += f' line="{finding.lineno}"'
+        self.out.write(
+            f'  <testcase classname={quoteattr(finding.check)} '
+            f'name={quoteattr(f"{finding.id} {finding.rule}")}{attrs}>'
+            f'<failure type={quoteattr(finding.rule)} '
+            f'message={quoteattr(f"[{finding.severity}] {finding.message}")}>'
+            f'{escape(f"{where}: {subject}{finding.message}")}</failure></testcase>\n')
+
+    def _close(self, errors: dict[str, str]) -> None:
+        for check, error in errors.items():
+            self.out.write(f'  <testcase classname={quoteattr(check)} name="run">'
+                           f'<error message={quoteattr(error)}/></testcase>\n')
+        self.out.write("</testsuite>\n</testsuites>\n")
+
+
+WRITERS: dict[str, type[ViolationWriter]] = {
+    "ndjson": NdjsonWriter,
+    "sarif": SarifWriter,
+    "junit": JunitWriter,
+}
+
+
+def write_findings(findings: Iterable[Any], fmt: str, out: TextIO,
+                   source_dir: str = "docs", errors: dict[str, str] | None = None) -> int:
+    """
+    Stream findings to ``out`` in one of ``WRITERS``' formats.
+
+    Parameters
+    ----------
+    findings : Iterable[Any]
+        Findings, consumed lazily (e.g. ``Audit.stream()``).
+    fmt : str
+        ``ndjson``, ``sarif`` or ``junit``.
+    out : TextIO
+        Destination stream.
+    source_dir : str
+        Directory the docnames are relative to.
+    errors : dict[str, str], optional
+        Check -> error, read after ``findings`` is exhausted (pass
+        ``Audit.errors``, which the stream fills as checks fail).
+
+    Returns
+    -------
+    int
+        Number of findings written.
+    """
+    if fmt not in WRITERS:
+        raise ValueError(f"Unknown format: {fmt}. Valid: {list(WRITERS)}")
+    writer = WRITERS[fmt](out, source_dir)
+    for finding in findings:
+        writer.write(finding)
+    writer.close(errors)
+    return writer.count
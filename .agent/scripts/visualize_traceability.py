@@ -19,10 +19,11 @@ Exit Codes
 1 : Error
 """
 import argparse
-import json
 import sys
 from pathlib import Path
-from collections import deque
+
+from citation_graph import CitationGraph, load_graph
+from needs_store import load_records
 
 TIER_ORDER = ["BRD", "NFR", "FSD", "SAD", "ICD", "TDD", "ISP"]
 TIER_COLORS = {"BRD": "#e3f2fd", "NFR": "#fff3e0", "FSD": "#e8f5e9",
@@ -35,34 +36,16 @@ def get_tier(tag_id: str) -> str | None:
     return prefix if prefix in TIER_ORDER else None
 
 
-def load_needs(path: Path) -> dict:
-    with open(path, "r", encoding="utf-8") as f:
-        data = json.load(f)
-    return data.get("versions", {}).get("0.1", {}).get("needs", {})
-
-
-def traverse(root: str, direction: str, depth: int, needs: dict) -> set:
-    parents = {k: needs[k].get("links", []) for k in needs}
-    children = {k: [] for k in needs}
-    for nid, plist in parents.items():
-        for pid in plist:
-            if pid in children: children[pid].append(nid)
-
-    visited = set()
-    queue = deque([(root, 0)])
-    while queue:
-        node, lvl = queue.popleft()
-        if node in visited or lvl > depth: continue
-        visited.add(node)
-        if direction in ("up", "both"):
-            for p in parents.get(node, []): queue.append((p, lvl + 1))
-        if direction in ("down", "both"):
-            for c in children.get(node, []): queue.append((c, lvl + 1))
-    return visited
+def traverse(root: str, direction: str, depth: int, needs: dict,
+             graph: CitationGraph | None = None) -> set:
+    graph = graph or CitationGraph.from_needs(needs)
+    if root not in graph: return {root}
+    return {graph.ids[i] for i in graph.traverse([root], direction, depth)}
 
 
-def generate_mermaid(needs: dict, include: set | None = None) -> str:
-    parents = {k: needs[k].get("links", []) for k in needs}
+def generate_mermaid(needs: dict, include: set | None = None,
+                     graph: CitationGraph | None = None) -> str:
+    graph = graph or CitationGraph.from_needs(needs)
     tiers = {t: [] for t in TIER_ORDER}
     for nid in (include or needs.keys()):
         tier = get_tier(nid)
@@ -81,7 +64,7 @@ def generate_mermaid(needs: dict, include: set | None = None) -> str:
 
     for nid in (include or needs.keys()):
         safe_c = nid.replace(".", "_").replace("-", "_")
-        for pid in parents.get(nid, []):
+        for pid in graph.parents_of(nid):
             if include and pid not in include: continue
             safe_p = pid.replace(".", "_").replace("-", "_")
             lines.append(f"    {safe_c} -->|cites| {safe_p}")
@@ -101,9 +84,10 @@ def main() -> int:
         print(f"Error: {path} not found", file=sys.stderr); return 1
 
     try:
-        needs = load_needs(path)
-        include = traverse(args.root, args.direction, args.depth, needs) if args.root else None
-        print(generate_mermaid(needs, include))
+        needs = load_records(path)
+        graph = load_graph(path, needs)
+        include = traverse(args.root, args.direction, args.depth, needs, graph) if args.root else None
+        print(generate_mermaid(needs, include, graph))
         return 0
     except Exception as e:
         print(f"Error: {e}", file=sys.stderr); return 1